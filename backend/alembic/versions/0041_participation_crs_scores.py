@@ -0,0 +1,37 @@
+"""Participation: materialized CRS inputs (base score, tier weight, incident aggregates).
+
+NULL crs_base_score marks the row as stale; app.services.crs fills it on the next CRS run.
+
+Revision ID: 0041_participation_crs_scores
+Revises: 0040_timeline_checks
+Create Date: 2026-02-04
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0041_participation_crs_scores"
+down_revision = "0040_timeline_checks"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("participations", sa.Column("crs_base_score", sa.Float(), nullable=True))
+    op.add_column("participations", sa.Column("crs_tier_weight", sa.Float(), nullable=True))
+    op.add_column("participations", sa.Column("crs_incident_score_sum", sa.Float(), nullable=True))
+    op.add_column("participations", sa.Column("crs_incidents_count", sa.Integer(), nullable=True))
+    # CRS window lookup: driver + discipline + state, newest first
+    op.create_index(
+        "ix_participations_driver_discipline_created",
+        "participations",
+        ["driver_id", "discipline", "created_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_participations_driver_discipline_created", table_name="participations")
+    op.drop_column("participations", "crs_incidents_count")
+    op.drop_column("participations", "crs_incident_score_sum")
+    op.drop_column("participations", "crs_tier_weight")
+    op.drop_column("participations", "crs_base_score")
@@ -0,0 +1,26 @@
+"""TaskDefinition: updated_at (version key for compiled requirement predicates).
+
+Revision ID: 0042_task_def_updated_at
+Revises: 0041_participation_crs_scores
+Create Date: 2026-02-04
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0042_task_def_updated_at"
+down_revision = "0041_participation_crs_scores"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "task_definitions",
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.execute("UPDATE task_definitions SET updated_at = created_at")
+
+
+def downgrade() -> None:
+    op.drop_column("task_definitions", "updated_at")
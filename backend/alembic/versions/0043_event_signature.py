@@ -0,0 +1,98 @@
+"""Events: materialized event_signature; task_completions: index for diversity lookups.
+
+Revision ID: 0043_event_signature
+Revises: 0042_task_def_updated_at
+Create Date: 2026-02-05
+
+"""
+import hashlib
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0043_event_signature"
+down_revision = "0042_task_def_updated_at"
+branch_labels = None
+depends_on = None
+
+
+def _duration_bucket(minutes) -> str:
+    minutes = minutes or 0
+    if minutes < 15:
+        return "short"
+    if minutes < 30:
+        return "medium"
+    if minutes < 60:
+        return "long"
+    if minutes < 120:
+        return "endurance"
+    return "ultra"
+
+
+def _signature(row) -> str:
+    # Frozen copy of app.domain.events.event_signature at this revision.
+    car_class_list = row.car_class_list
+    if isinstance(car_class_list, str):
+        car_class_list = json.loads(car_class_list)
+    payload = {
+        "source": row.source,
+        "event_type": row.event_type,
+        "format_type": row.format_type,
+        "schedule_type": row.schedule_type,
+        "duration_bucket": _duration_bucket(row.duration_minutes),
+        "class_count": row.class_count,
+        "car_class_list": sorted([value for value in (car_class_list or []) if value]),
+        "damage_model": row.damage_model,
+        "penalties": row.penalties,
+        "fuel_usage": row.fuel_usage,
+        "tire_wear": row.tire_wear,
+        "weather": row.weather,
+        "night": bool(row.night),
+        "team_event": bool(row.team_event),
+        "official_event": bool(row.official_event),
+        "track_type": row.track_type,
+        "surface_type": row.surface_type,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def upgrade() -> None:
+    op.add_column("events", sa.Column("event_signature", sa.String(64), nullable=True))
+
+    conn = op.get_bind()
+    rows = conn.execute(
+        sa.text(
+            "SELECT id, source, event_type, format_type, schedule_type, duration_minutes, class_count, "
+            "car_class_list, damage_model, penalties, fuel_usage, tire_wear, weather, night, team_event, "
+            "official_event, track_type, surface_type FROM events"
+        )
+    ).fetchall()
+    update = sa.text("UPDATE events SET event_signature = :signature WHERE id = :id")
+    for row in rows:
+        conn.execute(update, {"signature": _signature(row), "id": row.id})
+
+    op.create_index("ix_events_event_signature", "events", ["event_signature"])
+
+    # Legacy completions without a stored signature inherit it from their participation's event.
+    op.execute(
+        """
+        UPDATE task_completions
+        SET event_signature = e.event_signature
+        FROM participations p
+        JOIN events e ON e.id = p.event_id
+        WHERE task_completions.participation_id = p.id
+          AND task_completions.event_signature IS NULL
+        """
+    )
+    op.create_index(
+        "ix_task_completions_driver_task_signature_created",
+        "task_completions",
+        ["driver_id", "task_id", "event_signature", "created_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_task_completions_driver_task_signature_created", table_name="task_completions")
+    op.drop_index("ix_events_event_signature", table_name="events")
+    op.drop_column("events", "event_signature")
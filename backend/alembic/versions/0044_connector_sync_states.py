@@ -0,0 +1,32 @@
+"""connector_sync_states: per-source ETag / Last-Modified and last sync summary
+
+Revision ID: 0044_connector_sync_states
+Revises: 0043_event_signature
+Create Date: 2026-02-06
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0044_connector_sync_states"
+down_revision = "0043_event_signature"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "connector_sync_states",
+        sa.Column("source", sa.String(40), primary_key=True),
+        sa.Column("etag", sa.String(200), nullable=True),
+        sa.Column("last_modified", sa.String(64), nullable=True),
+        sa.Column("last_status", sa.String(20), nullable=True),
+        sa.Column("last_error", sa.String(300), nullable=True),
+        sa.Column("last_duration_ms", sa.Float(), nullable=True),
+        sa.Column("last_summary", sa.JSON(), nullable=False, server_default="{}"),
+        sa.Column("last_synced_at", sa.DateTime(timezone=True), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("connector_sync_states")
@@ -0,0 +1,24 @@
+"""connector_sync_states: incremental cursor (last seen updated_at / source_event_id)
+
+Revision ID: 0045_connector_sync_cursor
+Revises: 0044_connector_sync_states
+Create Date: 2026-02-06
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0045_connector_sync_cursor"
+down_revision = "0044_connector_sync_states"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("connector_sync_states", sa.Column("cursor_updated_at", sa.String(64), nullable=True))
+    op.add_column("connector_sync_states", sa.Column("cursor_source_event_id", sa.String(80), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("connector_sync_states", "cursor_source_event_id")
+    op.drop_column("connector_sync_states", "cursor_updated_at")
@@ -0,0 +1,81 @@
+"""driver_stats: pre-aggregated participations / incidents / penalties per driver and discipline
+
+Revision ID: 0046_driver_stats
+Revises: 0045_connector_sync_cursor
+Create Date: 2026-02-07
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0046_driver_stats"
+down_revision = "0045_connector_sync_cursor"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "driver_stats",
+        sa.Column("driver_id", sa.String(36), sa.ForeignKey("drivers.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("discipline", sa.String(20), primary_key=True),
+        sa.Column("participations_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("registered_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("withdrawn_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("started_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("completed_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("finished_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("dnf_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("dsq_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("dns_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("incidents_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("incident_score_sum", sa.Float(), nullable=False, server_default="0"),
+        sa.Column("penalties_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("last_race_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+    )
+    # Backfill from existing history (later changes are maintained by the app in the same transaction).
+    op.execute(
+        """
+        INSERT INTO driver_stats (
+            driver_id, discipline, participations_count,
+            registered_count, withdrawn_count, started_count, completed_count,
+            finished_count, dnf_count, dsq_count, dns_count,
+            incidents_count, incident_score_sum, penalties_count, last_race_at, updated_at
+        )
+        SELECT
+            p.driver_id,
+            CAST(p.discipline AS VARCHAR(20)),
+            COUNT(p.id),
+            SUM(CASE WHEN CAST(p.participation_state AS VARCHAR(20)) = 'registered' THEN 1 ELSE 0 END),
+            SUM(CASE WHEN CAST(p.participation_state AS VARCHAR(20)) = 'withdrawn' THEN 1 ELSE 0 END),
+            SUM(CASE WHEN CAST(p.participation_state AS VARCHAR(20)) = 'started' THEN 1 ELSE 0 END),
+            SUM(CASE WHEN CAST(p.participation_state AS VARCHAR(20)) = 'completed' THEN 1 ELSE 0 END),
+            SUM(CASE WHEN CAST(p.status AS VARCHAR(20)) = 'finished' THEN 1 ELSE 0 END),
+            SUM(CASE WHEN CAST(p.status AS VARCHAR(20)) = 'dnf' THEN 1 ELSE 0 END),
+            SUM(CASE WHEN CAST(p.status AS VARCHAR(20)) = 'dsq' THEN 1 ELSE 0 END),
+            SUM(CASE WHEN CAST(p.status AS VARCHAR(20)) = 'dns' THEN 1 ELSE 0 END),
+            COALESCE(SUM(inc.incidents_count), 0),
+            COALESCE(SUM(inc.score_sum), 0),
+            COALESCE(SUM(pen.penalties_count), 0),
+            MAX(COALESCE(p.finished_at, p.started_at)),
+            CURRENT_TIMESTAMP
+        FROM participations p
+        LEFT JOIN (
+            SELECT participation_id, COUNT(id) AS incidents_count, SUM(score) AS score_sum
+            FROM incidents
+            GROUP BY participation_id
+        ) inc ON inc.participation_id = p.id
+        LEFT JOIN (
+            SELECT i.participation_id, COUNT(pe.id) AS penalties_count
+            FROM penalties pe
+            JOIN incidents i ON pe.incident_id = i.id
+            GROUP BY i.participation_id
+        ) pen ON pen.participation_id = p.id
+        GROUP BY p.driver_id, CAST(p.discipline AS VARCHAR(20))
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("driver_stats")
@@ -0,0 +1,21 @@
+"""incidents: index participation_id (per-participation counts in list views and driver_stats refresh)
+
+Revision ID: 0047_incident_participation_ix
+Revises: 0046_driver_stats
+Create Date: 2026-02-07
+
+"""
+from alembic import op
+
+revision = "0047_incident_participation_ix"
+down_revision = "0046_driver_stats"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_incidents_participation_id", "incidents", ["participation_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_incidents_participation_id", table_name="incidents")
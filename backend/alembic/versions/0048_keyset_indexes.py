@@ -0,0 +1,33 @@
+"""keyset pagination indexes: (created_at, id) on list tables, (driver_id, computed_at, id) on crs_history
+
+Revision ID: 0048_keyset_indexes
+Revises: 0047_incident_participation_ix
+Create Date: 2026-02-08
+
+"""
+from alembic import op
+
+revision = "0048_keyset_indexes"
+down_revision = "0047_incident_participation_ix"
+branch_labels = None
+depends_on = None
+
+INDEXES = (
+    ("ix_participations_created_at_id", "participations", ["created_at", "id"]),
+    ("ix_participations_driver_created_at_id", "participations", ["driver_id", "created_at", "id"]),
+    ("ix_incidents_created_at_id", "incidents", ["created_at", "id"]),
+    ("ix_penalties_created_at_id", "penalties", ["created_at", "id"]),
+    ("ix_raw_events_created_at_id", "raw_events", ["created_at", "id"]),
+    ("ix_audit_logs_created_at_id", "audit_logs", ["created_at", "id"]),
+    ("ix_crs_history_driver_computed_at_id", "crs_history", ["driver_id", "computed_at", "id"]),
+)
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,34 @@
+"""events: current_tier (materialized tier of the event's classification, kept in sync by ORM listeners)
+
+Revision ID: 0049_event_current_tier
+Revises: 0048_keyset_indexes
+Create Date: 2026-02-08
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0049_event_current_tier"
+down_revision = "0048_keyset_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("events", sa.Column("current_tier", sa.String(10), nullable=True))
+    op.create_index("ix_events_current_tier", "events", ["current_tier"])
+    op.execute(
+        """
+        UPDATE events SET current_tier = (
+            SELECT c.event_tier FROM classifications c
+            WHERE c.event_id = events.id
+            ORDER BY c.created_at DESC
+            LIMIT 1
+        )
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_events_current_tier", table_name="events")
+    op.drop_column("events", "current_tier")
@@ -0,0 +1,29 @@
+"""events: composite indexes for upcoming/past search (tier + start window + game)
+
+ix_events_current_tier_start_time has current_tier as prefix, so the single-column index from 0049 is dropped.
+
+Revision ID: 0050_event_search_indexes
+Revises: 0049_event_current_tier
+Create Date: 2026-02-08
+
+"""
+from alembic import op
+
+revision = "0050_event_search_indexes"
+down_revision = "0049_event_current_tier"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_events_current_tier_start_time", "events", ["current_tier", "start_time_utc", "game"]
+    )
+    op.create_index("ix_events_start_time_game", "events", ["start_time_utc", "game"])
+    op.drop_index("ix_events_current_tier", table_name="events")
+
+
+def downgrade() -> None:
+    op.create_index("ix_events_current_tier", "events", ["current_tier"])
+    op.drop_index("ix_events_start_time_game", table_name="events")
+    op.drop_index("ix_events_current_tier_start_time", table_name="events")
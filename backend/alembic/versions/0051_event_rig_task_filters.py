@@ -0,0 +1,73 @@
+"""events: rig requirement ordinals (rig_wheel_rank, rig_pedals_rank, rig_clutch_required) and JSONB task_codes
+
+Rig ranks mirror app.core.constants.rig WHEEL_ORDER / PEDALS_ORDER; unknown or missing values = no requirement
+(NULL). task_codes becomes JSONB with a GIN (jsonb_path_ops) index for @> containment filters.
+
+Revision ID: 0051_event_rig_task_filters
+Revises: 0050_event_search_indexes
+Create Date: 2026-02-09
+
+"""
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision = "0051_event_rig_task_filters"
+down_revision = "0050_event_search_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("events", sa.Column("rig_wheel_rank", sa.Integer(), nullable=True))
+    op.add_column("events", sa.Column("rig_pedals_rank", sa.Integer(), nullable=True))
+    op.add_column(
+        "events",
+        sa.Column("rig_clutch_required", sa.Boolean(), nullable=False, server_default="false"),
+    )
+    op.execute(
+        """
+        UPDATE events SET
+            rig_wheel_rank = CASE rig_options->>'wheel_type'
+                WHEN 'legacy' THEN 0 WHEN 'force_feedback_nm' THEN 1 END,
+            rig_pedals_rank = CASE rig_options->>'pedals_class'
+                WHEN 'basic' THEN 0 WHEN 'spring' THEN 1 WHEN 'premium' THEN 2 END,
+            rig_clutch_required = COALESCE(rig_options->>'manual_with_clutch' = 'true', false)
+        WHERE rig_options IS NOT NULL
+        """
+    )
+    op.create_index(
+        "ix_events_rig_ranks", "events", ["rig_wheel_rank", "rig_pedals_rank", "rig_clutch_required"]
+    )
+
+    op.alter_column(
+        "events",
+        "task_codes",
+        type_=postgresql.JSONB(),
+        existing_type=sa.JSON(),
+        existing_nullable=True,
+        postgresql_using="task_codes::jsonb",
+    )
+    op.create_index(
+        "ix_events_task_codes",
+        "events",
+        ["task_codes"],
+        postgresql_using="gin",
+        postgresql_ops={"task_codes": "jsonb_path_ops"},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_events_task_codes", table_name="events")
+    op.alter_column(
+        "events",
+        "task_codes",
+        type_=sa.JSON(),
+        existing_type=postgresql.JSONB(),
+        existing_nullable=True,
+        postgresql_using="task_codes::json",
+    )
+    op.drop_index("ix_events_rig_ranks", table_name="events")
+    op.drop_column("events", "rig_clutch_required")
+    op.drop_column("events", "rig_pedals_rank")
+    op.drop_column("events", "rig_wheel_rank")
@@ -0,0 +1,105 @@
+"""participation_laps: append-only lap telemetry + lap summary columns on participations
+
+Moves raw_metrics.lap_times / raw_metrics.sector_times into participation_laps (one row per lap) and drops
+them from raw_metrics; downgrade puts them back.
+
+Revision ID: 0052_participation_laps
+Revises: 0051_event_rig_task_filters
+Create Date: 2026-02-09
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0052_participation_laps"
+down_revision = "0051_event_rig_task_filters"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "participation_laps",
+        sa.Column(
+            "participation_id",
+            sa.String(36),
+            sa.ForeignKey("participations.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("lap_number", sa.Integer(), primary_key=True),
+        sa.Column("lap_time_seconds", sa.Float(), nullable=False),
+        sa.Column("sector_times", sa.JSON(), nullable=True),
+        sa.Column("recorded_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+    )
+    op.add_column("participations", sa.Column("best_lap_seconds", sa.Float(), nullable=True))
+    op.add_column("participations", sa.Column("last_lap_seconds", sa.Float(), nullable=True))
+    op.add_column(
+        "participations", sa.Column("total_lap_seconds", sa.Float(), nullable=False, server_default="0")
+    )
+
+    op.execute(
+        """
+        INSERT INTO participation_laps (participation_id, lap_number, lap_time_seconds, sector_times, recorded_at)
+        SELECT
+            p.id,
+            CAST(l.ord AS INTEGER),
+            CAST(l.value #>> '{}' AS DOUBLE PRECISION),
+            p.raw_metrics -> 'sector_times' -> CAST(l.ord - 1 AS INTEGER),
+            COALESCE(p.finished_at, p.started_at, p.created_at)
+        FROM participations p
+        CROSS JOIN LATERAL json_array_elements(p.raw_metrics -> 'lap_times') WITH ORDINALITY AS l(value, ord)
+        WHERE json_typeof(p.raw_metrics -> 'lap_times') = 'array'
+        """
+    )
+    op.execute(
+        """
+        UPDATE participations p SET
+            best_lap_seconds = s.best_lap,
+            last_lap_seconds = s.last_lap,
+            total_lap_seconds = s.total_lap,
+            laps_completed = s.laps
+        FROM (
+            SELECT
+                participation_id,
+                MIN(lap_time_seconds) AS best_lap,
+                (ARRAY_AGG(lap_time_seconds ORDER BY lap_number DESC))[1] AS last_lap,
+                SUM(lap_time_seconds) AS total_lap,
+                COUNT(*) AS laps
+            FROM participation_laps
+            GROUP BY participation_id
+        ) s
+        WHERE p.id = s.participation_id
+        """
+    )
+    op.execute(
+        """
+        UPDATE participations
+        SET raw_metrics = CAST(CAST(raw_metrics AS JSONB) - 'lap_times' - 'sector_times' AS JSON)
+        WHERE CAST(raw_metrics AS JSONB) ? 'lap_times' OR CAST(raw_metrics AS JSONB) ? 'sector_times'
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        """
+        UPDATE participations p
+        SET raw_metrics = CAST(
+            CAST(p.raw_metrics AS JSONB)
+            || jsonb_build_object('lap_times', s.lap_times, 'sector_times', s.sector_times) AS JSON
+        )
+        FROM (
+            SELECT
+                participation_id,
+                JSONB_AGG(lap_time_seconds ORDER BY lap_number) AS lap_times,
+                JSONB_AGG(COALESCE(CAST(sector_times AS JSONB), '[]'::jsonb) ORDER BY lap_number) AS sector_times
+            FROM participation_laps
+            GROUP BY participation_id
+        ) s
+        WHERE p.id = s.participation_id
+        """
+    )
+    op.drop_column("participations", "total_lap_seconds")
+    op.drop_column("participations", "last_lap_seconds")
+    op.drop_column("participations", "best_lap_seconds")
+    op.drop_table("participation_laps")
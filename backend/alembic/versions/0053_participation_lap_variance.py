@@ -0,0 +1,36 @@
+"""participations: lap_time_m2 (Welford running variance of lap times)
+
+Revision ID: 0053_participation_lap_variance
+Revises: 0052_participation_laps
+Create Date: 2026-02-10
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0053_participation_lap_variance"
+down_revision = "0052_participation_laps"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "participations", sa.Column("lap_time_m2", sa.Float(), nullable=False, server_default="0")
+    )
+    # M2 = sum of squared deviations from the mean = sample variance * (n - 1)
+    op.execute(
+        """
+        UPDATE participations p SET lap_time_m2 = s.m2
+        FROM (
+            SELECT participation_id, COALESCE(VAR_SAMP(lap_time_seconds) * (COUNT(*) - 1), 0) AS m2
+            FROM participation_laps
+            GROUP BY participation_id
+        ) s
+        WHERE p.id = s.participation_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("participations", "lap_time_m2")
@@ -0,0 +1,39 @@
+"""raw_events: unique (source, source_event_id)
+
+Revision ID: 0054_raw_events_source_event_unique
+Revises: 0053_participation_lap_variance
+Create Date: 2026-02-12
+
+"""
+from alembic import op
+
+revision = "0054_raw_events_source_event_unique"
+down_revision = "0053_participation_lap_variance"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Overlapping syncs could store the same feed item twice: keep the first copy
+    op.execute(
+        """
+        DELETE FROM raw_events
+        WHERE id IN (
+            SELECT id FROM (
+                SELECT id, ROW_NUMBER() OVER (
+                    PARTITION BY source, source_event_id ORDER BY created_at, id
+                ) AS rn
+                FROM raw_events
+                WHERE source_event_id IS NOT NULL
+            ) ranked
+            WHERE rn > 1
+        )
+        """
+    )
+    op.create_index(
+        "uq_raw_events_source_event_id", "raw_events", ["source", "source_event_id"], unique=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("uq_raw_events_source_event_id", table_name="raw_events")
@@ -0,0 +1,23 @@
+"""Cursor pagination helpers for routes: parse the ?cursor= token and expose the next one in X-Next-Cursor."""
+
+from __future__ import annotations
+
+from fastapi import HTTPException, Response
+
+from app.repositories.pagination import PageCursor
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def parse_cursor(token: str | None) -> PageCursor | None:
+    if not token:
+        return None
+    try:
+        return PageCursor.decode(token)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from e
+
+
+def set_next_cursor(response: Response, token: str | None) -> None:
+    if token:
+        response.headers[NEXT_CURSOR_HEADER] = token
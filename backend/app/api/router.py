@@ -11,6 +11,7 @@ from app.api.routes.crs import router as crs_router
 from app.api.routes.dev import router as dev_router
 from app.api.routes.drivers import router as drivers_router
 from app.api.routes.events import router as events_router
+from app.api.routes.exports import router as exports_router
 from app.api.routes.ingest import router as ingest_router
 from app.api.routes.incidents import router as incidents_router
 from app.api.routes.penalties import router as penalties_router
@@ -59,4 +60,5 @@ api_router.include_router(metrics_router)
 
 # Admin & dev
 api_router.include_router(admin_router)
+api_router.include_router(exports_router)
 api_router.include_router(dev_router)
@@ -5,6 +5,7 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
 from app.api.routes.profile import _build_read, _compute_completion
+from app.api.pagination import parse_cursor
 from app.db.session import get_session
 from app.models.driver import Driver
 from app.models.user import User
@@ -23,9 +24,11 @@ from app.repositories.classification import ClassificationRepository
 from app.repositories.crs_history import CRSHistoryRepository
 from app.repositories.driver import DriverRepository
 from app.repositories.driver_license import DriverLicenseRepository
+from app.repositories.driver_stats import DriverStatsRepository
 from app.repositories.event import EventRepository
 from app.repositories.incident import IncidentRepository
 from app.repositories.license_level import LicenseLevelRepository
+from app.repositories.pagination import next_cursor
 from app.repositories.participation import ParticipationRepository
 from app.repositories.recommendation import RecommendationRepository
 from app.repositories.task_definition import TaskDefinitionRepository
@@ -46,6 +49,7 @@ from app.schemas.admin import (
     AdminLookupLicenseItem,
     AdminLookupCrsItem,
     AdminLookupRecommendationItem,
+    AdminLookupStatsItem,
     AdminParticipationSearchRead,
     AdminParticipationSummary,
     AdminPlayerInspectRead,
@@ -256,13 +260,11 @@ def admin_lookup(
     participations = ParticipationRepository(session).list_by_driver_id_with_events(
         driver.id, limit=50
     )
+    participation_ids = [part.id for part, _ in participations]
+    incident_counts = IncidentRepository(session).count_by_participation_ids(participation_ids)
     part_items = []
-    participation_ids = []
     for part, event in participations:
-        participation_ids.append(part.id)
-        incidents_count = (
-            IncidentRepository(session).count_by_participation_id(part.id)
-        )
+        incidents_count = incident_counts.get(part.id, 0)
         part_items.append(
             AdminLookupParticipationItem(
                 id=part.id,
@@ -330,6 +332,10 @@ def admin_lookup(
         licenses=license_items,
         last_crs=crs_out,
         last_recommendation=rec_out,
+        stats=[
+            AdminLookupStatsItem.model_validate(row)
+            for row in DriverStatsRepository(session).list_by_driver_id(driver.id)
+        ],
     )
 
 
@@ -356,14 +362,19 @@ def search_user_by_email(
 @router.get("/search/participations", response_model=AdminParticipationSearchRead)
 def search_participations(
     q: str,
+    limit: int = 200,
+    cursor: str | None = None,
     session: Session = Depends(get_session),
     _: User | None = Depends(require_roles("admin")),
 ):
+    """Driver's participations, newest first, one page at a time (next_cursor -> ?cursor=)."""
+    page_cursor = parse_cursor(cursor)
     user, driver = _find_user_and_driver(session, q)
     if not driver:
         raise HTTPException(status_code=404, detail="Driver not found")
-    participations = ParticipationRepository(session).list_by_driver_id_with_events(
-        driver.id, limit=1000
+    limit = max(1, min(limit, 1000))
+    participations = ParticipationRepository(session).list_page_by_driver_id_with_events(
+        driver.id, limit=limit, cursor=page_cursor
     )
     items = []
     for participation, event in participations:
@@ -377,6 +388,7 @@ def search_participations(
         primary_discipline=driver.primary_discipline,
         sim_games=driver.sim_games or [],
         participations=items,
+        next_cursor=next_cursor([part for part, _ in participations], limit),
     )
 
 
@@ -835,11 +847,8 @@ def driver_crs_diagnostic(
     participations = [p for p in all_parts if (p.discipline.value if hasattr(p.discipline, "value") else p.discipline) == discipline]
     participations_count = len(participations)
 
-    events_missing_classification: list[str] = []
-    for p in participations:
-        classification = ClassificationRepository(session).get_latest_for_event(p.event_id)
-        if not classification:
-            events_missing_classification.append(p.event_id)
+    tier_by_event = ClassificationRepository(session).tier_by_event([p.event_id for p in participations])
+    events_missing_classification = [p.event_id for p in participations if p.event_id not in tier_by_event]
 
     last_crs = CRSHistoryRepository(session).latest_by_driver_and_discipline(did, discipline)
     latest_crs_score = last_crs.score if last_crs else None
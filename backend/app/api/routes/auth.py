@@ -1,13 +1,15 @@
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 
 from app.core.settings import settings
+from app.api.pagination import parse_cursor, set_next_cursor
 from app.db.session import get_session
 from app.models.audit_log import AuditLog
 from app.models.user import User
 from app.repositories.audit_log import AuditLogRepository
+from app.repositories.pagination import next_cursor
 from app.repositories.user import UserRepository
 from app.schemas.auth import (
     AuditLogRead,
@@ -189,7 +191,15 @@ def list_users(
 
 @router.get("/audit", response_model=List[AuditLogRead])
 def list_audit_logs(
+    response: Response,
+    limit: int = 200,
+    cursor: str | None = None,
     session: Session = Depends(get_session),
     _: User | None = Depends(require_roles("admin")),
 ):
-    return AuditLogRepository(session).list_recent(200)
+    """Newest first; follow X-Next-Cursor (?cursor=) for older entries."""
+    page_cursor = parse_cursor(cursor)
+    limit = max(1, min(limit, 500))
+    logs = AuditLogRepository(session).list_recent(limit, cursor=page_cursor)
+    set_next_cursor(response, next_cursor(logs, limit))
+    return logs
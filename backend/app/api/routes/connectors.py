@@ -1,76 +1,85 @@
 from __future__ import annotations
 
-from urllib.error import HTTPError, URLError
-
+import httpx
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 
-from app.core.settings import settings
 from app.db.session import get_session
-from app.services.connectors import extract_events, fetch_json
-from app.services.ingestion import ingest_payload
+from app.repositories.connector_sync_state import ConnectorSyncStateRepository
+from app.services.connector_sync import (
+    SyncInProgressError,
+    configured_sources,
+    get_source,
+    sync_all_sources,
+    sync_source,
+)
 from app.services.auth import require_roles, require_user
 from app.models.user import User
 
 router = APIRouter(prefix="/connectors", tags=["connectors"])
 
 
-def _sync_source(session: Session, source: str, url: str | None, api_key: str | None) -> dict:
-    if not url:
-        raise HTTPException(status_code=400, detail=f"{source} events URL is not configured")
+def _sync_source(session: Session, source_name: str, full: bool = False) -> dict:
+    source = get_source(source_name)
+    if source is None or not source.url:
+        raise HTTPException(status_code=400, detail=f"{source_name} events URL is not configured")
     try:
-        payload = fetch_json(url, api_key)
-        events = extract_events(payload)
+        return sync_source(session, source, incremental=not full)
+    except SQLAlchemyError:
+        raise
+    except SyncInProgressError as exc:
+        raise HTTPException(status_code=409, detail=str(exc))
     except ValueError as exc:
         raise HTTPException(status_code=422, detail=str(exc))
-    except HTTPError as exc:
-        raise HTTPException(status_code=exc.code or 502, detail=f"{source} fetch failed")
-    except URLError as exc:
-        raise HTTPException(status_code=502, detail=f"{source} fetch failed: {exc.reason}")
+    except httpx.HTTPStatusError as exc:
+        raise HTTPException(status_code=exc.response.status_code or 502, detail=f"{source_name} fetch failed")
+    except httpx.RequestError as exc:
+        raise HTTPException(status_code=502, detail=f"{source_name} fetch failed: {exc}")
     except Exception:
-        raise HTTPException(status_code=502, detail=f"{source} fetch failed")
-
-    classified = 0
-    failed = 0
+        raise HTTPException(status_code=502, detail=f"{source_name} fetch failed")
 
-    for event_payload in events:
-        try:
-            raw_event = ingest_payload(session, source, event_payload, create_event=True)
-            if raw_event.status == "classified":
-                classified += 1
-            elif raw_event.status == "failed":
-                failed += 1
-        except Exception:
-            session.rollback()
-            failed += 1
 
-    return {"source": source, "total": len(events), "classified": classified, "failed": failed}
+@router.get("/status")
+def connector_status(
+    session: Session = Depends(get_session),
+    _: User = Depends(require_user()),
+):
+    states = {state.source: state for state in ConnectorSyncStateRepository(session).list_all()}
+    status = {}
+    for source in configured_sources():
+        state = states.get(source.name)
+        status[source.name] = {
+            "configured": bool(source.url),
+            "last_status": state.last_status if state else None,
+            "last_synced_at": state.last_synced_at if state else None,
+            "last_duration_ms": state.last_duration_ms if state else None,
+            "cursor": state.cursor_updated_at if state else None,
+        }
+    return status
 
 
-@router.get("/status")
-def connector_status(_: User = Depends(require_user())):
-    return {
-        "wss": {"configured": bool(settings.wss_events_url)},
-        "gridfinder": {"configured": bool(settings.gridfinder_events_url)},
-    }
+@router.post("/sync-all")
+def sync_all(_: User | None = Depends(require_roles("admin"))):
+    """Sync every configured source concurrently; per-source status, counts and duration_ms."""
+    return sync_all_sources()
 
 
 @router.post("/wss/sync")
 def sync_wss(
+    full: bool = False,
     session: Session = Depends(get_session),
     _: User | None = Depends(require_roles("admin")),
 ):
-    return _sync_source(session, "wss", settings.wss_events_url, settings.wss_api_key)
+    """Incremental sync from the stored cursor; full=true ignores cursor and validators."""
+    return _sync_source(session, "wss", full)
 
 
 @router.post("/gridfinder/sync")
 def sync_gridfinder(
+    full: bool = False,
     session: Session = Depends(get_session),
     _: User | None = Depends(require_roles("admin")),
 ):
-    return _sync_source(
-        session,
-        "gridfinder",
-        settings.gridfinder_events_url,
-        settings.gridfinder_api_key,
-    )
+    """Incremental sync from the stored cursor; full=true ignores cursor and validators."""
+    return _sync_source(session, "gridfinder", full)
@@ -182,18 +182,18 @@ def dev_mock_incident_tick(
 ) -> dict[str, Any]:
     """Run one tick of the mock incident service. Adds incidents for participations with state started."""
     from app.core.settings import settings
-    from app.services.crs import recompute_crs
+    from app.services.crs_queue import enqueue_crs_recompute
     from app.services.mock_incident_service import tick_mock_incidents
     result = tick_mock_incidents(
         session,
         probability=getattr(settings, "mock_incident_probability", 0.15),
     )
+    session.commit()
     for driver_id, discipline in result.get("driver_discipline_pairs") or []:
         try:
-            recompute_crs(session, driver_id, discipline, trigger_participation_id=None)
+            enqueue_crs_recompute(session, driver_id, discipline, trigger_participation_id=None)
         except Exception:
-            pass
-    session.commit()
+            session.rollback()
     return {
         "incidents_created": result["incidents_created"],
         "driver_discipline_pairs": result["driver_discipline_pairs"],
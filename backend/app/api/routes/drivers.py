@@ -1,10 +1,11 @@
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
 
 from sqlalchemy import select
 
+from app.api.pagination import parse_cursor, set_next_cursor
 from app.db.session import get_session
 from app.models.anti_gaming import AntiGamingReport
 from app.models.driver import Driver
@@ -20,6 +21,7 @@ from app.models.user import User
 from app.models.user_profile import UserProfile
 from app.repositories.crs_history import CRSHistoryRepository
 from app.repositories.driver import DriverRepository
+from app.repositories.pagination import next_cursor
 from app.repositories.user_profile import UserProfileRepository
 from app.schemas.crs import CRSHistoryRead
 from app.schemas.driver import DriverCreate, DriverRead, DriverUpdate
@@ -132,17 +134,31 @@ def create_my_driver(
 @router.get("/{driver_id}/crs/history", response_model=List[CRSHistoryRead])
 def get_driver_crs_history(
     driver_id: str,
+    response: Response,
     discipline: str | None = None,
+    limit: int | None = None,
+    cursor: str | None = None,
     session: Session = Depends(get_session),
     user: User = Depends(require_user()),
 ):
-    """CRS history for driver (includes inputs_hash, computed_from_participation_id)."""
+    """
+    CRS history for driver (includes inputs_hash, computed_from_participation_id), newest first.
+    Full history by default; with limit, one page and X-Next-Cursor for the next (?cursor=).
+    """
+    page_cursor = parse_cursor(cursor)
     driver = DriverRepository(session).get_by_id(driver_id)
     if not driver:
         raise HTTPException(status_code=404, detail="Driver not found")
     if user.role not in {"admin"} and driver.user_id != user.id:
         raise HTTPException(status_code=403, detail="Insufficient role")
-    return CRSHistoryRepository(session).list_by_driver_id(driver_id, discipline)
+    if limit is None:
+        return CRSHistoryRepository(session).list_by_driver_id(driver_id, discipline)
+    limit = max(1, min(limit, 500))
+    history = CRSHistoryRepository(session).list_by_driver_id(
+        driver_id, discipline, limit=limit, cursor=page_cursor
+    )
+    set_next_cursor(response, next_cursor(history, limit, time_attr="computed_at"))
+    return history
 
 
 @router.patch("/me", response_model=DriverRead)
@@ -1,17 +1,22 @@
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
+from app.core.settings import settings
 from app.db.session import get_session
 from app.models.classification import Classification
 from app.models.event import Event
 from app.models.user import User
 from app.repositories.classification import ClassificationRepository
 from app.repositories.event import EventRepository
+from app.repositories.participation import ParticipationRepository
 from app.schemas.classification import ClassificationRead
 from app.schemas.event import EventCreate, EventRead, EventUpdate
-from app.services.classifier import build_event_payload, classify_event, TIER_LABELS
+from app.services.classification_cache import classify_event_cached
+from app.services.classifier import build_event_payload, TIER_LABELS
 from app.services.auth import require_roles, require_user
 from app.services.event_service import (
     events_breakdown,
@@ -24,6 +29,7 @@ from app.services.event_service import (
     list_upcoming_count as service_list_upcoming_count,
     list_upcoming_events as service_list_upcoming_events,
 )
+from app.services.live_race import get_live_race_hub, live_race_snapshot, stream_live_race
 from app.services.timeline_validation import validate_event_timeline
 from app.utils.special_events import special_slot_tier_conflict
 
@@ -68,7 +74,7 @@ def create_event(
             )
 
     classification_payload = build_event_payload(event, infer_discipline(event))
-    classification_data = classify_event(classification_payload)
+    classification_data = classify_event_cached(classification_payload)
     classification_data["event_tier"] = tier
     classification_data["tier_label"] = TIER_LABELS.get(tier, tier)
 
@@ -100,9 +106,14 @@ def list_events(
     same_tier: bool = False,
     rig_filter: bool = True,
     task_code: str | None = None,
+    limit: int | None = None,
+    offset: int = 0,
     session: Session = Depends(get_session),
     user: User = Depends(require_user()),
 ):
+    """List events; all filters (driver sim_games/tier/rig, task_code) apply in SQL before limit/offset."""
+    if limit is not None:
+        limit = max(1, min(limit, 500))
     if driver_id and user.role not in {"admin"}:
         from app.repositories.driver import DriverRepository
         driver = DriverRepository(session).get_by_id(driver_id)
@@ -119,6 +130,8 @@ def list_events(
         same_tier=same_tier,
         rig_filter=rig_filter,
         task_code=task_code,
+        limit=limit,
+        offset=max(0, offset),
         user_id=user.id,
         user_role=user.role or "",
     )
@@ -126,6 +139,7 @@ def list_events(
 
 @router.get("/upcoming", response_model=List[EventRead])
 def list_upcoming_events(
+    response: Response,
     driver_id: str,
     discipline: str,
     limit: int = 3,
@@ -133,11 +147,12 @@ def list_upcoming_events(
     session: Session = Depends(get_session),
     user: User = Depends(require_user()),
 ):
-    """Upcoming events for driver: start_time_utc > now, tier match, sim_games. Paginated."""
+    """Upcoming events for driver: start_time_utc > now, tier match, sim_games. Paginated; X-Total-Count header."""
     limit = max(1, min(limit, 50))
-    out = service_list_upcoming_events(
+    out, total = service_list_upcoming_events(
         session, driver_id, user.id, user.role or "", limit=limit, offset=offset
     )
+    response.headers["X-Total-Count"] = str(total)
     if not out and driver_id:
         from app.repositories.driver import DriverRepository
         if not DriverRepository(session).get_by_id(driver_id):
@@ -158,6 +173,7 @@ def get_upcoming_count(
 
 @router.get("/past", response_model=List[EventRead])
 def list_past_events(
+    response: Response,
     driver_id: str,
     limit: int = 3,
     offset: int = 0,
@@ -165,17 +181,19 @@ def list_past_events(
     session: Session = Depends(get_session),
     user: User = Depends(require_user()),
 ):
-    """Past events for driver: start_time_utc < now, within recent_days. Paginated."""
+    """Past events for driver: start_time_utc < now, within recent_days. Paginated; X-Total-Count header."""
     if driver_id and user.role not in {"admin"}:
         from app.repositories.driver import DriverRepository
         driver = DriverRepository(session).get_by_id(driver_id)
         if not driver or driver.user_id != user.id:
             raise HTTPException(status_code=403, detail="Insufficient role")
     limit = max(1, min(limit, 50))
-    return service_list_past_events(
+    out, total = service_list_past_events(
         session, driver_id, user.id, user.role or "",
         limit=limit, offset=offset, recent_days=recent_days,
     )
+    response.headers["X-Total-Count"] = str(total)
+    return out
 
 
 @router.get("/past/count")
@@ -217,6 +235,52 @@ def get_event(
     )
 
 
+def _live_race_snapshot_sync(session: Session, event_id: str, user: User) -> dict:
+    """404 / 403 checks and the snapshot; closes the session so the stream holds no DB connection."""
+    try:
+        if not EventRepository(session).get_by_id(event_id):
+            raise HTTPException(status_code=404, detail="Event not found")
+        if user.role not in {"admin"}:
+            if not ParticipationRepository(session).user_has_participation_in_event(user.id, event_id):
+                raise HTTPException(status_code=403, detail="Insufficient role")
+        return live_race_snapshot(session, event_id)
+    finally:
+        session.close()
+
+
+@router.get("/{event_id}/live")
+async def live_race_stream(
+    event_id: str,
+    request: Request,
+    session: Session = Depends(get_session),
+    user: User = Depends(require_user()),
+):
+    """
+    Server-Sent Events: standings snapshot, then standings / incident / crs / finished messages of the
+    event as they happen (replaces polling /participations/active during a race). Admins and drivers
+    registered for the event.
+    """
+    hub = get_live_race_hub()
+    if hub is None:
+        raise HTTPException(status_code=503, detail="Live race updates are disabled")
+    # Subscribe and wait until the channel is live before the snapshot, so no update between the two is lost.
+    # If Redis does not confirm in time (listener reconnecting) the stream starts anyway and may miss them.
+    subscription = hub.subscribe(event_id)
+    try:
+        await hub.wait_subscribed(subscription, settings.live_race_subscribe_timeout_seconds)
+        snapshot = await run_in_threadpool(_live_race_snapshot_sync, session, event_id, user)
+    except BaseException:
+        hub.unsubscribe(subscription)
+        raise
+    return StreamingResponse(
+        stream_live_race(
+            hub, subscription, snapshot, request.is_disconnected, settings.live_race_heartbeat_seconds
+        ),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.patch("/{event_id}", response_model=EventRead)
 def update_event(
     event_id: str,
@@ -307,7 +371,7 @@ def reclassify_event(
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
     classification_payload = build_event_payload(event, infer_discipline(event))
-    classification_data = classify_event(classification_payload)
+    classification_data = classify_event_cached(classification_payload)
     classification = classification_repo.get_latest_for_event(event.id)
     if not classification:
         classification = Classification(event_id=event.id, **classification_data)
@@ -0,0 +1,52 @@
+"""Admin exports: stream participations, incidents, penalties, CRS history and audit logs as NDJSON or CSV."""
+
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+
+from app.models.user import User
+from app.services.auth import require_roles
+from app.services.exports import (
+    EXPORT_DATASETS,
+    EXPORT_FORMATS,
+    ExportFilters,
+    csv_chunks,
+    export_query,
+    iter_export_rows,
+    ndjson_chunks,
+)
+
+router = APIRouter(prefix="/admin/exports", tags=["admin"])
+
+
+@router.get("/{dataset}")
+def export_dataset(
+    dataset: str,
+    format: str = "ndjson",
+    driver_id: str | None = None,
+    event_id: str | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    _: User | None = Depends(require_roles("admin")),
+):
+    """Stream all matching rows (oldest first) as NDJSON or CSV; since/until bound the dataset's timestamp."""
+    if dataset not in EXPORT_DATASETS:
+        raise HTTPException(status_code=404, detail=f"Unknown dataset; one of {sorted(EXPORT_DATASETS)}")
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of {sorted(EXPORT_FORMATS)}")
+    filters = ExportFilters(driver_id=driver_id, event_id=event_id, since=since, until=until)
+    try:
+        query = export_query(dataset, filters)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    rows = iter_export_rows(query)
+    if format == "csv":
+        body = csv_chunks(rows, [column.key for column in query.selected_columns])
+    else:
+        body = ndjson_chunks(rows)
+    return StreamingResponse(
+        body,
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="{dataset}.{format}"'},
+    )
@@ -1,15 +1,18 @@
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
 
+from app.api.pagination import parse_cursor, set_next_cursor
 from app.db.session import get_session
 from app.models.participation import ParticipationStatus
 from app.models.user import User
 from app.penalties.scores import get_score_for_penalty_type
 from app.repositories.driver import DriverRepository
+from app.repositories.driver_stats import DriverStatsRepository
 from app.repositories.event import EventRepository
 from app.repositories.incident import IncidentRepository
+from app.repositories.pagination import next_cursor
 from app.repositories.participation import ParticipationRepository
 from app.repositories.penalty import PenaltyRepository
 from app.schemas.incident import IncidentRead, IncidentWithEventRead
@@ -44,18 +47,23 @@ def get_incidents_count(
                 return {"total": 0}
             if participation.driver_id != driver.id:
                 raise HTTPException(status_code=403, detail="Insufficient role")
-    total = IncidentRepository(session).count_filtered(
-        driver_id=driver_id, participation_id=participation_id
-    )
+    if participation_id:
+        total = IncidentRepository(session).count_filtered(
+            driver_id=driver_id, participation_id=participation_id
+        )
+    else:
+        total = DriverStatsRepository(session).total("incidents_count", driver_id=driver_id)
     return {"total": total}
 
 
 @router.get("", response_model=List[IncidentWithEventRead])
 def list_all_incidents(
+    response: Response,
     driver_id: str | None = None,
     participation_id: str | None = None,
     limit: int = 100,
     offset: int = 0,
+    cursor: str | None = None,
     session: Session = Depends(get_session),
     user: User = Depends(require_user()),
 ):
@@ -75,12 +83,18 @@ def list_all_incidents(
                 return []
             if participation.driver_id != driver.id:
                 raise HTTPException(status_code=403, detail="Insufficient role")
+    page_cursor = parse_cursor(cursor)
     limit = max(1, min(limit, 200))
     incidents = IncidentRepository(session).list_filtered(
-        driver_id=driver_id, participation_id=participation_id, offset=offset, limit=limit
+        driver_id=driver_id,
+        participation_id=participation_id,
+        offset=offset,
+        limit=limit,
+        cursor=page_cursor,
     )
     if not incidents:
         return []
+    set_next_cursor(response, next_cursor(incidents, limit))
     part_repo = ParticipationRepository(session)
     event_repo = EventRepository(session)
     result = []
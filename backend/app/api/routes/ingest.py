@@ -1,14 +1,27 @@
 import json
+from datetime import datetime, timezone
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
+from app.api.pagination import parse_cursor, set_next_cursor
 from app.db.session import get_session
 from app.models.user import User
+from app.repositories.pagination import next_cursor
 from app.repositories.raw_event import RawEventRepository
-from app.schemas.raw_event import RawEventIngest, RawEventRead
-from app.services.ingestion import ingest_payload
+from app.schemas.raw_event import (
+    RawEventBulkIngest,
+    RawEventBulkItemResult,
+    RawEventBulkResult,
+    RawEventIngest,
+    RawEventRead,
+)
+from app.schemas.telemetry import TelemetryBatchResult
+from app.services.ingestion import ingest_payload, ingest_payloads_bulk, summarize_ingest
+from app.services.telemetry_ingest import ingest_telemetry, is_lap_conflict, parse_telemetry_body
 from app.services.auth import require_roles, require_user
 from app.core.settings import settings
 
@@ -38,15 +51,100 @@ def ingest_raw_event(
     )
 
 
+@router.post("/raw-events/bulk", response_model=RawEventBulkResult)
+def ingest_raw_events_bulk(
+    payload: RawEventBulkIngest,
+    session: Session = Depends(get_session),
+    _: User | None = Depends(require_roles("admin")),
+):
+    if len(payload.items) > settings.ingest_bulk_max_items:
+        raise HTTPException(status_code=413, detail=f"Too many items (max {settings.ingest_bulk_max_items})")
+    for index, item in enumerate(payload.items):
+        if len(json.dumps(item.payload).encode("utf-8")) > settings.ingest_payload_max_bytes:
+            raise HTTPException(status_code=413, detail=f"Payload too large (item {index})")
+    results = ingest_payloads_bulk(
+        session,
+        payload.source,
+        [item.payload for item in payload.items],
+        payload.create_event,
+        [item.source_event_id for item in payload.items],
+    )
+    return RawEventBulkResult(
+        **summarize_ingest(results),
+        items=[RawEventBulkItemResult.model_validate(r) for r in results],
+    )
+
+
+NDJSON_MEDIA_TYPES = {"application/x-ndjson", "application/ndjson", "application/jsonl"}
+
+
+def _ingest_telemetry_sync(session: Session, body: bytes, ndjson: bool) -> TelemetryBatchResult:
+    try:
+        messages, errors = parse_telemetry_body(body, ndjson)
+    except ValueError as e:  # also JSONDecodeError / UnicodeDecodeError
+        raise HTTPException(status_code=400, detail=f"Invalid telemetry body: {e}") from e
+    if len(messages) + len(errors) > settings.telemetry_batch_max_messages:
+        raise HTTPException(
+            status_code=413, detail=f"Too many messages (max {settings.telemetry_batch_max_messages})"
+        )
+    try:
+        result = ingest_telemetry(session, messages, errors)
+    except IntegrityError as e:
+        session.rollback()
+        if is_lap_conflict(e):
+            raise HTTPException(
+                status_code=409, detail="Laps were written concurrently by another batch; resend"
+            ) from e
+        raise HTTPException(status_code=409, detail="Telemetry batch conflicts with stored data") from e
+    return TelemetryBatchResult(
+        total=result.total,
+        accepted=result.accepted,
+        rejected=result.rejected,
+        duplicates=result.duplicates,
+        laps_written=result.laps_written,
+        sectors_applied=result.sectors_applied,
+        incidents_created=result.incidents_created,
+        crs_recomputes=result.crs_recomputes,
+        errors=result.errors,
+        received_at=datetime.now(timezone.utc),
+    )
+
+
+@router.post("/telemetry", response_model=TelemetryBatchResult)
+async def ingest_telemetry_batch(
+    request: Request,
+    session: Session = Depends(get_session),
+    _: User | None = Depends(require_roles("admin")),
+):
+    """
+    Lap, sector and incident messages of many participations in one transaction (race server relays).
+    Body: JSON list or {"messages": [...]}, or NDJSON (Content-Type: application/x-ndjson). Each message has
+    "type": "lap" | "sector" | "incident" and a participation_id; invalid messages are reported by index.
+    """
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > settings.telemetry_max_body_bytes:
+        raise HTTPException(status_code=413, detail="Payload too large")
+    body = await request.body()
+    if len(body) > settings.telemetry_max_body_bytes:
+        raise HTTPException(status_code=413, detail="Payload too large")
+    media_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    return await run_in_threadpool(_ingest_telemetry_sync, session, body, media_type in NDJSON_MEDIA_TYPES)
+
+
 @router.get("/raw-events", response_model=List[RawEventRead])
 def list_raw_events(
+    response: Response,
     limit: int = 100,
     offset: int = 0,
+    cursor: str | None = None,
     session: Session = Depends(get_session),
     _: User | None = Depends(require_roles("admin")),
 ):
+    page_cursor = parse_cursor(cursor)
     limit = max(1, min(limit, 200))
-    return RawEventRepository(session).list_paginated(offset=offset, limit=limit)
+    raw_events = RawEventRepository(session).list_paginated(offset=offset, limit=limit, cursor=page_cursor)
+    set_next_cursor(response, next_cursor(raw_events, limit))
+    return raw_events
 
 
 @router.get("/raw-events/{raw_event_id}", response_model=RawEventRead)
@@ -8,7 +8,15 @@ from app.repositories.driver import DriverRepository
 from app.repositories.event import EventRepository
 from app.repositories.participation import ParticipationRepository
 from app.repositories.user import UserRepository
+from app.services.audit_writer import get_audit_writer
 from app.services.auth import require_roles
+from app.services.auth_cache import get_api_key_cache
+from app.services.classification_cache import get_classification_cache
+from app.services.crs_queue import get_crs_worker
+from app.services.event_search import get_event_count_cache
+from app.services.live_race import get_live_race_hub
+from app.services.mock_race_runner import get_race_engine
+from app.services.rate_limit import rate_limit_stats
 
 router = APIRouter(prefix="/metrics", tags=["metrics"])
 
@@ -18,10 +26,22 @@ def get_metrics(
     session: Session = Depends(get_session),
     _: User | None = Depends(require_roles("admin")),
 ):
+    crs_worker = get_crs_worker()
+    audit_writer = get_audit_writer()
+    race_engine = get_race_engine()
+    live_race = get_live_race_hub()
     return {
         "users": UserRepository(session).count(),
         "drivers": DriverRepository(session).count(),
         "events": EventRepository(session).count(),
         "classifications": ClassificationRepository(session).count(),
         "participations": ParticipationRepository(session).count(),
+        "crs_queue": crs_worker.stats() if crs_worker else None,
+        "classification_cache": get_classification_cache().stats(),
+        "auth_cache": get_api_key_cache().stats(),
+        "event_count_cache": get_event_count_cache().stats(),
+        "audit_writer": audit_writer.stats() if audit_writer else None,
+        "race_engine": race_engine.stats() if race_engine else None,
+        "live_race": live_race.stats() if live_race else None,
+        "rate_limit": rate_limit_stats(),
     }
\ No newline at end of file
@@ -1,31 +1,40 @@
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
 
+from app.api.pagination import parse_cursor, set_next_cursor
 from app.db.session import get_session
 from app.models.incident import Incident
-from app.models.participation import Participation, ParticipationState, ParticipationStatus
+from app.models.participation import (
+    Participation,
+    ParticipationState,
+    ParticipationStatus,
+    duration_minutes_between,
+)
 from app.models.penalty import Penalty
 from app.models.user import User
 from app.repositories.classification import ClassificationRepository
 from app.repositories.driver import DriverRepository
 from app.repositories.event import EventRepository
 from app.repositories.incident import IncidentRepository
+from app.repositories.pagination import next_cursor
 from app.repositories.participation import ParticipationRepository
+from app.repositories.participation_lap import ParticipationLapRepository
 from app.repositories.penalty import PenaltyRepository
 from app.repositories.task_completion import TaskCompletionRepository
 from app.schemas.incident import IncidentCreate, IncidentRead
 from app.schemas.participation import (
     ActiveParticipationRead,
     ParticipationCreate,
+    ParticipationLapRead,
     ParticipationRead,
     ParticipationWithEventRead,
     ParticipationWithdrawUpdate,
 )
 from app.schemas.penalty import PenaltyCreate, PenaltyRead, PenaltyTypeEnum
 from app.services.tasks import assign_tasks_on_registration, evaluate_tasks
-from app.services.crs import recompute_crs
+from app.services.crs_queue import enqueue_crs_recompute
 from app.services.incident_from_code import create_incident_from_code
 from app.services.timeline_validation import validate_participation_timeline
 from app.services.auth import require_user
@@ -100,7 +109,7 @@ def create_participation(
     session.refresh(participation)
     assign_tasks_on_registration(session, driver.id, participation.id)
     try:
-        recompute_crs(
+        enqueue_crs_recompute(
             session,
             driver.id,
             participation.discipline.value if hasattr(participation.discipline, "value") else participation.discipline,
@@ -113,16 +122,19 @@ def create_participation(
 
 @router.get("", response_model=List[ParticipationWithEventRead])
 def list_participations(
+    response: Response,
     driver_id: str | None = None,
     event_id: str | None = None,
     limit: int = 100,
     offset: int = 0,
+    cursor: str | None = None,
     session: Session = Depends(get_session),
     user: User = Depends(require_user()),
 ):
+    """Newest first. Pass the X-Next-Cursor response header back as ?cursor= for the next page (keyset)."""
+    page_cursor = parse_cursor(cursor)
     part_repo = ParticipationRepository(session)
     driver_repo = DriverRepository(session)
-    event_repo = EventRepository(session)
     if user.role not in {"admin"}:
         if driver_id:
             driver = driver_repo.get_by_id(driver_id)
@@ -134,22 +146,17 @@ def list_participations(
                 return []
             driver_id = driver.id
     limit = max(1, min(limit, 200))
-    participations = part_repo.list_filtered(
-        driver_id=driver_id, event_id=event_id, offset=offset, limit=limit
+    rows = part_repo.list_rows_with_event(
+        driver_id=driver_id, event_id=event_id, offset=offset, limit=limit, cursor=page_cursor
     )
-    if not participations:
-        return []
-    result = []
-    for p in participations:
-        event = event_repo.get_by_id(p.event_id)
-        result.append(
-            ParticipationWithEventRead(
-                **ParticipationRead.model_validate(p).model_dump(),
-                event_title=event.title if event else "",
-                event_start_time_utc=event.start_time_utc if event else None,
-            )
+    set_next_cursor(response, next_cursor(rows, limit))
+    return [
+        ParticipationWithEventRead(
+            **row,
+            duration_minutes=duration_minutes_between(row["started_at"], row["finished_at"]),
         )
-    return result
+        for row in rows
+    ]
 
 
 @router.get("/active", response_model=ActiveParticipationRead | None)
@@ -265,7 +272,7 @@ def create_incident(
         if hasattr(participation.discipline, "value")
         else str(participation.discipline)
     )
-    recompute_crs(session, participation.driver_id, discipline_str, trigger_participation_id=participation.id)
+    enqueue_crs_recompute(session, participation.driver_id, discipline_str, trigger_participation_id=participation.id)
     return incident
 
 
@@ -348,3 +355,20 @@ def list_penalties(
         if not driver or driver.user_id != user.id:
             raise HTTPException(status_code=403, detail="Insufficient role")
     return PenaltyRepository(session).list_by_participation_id(participation_id)
+
+
+@router.get("/{participation_id}/laps", response_model=List[ParticipationLapRead])
+def list_laps(
+    participation_id: str,
+    session: Session = Depends(get_session),
+    user: User = Depends(require_user()),
+):
+    """Completed laps (lap time + sector splits) in lap order."""
+    participation = ParticipationRepository(session).get_by_id(participation_id)
+    if not participation:
+        raise HTTPException(status_code=404, detail="Participation not found")
+    if user.role not in {"admin"}:
+        driver = DriverRepository(session).get_by_id(participation.driver_id)
+        if not driver or driver.user_id != user.id:
+            raise HTTPException(status_code=403, detail="Insufficient role")
+    return ParticipationLapRepository(session).list_for_participation(participation_id)
@@ -2,14 +2,17 @@
 
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy.orm import Session
 
+from app.api.pagination import parse_cursor, set_next_cursor
 from app.db.session import get_session
 from app.models.user import User
 from app.repositories.driver import DriverRepository
+from app.repositories.driver_stats import DriverStatsRepository
 from app.repositories.event import EventRepository
 from app.repositories.incident import IncidentRepository
+from app.repositories.pagination import next_cursor
 from app.repositories.participation import ParticipationRepository
 from app.repositories.penalty import PenaltyRepository
 from app.schemas.penalty import PenaltyRead, PenaltyWithEventRead
@@ -42,18 +45,23 @@ def get_penalties_count(
                 return {"total": 0}
             if not driver or participation.driver_id != driver.id:
                 return {"total": 0}
-    total = PenaltyRepository(session).count_filtered(
-        driver_id=driver_id, participation_id=participation_id
-    )
+    if participation_id:
+        total = PenaltyRepository(session).count_filtered(
+            driver_id=driver_id, participation_id=participation_id
+        )
+    else:
+        total = DriverStatsRepository(session).total("penalties_count", driver_id=driver_id)
     return {"total": total}
 
 
 @router.get("", response_model=List[PenaltyWithEventRead])
 def list_all_penalties(
+    response: Response,
     driver_id: str | None = None,
     participation_id: str | None = None,
     limit: int = 100,
     offset: int = 0,
+    cursor: str | None = None,
     session: Session = Depends(get_session),
     user: User = Depends(require_user()),
 ):
@@ -73,12 +81,18 @@ def list_all_penalties(
                 return []
             if participation.driver_id != driver.id:
                 raise HTTPException(status_code=403, detail="Insufficient role")
+    page_cursor = parse_cursor(cursor)
     limit = max(1, min(limit, 200))
     penalties = PenaltyRepository(session).list_filtered(
-        driver_id=driver_id, participation_id=participation_id, offset=offset, limit=limit
+        driver_id=driver_id,
+        participation_id=participation_id,
+        offset=offset,
+        limit=limit,
+        cursor=page_cursor,
     )
     if not penalties:
         return []
+    set_next_cursor(response, next_cursor(penalties, limit))
     part_repo = ParticipationRepository(session)
     event_repo = EventRepository(session)
     result = []
@@ -38,6 +38,7 @@ from app.core.constants.validation import (
 from app.core.constants.profile import PROFILE_REQUIRED_FIELDS
 from app.core.constants.algorithms import (
     CRS_ALGO_VERSION,
+    CRS_WINDOW_SIZE,
     FREE_INCIDENTS,
     GT_GLOBAL_PROFILE,
     GT_GLOBAL_SIM_GAMES,
@@ -84,6 +85,7 @@ __all__ = [
     "ALLOWED_WEATHER",
     "PROFILE_REQUIRED_FIELDS",
     "CRS_ALGO_VERSION",
+    "CRS_WINDOW_SIZE",
     "FREE_INCIDENTS",
     "GT_GLOBAL_PROFILE",
     "GT_GLOBAL_SIM_GAMES",
@@ -3,6 +3,7 @@
 CRS_ALGO_VERSION = "crs_v2"  # v2: rating from Incident.score only; Penalty is UI/result only
 REC_ALGO_VERSION = "rec_v1"
 PARTICIPATIONS_INPUT_LIMIT = 20
+CRS_WINDOW_SIZE = 30  # CRS = tier-weighted average over the driver's last N started/completed participations
 
 # CRS v2: participation_score = 100 - incident_deduction - status - repeat_penalty + consistency - pace
 INCIDENT_K = 2.0  # incident_deduction = incident_score_sum * INCIDENT_K
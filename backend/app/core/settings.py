@@ -12,21 +12,80 @@ class Settings:
     app_env: str = os.getenv("APP_ENV", "local")
     port: int = int(os.getenv("PORT", "8000"))
     classification_version: str = os.getenv("CLASSIFICATION_VERSION", "1.0.0")
+    # Classification cache (inputs_hash + version): in-process LRU size, optional shared Redis tier + TTL
+    classification_cache_size: int = int(os.getenv("CLASSIFICATION_CACHE_SIZE", "4096"))
+    classification_cache_redis_enabled: bool = os.getenv("CLASSIFICATION_CACHE_REDIS_ENABLED", "false").lower() == "true"
+    classification_cache_ttl_seconds: int = int(os.getenv("CLASSIFICATION_CACHE_TTL_SECONDS", "3600"))
     auth_enabled: bool = os.getenv("AUTH_ENABLED", "true").lower() == "true"
     bootstrap_key: str = os.getenv("BOOTSTRAP_KEY", "change-me")
     auth_rate_limit_per_minute: int = int(os.getenv("AUTH_RATE_LIMIT_PER_MINUTE", "10"))
+    # Rate limiter: redis (shared across workers, memory fallback) | memory; max keys kept in memory
+    rate_limit_backend: str = os.getenv("RATE_LIMIT_BACKEND", "redis")
+    rate_limit_max_keys: int = int(os.getenv("RATE_LIMIT_MAX_KEYS", "10000"))
+    # Admin exports: rows fetched per server-side cursor batch
+    export_batch_size: int = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+    # API-key -> user cache (0 disables); revocations reach other worker processes after at most the TTL
+    auth_cache_ttl_seconds: float = float(os.getenv("AUTH_CACHE_TTL_SECONDS", "30"))
+    auth_cache_size: int = int(os.getenv("AUTH_CACHE_SIZE", "10000"))
+    # Upcoming/past event counts per (window, tier, game set): short TTL cache (0 disables), max entries
+    event_count_cache_ttl_seconds: float = float(os.getenv("EVENT_COUNT_CACHE_TTL_SECONDS", "30"))
+    event_count_cache_size: int = int(os.getenv("EVENT_COUNT_CACHE_SIZE", "2048"))
+    # Audit log: buffered in memory and written by a background thread in multi-row INSERTs
+    audit_writer_enabled: bool = os.getenv("AUDIT_WRITER_ENABLED", "true").lower() == "true"
+    audit_buffer_size: int = int(os.getenv("AUDIT_BUFFER_SIZE", "10000"))
+    audit_batch_size: int = int(os.getenv("AUDIT_BATCH_SIZE", "200"))
+    audit_flush_interval_seconds: float = float(os.getenv("AUDIT_FLUSH_INTERVAL_SECONDS", "2.0"))
     ingest_payload_max_bytes: int = int(os.getenv("INGEST_PAYLOAD_MAX_BYTES", "250000"))
+    # Bulk ingestion (connector syncs, /ingest/raw-events/bulk): rows per transaction, max items per request
+    ingest_bulk_chunk_size: int = int(os.getenv("INGEST_BULK_CHUNK_SIZE", "500"))
+    ingest_bulk_max_items: int = int(os.getenv("INGEST_BULK_MAX_ITEMS", "5000"))
+    # Live telemetry (/ingest/telemetry): max request body and messages per batch (one transaction)
+    telemetry_max_body_bytes: int = int(os.getenv("TELEMETRY_MAX_BODY_BYTES", "5000000"))
+    telemetry_batch_max_messages: int = int(os.getenv("TELEMETRY_BATCH_MAX_MESSAGES", "10000"))
     anti_gaming_min_multiplier: float = float(os.getenv("ANTI_GAMING_MIN_MULTIPLIER", "0.5"))
     anti_gaming_max_multiplier: float = float(os.getenv("ANTI_GAMING_MAX_MULTIPLIER", "1.5"))
+    # CRS: use materialized per-participation scores (participations.crs_*) instead of full recompute
+    crs_incremental_enabled: bool = os.getenv("CRS_INCREMENTAL_ENABLED", "true").lower() == "true"
+    # CRS recompute queue: coalesce triggers per (driver, discipline) and recompute in a background worker
+    crs_queue_enabled: bool = os.getenv("CRS_QUEUE_ENABLED", "true").lower() == "true"
+    crs_queue_backend: str = os.getenv("CRS_QUEUE_BACKEND", "memory")  # memory | redis
+    crs_queue_debounce_seconds: float = float(os.getenv("CRS_QUEUE_DEBOUNCE_SECONDS", "1.0"))
+    # Consecutive failed recomputes after which a (driver, discipline) key is dropped from the queue
+    crs_queue_max_attempts: int = int(os.getenv("CRS_QUEUE_MAX_ATTEMPTS", "5"))
     wss_events_url: str | None = os.getenv("WSS_EVENTS_URL") or None
     wss_api_key: str | None = os.getenv("WSS_API_KEY") or None
     gridfinder_events_url: str | None = os.getenv("GRIDFINDER_EVENTS_URL") or None
     gridfinder_api_key: str | None = os.getenv("GRIDFINDER_API_KEY") or None
+    # Connector syncs parse the feed incrementally and ingest in INGEST_BULK_CHUNK_SIZE chunks while downloading
+    connector_streaming_enabled: bool = os.getenv("CONNECTOR_STREAMING_ENABLED", "true").lower() == "true"
+    # Pooled HTTP client for connector feeds (read timeout applies per chunk, not to the whole download)
+    connector_timeout_seconds: float = float(os.getenv("CONNECTOR_TIMEOUT_SECONDS", "20"))
+    connector_connect_timeout_seconds: float = float(os.getenv("CONNECTOR_CONNECT_TIMEOUT_SECONDS", "5"))
+    connector_max_connections: int = int(os.getenv("CONNECTOR_MAX_CONNECTIONS", "10"))
+    connector_max_pages: int = int(os.getenv("CONNECTOR_MAX_PAGES", "50"))
+    connector_sync_max_workers: int = int(os.getenv("CONNECTOR_SYNC_MAX_WORKERS", "4"))
+    # Delta requests: stored cursor is sent as ?<param>=<last updated_at>&<id param>=<last source_event_id>
+    connector_cursor_param: str = os.getenv("CONNECTOR_CURSOR_PARAM", "updated_since")
+    connector_cursor_id_param: str = os.getenv("CONNECTOR_CURSOR_ID_PARAM", "after_id")
+    # Scheduled connector sync (every configured source; one API worker per interval when Redis is available)
+    connector_sync_enabled: bool = os.getenv("CONNECTOR_SYNC_ENABLED", "true").lower() == "true"
+    connector_sync_interval_minutes: int = int(os.getenv("CONNECTOR_SYNC_INTERVAL_MINUTES", "15"))
 
     # Mock race service: simulate race data for events that have started until event finished
     # mock_race_enabled: bool = os.getenv("MOCK_RACE_ENABLED", "false").lower() == "true"
     mock_race_enabled: bool = True
     mock_race_interval_seconds: int = int(os.getenv("MOCK_RACE_INTERVAL_SECONDS", "2"))
+    # Race engine: worker threads ticking live events in parallel (one DB connection each while ticking)
+    race_engine_workers: int = int(os.getenv("RACE_ENGINE_WORKERS", "4"))
+    # Redis lease per event held for one tick (until after its commit): must exceed the slowest tick
+    race_engine_lease_seconds: int = int(os.getenv("RACE_ENGINE_LEASE_SECONDS", "120"))
+    # Live race updates (GET /events/{id}/live, SSE): fan-out via Redis pub/sub across API workers when available
+    live_race_enabled: bool = os.getenv("LIVE_RACE_ENABLED", "true").lower() == "true"
+    live_race_queue_size: int = int(os.getenv("LIVE_RACE_QUEUE_SIZE", "100"))
+    live_race_heartbeat_seconds: int = int(os.getenv("LIVE_RACE_HEARTBEAT_SECONDS", "15"))
+    live_race_reconnect_max_seconds: float = float(os.getenv("LIVE_RACE_RECONNECT_MAX_SECONDS", "30"))
+    # Max wait for Redis to confirm a new client's channel before its snapshot is taken
+    live_race_subscribe_timeout_seconds: float = float(os.getenv("LIVE_RACE_SUBSCRIBE_TIMEOUT_SECONDS", "2"))
 
     # Mock incident service: for participations with state "started", add realistic incidents per tick
     mock_incident_enabled: bool = os.getenv("MOCK_INCIDENT_ENABLED", "true").lower() == "true"
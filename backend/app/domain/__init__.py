@@ -2,6 +2,8 @@
 
 from app.domain.events import (
     TIER_ORDER,
+    duration_bucket,
+    event_signature,
     infer_discipline,
     tier_range_for_readiness,
 )
@@ -10,6 +12,8 @@ from app.domain.tasks import TIER_RANK
 __all__ = [
     "TIER_ORDER",
     "TIER_RANK",
+    "duration_bucket",
+    "event_signature",
     "infer_discipline",
     "tier_range_for_readiness",
 ]
@@ -1,4 +1,7 @@
-"""Event domain: tier order, discipline inference, tier-for-readiness (pure, no DB)."""
+"""Event domain: tier order, discipline inference, tier-for-readiness, event signature (pure, no DB)."""
+
+import hashlib
+import json
 
 from app.core.constants import TIER_ORDER
 
@@ -24,3 +27,41 @@ def tier_range_for_readiness(crs_score: float) -> tuple[str, str]:
     if crs_score >= 70:
         return "E2", "E3"
     return "E1", "E2"
+
+
+def duration_bucket(minutes: int | None) -> str:
+    minutes = minutes or 0
+    if minutes < 15:
+        return "short"
+    if minutes < 30:
+        return "medium"
+    if minutes < 60:
+        return "long"
+    if minutes < 120:
+        return "endurance"
+    return "ultra"
+
+
+def event_signature(event) -> str:
+    """SHA-256 of the event's format/conditions (task diversity rules treat equal signatures as the same event)."""
+    payload = {
+        "source": event.source,
+        "event_type": event.event_type,
+        "format_type": event.format_type,
+        "schedule_type": event.schedule_type,
+        "duration_bucket": duration_bucket(event.duration_minutes),
+        "class_count": event.class_count,
+        "car_class_list": sorted([value for value in (event.car_class_list or []) if value]),
+        "damage_model": event.damage_model,
+        "penalties": event.penalties,
+        "fuel_usage": event.fuel_usage,
+        "tire_wear": event.tire_wear,
+        "weather": event.weather,
+        "night": bool(event.night),
+        "team_event": bool(event.team_event),
+        "official_event": bool(event.official_event),
+        "track_type": event.track_type,
+        "surface_type": event.surface_type,
+    }
+    payload_bytes = json.dumps(payload, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(payload_bytes).hexdigest()
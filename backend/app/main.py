@@ -3,6 +3,7 @@ import logging
 
 from fastapi import FastAPI
 from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
 # TODO remove:
 # from fastapi.responses import FileResponse
 # from fastapi.staticfiles import StaticFiles
@@ -11,9 +12,17 @@ from app.api.router import api_router
 from app.core.logging import configure_logging
 from app.db.redis import create_redis_client
 from app.db.session import SessionLocal, init_db
-from app.services.auth import get_user_by_key, log_audit
+from app.services.audit_writer import get_audit_writer, record_audit, start_audit_writer, stop_audit_writer
+from app.services.auth import get_user_by_key
+from app.services.auth_cache import configure_auth_cache
+from app.services.classification_cache import configure_classification_cache
+from app.services.connector_sync_runner import start_connector_sync_background
+from app.services.connectors import close_http_client
+from app.services.crs_queue import start_crs_recompute_background, stop_crs_recompute_background
+from app.services.live_race import start_live_race, stop_live_race
 from app.services.mock_event_runner import start_mock_event_background
-from app.services.mock_race_runner import start_mock_race_background
+from app.services.mock_race_runner import start_mock_race_background, stop_mock_race_background
+from app.services.rate_limit import configure_rate_limiter
 
 app = FastAPI(title="RacerPath", version="0.1.0")
 app.include_router(api_router)
@@ -30,22 +39,52 @@ def startup() -> None:
         app.state.redis.ping()
     except Exception:
         app.state.redis = None
-    start_mock_race_background()
+    configure_auth_cache(app.state.redis)
+    configure_classification_cache(app.state.redis)
+    configure_rate_limiter(app.state.redis)
+    start_audit_writer()
+    start_live_race(app.state.redis)
+    start_crs_recompute_background(app.state.redis)
+    start_mock_race_background(app.state.redis)
     start_mock_event_background()
+    start_connector_sync_background(app.state.redis)
+
+
+@app.on_event("shutdown")
+def shutdown() -> None:
+    stop_mock_race_background()
+    stop_crs_recompute_background()
+    stop_live_race()
+    close_http_client()
+    stop_audit_writer()
 
 
 @app.middleware("http")
 async def audit_middleware(request, call_next):
     response = await call_next(request)
     if request.method in {"POST", "PUT", "PATCH", "DELETE"} and request.url.path.startswith("/api"):
+        # Reuse the user resolved by require_user / require_roles; look up only if no dependency ran
+        user = getattr(request.state, "auth_identity", None)
+        api_key = request.headers.get("X-API-Key")
+        writer = get_audit_writer()
+        if (user is None and api_key) or writer is None or not writer.running:
+            # Key lookup / synchronous write hit the DB: keep them off the event loop
+            await run_in_threadpool(
+                _audit_request, user, api_key, request.method, request.url.path, response.status_code
+            )
+        else:
+            record_audit(user, request.method, request.url.path, response.status_code)
+    return response
+
+
+def _audit_request(user, api_key: str | None, method: str, path: str, status_code: int) -> None:
+    if user is None and api_key:
         session = SessionLocal()
         try:
-            api_key = request.headers.get("X-API-Key")
-            user = get_user_by_key(session, api_key) if api_key else None
-            log_audit(session, user, request.method, request.url.path, response.status_code)
+            user = get_user_by_key(session, api_key)
         finally:
             session.close()
-    return response
+    record_audit(user, method, path, status_code)
 
 
 @app.exception_handler(Exception)
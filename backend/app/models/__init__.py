@@ -19,6 +19,9 @@ from app.models.real_world_format import RealWorldFormat
 from app.models.real_world_readiness import RealWorldReadiness
 from app.models.anti_gaming import AntiGamingReport
 from app.models.tier_progression_rule import TierProgressionRule
+from app.models.connector_sync_state import ConnectorSyncState
+from app.models.driver_stats import DriverStats
+from app.models.participation_lap import ParticipationLap
 
 __all__ = [
     "Base",
@@ -42,4 +45,7 @@ __all__ = [
     "RealWorldReadiness",
     "AntiGamingReport",
     "TierProgressionRule",
+    "ConnectorSyncState",
+    "DriverStats",
+    "ParticipationLap",
 ]
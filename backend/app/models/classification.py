@@ -1,10 +1,12 @@
 from datetime import datetime
 import uuid
 
-from sqlalchemy import DateTime, Float, ForeignKey, JSON, String, UniqueConstraint
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import DateTime, Float, ForeignKey, JSON, String, UniqueConstraint, event, inspect, update
+from sqlalchemy.orm import Mapped, mapped_column, object_session
+from sqlalchemy.orm.attributes import set_committed_value
 
 from app.models.base import Base
+from app.models.event import Event
 
 
 class Classification(Base):
@@ -24,3 +26,24 @@ class Classification(Base):
     inputs_hash: Mapped[str] = mapped_column(String(64), nullable=False)
     inputs_snapshot: Mapped[dict] = mapped_column(JSON, nullable=False, default=dict)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow)
+
+
+def _set_event_current_tier(connection, target: Classification, tier: str | None) -> None:
+    """Write events.current_tier and refresh the loaded Event (if any) without marking it dirty."""
+    connection.execute(update(Event).where(Event.id == target.event_id).values(current_tier=tier))
+    session = object_session(target)
+    if session is not None:
+        loaded = session.identity_map.get(inspect(Event).identity_key_from_primary_key((target.event_id,)))
+        if loaded is not None:
+            set_committed_value(loaded, "current_tier", tier)
+
+
+@event.listens_for(Classification, "after_insert")
+@event.listens_for(Classification, "after_update")
+def _sync_event_current_tier(mapper, connection, target: Classification) -> None:
+    _set_event_current_tier(connection, target, target.event_tier)
+
+
+@event.listens_for(Classification, "after_delete")
+def _clear_event_current_tier(mapper, connection, target: Classification) -> None:
+    _set_event_current_tier(connection, target, None)
@@ -0,0 +1,24 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, Float, JSON, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class ConnectorSyncState(Base):
+    """Per-source connector sync state: HTTP validators, incremental cursor and last run summary."""
+
+    __tablename__ = "connector_sync_states"
+
+    source: Mapped[str] = mapped_column(String(40), primary_key=True)
+    etag: Mapped[str | None] = mapped_column(String(200), nullable=True)
+    last_modified: Mapped[str | None] = mapped_column(String(64), nullable=True)  # raw Last-Modified header
+    # Delta cursor: newest updated_at seen in the feed (verbatim) and that item's source_event_id (tie-break)
+    cursor_updated_at: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    cursor_source_event_id: Mapped[str | None] = mapped_column(String(80), nullable=True)
+    last_status: Mapped[str | None] = mapped_column(String(20), nullable=True)  # ok | not_modified | error
+    last_error: Mapped[str | None] = mapped_column(String(300), nullable=True)
+    last_duration_ms: Mapped[float | None] = mapped_column(Float, nullable=True)
+    last_summary: Mapped[dict] = mapped_column(JSON, nullable=False, default=dict)
+    last_synced_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
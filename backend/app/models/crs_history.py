@@ -3,7 +3,7 @@ from __future__ import annotations
 from datetime import datetime
 import uuid
 
-from sqlalchemy import DateTime, Float, ForeignKey, JSON, String
+from sqlalchemy import DateTime, Float, ForeignKey, Index, JSON, String
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.models.base import Base
@@ -11,13 +11,17 @@ from app.models.base import Base
 
 class CRSHistory(Base):
     __tablename__ = "crs_history"
+    __table_args__ = (
+        # Driver history pages: (computed_at, id) desc per driver
+        Index("ix_crs_history_driver_computed_at_id", "driver_id", "computed_at", "id"),
+    )
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     driver_id: Mapped[str] = mapped_column(String(36), ForeignKey("drivers.id"), nullable=False)
     discipline: Mapped[str] = mapped_column(String(20), nullable=False)
     score: Mapped[float] = mapped_column(Float, nullable=False)
     inputs: Mapped[dict] = mapped_column(JSON, nullable=False, default=dict)
-    computed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow)
+    computed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow, nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow)
     computed_from_participation_id: Mapped[str | None] = mapped_column(
         String(36), ForeignKey("participations.id", ondelete="SET NULL"), nullable=True
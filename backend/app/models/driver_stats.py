@@ -0,0 +1,89 @@
+"""Pre-aggregated per driver/discipline counters for dashboards, count endpoints and admin lookup."""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, Float, ForeignKey, Integer, String, event
+from sqlalchemy.orm import Mapped, Session, mapped_column
+
+from app.models.base import Base
+
+
+class DriverStats(Base):
+    """
+    Maintained by app.services.driver_stats in the same transaction as the change: the listeners below
+    turn each flush into counter deltas (bulk DELETEs and changes a delta cannot express queue a full
+    recompute of the driver) and write them once, before the transaction commits.
+    """
+
+    __tablename__ = "driver_stats"
+
+    driver_id: Mapped[str] = mapped_column(
+        String(36), ForeignKey("drivers.id", ondelete="CASCADE"), primary_key=True
+    )
+    discipline: Mapped[str] = mapped_column(String(20), primary_key=True)
+    participations_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    # By participation_state
+    registered_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    withdrawn_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    started_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    completed_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    # By status
+    finished_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    dnf_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    dsq_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    dns_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    incidents_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    incident_score_sum: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    penalties_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    last_race_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow, nullable=False)
+
+
+@event.listens_for(Session, "before_flush")
+def _load_deleted_driver_stats_inputs(session: Session, flush_context, instances) -> None:
+    from app.services.driver_stats import load_deleted_stats_inputs
+
+    load_deleted_stats_inputs(session)
+
+
+@event.listens_for(Session, "after_flush")
+def _record_driver_stats_deltas(session: Session, flush_context) -> None:
+    from app.services.driver_stats import record_flush_deltas
+
+    record_flush_deltas(session)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_driver_stats_on_bulk_delete(orm_execute_state):
+    """Bulk DELETE of participations/incidents/penalties bypasses flush: queue the affected drivers."""
+    if not orm_execute_state.is_delete:
+        return None
+    from app.services.driver_stats import STATS_SOURCE_TABLES, driver_ids_for_delete, mark_drivers_stale
+
+    statement = orm_execute_state.statement
+    table_name = getattr(getattr(statement, "table", None), "name", None)
+    if table_name not in STATS_SOURCE_TABLES:
+        return None
+    session = orm_execute_state.session
+    mark_drivers_stale(session, driver_ids_for_delete(session.connection(), table_name, statement.whereclause))
+    return None
+
+
+@event.listens_for(Session, "before_commit")
+def _write_driver_stats_before_commit(session: Session) -> None:
+    from app.services.driver_stats import apply_pending_stats
+
+    # Flush first so the last pending changes are queued (commit's own flush runs after this hook)
+    session.flush()
+    apply_pending_stats(session)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _forget_stale_drivers(session: Session, transaction) -> None:
+    from app.services.driver_stats import STALE_DRIVERS_KEY, STATS_DELTAS_KEY
+
+    if transaction.parent is None:
+        session.info.pop(STALE_DRIVERS_KEY, None)
+        session.info.pop(STATS_DELTAS_KEY, None)
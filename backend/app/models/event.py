@@ -1,10 +1,13 @@
 from datetime import datetime, timezone
 import uuid
 
-from sqlalchemy import Boolean, CheckConstraint, DateTime, Integer, JSON, String
+from sqlalchemy import Boolean, CheckConstraint, DateTime, Index, Integer, JSON, String, event
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column
 
+from app.domain.events import event_signature
 from app.models.base import Base
+from app.utils.rig_compat import event_rig_requirements
 
 
 class Event(Base):
@@ -30,6 +33,16 @@ class Event(Base):
             "finished_time_utc IS NULL OR start_time_utc IS NULL OR start_time_utc <= finished_time_utc",
             name="ck_events_start_lte_finished",
         ),
+        # Upcoming/past event search: tier + start window (+ game), and start window + game across tiers
+        Index("ix_events_current_tier_start_time", "current_tier", "start_time_utc", "game"),
+        Index("ix_events_start_time_game", "start_time_utc", "game"),
+        Index("ix_events_rig_ranks", "rig_wheel_rank", "rig_pedals_rank", "rig_clutch_required"),
+        Index(
+            "ix_events_task_codes",
+            "task_codes",
+            postgresql_using="gin",
+            postgresql_ops={"task_codes": "jsonb_path_ops"},
+        ),
     )
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
@@ -89,11 +102,51 @@ class Event(Base):
     assists_allowed: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
 
     rig_options: Mapped[dict | None] = mapped_column(JSON, nullable=True, default=None)
-    # Task codes that can be completed at this event (e.g. ["GT_CLEAN_SPRINT"]); empty/None = normal race only
-    task_codes: Mapped[list | None] = mapped_column(JSON, nullable=True, default=None)
+    # Ordinal projection of rig_options (app.utils.rig_compat.event_rig_requirements); kept in sync on
+    # insert/update so rig compatibility filters run in SQL. NULL rank = no requirement
+    rig_wheel_rank: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    rig_pedals_rank: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    rig_clutch_required: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    # Task codes that can be completed at this event (e.g. ["GT_CLEAN_SPRINT"]); empty/None = normal race only.
+    # JSONB on PostgreSQL with a GIN index, so task_code filters use containment (@>)
+    task_codes: Mapped[list | None] = mapped_column(
+        JSON().with_variant(JSONB(), "postgresql"), nullable=True, default=None
+    )
+
+    # Materialized app.domain.events.event_signature; kept in sync on insert/update (task diversity rules)
+    event_signature: Mapped[str | None] = mapped_column(String(64), nullable=True, index=True)
+    # Materialized classifications.event_tier of this event (NULL = not classified); kept in sync by
+    # Classification mapper events and set explicitly by bulk ingestion
+    current_tier: Mapped[str | None] = mapped_column(String(10), nullable=True)
 
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         nullable=False,
         default=lambda: datetime.now(timezone.utc),
     )
+
+
+def apply_scalar_defaults(target: Event) -> Event:
+    """Fill unset attributes from scalar column defaults (Core applies them only when the INSERT executes)."""
+    for attr in Event.__mapper__.column_attrs:
+        column = attr.columns[0]
+        if column.default is not None and column.default.is_scalar and getattr(target, attr.key) is None:
+            setattr(target, attr.key, column.default.arg)
+    return target
+
+
+def _set_rig_requirements(target: Event) -> None:
+    for key, value in event_rig_requirements(target.rig_options).items():
+        setattr(target, key, value)
+
+
+@event.listens_for(Event, "before_insert")
+def _set_event_signature_on_insert(mapper, connection, target: Event) -> None:
+    target.event_signature = event_signature(apply_scalar_defaults(target))
+    _set_rig_requirements(target)
+
+
+@event.listens_for(Event, "before_update")
+def _set_event_signature(mapper, connection, target: Event) -> None:
+    target.event_signature = event_signature(target)
+    _set_rig_requirements(target)
@@ -3,7 +3,7 @@ from __future__ import annotations
 from datetime import datetime
 import uuid
 
-from sqlalchemy import DateTime, Float, ForeignKey, Integer, String
+from sqlalchemy import DateTime, Float, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base
@@ -11,9 +11,16 @@ from app.models.base import Base
 
 class Incident(Base):
     __tablename__ = "incidents"
+    __table_args__ = (
+        # Keyset pagination: (created_at, id) desc
+        Index("ix_incidents_created_at_id", "created_at", "id"),
+    )
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    participation_id: Mapped[str] = mapped_column(String(36), ForeignKey("participations.id"), nullable=False)
+    # active_history: a move keeps the old participation id in the attribute history (its CRS goes stale too)
+    participation_id: Mapped[str] = mapped_column(
+        String(36), ForeignKey("participations.id"), nullable=False, index=True, active_history=True
+    )
     participation: Mapped["Participation"] = relationship("Participation", back_populates="incidents")
     code: Mapped[str | None] = mapped_column(String(40), nullable=True)  # required for new rows; e.g. off_track, contact
     score: Mapped[float] = mapped_column(Float, nullable=False, server_default="0")  # CRS deduction input
@@ -22,7 +29,7 @@ class Incident(Base):
     lap: Mapped[int | None] = mapped_column(Integer, nullable=True)
     timestamp_utc: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     description: Mapped[str | None] = mapped_column(String(240), nullable=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow, nullable=False)
 
     penalties: Mapped[list["Penalty"]] = relationship(
         "Penalty", back_populates="incident", lazy="selectin", cascade="all, delete-orphan"
@@ -4,8 +4,8 @@ from datetime import datetime
 import uuid
 from enum import Enum
 
-from sqlalchemy import CheckConstraint, DateTime, Enum as SAEnum, Float, ForeignKey, Integer, JSON, String, UniqueConstraint
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import CheckConstraint, DateTime, Enum as SAEnum, Float, ForeignKey, Index, Integer, JSON, String, UniqueConstraint, event, inspect
+from sqlalchemy.orm import Mapped, Session, mapped_column, relationship
 
 from app.models.base import Base
 
@@ -45,6 +45,10 @@ class Participation(Base):
             "finished_at IS NULL OR started_at IS NULL OR started_at <= finished_at",
             name="ck_participations_started_lte_finished",
         ),
+        Index("ix_participations_driver_discipline_created", "driver_id", "discipline", "created_at"),
+        # Keyset pagination: (created_at, id) desc, overall and per driver
+        Index("ix_participations_created_at_id", "created_at", "id"),
+        Index("ix_participations_driver_created_at_id", "driver_id", "created_at", "id"),
     )
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
@@ -82,6 +86,20 @@ class Participation(Base):
 
     raw_metrics: Mapped[dict] = mapped_column(JSON, nullable=False, default=dict)
 
+    # Lap summary, maintained by app.services.lap_telemetry.append_laps (laps themselves: participation_laps)
+    best_lap_seconds: Mapped[float | None] = mapped_column(Float, nullable=True)
+    last_lap_seconds: Mapped[float | None] = mapped_column(Float, nullable=True)
+    total_lap_seconds: Mapped[float] = mapped_column(Float, nullable=False, default=0.0, server_default="0")
+    # Welford M2 (sum of squared deviations) of lap times; with laps_completed and total_lap_seconds gives
+    # the running variance (app.services.lap_stats)
+    lap_time_m2: Mapped[float] = mapped_column(Float, nullable=False, default=0.0, server_default="0")
+
+    # Materialized CRS inputs (app.services.crs): NULL crs_base_score means stale, recomputed on next CRS run.
+    crs_base_score: Mapped[float | None] = mapped_column(Float, nullable=True)
+    crs_tier_weight: Mapped[float | None] = mapped_column(Float, nullable=True)
+    crs_incident_score_sum: Mapped[float | None] = mapped_column(Float, nullable=True)
+    crs_incidents_count: Mapped[int | None] = mapped_column(Integer, nullable=True)
+
     started_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow, nullable=False)
@@ -102,7 +120,47 @@ class Participation(Base):
 
     @property
     def duration_minutes(self) -> int | None:
-        if not self.started_at or not self.finished_at:
-            return None
-        delta = self.finished_at - self.started_at
-        return abs(int(delta.total_seconds() // 60))
+        return duration_minutes_between(self.started_at, self.finished_at)
+
+
+def duration_minutes_between(started_at: datetime | None, finished_at: datetime | None) -> int | None:
+    """Whole minutes between start and finish (None unless both are set)."""
+    if not started_at or not finished_at:
+        return None
+    delta = finished_at - started_at
+    return abs(int(delta.total_seconds() // 60))
+
+
+
+# Columns feeding the materialized CRS score (app.services.crs); a change marks crs_base_score stale.
+CRS_SCORE_FIELDS = ("status", "consistency_score", "pace_delta", "classification_id")
+
+
+@event.listens_for(Session, "before_flush")
+def _invalidate_crs_scores(session: Session, flush_context, instances) -> None:
+    """Null crs_base_score when a participation's incidents or score-relevant columns change."""
+    from app.models.incident import Incident
+
+    stale_ids: set[str] = set()
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, Incident):
+            if obj in session.dirty and not session.is_modified(obj, include_collections=False):
+                continue
+            if obj.participation_id:
+                stale_ids.add(obj.participation_id)
+            # Moved to another participation (FK or relationship): the old one loses the incident
+            state = inspect(obj)
+            stale_ids.update(pid for pid in state.attrs.participation_id.history.deleted if pid)
+            moved = state.attrs.participation.history
+            stale_ids.update(part.id for part in (*moved.added, *moved.deleted) if part is not None and part.id)
+        elif isinstance(obj, Participation) and obj in session.dirty:
+            state = inspect(obj)
+            if any(state.attrs[name].history.has_changes() for name in CRS_SCORE_FIELDS):
+                obj.crs_base_score = None
+    if not stale_ids:
+        return
+    with session.no_autoflush:
+        for participation_id in stale_ids:
+            participation = session.get(Participation, participation_id)
+            if participation is not None:
+                participation.crs_base_score = None
@@ -0,0 +1,30 @@
+"""Append-only lap telemetry: one compact row per completed lap of a participation."""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, Float, ForeignKey, Integer, JSON, PrimaryKeyConstraint, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class ParticipationLap(Base):
+    """
+    Written in bulk by app.services.lap_telemetry.append_laps (never updated); the per-participation summary
+    (laps_completed, best/last lap, total lap time) lives on Participation.
+    """
+
+    __tablename__ = "participation_laps"
+    # Name Postgres gave the primary key in 0052; a violation means the lap was written by a concurrent batch
+    __table_args__ = (PrimaryKeyConstraint("participation_id", "lap_number", name="participation_laps_pkey"),)
+
+    participation_id: Mapped[str] = mapped_column(
+        String(36), ForeignKey("participations.id", ondelete="CASCADE"), primary_key=True
+    )
+    lap_number: Mapped[int] = mapped_column(Integer, primary_key=True)  # 1-based
+    lap_time_seconds: Mapped[float] = mapped_column(Float, nullable=False)
+    # Sector splits in seconds, e.g. [s1, s2, s3]; None when the source reports lap times only
+    sector_times: Mapped[list | None] = mapped_column(JSON, nullable=True, default=None)
+    recorded_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow, nullable=False)
@@ -4,7 +4,7 @@ from datetime import datetime
 import uuid
 from enum import Enum
 
-from sqlalchemy import DateTime, Float, ForeignKey, Integer, String
+from sqlalchemy import DateTime, Float, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base
@@ -20,6 +20,10 @@ class PenaltyType(str, Enum):
 
 class Penalty(Base):
     __tablename__ = "penalties"
+    __table_args__ = (
+        # Keyset pagination: (created_at, id) desc
+        Index("ix_penalties_created_at_id", "created_at", "id"),
+    )
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     incident_id: Mapped[str] = mapped_column(
@@ -30,7 +34,7 @@ class Penalty(Base):
     time_seconds: Mapped[int | None] = mapped_column(Integer, nullable=True)
     lap: Mapped[int | None] = mapped_column(Integer, nullable=True)
     description: Mapped[str | None] = mapped_column(String(240), nullable=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow, nullable=False)
 
     incident: Mapped["Incident"] = relationship("Incident", back_populates="penalties")
 
@@ -1,7 +1,7 @@
 from datetime import datetime
 import uuid
 
-from sqlalchemy import DateTime, ForeignKey, JSON, String
+from sqlalchemy import DateTime, ForeignKey, Index, JSON, String
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.models.base import Base
@@ -9,6 +9,12 @@ from app.models.base import Base
 
 class RawEvent(Base):
     __tablename__ = "raw_events"
+    __table_args__ = (
+        # Keyset pagination: (created_at, id) desc
+        Index("ix_raw_events_created_at_id", "created_at", "id"),
+        # One raw event per feed item; bulk ingestion inserts with ON CONFLICT DO NOTHING on it
+        Index("uq_raw_events_source_event_id", "source", "source_event_id", unique=True),
+    )
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     source: Mapped[str] = mapped_column(String(40), nullable=False)
@@ -18,5 +24,5 @@ class RawEvent(Base):
     status: Mapped[str] = mapped_column(String(20), nullable=False, default="pending")
     errors: Mapped[list] = mapped_column(JSON, nullable=False, default=list)
     event_id: Mapped[str | None] = mapped_column(String(36), ForeignKey("events.id"), nullable=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow, nullable=False)
     normalized_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
\ No newline at end of file
@@ -3,7 +3,7 @@ from __future__ import annotations
 from datetime import datetime
 import uuid
 
-from sqlalchemy import DateTime, Float, ForeignKey, JSON, String
+from sqlalchemy import DateTime, Float, ForeignKey, Index, JSON, String
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.models.base import Base
@@ -11,6 +11,16 @@ from app.models.base import Base
 
 class TaskCompletion(Base):
     __tablename__ = "task_completions"
+    __table_args__ = (
+        # Diversity rules: same-signature counts / cooldowns per driver+task inside a time window
+        Index(
+            "ix_task_completions_driver_task_signature_created",
+            "driver_id",
+            "task_id",
+            "event_signature",
+            "created_at",
+        ),
+    )
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     driver_id: Mapped[str] = mapped_column(String(36), ForeignKey("drivers.id"), nullable=False)
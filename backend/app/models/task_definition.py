@@ -49,4 +49,8 @@ class TaskDefinition(Base):
     period: Mapped[str | None] = mapped_column(String(16), nullable=True)
     window_size: Mapped[int | None] = mapped_column(Integer, nullable=True)
     window_unit: Mapped[str | None] = mapped_column(String(20), nullable=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow)
\ No newline at end of file
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow)
+    # Bumped on every update; version key for compiled requirements (app.services.task_requirements)
+    updated_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
\ No newline at end of file
@@ -3,13 +3,16 @@
 from app.repositories.anti_gaming import AntiGamingReportRepository
 from app.repositories.audit_log import AuditLogRepository
 from app.repositories.classification import ClassificationRepository
+from app.repositories.connector_sync_state import ConnectorSyncStateRepository
 from app.repositories.crs_history import CRSHistoryRepository
 from app.repositories.driver import DriverRepository
 from app.repositories.driver_license import DriverLicenseRepository
+from app.repositories.driver_stats import DriverStatsRepository
 from app.repositories.event import EventRepository
 from app.repositories.incident import IncidentRepository
 from app.repositories.license_level import LicenseLevelRepository
 from app.repositories.participation import ParticipationRepository
+from app.repositories.participation_lap import ParticipationLapRepository
 from app.repositories.raw_event import RawEventRepository
 from app.repositories.real_world import RealWorldFormatRepository, RealWorldReadinessRepository
 from app.repositories.recommendation import RecommendationRepository
@@ -23,13 +26,16 @@ __all__ = [
     "AntiGamingReportRepository",
     "AuditLogRepository",
     "ClassificationRepository",
+    "ConnectorSyncStateRepository",
     "CRSHistoryRepository",
     "DriverRepository",
     "DriverLicenseRepository",
+    "DriverStatsRepository",
     "EventRepository",
     "IncidentRepository",
     "LicenseLevelRepository",
     "ParticipationRepository",
+    "ParticipationLapRepository",
     "RawEventRepository",
     "RealWorldFormatRepository",
     "RealWorldReadinessRepository",
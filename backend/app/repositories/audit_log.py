@@ -7,19 +7,16 @@ from typing import List
 from sqlalchemy.orm import Session
 
 from app.models.audit_log import AuditLog
+from app.repositories.pagination import PageCursor, keyset_page
 
 
 class AuditLogRepository:
     def __init__(self, session: Session) -> None:
         self._session = session
 
-    def list_recent(self, limit: int = 200) -> List[AuditLog]:
-        return (
-            self._session.query(AuditLog)
-            .order_by(AuditLog.created_at.desc())
-            .limit(limit)
-            .all()
-        )
+    def list_recent(self, limit: int = 200, cursor: PageCursor | None = None) -> List[AuditLog]:
+        query = self._session.query(AuditLog)
+        return keyset_page(query, AuditLog.created_at, AuditLog.id, cursor, limit).all()
 
     def add(self, log: AuditLog) -> None:
         self._session.add(log)
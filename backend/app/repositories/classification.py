@@ -1,8 +1,10 @@
 """Classification repository: DB access for event classifications."""
 
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.models.classification import Classification
+from app.models.event import Event
 
 
 class ClassificationRepository:
@@ -41,15 +43,24 @@ class ClassificationRepository:
             query = query.filter(Classification.event_id == event_id)
         return query.all()
 
-    def tier_by_event(self, event_ids: list[str]) -> dict[str, str]:
-        """Return event_id -> event_tier for the latest classification per event."""
-        rows = self.list_for_events(event_ids)
-        out: dict[str, str] = {}
-        for c in rows:
-            if c.event_id not in out:
-                out[c.event_id] = c.event_tier or "E2"
+    def latest_by_event_ids(self, event_ids: list[str]) -> dict[str, Classification]:
+        """event_id -> latest classification, one query for all ids (events without one are omitted)."""
+        out: dict[str, Classification] = {}
+        for c in self.list_for_events(list(set(event_ids))):
+            out.setdefault(c.event_id, c)
         return out
 
+    def tier_by_event(self, event_ids: list[str]) -> dict[str, str]:
+        """Return event_id -> event_tier of classified events, read from the materialized events.current_tier."""
+        if not event_ids:
+            return {}
+        rows = self._session.execute(
+            select(Event.id, Event.current_tier).where(
+                Event.id.in_(set(event_ids)), Event.current_tier.isnot(None)
+            )
+        )
+        return {event_id: tier for event_id, tier in rows}
+
     def count(self) -> int:
         return self._session.query(Classification).count()
 
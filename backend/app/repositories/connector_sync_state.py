@@ -0,0 +1,27 @@
+"""ConnectorSyncState repository: per-source conditional request validators and last sync summary."""
+
+from __future__ import annotations
+
+from typing import List
+
+from sqlalchemy.orm import Session
+
+from app.models.connector_sync_state import ConnectorSyncState
+
+
+class ConnectorSyncStateRepository:
+    def __init__(self, session: Session) -> None:
+        self._session = session
+
+    def get(self, source: str) -> ConnectorSyncState | None:
+        return self._session.get(ConnectorSyncState, source)
+
+    def get_or_create(self, source: str) -> ConnectorSyncState:
+        state = self.get(source)
+        if state is None:
+            state = ConnectorSyncState(source=source, last_summary={})
+            self._session.add(state)
+        return state
+
+    def list_all(self) -> List[ConnectorSyncState]:
+        return self._session.query(ConnectorSyncState).order_by(ConnectorSyncState.source).all()
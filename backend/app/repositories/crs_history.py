@@ -4,9 +4,11 @@ from __future__ import annotations
 
 from typing import List
 
+from sqlalchemy import func, tuple_
 from sqlalchemy.orm import Session
 
 from app.models.crs_history import CRSHistory
+from app.repositories.pagination import PageCursor, keyset_page
 
 
 class CRSHistoryRepository:
@@ -14,12 +16,19 @@ class CRSHistoryRepository:
         self._session = session
 
     def list_by_driver_id(
-        self, driver_id: str, discipline: str | None = None
+        self,
+        driver_id: str,
+        discipline: str | None = None,
+        limit: int | None = None,
+        cursor: PageCursor | None = None,
     ) -> List[CRSHistory]:
+        """Newest computed first; all rows unless limit is given (then one keyset page after cursor)."""
         query = self._session.query(CRSHistory).filter(CRSHistory.driver_id == driver_id)
         if discipline:
             query = query.filter(CRSHistory.discipline == discipline)
-        return query.order_by(CRSHistory.computed_at.desc()).all()
+        if limit is None:
+            return query.order_by(CRSHistory.computed_at.desc(), CRSHistory.id.desc()).all()
+        return keyset_page(query, CRSHistory.computed_at, CRSHistory.id, cursor, limit).all()
 
     def latest_by_driver(self, driver_id: str) -> CRSHistory | None:
         return (
@@ -42,5 +51,31 @@ class CRSHistoryRepository:
             .first()
         )
 
+    def latest_scores(self, keys: List[tuple[str, str]]) -> dict[tuple[str, str], float]:
+        """Latest score per (driver_id, discipline) in one query (keys without history are omitted)."""
+        if not keys:
+            return {}
+        ranked = (
+            self._session.query(
+                CRSHistory.driver_id,
+                CRSHistory.discipline,
+                CRSHistory.score,
+                func.row_number()
+                .over(
+                    partition_by=(CRSHistory.driver_id, CRSHistory.discipline),
+                    order_by=(CRSHistory.computed_at.desc(), CRSHistory.id.desc()),
+                )
+                .label("rank"),
+            )
+            .filter(tuple_(CRSHistory.driver_id, CRSHistory.discipline).in_(list(set(keys))))
+            .subquery()
+        )
+        rows = (
+            self._session.query(ranked.c.driver_id, ranked.c.discipline, ranked.c.score)
+            .filter(ranked.c.rank == 1)
+            .all()
+        )
+        return {(driver_id, discipline): float(score) for driver_id, discipline, score in rows}
+
     def add(self, record: CRSHistory) -> None:
         self._session.add(record)
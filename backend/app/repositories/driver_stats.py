@@ -0,0 +1,30 @@
+"""DriverStats repository: pre-aggregated per driver/discipline counters."""
+
+from __future__ import annotations
+
+from typing import List, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.models.driver_stats import DriverStats
+
+
+class DriverStatsRepository:
+    def __init__(self, session: Session) -> None:
+        self._session = session
+
+    def list_by_driver_id(self, driver_id: str) -> List[DriverStats]:
+        return (
+            self._session.query(DriverStats)
+            .filter(DriverStats.driver_id == driver_id)
+            .order_by(DriverStats.discipline)
+            .all()
+        )
+
+    def total(self, column: str, driver_id: Optional[str] = None) -> int:
+        """Sum of one counter column over a driver's disciplines (or all drivers)."""
+        query = self._session.query(func.coalesce(func.sum(getattr(DriverStats, column)), 0))
+        if driver_id:
+            query = query.filter(DriverStats.driver_id == driver_id)
+        return int(query.scalar() or 0)
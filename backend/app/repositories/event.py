@@ -5,13 +5,40 @@ from __future__ import annotations
 from datetime import datetime, timedelta, timezone
 from typing import List
 
-from sqlalchemy import func
+from sqlalchemy import func, or_, select, type_coerce
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Session
 
-from app.models.classification import Classification
 from app.models.event import Event
 
 
+# (wheel rank, pedals rank, has clutch), see app.utils.rig_compat.driver_rig_ranks
+RigRanks = tuple[int, int, bool]
+
+
+def tier_filter(tiers: List[str]):
+    """events.current_tier in tiers; unclassified events (current_tier NULL) count as E2."""
+    clause = Event.current_tier.in_(tiers)
+    return or_(clause, Event.current_tier.is_(None)) if "E2" in tiers else clause
+
+
+def rig_filters(driver_rig: RigRanks) -> list:
+    """SQL form of driver_rig_satisfies_event on the materialized events.rig_* columns."""
+    wheel_rank, pedals_rank, has_clutch = driver_rig
+    filters = [
+        or_(Event.rig_wheel_rank.is_(None), Event.rig_wheel_rank <= wheel_rank),
+        or_(Event.rig_pedals_rank.is_(None), Event.rig_pedals_rank <= pedals_rank),
+    ]
+    if not has_clutch:
+        filters.append(Event.rig_clutch_required.is_(False))
+    return filters
+
+
+def task_code_filter(task_code: str):
+    """events.task_codes contains task_code (JSONB containment, served by the GIN index)."""
+    return type_coerce(Event.task_codes, JSONB).contains([task_code])
+
+
 class EventRepository:
     def __init__(self, session: Session) -> None:
         self._session = session
@@ -31,8 +58,17 @@ class EventRepository:
         date_from: str | None = None,
         date_to: str | None = None,
         game_in: List[str] | None = None,
+        task_code: str | None = None,
+        tiers: List[str] | None = None,
+        driver_rig: RigRanks | None = None,
         order_desc: bool = True,
+        limit: int | None = None,
+        offset: int = 0,
     ) -> List[Event]:
+        """
+        Events matching all given filters, applied in SQL before limit/offset: tiers = allowed
+        events.current_tier values, driver_rig = driver_rig_ranks(...) of the driver the rig must satisfy.
+        """
         query = self._session.query(Event)
         if game:
             query = query.filter(Event.game == game)
@@ -60,8 +96,18 @@ class EventRepository:
                 pass
         if game_in:
             query = query.filter(Event.game.in_(game_in))
+        if task_code:
+            query = query.filter(task_code_filter(task_code))
+        if tiers is not None:
+            query = query.filter(tier_filter(tiers))
+        if driver_rig is not None:
+            query = query.filter(*rig_filters(driver_rig))
         if order_desc:
-            query = query.order_by(Event.created_at.desc())
+            query = query.order_by(Event.created_at.desc(), Event.id)
+        if offset:
+            query = query.offset(offset)
+        if limit is not None:
+            query = query.limit(limit)
         return query.all()
 
     def list_by_ids(self, event_ids: List[str], order_by_start: bool = False) -> List[Event]:
@@ -97,111 +143,64 @@ class EventRepository:
     def add(self, event: Event) -> None:
         self._session.add(event)
 
-    def list_upcoming_ids(
-        self,
-        driver_tier: str,
-        driver_games: List[str] | None = None,
-        limit: int = 3,
-        offset: int = 0,
-    ) -> List[str]:
-        """Event ids with start_time_utc > now, tier match, optional game filter; order by start, limit/offset."""
-        now = datetime.now(timezone.utc)
-        query = (
-            self._session.query(Event.id)
-            .outerjoin(Classification, Event.id == Classification.event_id)
-            .filter(
-                Event.start_time_utc.isnot(None),
-                Event.start_time_utc > now,
-                func.coalesce(Classification.event_tier, "E2") == driver_tier,
-            )
-        )
-        if driver_games:
-            query = query.filter(Event.game.in_(driver_games))
-        subq = (
-            query.with_entities(Event.id, Event.start_time_utc)
-            .group_by(Event.id, Event.start_time_utc)
-            .order_by(Event.start_time_utc.asc())
-            .offset(offset)
-            .limit(limit)
-        )
-        rows = subq.all()
-        return [row[0] for row in rows]
-
-    def count_upcoming_ids(
+    def _window_filters(
         self,
+        window: str,
         driver_tier: str,
-        driver_games: List[str] | None = None,
-    ) -> int:
-        """Count events with start_time_utc > now, tier match, optional game filter."""
+        driver_games: List[str] | None,
+        recent_days: int,
+        driver_rig: RigRanks | None = None,
+    ) -> list:
+        """WHERE clauses of the upcoming/past search."""
         now = datetime.now(timezone.utc)
-        query = (
-            self._session.query(Event.id)
-            .outerjoin(Classification, Event.id == Classification.event_id)
-            .filter(
-                Event.start_time_utc.isnot(None),
-                Event.start_time_utc > now,
-                func.coalesce(Classification.event_tier, "E2") == driver_tier,
-            )
-        )
+        if window == "upcoming":
+            filters = [Event.start_time_utc > now]
+        else:
+            filters = [Event.start_time_utc < now, Event.start_time_utc >= now - timedelta(days=recent_days)]
+        filters.append(tier_filter([driver_tier]))
         if driver_games:
-            query = query.filter(Event.game.in_(driver_games))
-        return query.distinct().count()
+            filters.append(Event.game.in_(driver_games))
+        if driver_rig is not None:
+            filters.extend(rig_filters(driver_rig))
+        return filters
 
-    def list_past_ids(
+    def search_window(
         self,
+        window: str,
         driver_tier: str,
         driver_games: List[str] | None = None,
         limit: int = 3,
         offset: int = 0,
         recent_days: int = 30,
-    ) -> List[str]:
-        """Event ids with start_time_utc < now and within recent_days, tier match; order by start desc."""
-        now = datetime.now(timezone.utc)
-        since = now - timedelta(days=recent_days)
-        query = (
-            self._session.query(Event.id)
-            .outerjoin(Classification, Event.id == Classification.event_id)
-            .filter(
-                Event.start_time_utc.isnot(None),
-                Event.start_time_utc < now,
-                Event.start_time_utc >= since,
-                func.coalesce(Classification.event_tier, "E2") == driver_tier,
-            )
-        )
-        if driver_games:
-            query = query.filter(Event.game.in_(driver_games))
-        subq = (
-            query.with_entities(Event.id, Event.start_time_utc)
-            .group_by(Event.id, Event.start_time_utc)
-            .order_by(Event.start_time_utc.desc())
-            .offset(offset)
-            .limit(limit)
-        )
-        rows = subq.all()
-        return [row[0] for row in rows]
-
-    def count_past_ids(
+        with_total: bool = True,
+        driver_rig: RigRanks | None = None,
+    ) -> tuple[List[Event], int | None]:
+        """
+        One page of upcoming (start asc) or past (start desc, within recent_days) events for a tier and game set.
+        With with_total the match count comes back in the same query (COUNT(*) OVER ()); it is None when the
+        page is empty, since no row carries it.
+        """
+        filters = self._window_filters(window, driver_tier, driver_games, recent_days, driver_rig)
+        order = Event.start_time_utc.asc() if window == "upcoming" else Event.start_time_utc.desc()
+        columns = [Event, func.count().over().label("total")] if with_total else [Event]
+        rows = self._session.execute(
+            select(*columns).where(*filters).order_by(order, Event.id).offset(offset).limit(limit)
+        ).all()
+        events = [row[0] for row in rows]
+        total = int(rows[0][1]) if with_total and rows else None
+        return events, total
+
+    def count_window(
         self,
+        window: str,
         driver_tier: str,
         driver_games: List[str] | None = None,
         recent_days: int = 30,
+        driver_rig: RigRanks | None = None,
     ) -> int:
-        """Count past events within recent_days, tier match."""
-        now = datetime.now(timezone.utc)
-        since = now - timedelta(days=recent_days)
-        query = (
-            self._session.query(Event.id)
-            .outerjoin(Classification, Event.id == Classification.event_id)
-            .filter(
-                Event.start_time_utc.isnot(None),
-                Event.start_time_utc < now,
-                Event.start_time_utc >= since,
-                func.coalesce(Classification.event_tier, "E2") == driver_tier,
-            )
-        )
-        if driver_games:
-            query = query.filter(Event.game.in_(driver_games))
-        return query.distinct().count()
+        """Number of events search_window matches (without paging)."""
+        filters = self._window_filters(window, driver_tier, driver_games, recent_days, driver_rig)
+        return int(self._session.execute(select(func.count(Event.id)).where(*filters)).scalar_one())
 
 
 def _parse_iso_datetime(value: str) -> datetime:
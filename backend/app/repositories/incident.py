@@ -8,6 +8,7 @@ from sqlalchemy.orm import Session
 
 from app.models.incident import Incident
 from app.models.participation import Participation
+from app.repositories.pagination import PageCursor, keyset_page
 
 
 class IncidentRepository:
@@ -48,6 +49,7 @@ class IncidentRepository:
         participation_id: Optional[str] = None,
         offset: int = 0,
         limit: int = 100,
+        cursor: PageCursor | None = None,
     ) -> List[Incident]:
         query = self._session.query(Incident)
         if participation_id:
@@ -57,12 +59,7 @@ class IncidentRepository:
                 query.join(Participation, Incident.participation_id == Participation.id)
                 .filter(Participation.driver_id == driver_id)
             )
-        return (
-            query.order_by(Incident.created_at.desc())
-            .offset(offset)
-            .limit(limit)
-            .all()
-        )
+        return keyset_page(query, Incident.created_at, Incident.id, cursor, limit, offset).all()
 
     def count_by_participation_id(self, participation_id: str) -> int:
         return (
@@ -71,6 +68,19 @@ class IncidentRepository:
             .count()
         )
 
+    def count_by_participation_ids(self, participation_ids: List[str]) -> dict[str, int]:
+        """Incident counts per participation in one grouped query (ids without incidents are omitted)."""
+        if not participation_ids:
+            return {}
+        from sqlalchemy import func
+        rows = (
+            self._session.query(Incident.participation_id, func.count(Incident.id))
+            .filter(Incident.participation_id.in_(participation_ids))
+            .group_by(Incident.participation_id)
+            .all()
+        )
+        return {participation_id: int(count) for participation_id, count in rows}
+
     def sum_score_by_participation_id(self, participation_id: str) -> float:
         """Sum incident scores for a participation (CRS v2: single source of truth for rating)."""
         from sqlalchemy import func
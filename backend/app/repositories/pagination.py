@@ -0,0 +1,66 @@
+"""
+Keyset (cursor) pagination for list queries.
+
+Pages are ordered by (timestamp desc, id desc). The cursor is the (timestamp, id) of the last row of the
+previous page, handed to clients as an opaque url-safe token; the next page filters (timestamp, id) < cursor,
+which an index on (timestamp, id) answers directly instead of scanning and discarding OFFSET rows.
+The timestamp column must be NOT NULL: a NULL compares neither below nor above the cursor, so such rows
+would never be returned and a NULL on a page boundary would leave no cursor to continue from.
+"""
+
+from __future__ import annotations
+
+import base64
+from collections.abc import Mapping
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy import tuple_
+
+
+@dataclass(frozen=True)
+class PageCursor:
+    at: datetime
+    id: str
+
+    def encode(self) -> str:
+        raw = f"{self.at.isoformat()}|{self.id}".encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls, token: str) -> "PageCursor":
+        """Parse a token from encode(); ValueError if it is malformed."""
+        try:
+            raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)).decode()
+            at, _, row_id = raw.partition("|")
+            if not row_id:
+                raise ValueError("missing id")
+            return cls(at=datetime.fromisoformat(at), id=row_id)
+        except (UnicodeDecodeError, ValueError, TypeError) as e:
+            raise ValueError(f"Invalid cursor: {token!r}") from e
+
+
+def keyset_page(query, time_column, id_column, cursor: PageCursor | None, limit: int, offset: int = 0):
+    """Order query newest first and return one page: after cursor if given, otherwise at offset."""
+    if getattr(time_column, "nullable", False):
+        raise ValueError(f"Keyset pagination needs a NOT NULL timestamp column, got {time_column}")
+    if cursor is not None:
+        query = query.where(tuple_(time_column, id_column) < tuple_(cursor.at, cursor.id))
+    query = query.order_by(time_column.desc(), id_column.desc())
+    if cursor is None and offset:
+        query = query.offset(offset)
+    return query.limit(limit)
+
+
+def next_cursor(rows, limit: int, time_attr: str = "created_at") -> str | None:
+    """Token for the page after rows (None when the page was not full, i.e. there is no next page)."""
+    if not rows or len(rows) < limit:
+        return None
+    last = rows[-1]
+    if isinstance(last, Mapping):
+        at, row_id = last[time_attr], last["id"]
+    else:
+        at, row_id = getattr(last, time_attr), last.id
+    if at is None:
+        raise ValueError(f"Row {row_id!r} has no {time_attr}: cannot continue keyset pagination")
+    return PageCursor(at=at, id=row_id).encode()
@@ -4,10 +4,38 @@ from __future__ import annotations
 
 from typing import List, Optional
 
+from sqlalchemy import RowMapping, func, select
 from sqlalchemy.orm import Session, selectinload
 
+from app.models.event import Event
 from app.models.incident import Incident
 from app.models.participation import Participation, ParticipationState
+from app.models.penalty import Penalty
+from app.repositories.pagination import PageCursor, keyset_page
+
+# Participation columns returned by list_rows_with_event (ParticipationRead fields backed by columns)
+LIST_ROW_COLUMNS = (
+    "id",
+    "driver_id",
+    "event_id",
+    "classification_id",
+    "discipline",
+    "status",
+    "participation_state",
+    "position_overall",
+    "position_class",
+    "laps_completed",
+    "withdraw_count",
+    "pace_delta",
+    "consistency_score",
+    "raw_metrics",
+    "best_lap_seconds",
+    "last_lap_seconds",
+    "total_lap_seconds",
+    "started_at",
+    "finished_at",
+    "created_at",
+)
 
 
 class ParticipationRepository:
@@ -48,6 +76,49 @@ class ParticipationRepository:
             .all()
         )
 
+    def list_rows_with_event(
+        self,
+        driver_id: Optional[str] = None,
+        event_id: Optional[str] = None,
+        offset: int = 0,
+        limit: int = 100,
+        cursor: PageCursor | None = None,
+    ) -> List[RowMapping]:
+        """
+        One statement for list views: participation columns, event title / start time and incident / penalty
+        counts (correlated subqueries, evaluated for the page only). Returns row mappings, no ORM objects.
+        Newest first; pages after cursor when given (keyset), otherwise at offset.
+        """
+        incidents_count = (
+            select(func.count(Incident.id))
+            .where(Incident.participation_id == Participation.id)
+            .correlate(Participation)
+            .scalar_subquery()
+        )
+        penalties_count = (
+            select(func.count(Penalty.id))
+            .join(Incident, Penalty.incident_id == Incident.id)
+            .where(Incident.participation_id == Participation.id)
+            .correlate(Participation)
+            .scalar_subquery()
+        )
+        query = (
+            select(
+                *(getattr(Participation, name) for name in LIST_ROW_COLUMNS),
+                incidents_count.label("incidents_count"),
+                penalties_count.label("penalties_count"),
+                func.coalesce(Event.title, "").label("event_title"),
+                Event.start_time_utc.label("event_start_time_utc"),
+            )
+            .outerjoin(Event, Participation.event_id == Event.id)
+        )
+        if driver_id:
+            query = query.where(Participation.driver_id == driver_id)
+        if event_id:
+            query = query.where(Participation.event_id == event_id)
+        query = keyset_page(query, Participation.created_at, Participation.id, cursor, limit, offset)
+        return list(self._session.execute(query).mappings())
+
     def list_by_driver_id(self, driver_id: str) -> List[Participation]:
         return (
             self._session.query(Participation)
@@ -71,6 +142,18 @@ class ParticipationRepository:
         )
         return [(part, ev) for part, ev in rows]
 
+    def list_page_by_driver_id_with_events(
+        self, driver_id: str, limit: int = 200, cursor: PageCursor | None = None
+    ) -> List[tuple[Participation, Optional["Event"]]]:
+        """(Participation, Event) pairs for driver, newest created first, one keyset page after cursor."""
+        query = (
+            self._session.query(Participation, Event)
+            .outerjoin(Event, Participation.event_id == Event.id)
+            .filter(Participation.driver_id == driver_id)
+        )
+        rows = keyset_page(query, Participation.created_at, Participation.id, cursor, limit).all()
+        return [(part, ev) for part, ev in rows]
+
     def list_by_driver_id_and_event_id(
         self, driver_id: str, event_id: str
     ) -> List[Participation]:
@@ -93,6 +176,17 @@ class ParticipationRepository:
             .first()
         )
 
+    def user_has_participation_in_event(self, user_id: str, event_id: str) -> bool:
+        """True when any driver of user_id is registered for event_id (one query over all their drivers)."""
+        from app.models.driver import Driver
+        query = (
+            select(Participation.id)
+            .join(Driver, Participation.driver_id == Driver.id)
+            .where(Driver.user_id == user_id, Participation.event_id == event_id)
+            .limit(1)
+        )
+        return self._session.execute(query).first() is not None
+
     def get_active_by_driver(self, driver_id: str) -> Optional[Participation]:
         """Current race: participation_state=started, finished_at is null."""
         return (
@@ -106,6 +200,15 @@ class ParticipationRepository:
             .first()
         )
 
+    def list_by_ids(self, participation_ids: List[str]) -> List[Participation]:
+        if not participation_ids:
+            return []
+        return (
+            self._session.query(Participation)
+            .filter(Participation.id.in_(participation_ids))
+            .all()
+        )
+
     def list_by_event_id(self, event_id: str) -> List[Participation]:
         return (
             self._session.query(Participation)
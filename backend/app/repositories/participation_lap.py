@@ -0,0 +1,70 @@
+"""ParticipationLap repository: append-only lap telemetry rows."""
+
+from __future__ import annotations
+
+from typing import Dict, List
+
+from sqlalchemy import func, insert, select, tuple_
+from sqlalchemy.orm import Session
+
+from app.models.participation_lap import ParticipationLap
+
+
+class ParticipationLapRepository:
+    def __init__(self, session: Session) -> None:
+        self._session = session
+
+    def add_many(self, rows: List[dict]) -> None:
+        """One multi-row INSERT (no ORM objects, no mapper events)."""
+        if rows:
+            self._session.execute(insert(ParticipationLap), rows)
+
+    def list_for_participation(self, participation_id: str) -> List[ParticipationLap]:
+        return (
+            self._session.query(ParticipationLap)
+            .filter(ParticipationLap.participation_id == participation_id)
+            .order_by(ParticipationLap.lap_number)
+            .all()
+        )
+
+    def list_for_keys(self, keys: List[tuple[str, int]]) -> List[ParticipationLap]:
+        """Laps by (participation_id, lap_number) in one query."""
+        if not keys:
+            return []
+        return (
+            self._session.query(ParticipationLap)
+            .filter(tuple_(ParticipationLap.participation_id, ParticipationLap.lap_number).in_(keys))
+            .all()
+        )
+
+    def last_lap_numbers(self, participation_ids: List[str]) -> Dict[str, int]:
+        """Highest stored lap_number per participation (= stored lap count: laps are numbered 1..n)."""
+        if not participation_ids:
+            return {}
+        rows = self._session.execute(
+            select(ParticipationLap.participation_id, func.max(ParticipationLap.lap_number))
+            .where(ParticipationLap.participation_id.in_(participation_ids))
+            .group_by(ParticipationLap.participation_id)
+        )
+        return {pid: int(number) for pid, number in rows}
+
+    def lap_summaries(self, participation_ids: List[str]) -> Dict[str, tuple[int, float, float, float]]:
+        """(count, sum, sum of squares, best) of stored lap times per participation, one grouped query."""
+        if not participation_ids:
+            return {}
+        lap_time = ParticipationLap.lap_time_seconds
+        rows = self._session.execute(
+            select(
+                ParticipationLap.participation_id,
+                func.count(),
+                func.sum(lap_time),
+                func.sum(lap_time * lap_time),
+                func.min(lap_time),
+            )
+            .where(ParticipationLap.participation_id.in_(participation_ids))
+            .group_by(ParticipationLap.participation_id)
+        )
+        return {
+            pid: (int(count), float(total), float(squares), float(best))
+            for pid, count, total, squares, best in rows
+        }
@@ -10,6 +10,7 @@ from app.models.incident import Incident
 from app.models.participation import Participation
 from app.models.penalty import Penalty
 from app.penalties.scores import DEFAULT_PENALTY_SCORE
+from app.repositories.pagination import PageCursor, keyset_page
 
 
 class PenaltyRepository:
@@ -45,6 +46,7 @@ class PenaltyRepository:
         participation_id: Optional[str] = None,
         offset: int = 0,
         limit: int = 100,
+        cursor: PageCursor | None = None,
     ) -> List[Penalty]:
         query = (
             self._session.query(Penalty)
@@ -58,12 +60,7 @@ class PenaltyRepository:
                 query.join(Participation, Incident.participation_id == Participation.id)
                 .filter(Participation.driver_id == driver_id)
             )
-        return (
-            query.order_by(Penalty.created_at.desc())
-            .offset(offset)
-            .limit(limit)
-            .all()
-        )
+        return keyset_page(query, Penalty.created_at, Penalty.id, cursor, limit, offset).all()
 
     def count_filtered(
         self,
@@ -7,6 +7,7 @@ from typing import List, Optional
 from sqlalchemy.orm import Session
 
 from app.models.raw_event import RawEvent
+from app.repositories.pagination import PageCursor, keyset_page
 
 
 class RawEventRepository:
@@ -20,14 +21,11 @@ class RawEventRepository:
             .first()
         )
 
-    def list_paginated(self, offset: int = 0, limit: int = 100) -> List[RawEvent]:
-        return (
-            self._session.query(RawEvent)
-            .order_by(RawEvent.created_at.desc())
-            .offset(offset)
-            .limit(limit)
-            .all()
-        )
+    def list_paginated(
+        self, offset: int = 0, limit: int = 100, cursor: PageCursor | None = None
+    ) -> List[RawEvent]:
+        query = self._session.query(RawEvent)
+        return keyset_page(query, RawEvent.created_at, RawEvent.id, cursor, limit, offset).all()
 
     def add(self, raw_event: RawEvent) -> None:
         self._session.add(raw_event)
@@ -65,6 +65,26 @@ class AdminLookupRecommendationItem(BaseModel):
     created_at: datetime | None
 
 
+class AdminLookupStatsItem(BaseModel):
+    """driver_stats row: totals per discipline over the driver's whole history."""
+    discipline: str
+    participations_count: int
+    registered_count: int
+    withdrawn_count: int
+    started_count: int
+    completed_count: int
+    finished_count: int
+    dnf_count: int
+    dsq_count: int
+    dns_count: int
+    incidents_count: int
+    incident_score_sum: float
+    penalties_count: int
+    last_race_at: datetime | None
+
+    model_config = {"from_attributes": True}
+
+
 class AdminLookupRead(BaseModel):
     user: AdminLookupUser | None
     driver: AdminLookupDriver | None
@@ -73,6 +93,7 @@ class AdminLookupRead(BaseModel):
     licenses: list[AdminLookupLicenseItem] = []
     last_crs: AdminLookupCrsItem | None = None
     last_recommendation: AdminLookupRecommendationItem | None = None
+    stats: list[AdminLookupStatsItem] = []
 
 
 class AdminDriverCrsDiagnostic(BaseModel):
@@ -114,6 +135,7 @@ class AdminParticipationSearchRead(BaseModel):
     primary_discipline: str | None
     sim_games: list[str] = []
     participations: list[ParticipationAdminRead] = []
+    next_cursor: str | None = None  # pass as ?cursor= for the next (older) page
 
 
 class AdminParticipationSummary(BaseModel):
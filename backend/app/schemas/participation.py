@@ -60,6 +60,9 @@ class ParticipationRead(ParticipationCreate):
     classification_id: str | None = None
     duration_minutes: int | None = None
     withdraw_count: int = 0
+    best_lap_seconds: float | None = None
+    last_lap_seconds: float | None = None
+    total_lap_seconds: float = 0.0
     incidents_count: int = 0  # derived from participation.incidents
     penalties_count: int = 0  # derived from participation.penalties
     created_at: datetime
@@ -73,6 +76,16 @@ class ParticipationWithEventRead(ParticipationRead):
     event_start_time_utc: datetime | None = None
 
 
+class ParticipationLapRead(BaseModel):
+    """One completed lap (participation_laps row)."""
+    lap_number: int
+    lap_time_seconds: float
+    sector_times: list[float] | None = None
+    recorded_at: datetime
+
+    model_config = {"from_attributes": True}
+
+
 class ParticipationWithdrawUpdate(BaseModel):
     """Driver can only set participation_state to withdrawn (opt out of event)."""
     participation_state: Literal["withdrawn"] = "withdrawn"
@@ -11,6 +11,37 @@ class RawEventIngest(BaseModel):
     create_event: bool = True
 
 
+class RawEventBulkItem(BaseModel):
+    source_event_id: str | None = None
+    payload: Dict[str, Any] = Field(default_factory=dict)
+
+
+class RawEventBulkIngest(BaseModel):
+    source: Literal["wss", "gridfinder", "iracing", "acc_league", "lfm", "sro_esports", "other"]
+    items: List[RawEventBulkItem]
+    create_event: bool = True
+
+
+class RawEventBulkItemResult(BaseModel):
+    index: int
+    source_event_id: str | None
+    raw_event_id: str | None
+    event_id: str | None
+    status: str
+    errors: List[str]
+    duplicate: bool
+
+    model_config = {"from_attributes": True}
+
+
+class RawEventBulkResult(BaseModel):
+    total: int
+    classified: int
+    failed: int
+    duplicates: int
+    items: List[RawEventBulkItemResult]
+
+
 class RawEventRead(BaseModel):
     id: str
     source: str
@@ -0,0 +1,60 @@
+from datetime import datetime
+from typing import Annotated, List, Literal, Optional, Union
+
+from pydantic import BaseModel, Field, TypeAdapter
+
+from app.schemas.incident import IncidentCreate
+
+
+class TelemetryLap(BaseModel):
+    """Completed lap. lap_number (when sent) must be the next lap; already stored laps are skipped as duplicates."""
+
+    type: Literal["lap"]
+    participation_id: str
+    lap_number: int | None = Field(default=None, ge=1)
+    lap_time_seconds: float = Field(..., gt=0)
+    sector_times: Optional[List[Annotated[float, Field(gt=0)]]] = Field(default=None, max_length=10)
+    position_overall: int | None = Field(default=None, ge=1)
+    position_class: int | None = Field(default=None, ge=1)
+
+
+class TelemetrySector(BaseModel):
+    """One sector split (sector is 1-based) of a lap sent in the same batch or already stored."""
+
+    type: Literal["sector"]
+    participation_id: str
+    lap_number: int = Field(..., ge=1)
+    sector: int = Field(..., ge=1, le=10)
+    sector_time_seconds: float = Field(..., gt=0)
+
+
+class TelemetryIncident(IncidentCreate):
+    """Incident by platform code, as POST /participations/{id}/incidents."""
+
+    type: Literal["incident"]
+
+
+TelemetryMessage = Annotated[
+    Union[TelemetryLap, TelemetrySector, TelemetryIncident],
+    Field(discriminator="type"),
+]
+telemetry_message_adapter: TypeAdapter = TypeAdapter(TelemetryMessage)
+
+
+class TelemetryMessageError(BaseModel):
+    index: int
+    participation_id: str | None = None
+    error: str
+
+
+class TelemetryBatchResult(BaseModel):
+    total: int
+    accepted: int
+    rejected: int
+    duplicates: int
+    laps_written: int
+    sectors_applied: int
+    incidents_created: int
+    crs_recomputes: int
+    errors: List[TelemetryMessageError]
+    received_at: datetime
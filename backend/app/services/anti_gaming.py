@@ -6,17 +6,8 @@ from typing import Dict, List
 from sqlalchemy.orm import Session
 
 from app.models.anti_gaming import AntiGamingReport
-from app.models.classification import Classification
 from app.models.participation import Participation
-
-
-def _latest_classification(session: Session, event_id: str) -> Classification | None:
-    return (
-        session.query(Classification)
-        .filter(Classification.event_id == event_id)
-        .order_by(Classification.created_at.desc())
-        .first()
-    )
+from app.repositories.classification import ClassificationRepository
 
 
 def evaluate_anti_gaming(session: Session, driver_id: str, discipline: str) -> AntiGamingReport:
@@ -53,10 +44,8 @@ def evaluate_anti_gaming(session: Session, driver_id: str, discipline: str) -> A
     counts = Counter(event_ids)
     most_common = counts.most_common(1)[0][1] if counts else 0
 
-    tiers = []
-    for participation in participations:
-        classification = _latest_classification(session, participation.event_id)
-        tiers.append(classification.event_tier if classification else "E2")
+    tier_by_event = ClassificationRepository(session).tier_by_event(event_ids)
+    tiers = [tier_by_event.get(event_id, "E2") for event_id in event_ids]
 
     low_tier_count = sum(1 for tier in tiers if tier in {"E1", "E2"})
     low_tier_ratio = low_tier_count / total if total else 0
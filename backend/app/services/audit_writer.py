@@ -0,0 +1,182 @@
+"""
+Batched audit log writer.
+
+audit_middleware hands entries to record_audit, which appends them to a bounded in-memory ring buffer
+instead of committing one AuditLog row per request. A background thread writes the buffer with multi-row
+INSERTs every AUDIT_FLUSH_INTERVAL_SECONDS, or as soon as AUDIT_BATCH_SIZE entries are waiting. When the
+buffer is full the oldest entry is dropped (counted in stats). stop_audit_writer flushes what is left on
+shutdown.
+
+Without a running writer (scripts, tests, AUDIT_WRITER_ENABLED=false) record_audit writes synchronously.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from collections import deque
+from datetime import datetime
+
+from sqlalchemy import insert
+
+from app.core.settings import settings
+from app.db.session import SessionLocal
+from app.models.audit_log import AuditLog
+
+logger = logging.getLogger("racerpath")
+
+
+class AuditWriter:
+    def __init__(self, buffer_size: int, batch_size: int, flush_interval_seconds: float) -> None:
+        self.buffer_size = max(1, buffer_size)
+        self.batch_size = max(1, batch_size)
+        self.flush_interval_seconds = max(0.05, flush_interval_seconds)
+        self._buffer: deque[dict] = deque()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.enqueued = 0
+        self.dropped = 0
+        self.written = 0
+        self.failed = 0
+        self.batches = 0
+
+    def enqueue(self, entry: dict) -> None:
+        with self._lock:
+            if len(self._buffer) >= self.buffer_size:
+                self._buffer.popleft()
+                self.dropped += 1
+            self._buffer.append(entry)
+            self.enqueued += 1
+            full_batch = len(self._buffer) >= self.batch_size
+        if full_batch:
+            self._wakeup.set()
+
+    def _take_batch(self) -> list[dict]:
+        with self._lock:
+            count = min(self.batch_size, len(self._buffer))
+            return [self._buffer.popleft() for _ in range(count)]
+
+    def flush(self) -> int:
+        """Write everything buffered now (in batch_size INSERTs); returns number of rows written."""
+        written = 0
+        with self._flush_lock:
+            while True:
+                rows = self._take_batch()
+                if not rows:
+                    return written
+                session = SessionLocal()
+                try:
+                    session.execute(insert(AuditLog), rows)
+                    session.commit()
+                    written += len(rows)
+                    self.written += len(rows)
+                    self.batches += 1
+                except Exception as e:
+                    session.rollback()
+                    self.failed += len(rows)
+                    logger.exception("audit_writer: failed to write %s entries: %s", len(rows), e)
+                    return written
+                finally:
+                    session.close()
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            self._wakeup.wait(self.flush_interval_seconds)
+            self._wakeup.clear()
+            self.flush()
+        self.flush()
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, daemon=True, name="audit_writer")
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        self._stop.set()
+        self._wakeup.set()
+        if self._thread:
+            self._thread.join(timeout)
+        self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return bool(self._thread and self._thread.is_alive())
+
+    def stats(self) -> dict:
+        return {
+            "buffered": len(self._buffer),
+            "buffer_size": self.buffer_size,
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "batches": self.batches,
+            "dropped": self.dropped,
+            "failed": self.failed,
+        }
+
+
+_writer: AuditWriter | None = None
+
+
+def get_audit_writer() -> AuditWriter | None:
+    return _writer
+
+
+def record_audit(user, action: str, path: str, status_code: int) -> None:
+    """Audit one request: buffered when the writer runs, otherwise written synchronously via log_audit."""
+    if not settings.auth_enabled:
+        return
+    writer = _writer
+    if writer is not None and writer.running:
+        writer.enqueue(
+            {
+                "actor_user_id": user.id if user else None,
+                "actor_role": user.role if user else None,
+                "action": action,
+                "path": path,
+                "status_code": status_code,
+                "details": {},
+                "created_at": datetime.utcnow(),
+            }
+        )
+        return
+    from app.services.auth import log_audit
+
+    session = SessionLocal()
+    try:
+        log_audit(session, user, action, path, status_code)
+    finally:
+        session.close()
+
+
+def start_audit_writer() -> AuditWriter | None:
+    global _writer
+    if not getattr(settings, "audit_writer_enabled", False):
+        return None
+    if _writer is not None and _writer.running:
+        return _writer
+    _writer = AuditWriter(
+        settings.audit_buffer_size,
+        settings.audit_batch_size,
+        settings.audit_flush_interval_seconds,
+    )
+    _writer.start()
+    logger.info(
+        "audit_writer: background writer started (batch=%s, interval=%ss)",
+        _writer.batch_size,
+        _writer.flush_interval_seconds,
+    )
+    return _writer
+
+
+def stop_audit_writer() -> None:
+    """Flush buffered entries and stop the writer (called on app shutdown)."""
+    global _writer
+    if _writer is None:
+        return
+    _writer.stop()
+    _writer = None
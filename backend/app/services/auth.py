@@ -2,15 +2,25 @@ from __future__ import annotations
 
 import hashlib
 import secrets
+from dataclasses import dataclass
 from typing import Iterable
 
-from fastapi import Depends, Header, HTTPException
+from fastapi import Depends, Header, HTTPException, Request
 from sqlalchemy.orm import Session
 
 from app.core.settings import settings
 from app.db.session import get_session
 from app.models.audit_log import AuditLog
 from app.models.user import User
+from app.services.auth_cache import cached_user, remember_user
+
+
+@dataclass(frozen=True)
+class AuthIdentity:
+    """User resolved by require_user / require_roles, kept on request.state for audit_middleware."""
+
+    id: str
+    role: str
 
 
 def hash_key(api_key: str) -> str:
@@ -37,11 +47,17 @@ def verify_password(password: str, stored_hash: str | None) -> bool:
 
 def get_user_by_key(session: Session, api_key: str) -> User | None:
     key_hash = hash_key(api_key)
-    return (
+    user = cached_user(session, key_hash)
+    if user is not None:
+        return user
+    user = (
         session.query(User)
         .filter(User.api_key_hash == key_hash, User.active.is_(True))
         .first()
     )
+    if user is not None:
+        remember_user(key_hash, user)
+    return user
 
 
 def get_user_by_email(session: Session, email: str) -> User | None:
@@ -54,6 +70,7 @@ def get_user_by_email(session: Session, email: str) -> User | None:
 
 def require_roles(*roles: str):
     def dependency(
+        request: Request,
         x_api_key: str | None = Header(default=None, alias="X-API-Key"),
         session: Session = Depends(get_session),
     ) -> User | None:
@@ -64,6 +81,7 @@ def require_roles(*roles: str):
         user = get_user_by_key(session, x_api_key)
         if not user:
             raise HTTPException(status_code=401, detail="Invalid API key")
+        request.state.auth_identity = AuthIdentity(user.id, user.role)
         if roles and user.role not in roles:
             raise HTTPException(status_code=403, detail="Insufficient role")
         return user
@@ -73,6 +91,7 @@ def require_roles(*roles: str):
 
 def require_user():
     def dependency(
+        request: Request,
         x_api_key: str | None = Header(default=None, alias="X-API-Key"),
         session: Session = Depends(get_session),
     ) -> User:
@@ -81,12 +100,19 @@ def require_user():
         user = get_user_by_key(session, x_api_key)
         if not user:
             raise HTTPException(status_code=401, detail="Invalid API key")
+        request.state.auth_identity = AuthIdentity(user.id, user.role)
         return user
 
     return dependency
 
 
-def log_audit(session: Session, user: User | None, action: str, path: str, status_code: int) -> None:
+def log_audit(
+    session: Session,
+    user: User | AuthIdentity | None,
+    action: str,
+    path: str,
+    status_code: int,
+) -> None:
     if not settings.auth_enabled:
         return
     entry = AuditLog(
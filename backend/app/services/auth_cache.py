@@ -0,0 +1,210 @@
+"""
+API-key authentication cache: SHA-256 key hash -> column values of the active User it belongs to.
+
+A hit rebuilds a detached User and merges it into the request session with load=False, so routes still
+get a session-bound User (lazy attributes, writes on commit) without a SELECT. Entries expire after
+AUTH_CACHE_TTL_SECONDS and are dropped for a user once a transaction that updated or deleted that user's
+row commits (login / logout / revoke rotate api_key_hash, deactivation flips active); a committed bulk
+UPDATE/DELETE on users clears the whole cache.
+
+With Redis (configure_auth_cache) the invalidation reaches every API worker: it bumps a per-user epoch
+(auth_cache:epoch:{user_id}, or auth_cache:epoch:* for bulk changes), each entry remembers the epochs it
+was cached under and a hit whose epochs moved is a miss. Epochs are read after the user row, so a change
+committed in between can still be served until the entry's TTL. Without Redis other workers only see
+changes after the TTL.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, make_transient_to_detached, object_session
+
+from app.core.settings import settings
+from app.models.user import User
+
+logger = logging.getLogger("racerpath")
+
+# password_hash is never cached; it is loaded on access like any expired attribute.
+_CACHED_COLUMNS = ("id", "name", "email", "role", "api_key_hash", "active", "created_at")
+
+REDIS_EPOCH_PREFIX = "auth_cache:epoch:"
+REDIS_ALL_USERS = "*"
+# session.info key: user ids changed in the current transaction (REDIS_ALL_USERS after a bulk change)
+PENDING_INVALIDATIONS_KEY = "auth_cache_invalidate"
+
+Epochs = tuple[str | None, str | None]
+
+
+class ApiKeyCache:
+    def __init__(self, max_entries: int, ttl_seconds: float, redis_client=None) -> None:
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self.redis = redis_client
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, tuple[float, dict, Epochs | None]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.redis_errors = 0
+
+    def _epochs(self, user_id: str) -> Epochs | None:
+        """(user epoch, all-users epoch) from Redis; None without Redis or when it is unreachable."""
+        if self.redis is None:
+            return None
+        try:
+            user_epoch, all_epoch = self.redis.mget(
+                [REDIS_EPOCH_PREFIX + user_id, REDIS_EPOCH_PREFIX + REDIS_ALL_USERS]
+            )
+        except Exception as e:
+            self.redis_errors += 1
+            logger.debug("auth_cache: redis epoch read failed: %s", e)
+            return None
+        return user_epoch, all_epoch
+
+    def _bump_epoch(self, user_id: str) -> None:
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.incr(REDIS_EPOCH_PREFIX + user_id)
+            # Outlive every entry cached under the old epoch
+            pipe.expire(REDIS_EPOCH_PREFIX + user_id, math.ceil(max(self.ttl_seconds, 0)) + 1)
+            pipe.execute()
+        except Exception as e:
+            self.redis_errors += 1
+            logger.warning("auth_cache: redis invalidation of %s failed: %s", user_id, e)
+
+    def get(self, key_hash: str) -> dict | None:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key_hash)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[key_hash]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key_hash)
+        _, values, epochs = entry
+        if self.redis is not None:
+            current = self._epochs(values["id"])
+            if current is None or current != epochs:
+                # Invalidated by another worker (or Redis unreachable): fall back to the DB lookup
+                with self._lock:
+                    if self._entries.get(key_hash) is entry:
+                        del self._entries[key_hash]
+                    self.misses += 1
+                return None
+        with self._lock:
+            self.hits += 1
+        return values
+
+    def put(self, key_hash: str, user: User) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        values = {column: getattr(user, column) for column in _CACHED_COLUMNS}
+        epochs = self._epochs(values["id"])
+        if self.redis is not None and epochs is None:
+            return
+        with self._lock:
+            self._entries[key_hash] = (time.monotonic() + self.ttl_seconds, values, epochs)
+            self._entries.move_to_end(key_hash)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate_user(self, user_id: str) -> None:
+        with self._lock:
+            for key_hash in [k for k, (_, values, _) in self._entries.items() if values["id"] == user_id]:
+                del self._entries[key_hash]
+        if self.redis is not None:
+            self._bump_epoch(user_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+        if self.redis is not None:
+            self._bump_epoch(REDIS_ALL_USERS)
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "redis": self.redis is not None,
+            "hits": self.hits,
+            "misses": self.misses,
+            "redis_errors": self.redis_errors,
+        }
+
+
+_cache = ApiKeyCache(settings.auth_cache_size, settings.auth_cache_ttl_seconds)
+
+
+def get_api_key_cache() -> ApiKeyCache:
+    return _cache
+
+
+def configure_auth_cache(redis_client=None) -> None:
+    """Attach Redis (called from app startup) so invalidations reach every API worker."""
+    _cache.redis = redis_client
+
+
+def cached_user(session: Session, key_hash: str) -> User | None:
+    """Session-bound User for a cached key hash, or None on miss (no DB access either way)."""
+    values = _cache.get(key_hash)
+    if values is None:
+        return None
+    user = User(**values)
+    make_transient_to_detached(user)
+    return session.merge(user, load=False)
+
+
+def remember_user(key_hash: str, user: User) -> None:
+    _cache.put(key_hash, user)
+
+
+def invalidate_user(user_id: str) -> None:
+    _cache.invalidate_user(user_id)
+
+
+def _pending(session: Session | None) -> set[str] | None:
+    return None if session is None else session.info.setdefault(PENDING_INVALIDATIONS_KEY, set())
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_on_user_change(mapper, connection, target: User) -> None:
+    # Only after commit: until then other requests must keep seeing the committed row
+    pending = _pending(object_session(target))
+    if pending is None:
+        invalidate_user(target.id)
+    else:
+        pending.add(target.id)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _invalidate_on_bulk_user_change(orm_execute_state) -> None:
+    # query(User).update()/delete() skip mapper events; drop everything rather than guess the rows.
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None and mapper.class_ is User:
+        _pending(orm_execute_state.session).add(REDIS_ALL_USERS)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session: Session) -> None:
+    pending = session.info.pop(PENDING_INVALIDATIONS_KEY, None)
+    if not pending:
+        return
+    if REDIS_ALL_USERS in pending:
+        _cache.clear()
+        return
+    for user_id in pending:
+        invalidate_user(user_id)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _forget_pending_invalidations(session: Session, transaction) -> None:
+    if transaction.parent is None:
+        session.info.pop(PENDING_INVALIDATIONS_KEY, None)
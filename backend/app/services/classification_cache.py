@@ -0,0 +1,121 @@
+"""
+Two-level classification cache: bounded in-process LRU in front of an optional shared Redis tier.
+
+Keyed by classification_version + inputs_hash (sha256 of the classifier input snapshot, the same hash
+classify_event stores), so every payload that normalizes to the same snapshot is one dictionary lookup.
+Mock and connector feeds produce many identical configurations.
+
+Redis is off by default (CLASSIFICATION_CACHE_REDIS_ENABLED): a round trip costs more than classify_event
+itself, so it only pays off for sharing across workers once classification gets more expensive.
+Entries are deep copies taken on store (the snapshot may share lists with the caller's payload) and callers
+receive a fresh deep copy, so they may mutate it (e.g. event_tier overrides).
+"""
+
+from __future__ import annotations
+
+import copy
+import json
+import logging
+import threading
+from collections import OrderedDict
+
+from app.core.settings import settings
+from app.services.classifier import _hash_snapshot, _snapshot, classify_snapshot
+
+logger = logging.getLogger("racerpath")
+
+REDIS_KEY_PREFIX = "classify:v"
+
+
+class ClassificationCache:
+    def __init__(self, max_entries: int, redis_client=None, ttl_seconds: int = 3600) -> None:
+        self.max_entries = max(1, max_entries)
+        self.redis = redis_client
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, dict] = OrderedDict()
+        self.memory_hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+        self.redis_errors = 0
+
+    def _redis_get(self, key: str) -> dict | None:
+        try:
+            cached = self.redis.get(REDIS_KEY_PREFIX + key)
+        except Exception as e:
+            self.redis_errors += 1
+            logger.debug("classification_cache: redis get failed: %s", e)
+            return None
+        return json.loads(cached) if cached else None
+
+    def _redis_set(self, key: str, result: dict) -> None:
+        try:
+            self.redis.setex(REDIS_KEY_PREFIX + key, self.ttl_seconds, json.dumps(result))
+        except Exception as e:
+            self.redis_errors += 1
+            logger.debug("classification_cache: redis set failed: %s", e)
+
+    def _remember(self, key: str, result: dict) -> None:
+        result = copy.deepcopy(result)
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def classify(self, payload: dict) -> dict:
+        snapshot = _snapshot(payload)
+        inputs_hash = _hash_snapshot(snapshot)
+        key = f"{settings.classification_version}:{inputs_hash}"
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+                self.memory_hits += 1
+        if result is None and self.redis is not None:
+            result = self._redis_get(key)
+            if result is not None:
+                self.redis_hits += 1
+                self._remember(key, result)
+        if result is None:
+            self.misses += 1
+            result = classify_snapshot(snapshot, inputs_hash)
+            self._remember(key, result)
+            if self.redis is not None:
+                self._redis_set(key, result)
+        return copy.deepcopy(result)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.memory_hits + self.redis_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "redis": self.redis is not None,
+            "memory_hits": self.memory_hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+            "redis_errors": self.redis_errors,
+            "hit_rate": round((self.memory_hits + self.redis_hits) / lookups, 3) if lookups else None,
+        }
+
+
+_cache = ClassificationCache(settings.classification_cache_size, ttl_seconds=settings.classification_cache_ttl_seconds)
+
+
+def get_classification_cache() -> ClassificationCache:
+    return _cache
+
+
+def configure_classification_cache(redis_client=None) -> None:
+    """Attach the Redis tier (called from app startup) when enabled and available."""
+    if settings.classification_cache_redis_enabled and redis_client is not None:
+        _cache.redis = redis_client
+
+
+def classify_event_cached(payload: dict) -> dict:
+    """classify_event through the two-level cache; same result, caller owns the returned dict."""
+    return _cache.classify(payload)
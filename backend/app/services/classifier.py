@@ -213,8 +213,11 @@ def _hash_snapshot(snapshot: dict) -> str:
 
 
 def classify_event(payload: dict) -> dict:
-    snapshot = _snapshot(payload)
+    return classify_snapshot(_snapshot(payload))
 
+
+def classify_snapshot(snapshot: dict, inputs_hash: str | None = None) -> dict:
+    """Classify an already normalized input snapshot (inputs_hash may be passed when the caller has it)."""
     fmt = snapshot["format"]
     duration = snapshot["duration"]
     grid = snapshot["grid"]
@@ -309,7 +312,7 @@ def classify_event(payload: dict) -> dict:
         ),
         "caps_applied": caps_applied,
         "classification_version": settings.classification_version,
-        "inputs_hash": _hash_snapshot(snapshot),
+        "inputs_hash": inputs_hash or _hash_snapshot(snapshot),
         "inputs_snapshot": snapshot,
     }
 
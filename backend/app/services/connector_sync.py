@@ -0,0 +1,307 @@
+"""
+Connector sync: conditional, paginated feed fetch over the pooled HTTP client + bulk/streaming ingestion.
+
+sync_source syncs one feed on the caller's session and records ETag / Last-Modified and a run summary in
+connector_sync_states; a 304 on the first page skips the feed entirely. sync_all_sources runs every
+configured source concurrently (one thread and one session each) and reports per-source timing.
+
+Incremental syncs send the stored cursor (newest item updated_at + its source_event_id) as
+CONNECTOR_CURSOR_PARAM / CONNECTOR_CURSOR_ID_PARAM so the feed only returns deltas. Once the run succeeds
+the cursor advances to the newest item that was stored, but never past an item whose ingestion failed, so
+failed items are requested again by the next run; such a run also drops the stored ETag / Last-Modified,
+otherwise an unchanged feed would answer 304 and the failed items would never be fetched again. Feeds that
+ignore the params still work (dedupe by source_event_id), they just return everything.
+
+One run per source at a time: sync_source holds a per-source lock (a session-level Postgres advisory lock
+on a dedicated connection, plus an in-process lock) for the whole run, so manual /sync calls, /sync-all and
+scheduler ticks never overlap; a second caller gets SyncInProgressError.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Iterable, Iterator
+
+import httpx
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core.settings import settings
+from app.db.session import SessionLocal
+from app.repositories.connector_sync_state import ConnectorSyncStateRepository
+from app.services.connectors import FeedFetch, get_http_client, stream_events
+from app.services.ingestion import (
+    IngestItemResult,
+    ingest_payloads_bulk,
+    ingest_payloads_streaming,
+    summarize_ingest,
+)
+
+logger = logging.getLogger("racerpath")
+
+# First key of the two-key pg_try_advisory_lock(namespace, hashtext(source)) held for a sync run.
+ADVISORY_LOCK_NAMESPACE = 0x434E5331  # "CNS1"
+
+_local_locks: dict[str, threading.Lock] = {}
+_local_locks_guard = threading.Lock()
+
+
+class SyncInProgressError(RuntimeError):
+    """Another run of the same source holds its sync lock."""
+
+
+@dataclass(frozen=True)
+class ConnectorSource:
+    name: str
+    url: str | None
+    api_key: str | None
+
+
+def configured_sources() -> list[ConnectorSource]:
+    """All known connector sources (url is None when not configured)."""
+    return [
+        ConnectorSource("wss", settings.wss_events_url, settings.wss_api_key),
+        ConnectorSource("gridfinder", settings.gridfinder_events_url, settings.gridfinder_api_key),
+    ]
+
+
+def get_source(name: str) -> ConnectorSource | None:
+    return next((source for source in configured_sources() if source.name == name), None)
+
+
+def _elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 1)
+
+
+def error_message(exc: Exception) -> str:
+    if isinstance(exc, httpx.HTTPStatusError):
+        return f"HTTP {exc.response.status_code}"
+    if isinstance(exc, httpx.RequestError):
+        return f"{type(exc).__name__}: {exc}"
+    return str(exc) or type(exc).__name__
+
+
+def _parse_timestamp(value) -> datetime | None:
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+# (parsed updated_at, raw updated_at, source_event_id) of one feed item
+CursorPosition = tuple[datetime, str, str | None]
+
+
+class FeedCursor:
+    """
+    Delta cursor of a feed: (updated_at, source_event_id) of the newest stored item.
+
+    track() remembers the position of each item as it is pulled; record() is given the ingest results of the
+    next tracked items in order; advance() then moves the cursor to the newest stored item older than every
+    failed one (an item fails when nothing was stored for it, e.g. its chunk and row retry hit DB errors).
+    """
+
+    def __init__(self, updated_at: str | None = None, source_event_id: str | None = None) -> None:
+        self.updated_at = updated_at
+        self.source_event_id = source_event_id
+        self._parsed = _parse_timestamp(updated_at)
+        self._tracked: deque[CursorPosition | None] = deque()
+        self._stored: list[CursorPosition] = []
+        self._first_failed: datetime | None = None
+        self.failed = 0  # items of this run nothing was stored for
+
+    def params(self) -> dict:
+        if not self.updated_at:
+            return {}
+        params = {settings.connector_cursor_param: self.updated_at}
+        if self.source_event_id and settings.connector_cursor_id_param:
+            params[settings.connector_cursor_id_param] = self.source_event_id
+        return params
+
+    def track(self, payloads: Iterable[dict]) -> Iterator[dict]:
+        for payload in payloads:
+            base = payload.get("event") if isinstance(payload.get("event"), dict) else payload
+            raw = base.get("updated_at") or base.get("modified_at") or payload.get("updated_at")
+            parsed = _parse_timestamp(raw)
+            position = None
+            if parsed is not None:
+                source_event_id = payload.get("id")
+                position = (parsed, raw, str(source_event_id)[:80] if source_event_id not in (None, "") else None)
+            self._tracked.append(position)
+            yield payload
+
+    def record(self, results: list[IngestItemResult]) -> None:
+        for result in results:
+            position = self._tracked.popleft()
+            if result.raw_event_id is None:
+                self.failed += 1
+            if position is None:
+                continue
+            if result.raw_event_id is None:
+                if self._first_failed is None or position[0] < self._first_failed:
+                    self._first_failed = position[0]
+            else:
+                self._stored.append(position)
+
+    def advance(self) -> None:
+        for parsed, raw, source_event_id in self._stored:
+            if self._first_failed is not None and parsed >= self._first_failed:
+                continue
+            if self._parsed is None or parsed >= self._parsed:
+                self._parsed, self.updated_at, self.source_event_id = parsed, raw, source_event_id
+        self._stored.clear()
+
+
+def _record_run(
+    session: Session,
+    source: str,
+    status: str,
+    duration_ms: float,
+    summary: dict | None = None,
+    fetch: FeedFetch | None = None,
+    cursor: FeedCursor | None = None,
+    error: str | None = None,
+) -> None:
+    state = ConnectorSyncStateRepository(session).get_or_create(source)
+    if fetch is not None and not fetch.not_modified:
+        state.etag = fetch.etag
+        state.last_modified = fetch.last_modified
+    if cursor is not None:
+        state.cursor_updated_at = cursor.updated_at
+        state.cursor_source_event_id = cursor.source_event_id
+    state.last_status = status
+    state.last_error = error[:300] if error else None
+    state.last_duration_ms = duration_ms
+    state.last_summary = summary or {}
+    state.last_synced_at = datetime.now(timezone.utc)
+    session.commit()
+
+
+@contextmanager
+def _source_lock(session: Session, name: str):
+    """Hold the per-source sync lock for the duration of the block, or raise SyncInProgressError."""
+    with _local_locks_guard:
+        local = _local_locks.setdefault(name, threading.Lock())
+    if not local.acquire(blocking=False):
+        raise SyncInProgressError(f"{name} sync already running")
+    try:
+        engine = session.get_bind()
+        if engine.dialect.name != "postgresql":
+            yield
+            return
+        # Session-level lock on its own connection: the run's commits return the session's connection to the pool
+        key = (ADVISORY_LOCK_NAMESPACE, func.hashtext(name))
+        with engine.connect() as connection:
+            if not connection.execute(select(func.pg_try_advisory_lock(*key))).scalar():
+                raise SyncInProgressError(f"{name} sync already running")
+            try:
+                yield
+            finally:
+                connection.execute(select(func.pg_advisory_unlock(*key)))
+                connection.commit()
+    finally:
+        local.release()
+
+
+def sync_source(
+    session: Session,
+    source: ConnectorSource,
+    client: httpx.Client | None = None,
+    incremental: bool = True,
+) -> dict:
+    """
+    Fetch and ingest one source. Raises ValueError (unsupported/invalid feed), httpx.HTTPStatusError or
+    httpx.RequestError after recording the failed run. Validators and cursor only advance after a successful
+    run, so a failed sync re-requests the same delta next time. incremental=False forces a full download.
+    Raises SyncInProgressError (nothing recorded) while another run of the source holds its lock.
+    """
+    if not source.url:
+        raise ValueError(f"{source.name} events URL is not configured")
+    with _source_lock(session, source.name):
+        return _sync_source_locked(session, source, client, incremental)
+
+
+def _sync_source_locked(
+    session: Session, source: ConnectorSource, client: httpx.Client | None, incremental: bool
+) -> dict:
+    client = client or get_http_client()
+    state = ConnectorSyncStateRepository(session).get(source.name)
+    fetch = FeedFetch()
+    cursor = FeedCursor()
+    if incremental and state is not None:
+        fetch.etag = state.etag
+        fetch.last_modified = state.last_modified
+        cursor = FeedCursor(state.cursor_updated_at, state.cursor_source_event_id)
+    started = time.perf_counter()
+    try:
+        events = cursor.track(
+            stream_events(source.url, source.api_key, fetch, params=cursor.params(), client=client)
+        )
+        if settings.connector_streaming_enabled:
+            summary = ingest_payloads_streaming(session, source.name, events, on_results=cursor.record)
+        else:
+            results = ingest_payloads_bulk(session, source.name, list(events))
+            cursor.record(results)
+            summary = summarize_ingest(results)
+        cursor.advance()
+    except Exception as exc:
+        session.rollback()
+        _record_run(session, source.name, "error", _elapsed_ms(started), error=error_message(exc))
+        raise
+    summary["pages"] = fetch.pages
+    if cursor.failed or summary.get("failed"):
+        # Re-request the whole feed next time: a conditional request could be answered 304
+        fetch.etag = fetch.last_modified = None
+    status = "not_modified" if fetch.not_modified else "ok"
+    duration_ms = _elapsed_ms(started)
+    _record_run(session, source.name, status, duration_ms, summary, fetch, cursor)
+    return {
+        "source": source.name,
+        "status": status,
+        **summary,
+        "cursor": cursor.updated_at,
+        "duration_ms": duration_ms,
+    }
+
+
+def _sync_in_own_session(source: ConnectorSource, client: httpx.Client) -> dict:
+    started = time.perf_counter()
+    session = SessionLocal()
+    try:
+        return sync_source(session, source, client)
+    except SyncInProgressError as exc:
+        logger.info("connector_sync: %s skipped: %s", source.name, exc)
+        return {"source": source.name, "status": "busy", "error": str(exc), "duration_ms": _elapsed_ms(started)}
+    except Exception as exc:
+        logger.warning("connector_sync: %s failed: %s", source.name, exc)
+        return {
+            "source": source.name,
+            "status": "error",
+            "error": error_message(exc),
+            "duration_ms": _elapsed_ms(started),
+        }
+    finally:
+        session.close()
+
+
+def sync_all_sources(sources: list[ConnectorSource] | None = None) -> dict:
+    """Sync all configured sources concurrently; one failing source does not affect the others."""
+    sources = [source for source in (sources or configured_sources()) if source.url]
+    started = time.perf_counter()
+    if not sources:
+        return {"sources": [], "duration_ms": 0.0}
+    client = get_http_client()
+    workers = max(1, min(len(sources), settings.connector_sync_max_workers))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="connector_sync") as pool:
+        results = list(pool.map(lambda source: _sync_in_own_session(source, client), sources))
+    return {"sources": results, "duration_ms": _elapsed_ms(started)}
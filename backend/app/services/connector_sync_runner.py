@@ -0,0 +1,61 @@
+"""Background runner: incremental sync of every configured connector source every N minutes."""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+
+from app.core.settings import settings
+from app.services.connector_sync import configured_sources, sync_all_sources
+
+logger = logging.getLogger("racerpath")
+
+REDIS_LOCK_KEY = "connector_sync:lock"
+
+
+def _acquire_tick(redis_client, interval_seconds: int) -> bool:
+    """With several API workers only the one that takes the Redis lock syncs this interval."""
+    if redis_client is None:
+        return True
+    try:
+        return bool(redis_client.set(REDIS_LOCK_KEY, "1", nx=True, ex=max(1, interval_seconds - 1)))
+    except Exception as e:
+        logger.warning("connector_sync: redis lock failed, syncing anyway: %s", e)
+        return True
+
+
+def _run_tick(redis_client, interval_seconds: int) -> None:
+    if not _acquire_tick(redis_client, interval_seconds):
+        return
+    try:
+        result = sync_all_sources()
+        for source in result["sources"]:
+            logger.info(
+                "connector_sync: %s %s (total=%s, classified=%s, %.0f ms)",
+                source["source"],
+                source["status"],
+                source.get("total", 0),
+                source.get("classified", 0),
+                source["duration_ms"],
+            )
+    except Exception as e:
+        logger.exception("connector_sync tick failed: %s", e)
+
+
+def start_connector_sync_background(redis_client=None) -> None:
+    if not getattr(settings, "connector_sync_enabled", False):
+        return
+    if not any(source.url for source in configured_sources()):
+        return
+    interval_seconds = max(1, getattr(settings, "connector_sync_interval_minutes", 15)) * 60
+
+    def _loop() -> None:
+        time.sleep(30)  # first sync after app is up
+        while True:
+            _run_tick(redis_client, interval_seconds)
+            time.sleep(interval_seconds)
+
+    thread = threading.Thread(target=_loop, daemon=True, name="connector_sync")
+    thread.start()
+    logger.info("connector_sync: background thread started (interval=%s min)", interval_seconds // 60)
@@ -1,8 +1,17 @@
 from __future__ import annotations
 
+import codecs
 import json
+import threading
 import urllib.request
-from typing import Any
+from dataclasses import dataclass
+from typing import Any, Iterable, Iterator
+
+import httpx
+
+from app.core.settings import settings
+
+STREAM_READ_SIZE = 64 * 1024
 
 
 def fetch_json(url: str, api_key: str | None = None, timeout: int = 20) -> Any:
@@ -24,3 +33,216 @@ def extract_events(data: Any) -> list[dict]:
     else:
         raise ValueError("Unsupported payload shape: expected list or {events: [...]}")
     return [event for event in events if isinstance(event, dict)]
+
+
+class _JsonStreamReader:
+    """Text buffer over a byte-chunk iterator; decodes one JSON value at a time, reading more only when needed."""
+
+    def __init__(self, chunks: Iterable[bytes]) -> None:
+        self._chunks = iter(chunks)
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        if self._eof:
+            return False
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            self._eof = True
+            tail = self._text.decode(b"", final=True)
+        else:
+            tail = self._text.decode(chunk)
+        # Drop consumed text so the buffer never holds more than the current item + one read.
+        self._buf = self._buf[self._pos:] + tail
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Next non-whitespace character ("" at end of input)."""
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in " \t\r\n":
+                self._pos += 1
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                return ""
+
+    def advance(self) -> None:
+        self._pos += 1
+
+    def value(self) -> Any:
+        """Decode the JSON value at the cursor."""
+        if not self.peek():
+            raise ValueError("Invalid JSON feed: unexpected end")
+        while True:
+            try:
+                value, end = self._json.raw_decode(self._buf, self._pos)
+                # A number may continue in the next read: only trust a value that ends before the buffer does.
+                if end < len(self._buf) or self._eof:
+                    self._pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise ValueError("Invalid JSON feed")
+            self._fill()
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise ValueError(f"Invalid JSON feed: expected {char!r}")
+        self.advance()
+
+
+def _iter_array(reader: _JsonStreamReader) -> Iterator[dict]:
+    while True:
+        char = reader.peek()
+        if char == "]":
+            reader.advance()
+            return
+        if char == ",":
+            reader.advance()
+            continue
+        if char == "":
+            raise ValueError("Invalid JSON feed: unterminated array")
+        item = reader.value()
+        if isinstance(item, dict):
+            yield item
+
+
+def iter_feed_events(chunks: Iterable[bytes], meta: dict | None = None) -> Iterator[dict]:
+    """
+    Incrementally parse a `[...]` or `{"events": [...]}` feed, yielding event dicts as their bytes arrive.
+    Same shapes and filtering as extract_events. Other top-level keys of an object feed (e.g. a "next" page
+    URL) are stored in meta when given, otherwise skipped.
+    """
+    reader = _JsonStreamReader(chunks)
+    char = reader.peek()
+    if char == "[":
+        reader.advance()
+        yield from _iter_array(reader)
+        return
+    if char == "{":
+        reader.advance()
+        seen_events = False
+        while True:
+            char = reader.peek()
+            if char == ",":
+                reader.advance()
+                continue
+            if char in ("}", ""):
+                break
+            key = reader.value()
+            reader.expect(":")
+            if key == "events" and reader.peek() == "[":
+                reader.advance()
+                yield from _iter_array(reader)
+                seen_events = True
+                continue
+            value = reader.value()
+            if meta is not None:
+                meta[key] = value
+        if seen_events:
+            return
+    raise ValueError("Unsupported payload shape: expected list or {events: [...]}")
+
+
+_client: httpx.Client | None = None
+_client_lock = threading.Lock()
+
+
+def get_http_client() -> httpx.Client:
+    """Process-wide pooled HTTP client for connector feeds (keep-alive connections reused across syncs)."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = httpx.Client(
+                headers={"User-Agent": "RacerPath/1.0"},
+                timeout=httpx.Timeout(
+                    settings.connector_timeout_seconds,
+                    connect=settings.connector_connect_timeout_seconds,
+                ),
+                limits=httpx.Limits(
+                    max_connections=settings.connector_max_connections,
+                    max_keepalive_connections=settings.connector_max_connections,
+                ),
+                follow_redirects=True,
+            )
+        return _client
+
+
+def close_http_client() -> None:
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            _client = None
+
+
+@dataclass
+class FeedFetch:
+    """Conditional-request state of one feed fetch; filled in by stream_events as pages are read."""
+
+    etag: str | None = None
+    last_modified: str | None = None
+    not_modified: bool = False
+    pages: int = 0
+
+
+def _next_page_url(response: httpx.Response, meta: dict) -> str | None:
+    link = response.links.get("next", {}).get("url")
+    if link:
+        return str(response.url.join(link))
+    next_url = meta.get("next") or meta.get("next_url")
+    if isinstance(next_url, str) and next_url:
+        return str(response.url.join(next_url))
+    return None
+
+
+def stream_events(
+    url: str,
+    api_key: str | None = None,
+    fetch: FeedFetch | None = None,
+    max_pages: int | None = None,
+    params: dict | None = None,
+    client: httpx.Client | None = None,
+) -> Iterator[dict]:
+    """
+    Stream event dicts from a (possibly paginated) feed; the download advances only as the consumer pulls
+    items. Requests go over client (default: the pooled get_http_client()).
+
+    The first request is conditional on fetch.etag / fetch.last_modified; a 304 sets fetch.not_modified and
+    yields nothing. Validators of the first page are written back to fetch. Next pages come from a
+    `Link: <...>; rel="next"` header or a top-level "next" / "next_url" key (params, e.g. a delta cursor, are
+    sent with the first page only; next-page URLs carry their own query). HTTP errors raise
+    httpx.HTTPStatusError, transport errors httpx.RequestError.
+    """
+    client = client or get_http_client()
+    fetch = fetch if fetch is not None else FeedFetch()
+    max_pages = max_pages or settings.connector_max_pages
+    headers = {}
+    if api_key:
+        headers["Authorization"] = f"Bearer {api_key}"
+        headers["X-API-Key"] = api_key
+    page_url: str | None = url
+    while page_url and fetch.pages < max_pages:
+        page_headers = dict(headers)
+        page_params = params if fetch.pages == 0 else None
+        if fetch.pages == 0:
+            if fetch.etag:
+                page_headers["If-None-Match"] = fetch.etag
+            if fetch.last_modified:
+                page_headers["If-Modified-Since"] = fetch.last_modified
+        with client.stream("GET", page_url, headers=page_headers, params=page_params) as response:
+            if fetch.pages == 0 and response.status_code == 304:
+                fetch.not_modified = True
+                return
+            response.raise_for_status()
+            if fetch.pages == 0:
+                fetch.etag = response.headers.get("ETag")
+                fetch.last_modified = response.headers.get("Last-Modified")
+            fetch.pages += 1
+            meta: dict = {}
+            yield from iter_feed_events(response.iter_bytes(STREAM_READ_SIZE), meta)
+            page_url = _next_page_url(response, meta)
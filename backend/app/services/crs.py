@@ -2,19 +2,22 @@ from __future__ import annotations
 
 import hashlib
 import json
+import logging
 from dataclasses import dataclass
 
-from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import func
+from sqlalchemy.orm import Session, lazyload, selectinload
 
 from app.models.classification import Classification
 from app.models.anti_gaming import AntiGamingReport
 from app.models.crs_history import CRSHistory
+from app.models.incident import Incident
 from app.models.participation import Participation, ParticipationState, ParticipationStatus
 from app.models.task_completion import TaskCompletion
-from app.repositories.incident import IncidentRepository
 from app.core.settings import settings
 from app.core.constants import (
     CRS_ALGO_VERSION,
+    CRS_WINDOW_SIZE,
     FREE_INCIDENTS,
     INCIDENT_K,
     PARTICIPATIONS_INPUT_LIMIT,
@@ -22,6 +25,8 @@ from app.core.constants import (
     TIER_WEIGHTS,
 )
 
+logger = logging.getLogger("racerpath")
+
 
 @dataclass
 class CRSResult:
@@ -81,7 +86,53 @@ def _participation_score(
 CRS_PARTICIPATION_STATES = (ParticipationState.started, ParticipationState.completed)
 
 
+def _anti_gaming_multiplier(session: Session, driver_id: str, discipline: str) -> float:
+    report = (
+        session.query(AntiGamingReport)
+        .filter(AntiGamingReport.driver_id == driver_id, AntiGamingReport.discipline == discipline)
+        .order_by(AntiGamingReport.created_at.desc())
+        .first()
+    )
+    multiplier = report.multiplier if report else 1.0
+    return max(settings.anti_gaming_min_multiplier, min(settings.anti_gaming_max_multiplier, multiplier))
+
+
+def _crs_result_inputs(
+    participations: list[Participation],
+    weights: list[float],
+    total_incident_score: float,
+    multiplier: float,
+) -> dict:
+    return {
+        "participations": len(participations),
+        "avg_incident_score_sum": total_incident_score / len(participations) if participations else 0,
+        "dnf_rate": sum(1 for p in participations if p.status in {"dnf", "dsq"}) / len(participations),
+        "weighted_tier_average": sum(weights) / len(weights),
+        "anti_gaming_multiplier": multiplier,
+    }
+
+
+def _no_participations_inputs() -> dict:
+    return {
+        "participation_ids": [],
+        "reason": "no_participations",
+        "participations_count": 0,
+        "incidents_count": 0,
+        "finished_count": 0,
+        "task_completions_count": 0,
+    }
+
+
+def _task_completions_count(session: Session, driver_id: str) -> int:
+    return (
+        session.query(TaskCompletion)
+        .filter(TaskCompletion.driver_id == driver_id, TaskCompletion.status == "completed")
+        .count()
+    )
+
+
 def compute_crs(session: Session, driver_id: str, discipline: str) -> CRSResult:
+    """Full recompute: loads incidents and classification for every participation in the window."""
     participations = (
         session.query(Participation)
         .options(selectinload(Participation.incidents))
@@ -91,7 +142,7 @@ def compute_crs(session: Session, driver_id: str, discipline: str) -> CRSResult:
             Participation.participation_state.in_(CRS_PARTICIPATION_STATES),
         )
         .order_by(Participation.created_at.desc())
-        .limit(30)
+        .limit(CRS_WINDOW_SIZE)
         .all()
     )
 
@@ -119,24 +170,11 @@ def compute_crs(session: Session, driver_id: str, discipline: str) -> CRSResult:
     total_weight = sum(weights) or 1.0
     score = sum(weighted_scores) / total_weight
 
-    report = (
-        session.query(AntiGamingReport)
-        .filter(AntiGamingReport.driver_id == driver_id, AntiGamingReport.discipline == discipline)
-        .order_by(AntiGamingReport.created_at.desc())
-        .first()
-    )
-    multiplier = report.multiplier if report else 1.0
-    multiplier = max(settings.anti_gaming_min_multiplier, min(settings.anti_gaming_max_multiplier, multiplier))
+    multiplier = _anti_gaming_multiplier(session, driver_id, discipline)
     score *= multiplier
 
     total_incident_score = sum(sum(i.score for i in p.incidents) for p in participations)
-    inputs = {
-        "participations": len(participations),
-        "avg_incident_score_sum": total_incident_score / len(participations) if participations else 0,
-        "dnf_rate": sum(1 for p in participations if p.status in {"dnf", "dsq"}) / len(participations),
-        "weighted_tier_average": sum(weights) / len(weights),
-        "anti_gaming_multiplier": multiplier,
-    }
+    inputs = _crs_result_inputs(participations, weights, total_incident_score, multiplier)
 
     return CRSResult(score=round(clamp_score(score), 2), inputs=inputs)
 
@@ -145,6 +183,7 @@ def compute_inputs(session: Session, driver_id: str, discipline: str) -> dict:
     """Minimal input snapshot for CRS: participation ids, counts, aggregates (same filter as compute_crs)."""
     participations = (
         session.query(Participation)
+        .options(lazyload(Participation.incidents))
         .filter(
             Participation.driver_id == driver_id,
             Participation.discipline == discipline,
@@ -156,32 +195,122 @@ def compute_inputs(session: Session, driver_id: str, discipline: str) -> dict:
     )
     participation_ids = [p.id for p in participations]
     if not participations:
-        return {
-            "participation_ids": [],
-            "reason": "no_participations",
-            "participations_count": 0,
-            "incidents_count": 0,
-            "finished_count": 0,
-            "task_completions_count": 0,
-        }
-    incident_repo = IncidentRepository(session)
-    incidents_count = sum(incident_repo.count_by_participation_id(p.id) for p in participations)
+        return _no_participations_inputs()
+    incidents_count = (
+        session.query(func.count(Incident.id))
+        .filter(Incident.participation_id.in_(participation_ids))
+        .scalar()
+    ) or 0
     finished_count = sum(1 for p in participations if p.status == "finished")
-    task_completions_count = (
-        session.query(TaskCompletion)
-        .filter(TaskCompletion.driver_id == driver_id, TaskCompletion.status == "completed")
-        .count()
-    )
     return {
         "participation_ids": participation_ids,
         "participations_count": len(participations),
         "incidents_count": incidents_count,
         "finished_count": finished_count,
-        "task_completions_count": task_completions_count,
+        "task_completions_count": _task_completions_count(session, driver_id),
         "avg_incidents": incidents_count / len(participations) if participations else 0,
     }
 
 
+# ---- Incremental CRS: per-participation scores materialized on participations.crs_* ----
+
+def materialize_participation_scores(session: Session, participations: list[Participation]) -> int:
+    """
+    Fill crs_* columns for stale participations (crs_base_score or crs_tier_weight NULL).
+    Costs one incidents aggregate and one classification query regardless of how many are stale.
+    Does not commit. Returns number of participations materialized.
+    """
+    stale = [p for p in participations if p.crs_base_score is None or p.crs_tier_weight is None]
+    if not stale:
+        return 0
+    stale_ids = [p.id for p in stale]
+    aggregates = {
+        participation_id: (int(count), float(score_sum))
+        for participation_id, count, score_sum in (
+            session.query(
+                Incident.participation_id,
+                func.count(Incident.id),
+                func.coalesce(func.sum(Incident.score), 0.0),
+            )
+            .filter(Incident.participation_id.in_(stale_ids))
+            .group_by(Incident.participation_id)
+            .all()
+        )
+    }
+    classification_ids = {p.classification_id for p in stale if p.classification_id}
+    tiers: dict[str, str] = {}
+    if classification_ids:
+        tiers = dict(
+            session.query(Classification.id, Classification.event_tier)
+            .filter(Classification.id.in_(classification_ids))
+            .all()
+        )
+    for participation in stale:
+        if participation.classification_id not in tiers:
+            raise ValueError(
+                f"Participation {participation.id} (event {participation.event_id}) has no classification; "
+                "CRS requires participation.classification_id to be set (create participation with classified event)."
+            )
+        incidents_count, incident_score_sum = aggregates.get(participation.id, (0, 0.0))
+        participation.crs_incidents_count = incidents_count
+        participation.crs_incident_score_sum = incident_score_sum
+        participation.crs_base_score = _participation_score(participation, incident_score_sum, incidents_count)
+        participation.crs_tier_weight = TIER_WEIGHTS.get(tiers[participation.classification_id], 1.0)
+    return len(stale)
+
+
+def compute_crs_incremental(
+    session: Session, driver_id: str, discipline: str
+) -> tuple[CRSResult, dict]:
+    """
+    CRS and inputs snapshot from materialized participation scores.
+    Same result as compute_crs + compute_inputs, but only stale participations touch incidents/classifications,
+    so a new incident costs a constant number of queries instead of ~2N.
+    """
+    # Flush pending changes first so the before_flush hook marks their participations stale.
+    session.flush()
+    participations = (
+        session.query(Participation)
+        .options(lazyload(Participation.incidents))
+        .filter(
+            Participation.driver_id == driver_id,
+            Participation.discipline == discipline,
+            Participation.participation_state.in_(CRS_PARTICIPATION_STATES),
+        )
+        .order_by(Participation.created_at.desc())
+        .limit(max(CRS_WINDOW_SIZE, PARTICIPATIONS_INPUT_LIMIT))
+        .all()
+    )
+    if not participations:
+        return CRSResult(score=0.0, inputs={"reason": "no_participations"}), _no_participations_inputs()
+
+    materialize_participation_scores(session, participations)
+
+    window = participations[:CRS_WINDOW_SIZE]
+    weights = [p.crs_tier_weight for p in window]
+    total_weight = sum(weights) or 1.0
+    score = sum(p.crs_base_score * p.crs_tier_weight for p in window) / total_weight
+    multiplier = _anti_gaming_multiplier(session, driver_id, discipline)
+    score *= multiplier
+    total_incident_score = sum(p.crs_incident_score_sum for p in window)
+    result = CRSResult(
+        score=round(clamp_score(score), 2),
+        inputs=_crs_result_inputs(window, weights, total_incident_score, multiplier),
+    )
+
+    input_window = participations[:PARTICIPATIONS_INPUT_LIMIT]
+    incidents_count = sum(p.crs_incidents_count for p in input_window)
+    inputs_snapshot = {
+        "participation_ids": [p.id for p in input_window],
+        "participations_count": len(input_window),
+        "incidents_count": incidents_count,
+        "finished_count": sum(1 for p in input_window if p.status == "finished"),
+        "task_completions_count": _task_completions_count(session, driver_id),
+        "avg_incidents": incidents_count / len(input_window),
+    }
+    return result, inputs_snapshot
+
+
 def compute_inputs_hash(inputs: dict) -> str:
     """SHA256 of canonical JSON (sorted keys) for inputs snapshot."""
     payload = json.dumps(inputs, sort_keys=True).encode("utf-8")
@@ -198,17 +327,20 @@ def record_crs(
     return recompute_crs(session, driver_id, discipline, trigger_participation_id)
 
 
-def recompute_crs(
+def build_crs_history(
     session: Session,
     driver_id: str,
     discipline: str,
     trigger_participation_id: str | None = None,
 ) -> CRSHistory:
-    """Compute CRS and save with inputs_hash, algo_version, computed_from_participation_id."""
-    result = compute_crs(session, driver_id, discipline)
-    inputs_snapshot = compute_inputs(session, driver_id, discipline)
+    """Compute CRS and return an unsaved CRSHistory (inputs_hash, algo_version, computed_from_participation_id)."""
+    if settings.crs_incremental_enabled:
+        result, inputs_snapshot = compute_crs_incremental(session, driver_id, discipline)
+    else:
+        result = compute_crs(session, driver_id, discipline)
+        inputs_snapshot = compute_inputs(session, driver_id, discipline)
     inputs_hash = compute_inputs_hash(inputs_snapshot)
-    history = CRSHistory(
+    return CRSHistory(
         driver_id=driver_id,
         discipline=discipline,
         score=result.score,
@@ -217,7 +349,37 @@ def recompute_crs(
         inputs_hash=inputs_hash,
         algo_version=CRS_ALGO_VERSION,
     )
+
+
+def recompute_crs(
+    session: Session,
+    driver_id: str,
+    discipline: str,
+    trigger_participation_id: str | None = None,
+) -> CRSHistory:
+    """Compute CRS and save with inputs_hash, algo_version, computed_from_participation_id."""
+    history = build_crs_history(session, driver_id, discipline, trigger_participation_id)
     session.add(history)
     session.commit()
     session.refresh(history)
     return history
+
+
+def recompute_crs_batch(
+    session: Session,
+    keys: list[tuple[str, str, str | None]],
+) -> list[CRSHistory]:
+    """
+    Recompute CRS for many (driver_id, discipline, trigger_participation_id) keys and write all
+    CRSHistory rows in one commit. Keys whose CRS cannot be computed (ValueError) are skipped.
+    """
+    histories: list[CRSHistory] = []
+    for driver_id, discipline, trigger_participation_id in keys:
+        try:
+            histories.append(build_crs_history(session, driver_id, discipline, trigger_participation_id))
+        except ValueError as e:
+            logger.warning("crs: skip recompute driver_id=%s discipline=%s: %s", driver_id, discipline, e)
+    if histories:
+        session.add_all(histories)
+    session.commit()
+    return histories
@@ -0,0 +1,307 @@
+"""
+Debounced CRS recompute queue.
+
+Triggers (new incident, new participation, mock race tick) enqueue (driver_id, discipline); many triggers
+for the same pair within one debounce window coalesce into a single recompute. A background worker drains
+the queue every CRS_QUEUE_DEBOUNCE_SECONDS and writes all CRSHistory rows in one commit.
+
+Backends:
+- memory: in-process dict (per API worker).
+- redis: shared hash, so triggers from any API worker coalesce and exactly one worker drains each batch.
+
+A failed batch is retried key by key so only the failing keys go back to the queue; a key that keeps failing
+is dropped (error log, "dropped" in the worker stats) after CRS_QUEUE_MAX_ATTEMPTS consecutive failures.
+Attempt counters are per worker process.
+
+When the worker is not running (scripts, tests, CRS_QUEUE_ENABLED=false) enqueue_crs_recompute falls back
+to a synchronous recompute_crs on the caller's session.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+
+from sqlalchemy.orm import Session
+
+from app.core.settings import settings
+from app.db.session import SessionLocal
+from app.repositories.crs_history import CRSHistoryRepository
+from app.services.crs import recompute_crs, recompute_crs_batch
+from app.services.live_race import get_live_race_hub, publish_crs_updates
+
+logger = logging.getLogger("racerpath")
+
+REDIS_PENDING_KEY = "crs:recompute:pending"
+
+# (driver_id, discipline, trigger_participation_id)
+CRSRecomputeKey = tuple[str, str, str | None]
+
+
+class MemoryCRSQueue:
+    """In-process pending set: (driver_id, discipline) -> latest trigger_participation_id."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._pending: dict[tuple[str, str], str | None] = {}
+
+    def push(self, driver_id: str, discipline: str, trigger_participation_id: str | None) -> bool:
+        """Add key; return True if it was already pending (coalesced)."""
+        with self._lock:
+            key = (driver_id, discipline)
+            coalesced = key in self._pending
+            if trigger_participation_id or not coalesced:
+                self._pending[key] = trigger_participation_id
+            return coalesced
+
+    def drain(self) -> list[CRSRecomputeKey]:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        return [(driver_id, discipline, trigger) for (driver_id, discipline), trigger in pending.items()]
+
+    def requeue(self, keys: list[CRSRecomputeKey]) -> None:
+        """Put back keys of a failed batch; a key pushed again meanwhile keeps its newer trigger."""
+        with self._lock:
+            for driver_id, discipline, trigger in keys:
+                self._pending.setdefault((driver_id, discipline), trigger)
+
+    def size(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+
+class RedisCRSQueue:
+    """Shared pending hash in Redis: field "driver_id|discipline" -> trigger_participation_id ("" if none)."""
+
+    def __init__(self, redis_client) -> None:
+        self._redis = redis_client
+
+    @staticmethod
+    def _field(driver_id: str, discipline: str) -> str:
+        return f"{driver_id}|{discipline}"
+
+    def push(self, driver_id: str, discipline: str, trigger_participation_id: str | None) -> bool:
+        field = self._field(driver_id, discipline)
+        if trigger_participation_id:
+            return not self._redis.hset(REDIS_PENDING_KEY, field, trigger_participation_id)
+        return not self._redis.hsetnx(REDIS_PENDING_KEY, field, "")
+
+    def drain(self) -> list[CRSRecomputeKey]:
+        # HGETALL + DEL in one MULTI so concurrent workers never process the same batch twice.
+        pipe = self._redis.pipeline(transaction=True)
+        pipe.hgetall(REDIS_PENDING_KEY)
+        pipe.delete(REDIS_PENDING_KEY)
+        pending, _ = pipe.execute()
+        keys: list[CRSRecomputeKey] = []
+        for field, trigger in (pending or {}).items():
+            driver_id, _, discipline = field.partition("|")
+            keys.append((driver_id, discipline, trigger or None))
+        return keys
+
+    def requeue(self, keys: list[CRSRecomputeKey]) -> None:
+        """Put back keys of a failed batch; a key pushed again meanwhile keeps its newer trigger."""
+        pipe = self._redis.pipeline(transaction=False)
+        for driver_id, discipline, trigger in keys:
+            pipe.hsetnx(REDIS_PENDING_KEY, self._field(driver_id, discipline), trigger or "")
+        pipe.execute()
+
+    def size(self) -> int:
+        return int(self._redis.hlen(REDIS_PENDING_KEY))
+
+
+class CRSRecomputeWorker:
+    """Background thread: every debounce window drain the queue and recompute each key once."""
+
+    def __init__(self, queue, debounce_seconds: float, max_attempts: int = 5) -> None:
+        self.queue = queue
+        self.debounce_seconds = max(0.05, debounce_seconds)
+        self.max_attempts = max(1, max_attempts)
+        # (driver_id, discipline) -> consecutive failed recomputes; only touched by the flushing thread
+        self._attempts: dict[tuple[str, str], int] = {}
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        # Guards the counters (enqueue runs on request threads, flush on the worker thread)
+        self._lock = threading.Lock()
+        self.enqueued = 0
+        self.coalesced = 0
+        self.recomputed = 0
+        self.failed_batches = 0
+        self.requeued = 0
+        self.dropped = 0
+
+    def enqueue(self, driver_id: str, discipline: str, trigger_participation_id: str | None = None) -> None:
+        coalesced = self.queue.push(driver_id, discipline, trigger_participation_id)
+        with self._lock:
+            self.enqueued += 1
+            if coalesced:
+                self.coalesced += 1
+
+    def flush(self) -> int:
+        """Drain and recompute pending keys now; returns number of CRSHistory rows written."""
+        keys = self.queue.drain()
+        if not keys:
+            return 0
+        session = SessionLocal()
+        # Histories stay loaded after the batch commit (CRS deltas for the live race channel read them).
+        session.expire_on_commit = False
+        try:
+            live = get_live_race_hub() is not None
+            previous_scores = (
+                CRSHistoryRepository(session).latest_scores([(d, disc) for d, disc, _ in keys]) if live else {}
+            )
+            try:
+                histories = recompute_crs_batch(session, keys)
+                failed: list[CRSRecomputeKey] = []
+            except Exception as e:
+                # Nothing of the batch was committed (DB error, timeout, one bad key): retry key by key so
+                # only the failing keys are requeued. ValueError keys are skipped inside recompute_crs_batch.
+                logger.warning("crs_queue: batch recompute failed (%s keys), retrying per key: %s", len(keys), e)
+                session.rollback()
+                with self._lock:
+                    self.failed_batches += 1
+                histories, failed = self._recompute_per_key(session, keys) if len(keys) > 1 else ([], keys)
+            self._settle(keys, failed)
+            with self._lock:
+                self.recomputed += len(histories)
+            if live and histories:
+                try:
+                    publish_crs_updates(session, histories, previous_scores)
+                except Exception as e:
+                    logger.warning("crs_queue: live CRS updates failed: %s", e)
+            return len(histories)
+        finally:
+            session.close()
+
+    def _recompute_per_key(self, session: Session, keys: list[CRSRecomputeKey]):
+        histories = []
+        failed: list[CRSRecomputeKey] = []
+        for key in keys:
+            try:
+                histories.extend(recompute_crs_batch(session, [key]))
+            except Exception as e:
+                logger.warning("crs_queue: recompute of %s/%s failed: %s", key[0], key[1], e)
+                session.rollback()
+                failed.append(key)
+        return histories, failed
+
+    def _settle(self, keys: list[CRSRecomputeKey], failed: list[CRSRecomputeKey]) -> None:
+        """Reset attempt counters of recomputed keys; requeue failed keys, dropping those out of attempts."""
+        failed_pairs = {(driver_id, discipline) for driver_id, discipline, _ in failed}
+        for driver_id, discipline, _ in keys:
+            if (driver_id, discipline) not in failed_pairs:
+                self._attempts.pop((driver_id, discipline), None)
+        retry: list[CRSRecomputeKey] = []
+        dropped = 0
+        for key in failed:
+            pair = (key[0], key[1])
+            attempts = self._attempts.get(pair, 0) + 1
+            if attempts >= self.max_attempts:
+                logger.error("crs_queue: dropping %s/%s after %s failed recomputes", key[0], key[1], attempts)
+                self._attempts.pop(pair, None)
+                dropped += 1
+            else:
+                self._attempts[pair] = attempts
+                retry.append(key)
+        requeued = 0
+        if retry:
+            try:
+                self.queue.requeue(retry)
+                requeued = len(retry)
+            except Exception as requeue_error:
+                logger.error("crs_queue: requeue failed, %s recomputes lost: %s", len(retry), requeue_error)
+        with self._lock:
+            self.requeued += requeued
+            self.dropped += dropped
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.debounce_seconds):
+            self.flush()
+        self.flush()
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, daemon=True, name="crs_queue")
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+        self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return bool(self._thread and self._thread.is_alive())
+
+    def stats(self) -> dict:
+        pending = self.queue.size()
+        with self._lock:
+            return {
+                "backend": "redis" if isinstance(self.queue, RedisCRSQueue) else "memory",
+                "pending": pending,
+                "enqueued": self.enqueued,
+                "coalesced": self.coalesced,
+                "recomputed": self.recomputed,
+                "failed_batches": self.failed_batches,
+                "requeued": self.requeued,
+                "dropped": self.dropped,
+            }
+
+
+_worker: CRSRecomputeWorker | None = None
+
+
+def get_crs_worker() -> CRSRecomputeWorker | None:
+    return _worker
+
+
+def enqueue_crs_recompute(
+    session: Session,
+    driver_id: str,
+    discipline: str,
+    trigger_participation_id: str | None = None,
+) -> None:
+    """
+    Schedule a CRS recompute for (driver_id, discipline). Caller must commit its own changes first.
+    Without a running worker, recomputes synchronously on the given session (ValueError propagates).
+    """
+    worker = _worker
+    if worker is not None and worker.running:
+        try:
+            worker.enqueue(driver_id, discipline, trigger_participation_id)
+            return
+        except Exception as e:
+            logger.warning("crs_queue: enqueue failed, recomputing inline: %s", e)
+    recompute_crs(session, driver_id, discipline, trigger_participation_id=trigger_participation_id)
+
+
+def start_crs_recompute_background(redis_client=None) -> CRSRecomputeWorker | None:
+    """Start the queue worker (called from app startup). Redis backend when configured and available."""
+    global _worker
+    if not getattr(settings, "crs_queue_enabled", False):
+        return None
+    if _worker is not None and _worker.running:
+        return _worker
+    if settings.crs_queue_backend == "redis" and redis_client is not None:
+        queue = RedisCRSQueue(redis_client)
+    else:
+        queue = MemoryCRSQueue()
+    _worker = CRSRecomputeWorker(queue, settings.crs_queue_debounce_seconds, settings.crs_queue_max_attempts)
+    _worker.start()
+    logger.info(
+        "crs_queue: background worker started (backend=%s, debounce=%ss)",
+        _worker.stats()["backend"],
+        _worker.debounce_seconds,
+    )
+    return _worker
+
+
+def stop_crs_recompute_background() -> None:
+    """Flush pending recomputes and stop the worker (called on app shutdown)."""
+    global _worker
+    if _worker is None:
+        return
+    _worker.stop()
+    _worker = None
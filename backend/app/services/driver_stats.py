@@ -0,0 +1,460 @@
+"""
+driver_stats maintenance.
+
+Incremental path: after each flush the listeners in app.models.driver_stats turn the flushed
+participations / incidents / penalties into counter deltas per (driver_id, discipline) (collect_flush_deltas:
++1/-1 on the state and status counters, +/-score on incident_score_sum, ...), accumulated over the
+transaction and written right before it commits with one INSERT .. ON CONFLICT DO UPDATE SET
+col = col + excluded.col on the session's connection. The counters commit or roll back together with the
+change that caused them; concurrent writers (RaceEngine workers, telemetry batches, API requests) only
+meet on the row lock of the upsert. last_race_at only moves forward there (greatest of both).
+
+Repair path: refresh_driver_stats recomputes a driver's rows (all disciplines) from the source tables with
+three grouped queries. It runs for changes a delta cannot express: deleted participations, a participation
+moved to another driver or discipline, incidents / penalties moved between rows, changes that may lower
+last_race_at, old values that were not loaded, and bulk DELETEs (mark_drivers_stale); deltas of those
+drivers are dropped. On Postgres it takes a per-driver pg_advisory_xact_lock (in driver_id order, so two
+recomputes cannot deadlock) and locks the driver's existing rows (FOR UPDATE, waiting for in-flight delta
+writers) before reading. Rows are never delete + insert, so no writer can hit the primary key. Reads
+(count endpoints, admin lookup) are a single-row lookup.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Iterable
+
+from sqlalchemy import delete, func, inspect, select
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app.models.driver_stats import DriverStats
+from app.models.incident import Incident
+from app.models.participation import Participation
+from app.models.penalty import Penalty
+
+STATS_SOURCE_TABLES = frozenset({"participations", "incidents", "penalties"})
+
+# session.info key holding driver ids whose rows are recomputed before the transaction commits.
+STALE_DRIVERS_KEY = "driver_stats_stale"
+# session.info key: (driver_id, discipline) -> counter deltas of the transaction's flushes
+STATS_DELTAS_KEY = "driver_stats_deltas"
+# First key of the two-key pg_advisory_xact_lock(namespace, hashtext(driver_id)) taken per driver.
+ADVISORY_LOCK_NAMESPACE = 0x44535431  # "DST1"
+
+# Participation columns that feed driver_stats; other updates (laps, metrics, CRS cache) skip the refresh.
+STATS_PARTICIPATION_FIELDS = (
+    "driver_id",
+    "discipline",
+    "status",
+    "participation_state",
+    "started_at",
+    "finished_at",
+)
+
+_STATE_COLUMNS = {
+    "registered": "registered_count",
+    "withdrawn": "withdrawn_count",
+    "started": "started_count",
+    "completed": "completed_count",
+}
+_STATUS_COLUMNS = {
+    "finished": "finished_count",
+    "dnf": "dnf_count",
+    "dsq": "dsq_count",
+    "dns": "dns_count",
+}
+_COUNTER_COLUMNS = (
+    "participations_count",
+    *_STATE_COLUMNS.values(),
+    *_STATUS_COLUMNS.values(),
+    "incidents_count",
+    "incident_score_sum",
+    "penalties_count",
+)
+
+
+def _utc(at: datetime | None) -> datetime | None:
+    """Timestamps loaded from SQLite come back naive; compare everything as aware UTC."""
+    return at.replace(tzinfo=timezone.utc) if at is not None and at.tzinfo is None else at
+
+
+def _value(enum_or_str) -> str | None:
+    if enum_or_str is None:
+        return None
+    return enum_or_str.value if hasattr(enum_or_str, "value") else str(enum_or_str)
+
+
+def _empty_row(driver_id: str, discipline: str, now: datetime) -> dict:
+    row = {
+        "driver_id": driver_id,
+        "discipline": discipline,
+        "participations_count": 0,
+        "incidents_count": 0,
+        "incident_score_sum": 0.0,
+        "penalties_count": 0,
+        "last_race_at": None,
+        "updated_at": now,
+    }
+    for column in (*_STATE_COLUMNS.values(), *_STATUS_COLUMNS.values()):
+        row[column] = 0
+    return row
+
+
+def refresh_driver_stats(connection: Connection, driver_ids: Iterable[str]) -> int:
+    """Recompute driver_stats rows of driver_ids on connection (caller's transaction); returns rows upserted."""
+    driver_ids = sorted({d for d in driver_ids if d})
+    if not driver_ids:
+        return 0
+    _lock_drivers(connection, driver_ids)
+    # Wait for delta writers that already updated these rows, so the recompute reads their committed changes
+    connection.execute(
+        select(DriverStats.driver_id).where(DriverStats.driver_id.in_(driver_ids)).with_for_update()
+    ).all()
+    now = datetime.now(timezone.utc)
+    rows: dict[tuple[str, str], dict] = {}
+
+    def row_for(driver_id: str, discipline) -> dict:
+        key = (driver_id, _value(discipline))
+        if key not in rows:
+            rows[key] = _empty_row(key[0], key[1], now)
+        return rows[key]
+
+    for driver_id, discipline, state, status, count, last_race_at in connection.execute(
+        select(
+            Participation.driver_id,
+            Participation.discipline,
+            Participation.participation_state,
+            Participation.status,
+            func.count(Participation.id),
+            func.max(func.coalesce(Participation.finished_at, Participation.started_at)),
+        )
+        .where(Participation.driver_id.in_(driver_ids))
+        .group_by(
+            Participation.driver_id,
+            Participation.discipline,
+            Participation.participation_state,
+            Participation.status,
+        )
+    ):
+        row = row_for(driver_id, discipline)
+        row["participations_count"] += int(count)
+        state_column = _STATE_COLUMNS.get(_value(state))
+        if state_column:
+            row[state_column] += int(count)
+        status_column = _STATUS_COLUMNS.get(_value(status))
+        if status_column:
+            row[status_column] += int(count)
+        if last_race_at is not None and (row["last_race_at"] is None or last_race_at > row["last_race_at"]):
+            row["last_race_at"] = last_race_at
+
+    for driver_id, discipline, count, score_sum in connection.execute(
+        select(
+            Participation.driver_id,
+            Participation.discipline,
+            func.count(Incident.id),
+            func.coalesce(func.sum(Incident.score), 0.0),
+        )
+        .join_from(Incident, Participation, Incident.participation_id == Participation.id)
+        .where(Participation.driver_id.in_(driver_ids))
+        .group_by(Participation.driver_id, Participation.discipline)
+    ):
+        row = row_for(driver_id, discipline)
+        row["incidents_count"] = int(count)
+        row["incident_score_sum"] = float(score_sum or 0.0)
+
+    for driver_id, discipline, count in connection.execute(
+        select(Participation.driver_id, Participation.discipline, func.count(Penalty.id))
+        .join_from(Penalty, Incident, Penalty.incident_id == Incident.id)
+        .join(Participation, Incident.participation_id == Participation.id)
+        .where(Participation.driver_id.in_(driver_ids))
+        .group_by(Participation.driver_id, Participation.discipline)
+    ):
+        row_for(driver_id, discipline)["penalties_count"] = int(count)
+
+    for driver_id in driver_ids:
+        # Disciplines the driver no longer has participations in
+        disciplines = [discipline for d, discipline in rows if d == driver_id]
+        connection.execute(
+            delete(DriverStats).where(
+                DriverStats.driver_id == driver_id, DriverStats.discipline.not_in(disciplines)
+            )
+        )
+    if rows:
+        _upsert(connection, [rows[key] for key in sorted(rows)])
+    return len(rows)
+
+
+def _lock_drivers(connection: Connection, driver_ids: list[str]) -> None:
+    """Serialize refreshes of the same driver across transactions (Postgres only; released on commit)."""
+    if connection.dialect.name != "postgresql":
+        return
+    for driver_id in driver_ids:
+        connection.execute(select(func.pg_advisory_xact_lock(ADVISORY_LOCK_NAMESPACE, func.hashtext(driver_id))))
+
+
+def _insert(connection: Connection):
+    if connection.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert(DriverStats)
+
+
+def _upsert(connection: Connection, rows: list[dict]) -> None:
+    statement = _insert(connection)
+    keys = {"driver_id", "discipline"}
+    statement = statement.on_conflict_do_update(
+        index_elements=[DriverStats.driver_id, DriverStats.discipline],
+        set_={name: statement.excluded[name] for name in rows[0] if name not in keys},
+    )
+    connection.execute(statement, rows)
+
+
+def apply_deltas(connection: Connection, deltas: dict[tuple[str, str], dict]) -> int:
+    """Add counter deltas to driver_stats rows (created when missing); returns rows written."""
+    now = datetime.now(timezone.utc)
+    rows = []
+    for (driver_id, discipline), delta in sorted(deltas.items()):
+        row = {"driver_id": driver_id, "discipline": discipline, "last_race_at": delta.get("last_race_at")}
+        row.update({column: delta.get(column, 0) for column in _COUNTER_COLUMNS})
+        if any(row[column] for column in _COUNTER_COLUMNS) or row["last_race_at"] is not None:
+            rows.append({**row, "updated_at": now})
+    if not rows:
+        return 0
+    statement = _insert(connection)
+    excluded = statement.excluded
+    if connection.dialect.name == "postgresql":
+        last_race_at = func.greatest(DriverStats.last_race_at, excluded.last_race_at)  # ignores NULLs
+    else:
+        last_race_at = func.max(
+            func.coalesce(DriverStats.last_race_at, excluded.last_race_at),
+            func.coalesce(excluded.last_race_at, DriverStats.last_race_at),
+        )
+    set_ = {column: getattr(DriverStats, column) + excluded[column] for column in _COUNTER_COLUMNS}
+    statement = statement.on_conflict_do_update(
+        index_elements=[DriverStats.driver_id, DriverStats.discipline],
+        set_={**set_, "last_race_at": last_race_at, "updated_at": excluded.updated_at},
+    )
+    connection.execute(statement, rows)
+    return len(rows)
+
+
+def mark_drivers_stale(session: Session, driver_ids: Iterable[str]) -> None:
+    """Queue driver_ids for the full recompute before commit (their deltas are dropped)."""
+    session.info.setdefault(STALE_DRIVERS_KEY, set()).update(d for d in driver_ids if d)
+
+
+def record_flush_deltas(session: Session) -> None:
+    """Add the current flush's deltas to the transaction's pending ones (call from after_flush)."""
+    deltas, stale_driver_ids = collect_flush_deltas(session)
+    pending = session.info.setdefault(STATS_DELTAS_KEY, {})
+    for key, delta in deltas.items():
+        row = pending.setdefault(key, {})
+        for column, amount in delta.items():
+            if column == "last_race_at":
+                row[column] = max(filter(None, (row.get(column), amount)), default=None)
+            else:
+                row[column] = row.get(column, 0) + amount
+    mark_drivers_stale(session, stale_driver_ids)
+
+
+def apply_pending_stats(session: Session) -> int:
+    """Write the transaction's deltas and recompute its stale drivers (before commit); returns rows written."""
+    deltas = session.info.pop(STATS_DELTAS_KEY, None) or {}
+    stale_driver_ids = session.info.pop(STALE_DRIVERS_KEY, None) or set()
+    if not (deltas or stale_driver_ids):
+        return 0
+    connection = session.connection()
+    written = apply_deltas(connection, {k: v for k, v in deltas.items() if k[0] not in stale_driver_ids})
+    return written + refresh_driver_stats(connection, stale_driver_ids)
+
+
+def load_deleted_stats_inputs(session: Session) -> None:
+    """
+    Load the columns collect_flush_deltas reads from objects about to be deleted (call from before_flush):
+    after the flush their rows are gone and expired attributes could no longer be loaded.
+    """
+    for obj in session.deleted:
+        if isinstance(obj, Participation):
+            obj.driver_id
+        elif isinstance(obj, Incident):
+            obj.participation_id, obj.score
+        elif isinstance(obj, Penalty):
+            obj.incident_id
+
+
+def _before(state, name: str) -> tuple[bool, object]:
+    """(known, value before this flush) of a column attribute; unknown when it changed while unloaded."""
+    history = state.attrs[name].history
+    if history.deleted:
+        return True, history.deleted[0]
+    if history.unchanged:
+        return True, history.unchanged[0]
+    return False, None
+
+
+def _loaded_values(session: Session, model, columns: tuple[str, ...], ids: set[str]) -> dict[str, tuple]:
+    """id -> column values, from instances in the session where loaded, else one SELECT."""
+    values: dict[str, tuple] = {}
+    missing = set()
+    for id_ in ids:
+        obj = session.identity_map.get(session.identity_key(model, id_))
+        loaded = inspect(obj).dict if obj is not None else {}
+        if all(column in loaded for column in columns):
+            values[id_] = tuple(loaded[column] for column in columns)
+        else:
+            missing.add(id_)
+    if missing:
+        query = select(model.id, *(getattr(model, column) for column in columns)).where(model.id.in_(missing))
+        for id_, *row in session.connection().execute(query):
+            values[id_] = tuple(row)
+    return values
+
+
+def collect_flush_deltas(session: Session) -> tuple[dict[tuple[str, str], dict], set[str]]:
+    """
+    Counter deltas of the current flush per (driver_id, discipline), plus the drivers that need the full
+    recompute instead (see module docstring). Call from after_flush: the pre-flush history is intact.
+    """
+    deltas: dict[tuple[str, str], dict] = {}
+    stale_driver_ids: set[str] = set()
+    stale_participation_ids: set[str] = set()
+    stale_incident_ids: set[str] = set()
+    # (participation_id, incidents delta, score delta) / (incident_id, penalties delta)
+    incident_changes: list[tuple[str, int, float]] = []
+    penalty_changes: list[tuple[str, int]] = []
+
+    def add(key: tuple[str, str], column: str, amount=1) -> None:
+        row = deltas.setdefault(key, {})
+        row[column] = row.get(column, 0) + amount
+
+    def touch_last_race(key: tuple[str, str], at: datetime | None) -> None:
+        if at is not None:
+            row = deltas.setdefault(key, {})
+            row["last_race_at"] = max(filter(None, (row.get("last_race_at"), _utc(at))))
+
+    for obj in session.new:
+        if isinstance(obj, Participation):
+            key = (obj.driver_id, _value(obj.discipline))
+            add(key, "participations_count")
+            state_column = _STATE_COLUMNS.get(_value(obj.participation_state))
+            status_column = _STATUS_COLUMNS.get(_value(obj.status))
+            for column in (state_column, status_column):
+                if column:
+                    add(key, column)
+            touch_last_race(key, obj.finished_at or obj.started_at)
+        elif isinstance(obj, Incident):
+            incident_changes.append((obj.participation_id, 1, obj.score or 0.0))
+        elif isinstance(obj, Penalty):
+            penalty_changes.append((obj.incident_id, 1))
+
+    deleted_penalties = {id(obj) for obj in session.deleted if isinstance(obj, Penalty)}
+    for obj in session.deleted:
+        loaded = inspect(obj).dict
+        if isinstance(obj, Participation):
+            stale_driver_ids.add(loaded.get("driver_id"))
+        elif isinstance(obj, Incident):
+            incident_changes.append((loaded.get("participation_id"), -1, -(loaded.get("score") or 0.0)))
+        elif isinstance(obj, Penalty):
+            penalty_changes.append((loaded.get("incident_id"), -1))
+
+    for obj in session.dirty:
+        state = inspect(obj)
+        if isinstance(obj, Participation):
+            if not any(state.attrs[name].history.has_changes() for name in STATS_PARTICIPATION_FIELDS):
+                continue
+            if state.attrs.driver_id.history.has_changes() or state.attrs.discipline.history.has_changes():
+                stale_driver_ids.update(d for d in state.attrs.driver_id.history.deleted if d)
+                stale_driver_ids.add(obj.driver_id)
+                continue
+            key = (obj.driver_id, _value(obj.discipline))
+            for name, columns in (("participation_state", _STATE_COLUMNS), ("status", _STATUS_COLUMNS)):
+                if not state.attrs[name].history.has_changes():
+                    continue
+                known, old = _before(state, name)
+                if not known:
+                    stale_driver_ids.add(obj.driver_id)
+                    break
+                for column, amount in ((columns.get(_value(old)), -1), (columns.get(_value(getattr(obj, name))), 1)):
+                    if column:
+                        add(key, column, amount)
+            if state.attrs.started_at.history.has_changes() or state.attrs.finished_at.history.has_changes():
+                (finished_known, old_finished), (started_known, old_started) = (
+                    _before(state, "finished_at"),
+                    _before(state, "started_at"),
+                )
+                old_at, new_at = _utc(old_finished or old_started), _utc(obj.finished_at or obj.started_at)
+                if not (finished_known and started_known) or new_at is None or (old_at and new_at < old_at):
+                    stale_driver_ids.add(obj.driver_id)  # last_race_at may go back: recompute
+                else:
+                    touch_last_race(key, new_at)
+        elif isinstance(obj, Incident):
+            for penalty in state.attrs.penalties.history.deleted:
+                if id(penalty) in deleted_penalties:
+                    continue
+                if penalty.incident is None:  # orphan, deleted by the cascade
+                    penalty_changes.append((obj.id, -1))
+                else:
+                    stale_incident_ids.update((obj.id, penalty.incident.id))
+            if not session.is_modified(obj, include_collections=False):
+                continue
+            if state.attrs.participation_id.history.has_changes():
+                stale_participation_ids.update(p for p in state.attrs.participation_id.history.deleted if p)
+                stale_participation_ids.add(obj.participation_id)
+            elif state.attrs.score.history.has_changes():
+                known, old_score = _before(state, "score")
+                if known:
+                    incident_changes.append((obj.participation_id, 0, (obj.score or 0.0) - (old_score or 0.0)))
+                else:
+                    stale_participation_ids.add(obj.participation_id)
+        elif isinstance(obj, Penalty) and state.attrs.incident_id.history.has_changes():
+            stale_incident_ids.update(i for i in state.attrs.incident_id.history.deleted if i)
+            stale_incident_ids.add(obj.incident_id)
+
+    # Penalties / incidents -> participation -> (driver_id, discipline)
+    incident_ids = {iid for iid, _ in penalty_changes if iid} | {i for i in stale_incident_ids if i}
+    incident_participation = {
+        iid: values[0] for iid, values in _loaded_values(session, Incident, ("participation_id",), incident_ids).items()
+    }
+    stale_participation_ids.update(incident_participation.get(iid) for iid in stale_incident_ids)
+    participation_ids = {pid for pid, _, _ in incident_changes} | set(incident_participation.values())
+    participation_ids |= stale_participation_ids
+    participation_ids.discard(None)
+    participation_keys = {
+        pid: (driver_id, _value(discipline))
+        for pid, (driver_id, discipline) in _loaded_values(
+            session, Participation, ("driver_id", "discipline"), participation_ids
+        ).items()
+    }
+    stale_driver_ids.update(participation_keys[pid][0] for pid in stale_participation_ids if pid in participation_keys)
+    for participation_id, count, score in incident_changes:
+        key = participation_keys.get(participation_id)
+        if key is not None:
+            add(key, "incidents_count", count)
+            add(key, "incident_score_sum", score)
+    for incident_id, count in penalty_changes:
+        key = participation_keys.get(incident_participation.get(incident_id))
+        if key is not None:
+            add(key, "penalties_count", count)
+    stale_driver_ids.discard(None)
+    return deltas, stale_driver_ids
+
+
+def driver_ids_for_delete(connection: Connection, table_name: str, whereclause) -> set[str]:
+    """Drivers owning the rows a bulk DELETE on participations / incidents / penalties is about to remove."""
+    if table_name == "participations":
+        query = select(Participation.driver_id)
+    elif table_name == "incidents":
+        query = select(Participation.driver_id).join_from(
+            Incident, Participation, Incident.participation_id == Participation.id
+        )
+    else:
+        query = (
+            select(Participation.driver_id)
+            .join_from(Penalty, Incident, Penalty.incident_id == Incident.id)
+            .join(Participation, Incident.participation_id == Participation.id)
+        )
+    if whereclause is not None:
+        query = query.where(whereclause)
+    return set(connection.scalars(query.distinct()))
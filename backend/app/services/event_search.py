@@ -0,0 +1,132 @@
+"""
+Upcoming / past event search for the dashboard widgets.
+
+EventRepository.search_window returns one page of events together with the total match count (COUNT(*) OVER
+()) in a single query on the indexed events.current_tier / start_time_utc / game columns. Totals are cached
+per (window, tier, game set, rig, recent_days) for EVENT_COUNT_CACHE_TTL_SECONDS, so while a total is fresh
+the page query skips the window count and /count endpoints answer without touching the database. Counts may
+lag new or reclassified events by at most the TTL.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+
+from sqlalchemy.orm import Session
+
+from app.core.settings import settings
+from app.models.event import Event
+from app.repositories.event import EventRepository, RigRanks
+
+# (window, driver_tier, sorted game set, driver rig ranks, recent_days)
+CountKey = tuple[str, str, tuple[str, ...], RigRanks | None, int]
+
+
+class EventCountCache:
+    def __init__(self, max_entries: int, ttl_seconds: float) -> None:
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[CountKey, tuple[float, int]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: CountKey) -> int | None:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: CountKey, total: int) -> None:
+        if self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, total)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+_cache = EventCountCache(settings.event_count_cache_size, settings.event_count_cache_ttl_seconds)
+
+
+def get_event_count_cache() -> EventCountCache:
+    return _cache
+
+
+def _count_key(
+    window: str,
+    driver_tier: str,
+    driver_games: list[str] | None,
+    driver_rig: RigRanks | None,
+    recent_days: int,
+) -> CountKey:
+    # recent_days only bounds the past window
+    games = tuple(sorted(set(driver_games or [])))
+    return (window, driver_tier, games, driver_rig, recent_days if window == "past" else 0)
+
+
+def search_events(
+    session: Session,
+    window: str,
+    driver_tier: str,
+    driver_games: list[str] | None = None,
+    limit: int = 3,
+    offset: int = 0,
+    recent_days: int = 30,
+    driver_rig: RigRanks | None = None,
+) -> tuple[list[Event], int]:
+    """(page, total) of upcoming or past events for a tier, game set and rig; one query when total is cached."""
+    repo = EventRepository(session)
+    key = _count_key(window, driver_tier, driver_games, driver_rig, recent_days)
+    cached_total = _cache.get(key)
+    events, total = repo.search_window(
+        window,
+        driver_tier,
+        driver_games,
+        limit=limit,
+        offset=offset,
+        recent_days=recent_days,
+        with_total=cached_total is None,
+        driver_rig=driver_rig,
+    )
+    if cached_total is not None:
+        return events, cached_total
+    if total is None:
+        # Page past the end (or no matches): the windowed count had no row to ride on.
+        total = repo.count_window(window, driver_tier, driver_games, recent_days, driver_rig) if offset else 0
+    _cache.put(key, total)
+    return events, total
+
+
+def count_events(
+    session: Session,
+    window: str,
+    driver_tier: str,
+    driver_games: list[str] | None = None,
+    recent_days: int = 30,
+    driver_rig: RigRanks | None = None,
+) -> int:
+    """Total of search_events for the same arguments (cached)."""
+    key = _count_key(window, driver_tier, driver_games, driver_rig, recent_days)
+    total = _cache.get(key)
+    if total is None:
+        total = EventRepository(session).count_window(window, driver_tier, driver_games, recent_days, driver_rig)
+        _cache.put(key, total)
+    return total
@@ -14,8 +14,9 @@ from app.repositories.driver import DriverRepository
 from app.repositories.event import EventRepository
 from app.schemas.event import EventRead
 from app.services.classifier import TIER_LABELS
+from app.services.event_search import count_events, search_events
 from app.utils.game_aliases import expand_driver_games_for_event_match
-from app.utils.rig_compat import driver_rig_satisfies_event
+from app.utils.rig_compat import driver_rig_ranks
 
 
 def infer_discipline(event: Event) -> str:
@@ -87,13 +88,14 @@ def list_events(
     same_tier: bool = False,
     rig_filter: bool = True,
     task_code: str | None = None,
+    limit: int | None = None,
+    offset: int = 0,
     user_id: str,
     user_role: str,
 ) -> list[EventRead]:
-    """List events with optional filters; driver_id applies sim_games + tier + rig."""
+    """List events with optional filters; driver_id applies sim_games + tier + rig (all in SQL, before limit)."""
     driver_repo = DriverRepository(session)
     event_repo = EventRepository(session)
-    classification_repo = ClassificationRepository(session)
 
     driver = None
     if driver_id:
@@ -104,8 +106,16 @@ def list_events(
             return []
 
     game_in = None
-    if driver and driver.sim_games:
-        game_in = expand_driver_games_for_event_match(driver.sim_games)
+    tiers = None
+    driver_rig = None
+    if driver:
+        if driver.sim_games:
+            game_in = expand_driver_games_for_event_match(driver.sim_games)
+        driver_tier = getattr(driver, "tier", "E0") or "E0"
+        driver_tier_idx = TIER_ORDER.index(driver_tier) if driver_tier in TIER_ORDER else 0
+        tiers = [driver_tier] if same_tier else list(TIER_ORDER[driver_tier_idx:])
+        if rig_filter:
+            driver_rig = driver_rig_ranks(driver.rig_options)
 
     events = event_repo.list_events(
         game=game,
@@ -114,75 +124,69 @@ def list_events(
         date_from=date_from,
         date_to=date_to,
         game_in=game_in,
+        task_code=task_code,
+        tiers=tiers,
+        driver_rig=driver_rig,
+        limit=limit,
+        offset=offset,
     )
-    if task_code:
-        events = [e for e in events if getattr(e, "task_codes", None) and task_code in e.task_codes]
-    if not events:
-        return []
-
-    event_ids = [e.id for e in events]
-    tier_by_event = classification_repo.tier_by_event(event_ids)
-
-    if driver_id and driver:
-        driver_tier = getattr(driver, "tier", "E0") or "E0"
-        driver_tier_idx = TIER_ORDER.index(driver_tier) if driver_tier in TIER_ORDER else 0
-        if same_tier:
-            events = [e for e in events if (tier_by_event.get(e.id) or "E2") == driver_tier]
-        else:
-            events = [
-                e
-                for e in events
-                if TIER_ORDER.index(tier_by_event.get(e.id) or "E2") >= driver_tier_idx
-            ]
-        if rig_filter:
-            events = [e for e in events if driver_rig_satisfies_event(driver.rig_options, e.rig_options)]
-
     return [
-        EventRead.model_validate(e).model_copy(update={"event_tier": tier_by_event.get(e.id) or "E2"})
+        EventRead.model_validate(e).model_copy(update={"event_tier": e.current_tier or "E2"})
         for e in events
     ]
 
 
-def list_upcoming_events(
-    session: Session,
-    driver_id: str,
-    user_id: str,
-    user_role: str,
-    limit: int = 3,
-    offset: int = 0,
-) -> list[EventRead]:
-    """Upcoming events for driver: start_time_utc > now, tier match, sim_games, rig filter."""
-    driver_repo = DriverRepository(session)
-    event_repo = EventRepository(session)
-    classification_repo = ClassificationRepository(session)
-
-    driver = driver_repo.get_by_id(driver_id)
+def _search_driver(session: Session, driver_id: str, user_id: str, user_role: str):
+    """(driver, tier, expanded sim games) for upcoming/past search, or None if not found / not allowed."""
+    driver = DriverRepository(session).get_by_id(driver_id)
     if not driver or (user_role != "admin" and driver.user_id != user_id):
-        return []
-
+        return None
     driver_tier = getattr(driver, "tier", "E0") or "E0"
     driver_games = expand_driver_games_for_event_match(driver.sim_games or [])
+    return driver, driver_tier, list(driver_games) or None
+
 
-    event_ids = event_repo.list_upcoming_ids(
-        driver_tier=driver_tier,
-        driver_games=driver_games if driver_games else None,
+def _search_page(
+    session: Session,
+    window: str,
+    driver_id: str,
+    user_id: str,
+    user_role: str,
+    limit: int,
+    offset: int,
+    recent_days: int = 30,
+) -> tuple[list[EventRead], int]:
+    found = _search_driver(session, driver_id, user_id, user_role)
+    if found is None:
+        return [], 0
+    driver, driver_tier, driver_games = found
+    events, total = search_events(
+        session,
+        window,
+        driver_tier,
+        driver_games,
         limit=limit,
         offset=offset,
+        recent_days=recent_days,
+        driver_rig=driver_rig_ranks(driver.rig_options),
     )
-    if not event_ids:
-        return []
+    out = [EventRead.model_validate(e).model_copy(update={"event_tier": e.current_tier or "E2"}) for e in events]
+    return out, total
+
 
-    events = event_repo.list_by_ids(event_ids, order_by_start=True)
-    tier_by_event = classification_repo.tier_by_event(event_ids)
-    out = []
-    for e in events:
-        tier = tier_by_event.get(e.id)
-        if tier != driver_tier:
-            continue
-        if not driver_rig_satisfies_event(driver.rig_options, e.rig_options):
-            continue
-        out.append(EventRead.model_validate(e).model_copy(update={"event_tier": tier}))
-    return out
+def list_upcoming_events(
+    session: Session,
+    driver_id: str,
+    user_id: str,
+    user_role: str,
+    limit: int = 3,
+    offset: int = 0,
+) -> tuple[list[EventRead], int]:
+    """
+    Upcoming events for driver: start_time_utc > now, tier match, sim_games, rig filter.
+    Returns (page, total).
+    """
+    return _search_page(session, "upcoming", driver_id, user_id, user_role, limit, offset)
 
 
 def list_upcoming_count(
@@ -191,19 +195,13 @@ def list_upcoming_count(
     user_id: str,
     user_role: str,
 ) -> int:
-    """Count upcoming events for driver (tier + sim_games match; rig not applied to count)."""
-    driver_repo = DriverRepository(session)
-    event_repo = EventRepository(session)
-
-    driver = driver_repo.get_by_id(driver_id)
-    if not driver or (user_role != "admin" and driver.user_id != user_id):
+    """Count upcoming events for driver (tier + sim_games + rig match)."""
+    found = _search_driver(session, driver_id, user_id, user_role)
+    if found is None:
         return 0
-
-    driver_tier = getattr(driver, "tier", "E0") or "E0"
-    driver_games = expand_driver_games_for_event_match(driver.sim_games or [])
-    return event_repo.count_upcoming_ids(
-        driver_tier=driver_tier,
-        driver_games=driver_games if driver_games else None,
+    driver, driver_tier, driver_games = found
+    return count_events(
+        session, "upcoming", driver_tier, driver_games, driver_rig=driver_rig_ranks(driver.rig_options)
     )
 
 
@@ -215,44 +213,12 @@ def list_past_events(
     limit: int = 3,
     offset: int = 0,
     recent_days: int = 30,
-) -> list[EventRead]:
-    """Past events for driver: start_time_utc < now, within recent_days, tier match, rig filter."""
-    driver_repo = DriverRepository(session)
-    event_repo = EventRepository(session)
-    classification_repo = ClassificationRepository(session)
-
-    driver = driver_repo.get_by_id(driver_id)
-    if not driver or (user_role != "admin" and driver.user_id != user_id):
-        return []
-
-    driver_tier = getattr(driver, "tier", "E0") or "E0"
-    driver_games = expand_driver_games_for_event_match(driver.sim_games or [])
-
-    event_ids = event_repo.list_past_ids(
-        driver_tier=driver_tier,
-        driver_games=driver_games if driver_games else None,
-        limit=limit,
-        offset=offset,
-        recent_days=recent_days,
-    )
-    if not event_ids:
-        return []
-
-    events = event_repo.list_by_ids(event_ids, order_by_start=False)
-    by_id = {e.id: e for e in events}
-    tier_by_event = classification_repo.tier_by_event(event_ids)
-    out = []
-    for eid in event_ids:
-        e = by_id.get(eid)
-        if not e:
-            continue
-        tier = tier_by_event.get(e.id)
-        if tier != driver_tier:
-            continue
-        if not driver_rig_satisfies_event(driver.rig_options, e.rig_options):
-            continue
-        out.append(EventRead.model_validate(e).model_copy(update={"event_tier": tier}))
-    return out
+) -> tuple[list[EventRead], int]:
+    """
+    Past events for driver: start_time_utc < now, within recent_days, tier match, rig filter.
+    Returns (page, total) like list_upcoming_events.
+    """
+    return _search_page(session, "past", driver_id, user_id, user_role, limit, offset, recent_days)
 
 
 def list_past_count(
@@ -263,19 +229,12 @@ def list_past_count(
     recent_days: int = 30,
 ) -> int:
     """Count past events for driver within recent_days."""
-    driver_repo = DriverRepository(session)
-    event_repo = EventRepository(session)
-
-    driver = driver_repo.get_by_id(driver_id)
-    if not driver or (user_role != "admin" and driver.user_id != user_id):
+    found = _search_driver(session, driver_id, user_id, user_role)
+    if found is None:
         return 0
-
-    driver_tier = getattr(driver, "tier", "E0") or "E0"
-    driver_games = expand_driver_games_for_event_match(driver.sim_games or [])
-    return event_repo.count_past_ids(
-        driver_tier=driver_tier,
-        driver_games=driver_games if driver_games else None,
-        recent_days=recent_days,
+    driver, driver_tier, driver_games = found
+    return count_events(
+        session, "past", driver_tier, driver_games, recent_days, driver_rig=driver_rig_ranks(driver.rig_options)
     )
 
 
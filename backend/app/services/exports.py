@@ -0,0 +1,234 @@
+"""
+Streaming admin exports (NDJSON / CSV).
+
+export_query builds one SELECT per dataset (flat columns, ordered oldest first by (time, id) so the keyset
+indexes serve the sort). iter_export_rows runs it with yield_per, i.e. a server-side cursor that fetches
+EXPORT_BATCH_SIZE rows at a time, and the encoders turn rows into byte chunks as they arrive, so an export
+starts sending immediately and its memory does not grow with the row count.
+
+The generators open their own session: a StreamingResponse body is consumed after the route returns.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+from dataclasses import dataclass
+from datetime import date, datetime
+from enum import Enum
+from typing import Callable, Iterable, Iterator
+
+from sqlalchemy import Select, select
+
+from app.core.settings import settings
+from app.db.session import SessionLocal
+from app.models.audit_log import AuditLog
+from app.models.crs_history import CRSHistory
+from app.models.driver import Driver
+from app.models.event import Event
+from app.models.incident import Incident
+from app.models.participation import Participation
+from app.models.penalty import Penalty
+
+EXPORT_FORMATS = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+@dataclass(frozen=True)
+class ExportFilters:
+    driver_id: str | None = None
+    event_id: str | None = None
+    since: datetime | None = None
+    until: datetime | None = None
+
+
+@dataclass(frozen=True)
+class ExportSpec:
+    build: Callable[[], Select]
+    time_column: object
+    id_column: object
+    driver_column: object | None
+    event_column: object | None
+    driver_filter: Callable[[str], object] | None = None  # overrides driver_column == driver_id
+
+
+def _participations() -> Select:
+    return select(
+        Participation.id,
+        Participation.driver_id,
+        Participation.event_id,
+        Event.title.label("event_title"),
+        Participation.discipline,
+        Participation.status,
+        Participation.participation_state,
+        Participation.position_overall,
+        Participation.position_class,
+        Participation.laps_completed,
+        Participation.pace_delta,
+        Participation.consistency_score,
+        Participation.started_at,
+        Participation.finished_at,
+        Participation.created_at,
+    ).outerjoin(Event, Participation.event_id == Event.id)
+
+
+def _incidents() -> Select:
+    return select(
+        Incident.id,
+        Incident.participation_id,
+        Participation.driver_id,
+        Participation.event_id,
+        Incident.code,
+        Incident.incident_type,
+        Incident.severity,
+        Incident.score,
+        Incident.lap,
+        Incident.timestamp_utc,
+        Incident.description,
+        Incident.created_at,
+    ).join(Participation, Incident.participation_id == Participation.id)
+
+
+def _penalties() -> Select:
+    return (
+        select(
+            Penalty.id,
+            Penalty.incident_id,
+            Incident.participation_id,
+            Participation.driver_id,
+            Participation.event_id,
+            Penalty.penalty_type,
+            Penalty.score,
+            Penalty.time_seconds,
+            Penalty.lap,
+            Penalty.description,
+            Penalty.created_at,
+        )
+        .join(Incident, Penalty.incident_id == Incident.id)
+        .join(Participation, Incident.participation_id == Participation.id)
+    )
+
+
+def _crs_history() -> Select:
+    return select(
+        CRSHistory.id,
+        CRSHistory.driver_id,
+        CRSHistory.discipline,
+        CRSHistory.score,
+        CRSHistory.algo_version,
+        CRSHistory.inputs_hash,
+        CRSHistory.computed_from_participation_id,
+        Participation.event_id,
+        CRSHistory.computed_at,
+        CRSHistory.created_at,
+    ).outerjoin(Participation, CRSHistory.computed_from_participation_id == Participation.id)
+
+
+def _audit_logs() -> Select:
+    return select(
+        AuditLog.id,
+        AuditLog.actor_user_id,
+        AuditLog.actor_role,
+        AuditLog.action,
+        AuditLog.path,
+        AuditLog.status_code,
+        AuditLog.details,
+        AuditLog.created_at,
+    )
+
+
+def _audit_actor_is_driver_owner(driver_id: str):
+    # driver_id filter for audit logs = actions of the user owning that driver
+    return AuditLog.actor_user_id == select(Driver.user_id).where(Driver.id == driver_id).scalar_subquery()
+
+
+EXPORT_DATASETS: dict[str, ExportSpec] = {
+    "participations": ExportSpec(
+        _participations, Participation.created_at, Participation.id, Participation.driver_id, Participation.event_id
+    ),
+    "incidents": ExportSpec(
+        _incidents, Incident.created_at, Incident.id, Participation.driver_id, Participation.event_id
+    ),
+    "penalties": ExportSpec(
+        _penalties, Penalty.created_at, Penalty.id, Participation.driver_id, Participation.event_id
+    ),
+    "crs_history": ExportSpec(
+        _crs_history, CRSHistory.computed_at, CRSHistory.id, CRSHistory.driver_id, Participation.event_id
+    ),
+    "audit_logs": ExportSpec(
+        _audit_logs, AuditLog.created_at, AuditLog.id, None, None, driver_filter=_audit_actor_is_driver_owner
+    ),
+}
+
+
+def export_query(dataset: str, filters: ExportFilters) -> Select:
+    """SELECT for dataset with filters applied; KeyError for unknown dataset, ValueError for unsupported filter."""
+    spec = EXPORT_DATASETS[dataset]
+    query = spec.build()
+    if filters.driver_id:
+        if spec.driver_filter is not None:
+            query = query.where(spec.driver_filter(filters.driver_id))
+        else:
+            query = query.where(spec.driver_column == filters.driver_id)
+    if filters.event_id:
+        if spec.event_column is None:
+            raise ValueError(f"{dataset} export cannot be filtered by event_id")
+        query = query.where(spec.event_column == filters.event_id)
+    if filters.since:
+        query = query.where(spec.time_column >= filters.since)
+    if filters.until:
+        query = query.where(spec.time_column < filters.until)
+    return query.order_by(spec.time_column, spec.id_column)
+
+
+def iter_export_rows(query: Select, batch_size: int | None = None) -> Iterator[dict]:
+    """Stream rows of query through a server-side cursor (yield_per) on a dedicated session."""
+    session = SessionLocal()
+    try:
+        result = session.execute(
+            query.execution_options(yield_per=batch_size or settings.export_batch_size)
+        )
+        for row in result.mappings():
+            yield dict(row)
+    finally:
+        session.close()
+
+
+def _plain(value):
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def ndjson_chunks(rows: Iterable[dict], rows_per_chunk: int = 500) -> Iterator[bytes]:
+    """One JSON object per line; rows are grouped into chunks to keep per-write overhead low."""
+    lines: list[str] = []
+    for row in rows:
+        lines.append(json.dumps({key: _plain(value) for key, value in row.items()}, default=str))
+        if len(lines) >= rows_per_chunk:
+            yield ("\n".join(lines) + "\n").encode()
+            lines = []
+    if lines:
+        yield ("\n".join(lines) + "\n").encode()
+
+
+def csv_chunks(rows: Iterable[dict], columns: list[str], rows_per_chunk: int = 500) -> Iterator[bytes]:
+    """Header row, then rows; JSON-typed values (dict / list) are written as JSON text."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    count = 0
+    for row in rows:
+        writer.writerow(
+            json.dumps(value) if isinstance(value, (dict, list)) else ("" if value is None else _plain(value))
+            for value in (row.get(column) for column in columns)
+        )
+        count += 1
+        if count >= rows_per_chunk:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+            count = 0
+    yield buffer.getvalue().encode()
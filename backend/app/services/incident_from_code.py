@@ -1,6 +1,7 @@
 """
 Create incident from platform code (e.g. acc_off_track_time_penalty).
-Shared by API and mock: backend resolves score, incident_type, penalty from config and creates Incident + Penalty when needed.
+Shared by API, mock and telemetry ingestion: backend resolves score, incident_type, penalty from config and creates
+Incident + Penalty when needed.
 """
 
 from __future__ import annotations
@@ -8,8 +9,9 @@ from __future__ import annotations
 from sqlalchemy.orm import Session
 
 from app.core.incident_config import get_incident_by_code, normalize_game_to_platform, validate_code_for_platform
+from app.models.event import Event
 from app.models.incident import Incident
-from app.models.participation import ParticipationStatus
+from app.models.participation import Participation, ParticipationStatus
 from app.models.penalty import Penalty
 from app.penalties.scores import get_score_for_penalty_type
 from app.repositories.event import EventRepository
@@ -19,27 +21,20 @@ from app.repositories.penalty import PenaltyRepository
 from app.schemas.incident import incident_type_from_string
 
 
-def create_incident_from_code(
-    session: Session,
-    participation_id: str,
+def build_incident_from_code(
+    participation: Participation,
+    event: Event | None,
     code: str,
     *,
     severity: int = 1,
     lap: int | None = None,
     timestamp_utc=None,
     description: str | None = None,
-) -> Incident:
+) -> tuple[Incident, Penalty | None]:
     """
-    Create Incident (and Penalty when config says so) from a platform code.
-    Uses event.game to resolve platform; looks up code in config; creates Incident + Penalty if penalty != no_penalty.
-    Does not commit; caller must commit. Raises ValueError on validation failure.
+    Incident (and Penalty when config says so) for a platform code, not added to any session.
+    Uses event.game to resolve platform; raises ValueError on an unsupported platform or unknown code.
     """
-    part_repo = ParticipationRepository(session)
-    event_repo = EventRepository(session)
-    participation = part_repo.get_by_id(participation_id)
-    if not participation:
-        raise ValueError("Participation not found")
-    event = event_repo.get_by_id(participation.event_id) if participation.event_id else None
     platform = normalize_game_to_platform(event.game if event else None)
     if not platform:
         raise ValueError("Event game is not set or not supported. Set event game to AC (or ACC) or iRacing for incident codes.")
@@ -49,36 +44,66 @@ def create_incident_from_code(
     config_entry = get_incident_by_code(platform, code)
     if not config_entry:
         raise ValueError("Unknown incident code for this event platform.")
-    score = config_entry["score"]
-    incident_type_value = incident_type_from_string(config_entry["incident_type"]).value
     incident = Incident(
-        participation_id=participation_id,
+        participation_id=participation.id,
         code=code,
-        score=score,
-        incident_type=incident_type_value,
+        score=config_entry["score"],
+        incident_type=incident_type_from_string(config_entry["incident_type"]).value,
         severity=severity,
         lap=lap,
         timestamp_utc=timestamp_utc,
         description=description,
     )
-    IncidentRepository(session).add(incident)
-    session.flush()
-    from app.services.timeline_validation import validate_incident_timeline
-    validate_incident_timeline(incident, participation, event)
+    penalty = None
     penalty_type = config_entry.get("penalty") or "no_penalty"
     if penalty_type and penalty_type != "no_penalty":
-        time_seconds = config_entry.get("time_seconds") if penalty_type == "time_penalty" else None
         penalty = Penalty(
-            incident_id=incident.id,
+            incident=incident,
             penalty_type=penalty_type,
             score=get_score_for_penalty_type(penalty_type),
-            time_seconds=time_seconds,
+            time_seconds=config_entry.get("time_seconds") if penalty_type == "time_penalty" else None,
             lap=lap,
             description=None,
         )
+    return incident, penalty
+
+
+def create_incident_from_code(
+    session: Session,
+    participation_id: str,
+    code: str,
+    *,
+    severity: int = 1,
+    lap: int | None = None,
+    timestamp_utc=None,
+    description: str | None = None,
+) -> Incident:
+    """
+    Create Incident (and Penalty when config says so) from a platform code.
+    Uses event.game to resolve platform; looks up code in config; creates Incident + Penalty if penalty != no_penalty.
+    Does not commit; caller must commit. Raises ValueError on validation failure.
+    """
+    participation = ParticipationRepository(session).get_by_id(participation_id)
+    if not participation:
+        raise ValueError("Participation not found")
+    event = EventRepository(session).get_by_id(participation.event_id) if participation.event_id else None
+    incident, penalty = build_incident_from_code(
+        participation,
+        event,
+        code,
+        severity=severity,
+        lap=lap,
+        timestamp_utc=timestamp_utc,
+        description=description,
+    )
+    IncidentRepository(session).add(incident)
+    session.flush()
+    from app.services.timeline_validation import validate_incident_timeline
+    validate_incident_timeline(incident, participation, event)
+    if penalty is not None:
         PenaltyRepository(session).add(penalty)
         session.flush()
-        if penalty_type == "dsq":
+        if penalty.penalty_type == "dsq":
             participation.status = ParticipationStatus.dsq
         from app.services.timeline_validation import validate_penalty_timeline
         validate_penalty_timeline(penalty, incident, participation, event)
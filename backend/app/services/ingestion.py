@@ -1,14 +1,39 @@
 from __future__ import annotations
 
+import logging
+import uuid
+from dataclasses import dataclass, field
 from datetime import datetime
+from enum import Enum
+from itertools import islice
+from typing import Callable, Iterable, Sequence
 
+from pydantic_core import to_jsonable_python
+from sqlalchemy import delete, insert
 from sqlalchemy.orm import Session
 
+from app.core.settings import settings
+from app.domain.events import event_signature
 from app.models.classification import Classification
-from app.models.event import Event
+from app.models.event import Event, apply_scalar_defaults
 from app.models.raw_event import RawEvent
-from app.services.classifier import build_event_payload, classify_event, infer_primary_discipline
+from app.services.classification_cache import classify_event_cached
+from app.services.classifier import build_event_payload, infer_primary_discipline
 from app.services.normalizer import normalize_raw_event
+from app.utils.rig_compat import event_rig_requirements
+
+logger = logging.getLogger("racerpath")
+
+_EVENT_COLUMN_KEYS = frozenset(attr.key for attr in Event.__mapper__.column_attrs)
+
+
+def _event_fields(normalized_event: dict) -> dict:
+    """Event constructor kwargs from a normalized (EventCreate) dict: drop schema-only keys, enums to values."""
+    return {
+        key: value.value if isinstance(value, Enum) else value
+        for key, value in normalized_event.items()
+        if key in _EVENT_COLUMN_KEYS
+    }
 
 
 def ingest_payload(
@@ -42,7 +67,7 @@ def ingest_payload(
         session.flush()
 
         normalized_event, errors = normalize_raw_event(source, payload)
-        raw_event.normalized_event = normalized_event
+        raw_event.normalized_event = to_jsonable_python(normalized_event)
         raw_event.errors = errors
         raw_event.normalized_at = datetime.utcnow()
 
@@ -53,13 +78,13 @@ def ingest_payload(
         raw_event.status = "normalized"
 
         if create_event:
-            event = Event(**normalized_event)
+            event = Event(**_event_fields(normalized_event))
             session.add(event)
             session.flush()
 
             discipline = infer_primary_discipline(event.event_type, event.car_class_list, "gt")
             classification_payload = build_event_payload(event, discipline)
-            classification_data = classify_event(classification_payload)
+            classification_data = classify_event_cached(classification_payload)
 
             classification = Classification(event_id=event.id, **classification_data)
             session.add(classification)
@@ -68,3 +93,268 @@ def ingest_payload(
 
     session.refresh(raw_event)
     return raw_event
+
+
+@dataclass
+class IngestItemResult:
+    """Outcome of one payload in ingest_payloads_bulk (status of the existing raw event for duplicates)."""
+
+    index: int
+    source_event_id: str | None
+    raw_event_id: str | None = None
+    event_id: str | None = None
+    status: str = "failed"
+    errors: list[str] = field(default_factory=list)
+    duplicate: bool = False
+
+
+def _resolve_source_event_id(payload: dict, source_event_id: str | None) -> str | None:
+    value = source_event_id or payload.get("id")
+    return str(value) if value not in (None, "") else None
+
+
+def _existing_raw_events(session: Session, source: str, source_event_ids: set[str]) -> dict[str, tuple]:
+    """source_event_id -> (raw_event_id, status, event_id, errors) for already ingested payloads."""
+    if not source_event_ids:
+        return {}
+    rows = (
+        session.query(RawEvent.source_event_id, RawEvent.id, RawEvent.status, RawEvent.event_id, RawEvent.errors)
+        .filter(RawEvent.source == source, RawEvent.source_event_id.in_(source_event_ids))
+        .all()
+    )
+    existing: dict[str, tuple] = {}
+    for source_event_id, raw_event_id, status, event_id, errors in rows:
+        existing.setdefault(source_event_id, (raw_event_id, status, event_id, errors or []))
+    return existing
+
+
+def _ingest_chunk(
+    session: Session,
+    source: str,
+    items: list[tuple[int, str | None, dict]],
+    create_event: bool,
+) -> list[IngestItemResult]:
+    """Normalize + classify items in memory, then bulk insert events, raw events and classifications."""
+    now = datetime.utcnow()
+    event_rows: list[dict] = []
+    raw_rows: list[dict] = []
+    classification_rows: list[dict] = []
+    results: list[IngestItemResult] = []
+
+    for index, source_event_id, payload in items:
+        normalized_event, errors = normalize_raw_event(source, payload)
+        result = IngestItemResult(index=index, source_event_id=source_event_id, raw_event_id=str(uuid.uuid4()))
+        result.errors = errors
+        raw_row = {
+            "id": result.raw_event_id,
+            "source": source,
+            "source_event_id": source_event_id,
+            "payload": payload,
+            "normalized_event": to_jsonable_python(normalized_event),
+            "errors": errors,
+            "normalized_at": now,
+            "event_id": None,
+        }
+        if normalized_event is None or "missing_title" in errors:
+            result.status = "failed"
+        elif not create_event:
+            result.status = "normalized"
+        else:
+            event_id = str(uuid.uuid4())
+            fields = _event_fields(normalized_event)
+            # Transient Event with defaults applied: same inputs the ORM path hashes/classifies after flush.
+            event = apply_scalar_defaults(Event(id=event_id, **fields))
+            discipline = infer_primary_discipline(event.event_type, event.car_class_list, "gt")
+            classification_data = classify_event_cached(build_event_payload(event, discipline))
+            event_rows.append(
+                {
+                    **fields,
+                    "id": event_id,
+                    "event_signature": event_signature(event),
+                    "current_tier": classification_data["event_tier"],
+                    **event_rig_requirements(event.rig_options),
+                }
+            )
+            classification_rows.append({"id": str(uuid.uuid4()), "event_id": event_id, **classification_data})
+
+            raw_row["event_id"] = event_id
+            result.event_id = event_id
+            result.status = "classified"
+        raw_row["status"] = result.status
+        raw_rows.append(raw_row)
+        results.append(result)
+
+    # Bulk INSERTs skip mapper events; event_signature, current_tier and rig ranks are set explicitly above.
+    if event_rows:
+        session.execute(insert(Event), event_rows)
+    inserted = set(session.scalars(_insert_raw_events_stmt(session).returning(RawEvent.id), raw_rows))
+    if len(inserted) < len(raw_rows):
+        results = _resolve_conflicting_rows(session, source, results, inserted)
+        kept_events = {r.event_id for r in results if r.raw_event_id in inserted}
+        classification_rows = [row for row in classification_rows if row["event_id"] in kept_events]
+    if classification_rows:
+        session.execute(insert(Classification), classification_rows)
+    session.commit()
+    return results
+
+
+def _insert_raw_events_stmt(session: Session):
+    """INSERT raw_events ... ON CONFLICT (source, source_event_id) DO NOTHING (uq_raw_events_source_event_id)."""
+    if session.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    return dialect_insert(RawEvent).on_conflict_do_nothing(index_elements=["source", "source_event_id"])
+
+
+def _resolve_conflicting_rows(
+    session: Session, source: str, results: list[IngestItemResult], inserted: set[str]
+) -> list[IngestItemResult]:
+    """
+    Another writer stored some of the chunk's source_event_ids between the dedupe query and the INSERT: drop
+    the events created for them and report those items as duplicates of the stored raw events.
+    """
+    skipped = [r for r in results if r.raw_event_id not in inserted]
+    orphan_event_ids = [r.event_id for r in skipped if r.event_id]
+    if orphan_event_ids:
+        session.execute(delete(Event).where(Event.id.in_(orphan_event_ids)))
+    existing = _existing_raw_events(session, source, {r.source_event_id for r in skipped})
+    logger.info("ingest_bulk: %s item(s) already stored by a concurrent run", len(skipped))
+    resolved = []
+    for result in results:
+        if result.raw_event_id not in inserted:
+            raw_event_id, status, event_id, errors = existing[result.source_event_id]
+            result = IngestItemResult(
+                index=result.index,
+                source_event_id=result.source_event_id,
+                raw_event_id=raw_event_id,
+                event_id=event_id,
+                status=status,
+                errors=list(errors),
+                duplicate=True,
+            )
+        resolved.append(result)
+    return resolved
+
+
+def ingest_payloads_bulk(
+    session: Session,
+    source: str,
+    payloads: Sequence[dict],
+    create_event: bool = True,
+    source_event_ids: Sequence[str | None] | None = None,
+    chunk_size: int | None = None,
+) -> list[IngestItemResult]:
+    """
+    Bulk variant of ingest_payload for connector feeds: one dedupe query for all source_event_ids, then one
+    transaction per chunk with bulk INSERTs. A failing chunk is rolled back and retried item by item, so a
+    single bad payload only fails itself. Returns one IngestItemResult per payload, in input order.
+    Commits per chunk: call with no uncommitted work pending on session.
+    """
+    chunk_size = max(1, chunk_size or settings.ingest_bulk_chunk_size)
+    resolved = [
+        _resolve_source_event_id(payload, source_event_ids[i] if source_event_ids else None)
+        for i, payload in enumerate(payloads)
+    ]
+    existing = _existing_raw_events(session, source, {sid for sid in resolved if sid})
+    session.rollback()  # end the read transaction; each chunk commits on its own
+
+    results: list[IngestItemResult | None] = [None] * len(payloads)
+    first_index: dict[str, int] = {}
+    pending: list[tuple[int, str | None, dict]] = []
+    repeats: list[tuple[int, int]] = []
+    for index, (source_event_id, payload) in enumerate(zip(resolved, payloads)):
+        if source_event_id and source_event_id in existing:
+            raw_event_id, status, event_id, errors = existing[source_event_id]
+            results[index] = IngestItemResult(
+                index=index,
+                source_event_id=source_event_id,
+                raw_event_id=raw_event_id,
+                event_id=event_id,
+                status=status,
+                errors=list(errors),
+                duplicate=True,
+            )
+        elif source_event_id and source_event_id in first_index:
+            repeats.append((index, first_index[source_event_id]))
+        else:
+            if source_event_id:
+                first_index[source_event_id] = index
+            pending.append((index, source_event_id, payload))
+
+    for start in range(0, len(pending), chunk_size):
+        chunk = pending[start:start + chunk_size]
+        try:
+            chunk_results = _ingest_chunk(session, source, chunk, create_event)
+        except Exception as e:
+            session.rollback()
+            if len(chunk) > 1:
+                logger.warning("ingest_bulk: chunk of %s failed, retrying per item: %s", len(chunk), e)
+                chunk_results = []
+                for item in chunk:
+                    try:
+                        chunk_results.extend(_ingest_chunk(session, source, [item], create_event))
+                    except Exception as item_error:
+                        session.rollback()
+                        chunk_results.append(_failed_result(item, item_error))
+            else:
+                chunk_results = [_failed_result(chunk[0], e)]
+        for result in chunk_results:
+            results[result.index] = result
+
+    # Same source_event_id repeated inside the feed: report the first occurrence's raw event.
+    for index, first in repeats:
+        first_result = results[first]
+        results[index] = IngestItemResult(
+            index=index,
+            source_event_id=first_result.source_event_id,
+            raw_event_id=first_result.raw_event_id,
+            event_id=first_result.event_id,
+            status=first_result.status,
+            errors=list(first_result.errors),
+            duplicate=True,
+        )
+    return results
+
+
+def _failed_result(item: tuple[int, str | None, dict], error: Exception) -> IngestItemResult:
+    index, source_event_id, _ = item
+    logger.warning("ingest_bulk: item %s (%s) failed: %s", index, source_event_id, error)
+    return IngestItemResult(index=index, source_event_id=source_event_id, status="failed", errors=["ingest_error"])
+
+
+def summarize_ingest(results: Sequence[IngestItemResult]) -> dict:
+    return {
+        "total": len(results),
+        "classified": sum(1 for r in results if r.status == "classified"),
+        "failed": sum(1 for r in results if r.status == "failed"),
+        "duplicates": sum(1 for r in results if r.duplicate),
+    }
+
+
+def ingest_payloads_streaming(
+    session: Session,
+    source: str,
+    payloads: Iterable[dict],
+    create_event: bool = True,
+    chunk_size: int | None = None,
+    on_results: Callable[[list[IngestItemResult]], None] | None = None,
+) -> dict:
+    """
+    Pull payloads from an iterator (e.g. connectors.stream_events) chunk_size at a time and bulk-ingest each
+    chunk before pulling the next, so memory is bounded by the chunk and ingestion overlaps the download.
+    Returns aggregate counts only; on_results receives each chunk's per-item results (in input order).
+    """
+    chunk_size = max(1, chunk_size or settings.ingest_bulk_chunk_size)
+    summary = {"total": 0, "classified": 0, "failed": 0, "duplicates": 0, "chunks": 0}
+    iterator = iter(payloads)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return summary
+        results = ingest_payloads_bulk(session, source, chunk, create_event, chunk_size=chunk_size)
+        if on_results is not None:
+            on_results(results)
+        summary["chunks"] += 1
+        for key, value in summarize_ingest(results).items():
+            summary[key] += value
@@ -0,0 +1,85 @@
+"""
+Running lap statistics and grid ranking (pure, no DB).
+
+LapStats keeps count / mean / M2 (Welford) and best lap, so adding a lap is O(1) and the consistency score
+never needs the full lap list. Participation stores the state as laps_completed, total_lap_seconds
+(mean = total / count), lap_time_m2 and best_lap_seconds. rank_by_average_lap orders a whole grid with one
+sort (O(n log n)) instead of a position lookup per car.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Sequence, TypeVar
+
+from app.models.participation import Participation
+
+T = TypeVar("T")
+
+
+@dataclass
+class LapStats:
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0  # sum of squared deviations from the mean
+    best: float | None = None
+
+    @classmethod
+    def from_participation(cls, participation: Participation) -> "LapStats":
+        count = participation.laps_completed or 0
+        total = participation.total_lap_seconds or 0.0
+        return cls(
+            count=count,
+            mean=total / count if count else 0.0,
+            m2=participation.lap_time_m2 or 0.0,
+            best=participation.best_lap_seconds,
+        )
+
+    @classmethod
+    def from_laps(cls, count: int, total: float, sum_squares: float, best: float | None) -> "LapStats":
+        """State of count laps given their sum and sum of squares (reseeding from stored laps)."""
+        if not count:
+            return cls()
+        mean = total / count
+        return cls(count=count, mean=mean, m2=max(0.0, sum_squares - total * mean), best=best)
+
+    def push(self, lap_seconds: float) -> None:
+        """Welford update with one lap."""
+        self.count += 1
+        delta = lap_seconds - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (lap_seconds - self.mean)
+        self.best = lap_seconds if self.best is None else min(self.best, lap_seconds)
+
+    @property
+    def total(self) -> float:
+        return self.mean * self.count
+
+    @property
+    def sample_stddev(self) -> float | None:
+        if self.count < 2:
+            return None
+        return math.sqrt(max(0.0, self.m2) / (self.count - 1))
+
+
+def consistency_score(stats: LapStats) -> float:
+    """0–10 consistency score from lap time stddev: ~0 -> 10, ~2 s -> 5, 4 s+ -> 0; 5.0 with fewer than 2 laps."""
+    stddev = stats.sample_stddev
+    if stddev is None:
+        return 5.0
+    score = 10.0 - min(10.0, stddev * 2.5)
+    return round(max(0.0, min(10.0, score)), 1)
+
+
+def pace_delta(average_lap: float | None, best_lap_in_session: float | None) -> float:
+    """Average lap time minus best lap in session (seconds per lap)."""
+    if average_lap is None or best_lap_in_session is None:
+        return 0.0
+    return round(max(0.0, average_lap - best_lap_in_session), 2)
+
+
+def rank_by_average_lap(items: Sequence[T], averages: Sequence[float | None]) -> list[tuple[int, T]]:
+    """(position, item) by ascending average lap; items without laps go last, ties keep input order."""
+    order = sorted(range(len(items)), key=lambda i: (averages[i] is None, averages[i] or 0.0))
+    return [(position, items[i]) for position, i in enumerate(order, start=1)]
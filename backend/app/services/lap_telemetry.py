@@ -0,0 +1,105 @@
+"""
+Lap telemetry: append completed laps to participation_laps and keep the lap summary on Participation.
+
+append_laps writes only the new laps (one multi-row INSERT for a whole tick) and updates the summary columns
+(including running variance and consistency_score, see app.services.lap_stats) incrementally, so work and bytes
+written per tick are proportional to the number of new laps, not to race length.
+Laps are numbered after participation.laps_completed, which therefore must only be advanced through here.
+laps_completed may still disagree with the stored laps (set by a client or an admin edit): sync_lap_summaries
+checks it against the highest stored lap number and reseeds the summary from the stored laps before new laps
+are numbered and pushed, so no lap is skipped and the running variance starts from real lap times.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Iterable, Sequence
+
+from sqlalchemy.orm import Session
+
+from app.models.participation import Participation
+from app.repositories.participation_lap import ParticipationLapRepository
+from app.services.lap_stats import LapStats, consistency_score
+
+TOTAL_LAP_SECONDS_DECIMALS = 3
+
+
+@dataclass(frozen=True)
+class LapRecord:
+    lap_time_seconds: float
+    sector_times: Sequence[float] | None = None
+
+
+def lap_rows(participation: Participation, laps: Sequence[LapRecord], recorded_at: datetime) -> list[dict]:
+    """participation_laps rows for laps (numbered after laps_completed) and the summary update on participation."""
+    stats = LapStats.from_participation(participation)
+    rows = []
+    for lap in laps:
+        stats.push(lap.lap_time_seconds)
+        rows.append(
+            {
+                "participation_id": participation.id,
+                "lap_number": stats.count,
+                "lap_time_seconds": lap.lap_time_seconds,
+                "sector_times": list(lap.sector_times) if lap.sector_times is not None else None,
+                "recorded_at": recorded_at,
+            }
+        )
+    if laps:
+        _store_stats(participation, stats)
+        participation.last_lap_seconds = laps[-1].lap_time_seconds
+    return rows
+
+
+def _store_stats(participation: Participation, stats: LapStats) -> None:
+    participation.laps_completed = stats.count
+    participation.best_lap_seconds = stats.best
+    participation.total_lap_seconds = round(stats.total, TOTAL_LAP_SECONDS_DECIMALS)
+    participation.lap_time_m2 = stats.m2
+    participation.consistency_score = consistency_score(stats)
+
+
+def sync_lap_summaries(session: Session, participations: Sequence[Participation]) -> int:
+    """
+    Reseed the lap summary of participations whose laps_completed disagrees with their stored laps.
+    One query for the stored lap counts, one more only when some disagree; returns participations reseeded.
+    """
+    repo = ParticipationLapRepository(session)
+    stored = repo.last_lap_numbers([part.id for part in participations])
+    stale = [part for part in participations if (part.laps_completed or 0) != stored.get(part.id, 0)]
+    if not stale:
+        return 0
+    summaries = repo.lap_summaries([part.id for part in stale])
+    last_laps = {
+        lap.participation_id: lap.lap_time_seconds
+        for lap in repo.list_for_keys([(part.id, stored[part.id]) for part in stale if part.id in stored])
+    }
+    for part in stale:
+        count, total, sum_squares, best = summaries.get(part.id, (0, 0.0, 0.0, None))
+        _store_stats(part, LapStats.from_laps(count, total, sum_squares, best))
+        part.last_lap_seconds = last_laps.get(part.id)
+        if not count:
+            part.consistency_score = None
+    return len(stale)
+
+
+def append_laps(
+    session: Session,
+    laps_by_participation: Iterable[tuple[Participation, Sequence[LapRecord]]],
+) -> int:
+    """Append new laps for several participations in one INSERT; returns number of laps written."""
+    recorded_at = datetime.now(timezone.utc)
+    laps_by_participation = list(laps_by_participation)
+    sync_lap_summaries(session, [participation for participation, _ in laps_by_participation])
+    rows: list[dict] = []
+    for participation, laps in laps_by_participation:
+        rows.extend(lap_rows(participation, laps, recorded_at))
+    ParticipationLapRepository(session).add_many(rows)
+    return len(rows)
+
+
+def average_lap_seconds(participation: Participation) -> float | None:
+    if not participation.laps_completed:
+        return None
+    return (participation.total_lap_seconds or 0.0) / participation.laps_completed
@@ -0,0 +1,453 @@
+"""
+Live race channel: per-event standings (laps, lap times, positions), incidents, CRS deltas and race finish,
+pushed to subscribers of GET /events/{event_id}/live (Server-Sent Events) instead of polling
+/participations/active.
+
+Publishers (race engine tick, telemetry ingestion, CRS queue worker) build messages from objects they
+already hold and call publish_race_update after their commit. Each message is serialized once:
+- redis: PUBLISH on live_race:event:{event_id}; one listener thread per API worker subscribes to a channel
+  only while that worker has local subscribers for the event and fans messages out to them. When the
+  connection fails the thread reconnects with exponential backoff (up to LIVE_RACE_RECONNECT_MAX_SECONDS)
+  and re-subscribes the channels that still have subscribers. wait_subscribed() returns once Redis has
+  confirmed the event's channel, so a snapshot taken after it misses no update;
+- memory (no Redis): delivered in-process.
+A subscriber's queue holds LIVE_RACE_QUEUE_SIZE messages; when a client falls behind the oldest messages
+are dropped (standings are absolute, so the next one catches it up).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import threading
+from collections import deque
+from datetime import datetime, timezone
+from typing import AsyncIterator, Awaitable, Callable, Iterable
+
+from pydantic_core import to_jsonable_python
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+from app.core.settings import settings
+from app.models.crs_history import CRSHistory
+from app.models.incident import Incident
+from app.models.participation import Participation, ParticipationState
+
+logger = logging.getLogger("racerpath")
+
+REDIS_CHANNEL_PREFIX = "live_race:event:"
+RECONNECT_BASE_SECONDS = 0.5
+LISTEN_POLL_SECONDS = 0.1  # max delay before the listener sends a queued (un)subscribe
+
+# Participation fields sent in standings (the frontend merges them by participation id)
+STANDINGS_FIELDS = (
+    "id",
+    "driver_id",
+    "participation_state",
+    "status",
+    "laps_completed",
+    "last_lap_seconds",
+    "best_lap_seconds",
+    "position_overall",
+    "position_class",
+    "pace_delta",
+    "consistency_score",
+    "started_at",
+    "finished_at",
+)
+
+
+class LiveRaceSubscription:
+    """One SSE client: a bounded asyncio queue fed from any thread."""
+
+    def __init__(self, event_id: str, loop: asyncio.AbstractEventLoop, max_size: int) -> None:
+        self.event_id = event_id
+        self.queue: asyncio.Queue[tuple[str, str]] = asyncio.Queue(maxsize=max(1, max_size))
+        self._loop = loop
+        self.dropped = 0
+
+    def _put(self, item: tuple[str, str]) -> None:
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(item)
+
+    def deliver(self, item: tuple[str, str]) -> None:
+        try:
+            self._loop.call_soon_threadsafe(self._put, item)
+        except RuntimeError:  # loop closed: client is gone
+            pass
+
+
+class LiveRaceHub:
+    def __init__(self, redis_client=None, queue_size: int = 100, reconnect_max_seconds: float = 30.0) -> None:
+        self._redis = redis_client
+        self.queue_size = queue_size
+        self.reconnect_max_seconds = reconnect_max_seconds
+        self._lock = threading.Lock()
+        self._subscribers: dict[str, set[LiveRaceSubscription]] = {}
+        # Channel (un)subscribe requests for the listener thread, which owns the PubSub connection
+        self._pending: deque[tuple[str, str]] = deque()
+        # event_id -> set by the listener once Redis confirmed the channel subscription
+        self._ready: dict[str, threading.Event] = {}
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self.published = 0
+        self.delivered = 0
+        self.publish_errors = 0
+        self.reconnects = 0
+
+    @property
+    def backend(self) -> str:
+        return "redis" if self._redis is not None else "memory"
+
+    # -- subscribers ------------------------------------------------------------------------------------
+
+    def subscribe(self, event_id: str) -> LiveRaceSubscription:
+        """Register a subscriber for event_id (call from the event loop serving the client)."""
+        subscription = LiveRaceSubscription(event_id, asyncio.get_running_loop(), self.queue_size)
+        with self._lock:
+            subscribers = self._subscribers.setdefault(event_id, set())
+            if not subscribers:
+                self._ready[event_id] = threading.Event()
+                self._pending.append(("subscribe", REDIS_CHANNEL_PREFIX + event_id))
+            subscribers.add(subscription)
+        return subscription
+
+    async def wait_subscribed(self, subscription: LiveRaceSubscription, timeout: float) -> bool:
+        """
+        Wait until the subscription's channel is live in Redis (immediately for the memory backend). False
+        after timeout (Redis down / reconnecting): updates published before the channel is live are missed.
+        """
+        if self._redis is None:
+            return True
+        with self._lock:
+            ready = self._ready.get(subscription.event_id)
+        if ready is not None and (ready.is_set() or await asyncio.to_thread(ready.wait, timeout)):
+            return True
+        logger.warning("live_race: channel of event %s not confirmed in %ss", subscription.event_id[:8], timeout)
+        return False
+
+    def unsubscribe(self, subscription: LiveRaceSubscription) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.event_id)
+            if subscribers is None:
+                return
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[subscription.event_id]
+                self._ready.pop(subscription.event_id, None)
+                self._pending.append(("unsubscribe", REDIS_CHANNEL_PREFIX + subscription.event_id))
+
+    def _fanout(self, event_id: str, message_type: str, payload: str) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers.get(event_id, ()))
+        for subscription in subscribers:
+            subscription.deliver((message_type, payload))
+        self.delivered += len(subscribers)
+
+    # -- publishing -------------------------------------------------------------------------------------
+
+    def publish(self, event_id: str, message: dict) -> None:
+        payload = json.dumps(to_jsonable_python(message), separators=(",", ":"))
+        self.published += 1
+        if self._redis is not None:
+            try:
+                self._redis.publish(REDIS_CHANNEL_PREFIX + event_id, payload)
+                return
+            except Exception as e:
+                self.publish_errors += 1
+                logger.warning("live_race: redis publish failed, delivering locally: %s", e)
+        self._fanout(event_id, message["type"], payload)
+
+    # -- redis listener ---------------------------------------------------------------------------------
+
+    def _listen(self) -> None:
+        """Listener thread: runs until stop(); a failed connection is replaced after a backoff delay."""
+        failures = 0
+        while not self._stop.is_set():
+            pubsub = self._redis.pubsub(ignore_subscribe_messages=False)
+            # channel -> SUBSCRIBEs sent on this connection and not confirmed yet
+            unconfirmed: dict[str, int] = {}
+            try:
+                while not self._stop.is_set():
+                    while self._pending:
+                        action, channel = self._pending.popleft()
+                        getattr(pubsub, action)(channel)
+                        if action == "subscribe":
+                            unconfirmed[channel] = unconfirmed.get(channel, 0) + 1
+                    if not pubsub.subscribed:
+                        self._stop.wait(LISTEN_POLL_SECONDS)
+                        continue
+                    message = pubsub.get_message(timeout=LISTEN_POLL_SECONDS)
+                    failures = 0
+                    if not message:
+                        continue
+                    channel = str(message["channel"])
+                    event_id = channel[len(REDIS_CHANNEL_PREFIX):]
+                    if message.get("type") == "subscribe":
+                        self._confirm(channel, event_id, unconfirmed)
+                        continue
+                    if message.get("type") != "message":
+                        continue
+                    payload = message["data"]
+                    try:
+                        message_type = json.loads(payload).get("type", "")
+                    except (TypeError, ValueError):
+                        continue
+                    self._fanout(event_id, message_type, payload)
+                return
+            except Exception as e:
+                failures += 1
+                self.reconnects += 1
+                delay = min(self.reconnect_max_seconds, RECONNECT_BASE_SECONDS * 2 ** (failures - 1))
+                logger.warning("live_race: redis listener failed, reconnecting in %.1fs: %s", delay, e)
+            finally:
+                try:
+                    pubsub.close()
+                except Exception:
+                    pass
+            if self._stop.wait(delay):
+                return
+            self._resubscribe_all()
+
+    def _confirm(self, channel: str, event_id: str, unconfirmed: dict[str, int]) -> None:
+        # Only the last SUBSCRIBE sent counts: an earlier one may have been undone by an UNSUBSCRIBE since
+        remaining = unconfirmed.get(channel, 0) - 1
+        if remaining > 0:
+            unconfirmed[channel] = remaining
+            return
+        unconfirmed.pop(channel, None)
+        with self._lock:
+            ready = self._ready.get(event_id)
+        if ready is not None:
+            ready.set()
+
+    def _resubscribe_all(self) -> None:
+        """Queue a subscribe for every channel with local subscribers (new PubSub connection)."""
+        with self._lock:
+            self._pending.clear()
+            for ready in self._ready.values():
+                ready.clear()
+            self._pending.extend(("subscribe", REDIS_CHANNEL_PREFIX + event_id) for event_id in self._subscribers)
+
+    def start(self) -> None:
+        if self._redis is None or (self._thread and self._thread.is_alive()):
+            return
+        self._stop.clear()
+        # Re-subscribe channels that already have local subscribers (listener restart)
+        self._resubscribe_all()
+        self._thread = threading.Thread(target=self._listen, daemon=True, name="live_race")
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+        self._thread = None
+
+    def stats(self) -> dict:
+        with self._lock:
+            channels = len(self._subscribers)
+            subscribers = sum(len(subs) for subs in self._subscribers.values())
+            dropped = sum(sub.dropped for subs in self._subscribers.values() for sub in subs)
+        return {
+            "backend": self.backend,
+            "channels": channels,
+            "subscribers": subscribers,
+            "published": self.published,
+            "delivered": self.delivered,
+            "dropped": dropped,
+            "publish_errors": self.publish_errors,
+            "reconnects": self.reconnects,
+        }
+
+
+_hub: LiveRaceHub | None = None
+
+
+def get_live_race_hub() -> LiveRaceHub | None:
+    return _hub
+
+
+def start_live_race(redis_client=None) -> LiveRaceHub | None:
+    """Create the hub (called from app startup); Redis fan-out when a client is given."""
+    global _hub
+    if not settings.live_race_enabled:
+        return None
+    if _hub is None:
+        _hub = LiveRaceHub(
+            redis_client, settings.live_race_queue_size, settings.live_race_reconnect_max_seconds
+        )
+        _hub.start()
+        logger.info("live_race: hub started (backend=%s)", _hub.backend)
+    return _hub
+
+
+def stop_live_race() -> None:
+    global _hub
+    if _hub is None:
+        return
+    _hub.stop()
+    _hub = None
+
+
+# -- messages ---------------------------------------------------------------------------------------------
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _value(value):
+    return value.value if hasattr(value, "value") else value
+
+
+def participation_standing(participation: Participation) -> dict:
+    standing = {name: _value(getattr(participation, name, None)) for name in STANDINGS_FIELDS}
+    standing["participation_id"] = standing.pop("id")
+    return standing
+
+
+def standings_message(event_id: str, participations: Iterable[Participation], finished: bool = False) -> dict:
+    """Absolute lap/position state of the given participations (all of the grid or only changed ones)."""
+    return {
+        "type": "finished" if finished else "standings",
+        "event_id": event_id,
+        "at": _now(),
+        "participations": [participation_standing(part) for part in participations],
+    }
+
+
+def incident_message(
+    event_id: str,
+    incident: Incident,
+    participation: Participation,
+    penalty_types: list[str] | None = None,
+) -> dict:
+    """incident.id must be assigned (flushed); penalty_types default to the loaded incident.penalties."""
+    if penalty_types is None:
+        penalty_types = [penalty.penalty_type for penalty in incident.penalties]
+    return {
+        "type": "incident",
+        "event_id": event_id,
+        "at": _now(),
+        "participation_id": participation.id,
+        "driver_id": participation.driver_id,
+        "incident_id": incident.id,
+        "code": incident.code,
+        "incident_type": incident.incident_type,
+        "score": incident.score,
+        "lap": incident.lap,
+        "penalty_types": penalty_types,
+    }
+
+
+def publish_race_update(message: dict) -> None:
+    """Publish one message built by the helpers above (no-op when live updates are disabled)."""
+    hub = _hub
+    if hub is None:
+        return
+    try:
+        hub.publish(message["event_id"], message)
+    except Exception as e:
+        logger.warning("live_race: publish failed: %s", e)
+
+
+def live_race_snapshot(session: Session, event_id: str) -> dict:
+    """Standings of the whole grid, sent first on connect; "finished" once nobody is registered or racing."""
+    participations = session.query(Participation).filter(Participation.event_id == event_id).all()
+    finished = bool(participations) and all(
+        _value(part.participation_state) in (ParticipationState.completed.value, ParticipationState.withdrawn.value)
+        for part in participations
+    )
+    return standings_message(event_id, participations, finished=finished)
+
+
+def _sse(message_type: str, payload: str) -> str:
+    return f"event: {message_type}\ndata: {payload}\n\n"
+
+
+async def stream_live_race(
+    hub: LiveRaceHub,
+    subscription: LiveRaceSubscription,
+    snapshot: dict,
+    is_disconnected: Callable[[], Awaitable[bool]],
+    heartbeat_seconds: float,
+) -> AsyncIterator[str]:
+    """
+    SSE frames for one client: the snapshot, then every message of the event as it is published.
+    A comment line is sent every heartbeat_seconds of silence (keeps proxies from closing the connection).
+    Ends after the "finished" message or when the client disconnects; always unsubscribes.
+    """
+    try:
+        yield _sse(snapshot["type"], json.dumps(to_jsonable_python(snapshot), separators=(",", ":")))
+        if snapshot["type"] == "finished":
+            return
+        while True:
+            try:
+                message_type, payload = await asyncio.wait_for(subscription.queue.get(), timeout=heartbeat_seconds)
+            except asyncio.TimeoutError:
+                if await is_disconnected():
+                    return
+                yield ": keepalive\n\n"
+                continue
+            yield _sse(message_type, payload)
+            if message_type == "finished":
+                return
+    finally:
+        hub.unsubscribe(subscription)
+
+
+def publish_crs_updates(
+    session: Session,
+    histories: list[CRSHistory],
+    previous_scores: dict[tuple[str, str], float],
+) -> None:
+    """
+    CRS deltas to the live channel of each recompute's event: the trigger participation's event, else the
+    events the driver is racing in now. One participation query for the whole batch.
+    """
+    if _hub is None or not histories:
+        return
+    trigger_ids = {h.computed_from_participation_id for h in histories if h.computed_from_participation_id}
+    untriggered_drivers = {h.driver_id for h in histories if not h.computed_from_participation_id}
+    conditions = []
+    if trigger_ids:
+        conditions.append(Participation.id.in_(trigger_ids))
+    if untriggered_drivers:
+        conditions.append(
+            Participation.driver_id.in_(untriggered_drivers)
+            & (Participation.participation_state == ParticipationState.started)
+        )
+    rows = (
+        session.query(Participation.id, Participation.driver_id, Participation.event_id, Participation.participation_state)
+        .filter(or_(*conditions))
+        .all()
+    )
+    event_by_participation = {pid: event_id for pid, _, event_id, _ in rows}
+    live_events_by_driver: dict[str, list[tuple[str, str]]] = {}
+    for pid, driver_id, event_id, state in rows:
+        if _value(state) == ParticipationState.started.value:
+            live_events_by_driver.setdefault(driver_id, []).append((pid, event_id))
+
+    for history in histories:
+        previous = previous_scores.get((history.driver_id, history.discipline))
+        if history.computed_from_participation_id in event_by_participation:
+            targets = [(history.computed_from_participation_id, event_by_participation[history.computed_from_participation_id])]
+        else:
+            targets = live_events_by_driver.get(history.driver_id, [])
+        for participation_id, event_id in targets:
+            publish_race_update(
+                {
+                    "type": "crs",
+                    "event_id": event_id,
+                    "at": _now(),
+                    "participation_id": participation_id,
+                    "driver_id": history.driver_id,
+                    "discipline": history.discipline,
+                    "score": history.score,
+                    "delta": round(history.score - previous, 2) if previous is not None else None,
+                }
+            )
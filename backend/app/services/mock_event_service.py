@@ -25,7 +25,8 @@ from app.models.participation import Participation
 from app.models.penalty import Penalty
 from app.models.raw_event import RawEvent
 from app.models.task_completion import TaskCompletion
-from app.services.classifier import build_event_payload, classify_event
+from app.services.classification_cache import classify_event_cached
+from app.services.classifier import build_event_payload
 from app.services.timeline_validation import validate_event_timeline
 from app.core.constants import TIER_LABELS
 
@@ -125,7 +126,7 @@ def tick_mock_events(
             session.flush()
             continue
         classification_payload = build_event_payload(event, "gt")
-        classification_data = classify_event(classification_payload)
+        classification_data = classify_event_cached(classification_payload)
         classification_data["event_tier"] = tier
         classification_data["tier_label"] = TIER_LABELS.get(tier, tier)
         classification = Classification(event_id=event.id, **classification_data)
@@ -35,16 +35,15 @@ INCIDENT_CHOICES: List[Tuple[str, str, float, float]] = [
 ]
 
 
-def _started_participations(session: Session) -> List[Participation]:
-    """Participations currently in progress (state=started, started_at set)."""
-    return (
-        session.query(Participation)
-        .filter(
-            Participation.participation_state == ParticipationState.started,
-            Participation.started_at.isnot(None),
-        )
-        .all()
+def _started_participations(session: Session, event_id: str | None = None) -> List[Participation]:
+    """Participations currently in progress (state=started, started_at set), optionally of one event."""
+    query = session.query(Participation).filter(
+        Participation.participation_state == ParticipationState.started,
+        Participation.started_at.isnot(None),
     )
+    if event_id is not None:
+        query = query.filter(Participation.event_id == event_id)
+    return query.all()
 
 
 def tick_mock_incidents(
@@ -52,19 +51,22 @@ def tick_mock_incidents(
     *,
     probability: float = 0.15,
     max_per_tick: int = 3,
+    event_id: str | None = None,
 ) -> dict:
     """
     One tick: for a random subset of "started" participations, create one incident each
-    with realistic type, score, lap, timestamp_utc.     Returns incidents_created, driver_discipline_pairs (for CRS recompute).
+    with realistic type, score, lap, timestamp_utc. event_id limits the tick to one event (race engine).
+    Returns incidents_created, driver_discipline_pairs (for CRS recompute), incidents ((incident, participation) pairs).
     """
     now = datetime.now(timezone.utc)
-    participations = _started_participations(session)
+    participations = _started_participations(session, event_id)
     if not participations:
-        return {"incidents_created": 0, "driver_discipline_pairs": []}
+        return {"incidents_created": 0, "driver_discipline_pairs": [], "incidents": []}
 
     repo = IncidentRepository(session)
     created = 0
     driver_discipline_pairs: List[Tuple[str, str]] = []
+    created_incidents: List[Tuple[Incident, Participation]] = []
 
     # Shuffle and cap so we don't add too many per tick
     candidates = list(participations)
@@ -119,6 +121,7 @@ def tick_mock_incidents(
                 session.flush()
                 continue
         created += 1
+        created_incidents.append((incident, part))
         disc = part.discipline.value if hasattr(part.discipline, "value") else str(part.discipline or "gt")
         if (part.driver_id, disc) not in driver_discipline_pairs:
             driver_discipline_pairs.append((part.driver_id, disc))
@@ -127,4 +130,8 @@ def tick_mock_incidents(
             part.id[:8], part.driver_id[:8], incident_type_str, score, lap,
         )
 
-    return {"incidents_created": created, "driver_discipline_pairs": driver_discipline_pairs}
+    return {
+        "incidents_created": created,
+        "driver_discipline_pairs": driver_discipline_pairs,
+        "incidents": created_incidents,
+    }
@@ -1,74 +1,389 @@
-"""Background runner for mock race service: runs tick_mock_races periodically when MOCK_RACE_ENABLED."""
+"""
+Background race engine for the mock race service (runs when MOCK_RACE_ENABLED).
+
+Every live event is scheduled on its own: a scheduler thread discovers in-progress events once per
+MOCK_RACE_INTERVAL_SECONDS and dispatches each event at its next lap boundary to a pool of
+RACE_ENGINE_WORKERS threads. An event tick runs in its own session and commits on its own, so one slow
+event no longer delays the others, and an event is never ticked twice concurrently.
+
+- Nothing changed: when no new lap is due since the event's last tick, the tick is skipped without
+  touching the database.
+- Several API workers: with Redis, a tick holds the event's lease (SET NX race_engine:event:{id}, TTL
+  RACE_ENGINE_LEASE_SECONDS, longer than the worst-case tick) until after its commit, so no two workers
+  tick the same event at once. The lap watermark (race_engine:event:{id}:laps, laps written by the last
+  successful tick on any worker) makes a worker that gets the lease after another one finished the lap
+  skip it instead of ticking it again.
+- Live race channel: standings and incidents of each event tick are published after its commit
+  (app.services.live_race).
+- stats() (GET /metrics "race_engine"): live events, ticks, skips, failures, overruns (tick longer than
+  one interval) and tick lag (dispatch time minus lap boundary).
+"""
 
 from __future__ import annotations
 
 import logging
 import threading
 import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
 
 from app.core.settings import settings
 from app.db.session import SessionLocal
 from app.events.participation_events import dispatch_participation_completed
+from app.models.event import Event
+from app.services.crs_queue import enqueue_crs_recompute
+from app.services.live_race import get_live_race_hub, incident_message, publish_race_update, standings_message
 from app.services.mock_incident_service import tick_mock_incidents
-from app.services.mock_race_service import tick_mock_races
-from app.services.crs import recompute_crs
+from app.services.mock_race_service import RaceProgress, live_event_starts, tick_mock_race_event
 
 logger = logging.getLogger("racerpath")
 
+REDIS_CLAIM_PREFIX = "race_engine:event:"
+REDIS_WATERMARK_SUFFIX = ":laps"
+WATERMARK_TTL_SECONDS = 24 * 3600  # outlives any race; refreshed by every tick
+START_DELAY_SECONDS = 10  # first discovery after 10s so app is up
+
+# Delete the lease only while this engine still holds it (it may have expired and been taken over)
+_RELEASE_LEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+@dataclass
+class RaceSlot:
+    """Scheduling state of one live event."""
+
+    event_id: str
+    start_utc: datetime
+    next_due: datetime
+    laps_done: int = 0  # laps_done of the last successful tick (or ticked by another worker)
+    in_flight: bool = False
+
+
+class RaceEngine:
+    """Scheduler thread + worker pool; one independent tick per live event and lap."""
+
+    def __init__(
+        self,
+        interval_seconds: int,
+        workers: int,
+        redis_client=None,
+        start_delay_seconds: float = START_DELAY_SECONDS,
+        lease_seconds: int = 120,
+    ) -> None:
+        self.interval_seconds = max(1, interval_seconds)
+        self.workers = max(1, workers)
+        self.start_delay_seconds = start_delay_seconds
+        self.lease_seconds = max(1, lease_seconds)
+        self._redis = redis_client
+        self._lease_token = uuid.uuid4().hex
+        self._lock = threading.Lock()
+        self._slots: dict[str, RaceSlot] = {}
+        self._stop = threading.Event()
+        self._wake = threading.Event()  # a tick finished: its next boundary may be sooner than the wait
+        self._thread: threading.Thread | None = None
+        self._executor: ThreadPoolExecutor | None = None
+        self.ticks = 0
+        self.skipped = 0
+        self.claimed_elsewhere = 0
+        self.failed = 0
+        self.overruns = 0
+        self.finished_events = 0
+        self.last_lag_ms = 0.0
+        self.max_lag_ms = 0.0
+        self._lag_total_ms = 0.0
+        self.max_tick_ms = 0.0
+        self._tick_total_ms = 0.0
+
+    # -- scheduling -------------------------------------------------------------------------------------
+
+    def _next_boundary(self, slot: RaceSlot, progress: RaceProgress) -> datetime:
+        return slot.start_utc + timedelta(seconds=(progress.tick_index + 1) * self.interval_seconds)
+
+    def discover(self, now: datetime) -> None:
+        """Sync the schedule with events in progress: add new ones (due now), drop vanished idle ones."""
+        session = SessionLocal()
+        try:
+            live = dict(live_event_starts(session, now))
+        except Exception as e:
+            logger.warning("race_engine: event discovery failed: %s", e)
+            return
+        finally:
+            session.close()
+        with self._lock:
+            for event_id, start_utc in live.items():
+                if event_id not in self._slots:
+                    self._slots[event_id] = RaceSlot(event_id=event_id, start_utc=start_utc, next_due=now)
+            for event_id in [eid for eid, slot in self._slots.items() if eid not in live and not slot.in_flight]:
+                del self._slots[event_id]
+
+    def _claim(self, event_id: str, laps_done: int) -> tuple[bool, int | None]:
+        """
+        Take the event's lease for a tick up to laps_done. Returns (claimed, watermark): not claimed while
+        another worker ticks the event, or when one already wrote these laps (watermark >= laps_done).
+        Always claimed without Redis.
+        """
+        if self._redis is None:
+            return True, None
+        key = f"{REDIS_CLAIM_PREFIX}{event_id}"
+        try:
+            if not self._redis.set(key, self._lease_token, nx=True, ex=self.lease_seconds):
+                return False, None
+            watermark = self._redis.get(key + REDIS_WATERMARK_SUFFIX)
+        except Exception as e:
+            logger.warning("race_engine: redis claim failed, ticking locally: %s", e)
+            return True, None
+        watermark = int(watermark) if watermark is not None else None
+        if watermark is not None and watermark >= laps_done:
+            self._release(event_id, None)
+            return False, watermark
+        return True, watermark
+
+    def _release(self, event_id: str, laps_done: int | None) -> None:
+        """After the tick's commit: advance the watermark (laps_done None = tick failed) and drop the lease."""
+        if self._redis is None:
+            return
+        key = f"{REDIS_CLAIM_PREFIX}{event_id}"
+        try:
+            if laps_done is not None:
+                self._redis.set(key + REDIS_WATERMARK_SUFFIX, laps_done, ex=WATERMARK_TTL_SECONDS)
+            self._redis.eval(_RELEASE_LEASE_SCRIPT, 1, key, self._lease_token)
+        except Exception as e:
+            # The lease expires on its own after lease_seconds
+            logger.warning("race_engine: redis lease release failed for event %s: %s", event_id[:8], e)
+
+    def dispatch_due(self, now: datetime) -> int:
+        """Submit every idle event whose lap boundary has passed; returns number of ticks submitted."""
+        candidates: list[tuple[RaceSlot, RaceProgress]] = []
+        with self._lock:
+            for slot in self._slots.values():
+                if slot.in_flight or slot.next_due > now:
+                    continue
+                progress = RaceProgress.at(slot.start_utc, now, self.interval_seconds)
+                if progress.laps_done <= slot.laps_done and not progress.finished:
+                    self.skipped += 1
+                    slot.next_due = self._next_boundary(slot, progress)
+                    continue
+                slot.in_flight = True
+                candidates.append((slot, progress))
+
+        submitted = 0
+        for slot, progress in candidates:
+            claimed, watermark = self._claim(slot.event_id, progress.laps_done)
+            with self._lock:
+                if not claimed:
+                    # Busy elsewhere: retry at the next boundary; laps written elsewhere are not ticked again
+                    self.claimed_elsewhere += 1
+                    slot.in_flight = False
+                    if watermark is not None:
+                        slot.laps_done = max(slot.laps_done, watermark)
+                    slot.next_due = self._next_boundary(slot, progress)
+                    continue
+                lag_ms = max(0.0, (now - slot.next_due).total_seconds() * 1000.0)
+                self.last_lag_ms = lag_ms
+                self.max_lag_ms = max(self.max_lag_ms, lag_ms)
+                self._lag_total_ms += lag_ms
+                self.ticks += 1
+            self._submit(slot, now, progress)
+            submitted += 1
+        return submitted
+
+    def _submit(self, slot: RaceSlot, now: datetime, progress: RaceProgress) -> None:
+        if self._executor is None:
+            self.run_tick(slot, now, progress)
+        else:
+            self._executor.submit(self.run_tick, slot, now, progress)
+
+    # -- one event tick ---------------------------------------------------------------------------------
 
-def _run_tick() -> None:
-    session = SessionLocal()
-    interval = max(1, getattr(settings, "mock_race_interval_seconds", 60))
-    try:
-        result = tick_mock_races(session, interval_seconds=interval)
-        if getattr(settings, "mock_incident_enabled", True):
-            inc_result = tick_mock_incidents(
-                session,
-                probability=getattr(settings, "mock_incident_probability", 0.15),
-            )
-            for driver_id, discipline in inc_result.get("driver_discipline_pairs") or []:
+    def tick_event(self, event_id: str, now: datetime) -> bool:
+        """Advance one event in its own session and commit; False when the event is gone."""
+        session = SessionLocal()
+        try:
+            event = session.get(Event, event_id)
+            if event is None:
+                return False
+            result = tick_mock_race_event(session, event, now, self.interval_seconds)
+            crs_pairs = []
+            incidents = []
+            if getattr(settings, "mock_incident_enabled", True):
+                inc_result = tick_mock_incidents(
+                    session,
+                    probability=getattr(settings, "mock_incident_probability", 0.15),
+                    event_id=event_id,
+                )
+                crs_pairs = inc_result.get("driver_discipline_pairs") or []
+                incidents = inc_result.get("incidents") or []
+            # Live race messages are built before commit expires the participations
+            live_messages = []
+            if get_live_race_hub() is not None:
+                if result["participations"]:
+                    live_messages.append(
+                        standings_message(event_id, result["participations"], finished=result["race_finished"])
+                    )
+                live_messages.extend(incident_message(event_id, inc, part) for inc, part in incidents)
+            session.commit()
+            for message in live_messages:
+                publish_race_update(message)
+            for driver_id, discipline in crs_pairs:
                 try:
-                    recompute_crs(session, driver_id, discipline, trigger_participation_id=None)
+                    enqueue_crs_recompute(session, driver_id, discipline, trigger_participation_id=None)
                 except Exception:
-                    pass
-        session.commit()
-        for driver_id, participation_id in result.get("finished_driver_participation_pairs") or []:
-            dispatch_session = SessionLocal()
-            try:
-                dispatch_participation_completed(dispatch_session, driver_id, participation_id)
-                dispatch_session.commit()
-            except Exception as e:
-                logger.warning("mock_race: dispatch_participation_completed failed: %s", e)
-                dispatch_session.rollback()
-            finally:
-                dispatch_session.close()
-        if result.get("participations_updated") or result.get("participations_finished"):
-            logger.info(
-                "mock_race: events=%s updated=%s finished=%s",
-                result.get("events_processed"),
-                result.get("participations_updated"),
-                result.get("participations_finished"),
-            )
-    except Exception as e:
-        logger.exception("mock_race tick failed: %s", e)
-        session.rollback()
-    finally:
-        session.close()
-
-
-def _loop() -> None:
-    interval = max(1, getattr(settings, "mock_race_interval_seconds", 60))
-    # First tick after 10s so app is up
-    time.sleep(10)
-    while True:
-        if getattr(settings, "mock_race_enabled", False):
-            _run_tick()
-        time.sleep(interval)
-
-
-def start_mock_race_background() -> None:
+                    session.rollback()
+            for driver_id, participation_id in result.get("finished_driver_participation_pairs") or []:
+                try:
+                    dispatch_participation_completed(session, driver_id, participation_id)
+                    session.commit()
+                except Exception as e:
+                    logger.warning("race_engine: dispatch_participation_completed failed: %s", e)
+                    session.rollback()
+            return True
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    def run_tick(self, slot: RaceSlot, now: datetime, progress: RaceProgress) -> None:
+        started = time.monotonic()
+        ok = False
+        exists = True
+        try:
+            exists = self.tick_event(slot.event_id, now)
+            ok = True
+        except Exception as e:
+            logger.exception("race_engine: tick failed for event %s: %s", slot.event_id[:8], e)
+        self._release(slot.event_id, progress.laps_done if ok else None)
+        elapsed_ms = (time.monotonic() - started) * 1000.0
+        with self._lock:
+            self._tick_total_ms += elapsed_ms
+            self.max_tick_ms = max(self.max_tick_ms, elapsed_ms)
+            if elapsed_ms > self.interval_seconds * 1000.0:
+                self.overruns += 1
+            slot.in_flight = False
+            if not ok:
+                # Retry at the next boundary; the laps not written then are caught up in one go.
+                self.failed += 1
+                slot.next_due = self._next_boundary(slot, progress)
+            elif not exists or progress.finished:
+                self.finished_events += int(exists)
+                self._slots.pop(slot.event_id, None)
+            else:
+                slot.laps_done = progress.laps_done
+                slot.next_due = self._next_boundary(slot, progress)
+        self._wake.set()
+
+    # -- lifecycle --------------------------------------------------------------------------------------
+
+    def _seconds_until_next_due(self, now: datetime, next_discovery: float) -> float:
+        wait = next_discovery - time.monotonic()
+        with self._lock:
+            for slot in self._slots.values():
+                if not slot.in_flight:
+                    wait = min(wait, (slot.next_due - now).total_seconds())
+        return min(max(wait, 0.05), float(self.interval_seconds))
+
+    def _loop(self) -> None:
+        if self._stop.wait(self.start_delay_seconds):
+            return
+        next_discovery = 0.0
+        while not self._stop.is_set():
+            now = datetime.now(timezone.utc)
+            if time.monotonic() >= next_discovery:
+                self.discover(now)
+                next_discovery = time.monotonic() + self.interval_seconds
+            self.dispatch_due(now)
+            self._wake.wait(self._seconds_until_next_due(datetime.now(timezone.utc), next_discovery))
+            self._wake.clear()
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="race_engine")
+        self._thread = threading.Thread(target=self._loop, daemon=True, name="race_engine")
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout)
+        self._thread = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+        self._executor = None
+
+    @property
+    def running(self) -> bool:
+        return bool(self._thread and self._thread.is_alive())
+
+    def stats(self) -> dict:
+        with self._lock:
+            live_events = len(self._slots)
+            in_flight = sum(1 for slot in self._slots.values() if slot.in_flight)
+        completed = max(1, self.ticks - in_flight)
+        return {
+            "workers": self.workers,
+            "interval_seconds": self.interval_seconds,
+            "live_events": live_events,
+            "in_flight": in_flight,
+            "ticks": self.ticks,
+            "skipped": self.skipped,
+            "claimed_elsewhere": self.claimed_elsewhere,
+            "failed": self.failed,
+            "overruns": self.overruns,
+            "finished_events": self.finished_events,
+            "lag_ms": {
+                "last": round(self.last_lag_ms, 1),
+                "avg": round(self._lag_total_ms / max(1, self.ticks), 1),
+                "max": round(self.max_lag_ms, 1),
+            },
+            "tick_ms": {
+                "avg": round(self._tick_total_ms / completed, 1),
+                "max": round(self.max_tick_ms, 1),
+            },
+        }
+
+
+_engine: RaceEngine | None = None
+
+
+def get_race_engine() -> RaceEngine | None:
+    return _engine
+
+
+def start_mock_race_background(redis_client=None) -> RaceEngine | None:
+    """Start the race engine (called from app startup); Redis claims when a client is given."""
+    global _engine
     if not getattr(settings, "mock_race_enabled", False):
+        return None
+    if _engine is not None and _engine.running:
+        return _engine
+    _engine = RaceEngine(
+        interval_seconds=getattr(settings, "mock_race_interval_seconds", 60),
+        workers=settings.race_engine_workers,
+        redis_client=redis_client,
+        lease_seconds=settings.race_engine_lease_seconds,
+    )
+    _engine.start()
+    logger.info(
+        "mock_race: race engine started (interval=%ss, workers=%s)",
+        _engine.interval_seconds,
+        _engine.workers,
+    )
+    return _engine
+
+
+def stop_mock_race_background() -> None:
+    """Stop scheduling and wait for in-flight event ticks (called on app shutdown)."""
+    global _engine
+    if _engine is None:
         return
-    thread = threading.Thread(target=_loop, daemon=True, name="mock_race")
-    thread.start()
-    logger.info("mock_race: background thread started (interval=%ss)", settings.mock_race_interval_seconds)
+    _engine.stop()
+    _engine = None
@@ -12,7 +12,8 @@ from app.models.incident import Incident
 from app.models.participation import Participation
 from app.models.recommendation import Recommendation
 from app.models.task_completion import TaskCompletion
-from app.services.classifier import TIER_LABELS, build_event_payload, classify_event
+from app.services.classification_cache import classify_event_cached
+from app.services.classifier import TIER_LABELS, build_event_payload
 
 
 def restart_race_of_day(session: Session) -> dict:
@@ -79,7 +80,7 @@ def restart_race_of_day(session: Session) -> dict:
 
     tier = "E0"
     payload = build_event_payload(new_event, "gt")
-    classification_data = classify_event(payload)
+    classification_data = classify_event_cached(payload)
     classification_data["event_tier"] = tier
     classification_data["tier_label"] = TIER_LABELS.get(tier, tier)
     classification = Classification(event_id=new_event.id, **classification_data)
@@ -1,11 +1,46 @@
+"""
+Sliding-window rate limiting.
+
+enforce_rate_limit(key, config) allows at most config.limit hits per config.window_seconds for key.
+
+Backends:
+- memory: per-process hit deques; the least recently used keys are evicted beyond RATE_LIMIT_MAX_KEYS,
+  so unique client keys cannot grow memory without bound.
+- redis: one sorted set per key, checked and updated atomically by a Lua script, so the limit is shared by
+  all API workers and replicas. configure_rate_limiter attaches it at startup when RATE_LIMIT_BACKEND=redis
+  and Redis is reachable; if a Redis call fails, that hit is counted by the memory backend instead.
+"""
+
 from __future__ import annotations
 
+import logging
+import threading
 import time
-from collections import defaultdict, deque
+import uuid
+from collections import OrderedDict, deque
 from dataclasses import dataclass
 
 from fastapi import HTTPException
 
+from app.core.settings import settings
+
+logger = logging.getLogger("racerpath")
+
+REDIS_KEY_PREFIX = "ratelimit:"
+
+# KEYS[1] = sorted set; ARGV = now, window_seconds, limit, member. Returns 1 if the hit is allowed.
+_SLIDING_WINDOW_LUA = """
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now - window)
+if redis.call('ZCARD', KEYS[1]) >= tonumber(ARGV[3]) then
+    return 0
+end
+redis.call('ZADD', KEYS[1], now, ARGV[4])
+redis.call('PEXPIRE', KEYS[1], math.ceil(window * 1000))
+return 1
+"""
+
 
 @dataclass
 class RateLimitConfig:
@@ -13,15 +48,92 @@ class RateLimitConfig:
     window_seconds: int
 
 
-_HITS: dict[str, deque[float]] = defaultdict(deque)
+class MemoryRateLimiter:
+    """In-process sliding window: key -> deque of hit timestamps, bounded to max_keys (LRU)."""
+
+    def __init__(self, max_keys: int) -> None:
+        self.max_keys = max(1, max_keys)
+        self._lock = threading.Lock()
+        self._hits: OrderedDict[str, deque[float]] = OrderedDict()
+        self.evicted = 0
+
+    def hit(self, key: str, config: RateLimitConfig, now: float | None = None) -> bool:
+        """Record a hit for key; return False (nothing recorded) when the limit is reached."""
+        now = time.time() if now is None else now
+        window_start = now - config.window_seconds
+        with self._lock:
+            hits = self._hits.get(key)
+            if hits is None:
+                hits = self._hits[key] = deque()
+            else:
+                self._hits.move_to_end(key)
+            while hits and hits[0] < window_start:
+                hits.popleft()
+            if len(hits) >= config.limit:
+                return False
+            hits.append(now)
+            while len(self._hits) > self.max_keys:
+                self._hits.popitem(last=False)
+                self.evicted += 1
+            return True
+
+    def size(self) -> int:
+        with self._lock:
+            return len(self._hits)
+
+
+class RedisRateLimiter:
+    """Shared sliding window: sorted set per key (scores are hit timestamps), updated by one Lua call."""
+
+    def __init__(self, redis_client) -> None:
+        self._redis = redis_client
+        self._script = redis_client.register_script(_SLIDING_WINDOW_LUA)
+
+    def hit(self, key: str, config: RateLimitConfig, now: float | None = None) -> bool:
+        now = time.time() if now is None else now
+        member = f"{now:.6f}:{uuid.uuid4().hex}"
+        allowed = self._script(
+            keys=[REDIS_KEY_PREFIX + key],
+            args=[now, config.window_seconds, config.limit, member],
+        )
+        return bool(int(allowed))
+
+
+_memory = MemoryRateLimiter(settings.rate_limit_max_keys)
+_redis_limiter: RedisRateLimiter | None = None
+_stats = {"allowed": 0, "limited": 0, "redis_errors": 0}
+
+
+def configure_rate_limiter(redis_client=None) -> None:
+    """Use the shared Redis backend (called from app startup) when configured and available."""
+    global _redis_limiter
+    if settings.rate_limit_backend == "redis" and redis_client is not None:
+        _redis_limiter = RedisRateLimiter(redis_client)
+    else:
+        _redis_limiter = None
 
 
 def enforce_rate_limit(key: str, config: RateLimitConfig) -> None:
-    now = time.time()
-    window_start = now - config.window_seconds
-    hits = _HITS[key]
-    while hits and hits[0] < window_start:
-        hits.popleft()
-    if len(hits) >= config.limit:
+    allowed = None
+    limiter = _redis_limiter
+    if limiter is not None:
+        try:
+            allowed = limiter.hit(key, config)
+        except Exception as e:
+            _stats["redis_errors"] += 1
+            logger.warning("rate_limit: redis check failed, using in-process limiter: %s", e)
+    if allowed is None:
+        allowed = _memory.hit(key, config)
+    if not allowed:
+        _stats["limited"] += 1
         raise HTTPException(status_code=429, detail="Too many requests")
-    hits.append(now)
+    _stats["allowed"] += 1
+
+
+def rate_limit_stats() -> dict:
+    return {
+        "backend": "redis" if _redis_limiter is not None else "memory",
+        "memory_keys": _memory.size(),
+        "memory_evicted": _memory.evicted,
+        **_stats,
+    }
@@ -4,9 +4,9 @@ from typing import Dict, List
 
 from sqlalchemy.orm import Session
 
-from app.models.classification import Classification
 from app.models.crs_history import CRSHistory
 from app.models.driver_license import DriverLicense
+from app.models.event import Event
 from app.models.participation import Participation
 from app.models.real_world_format import RealWorldFormat
 from app.models.real_world_readiness import RealWorldReadiness
@@ -25,15 +25,6 @@ def _latest_crs(session: Session, driver_id: str, discipline: str) -> CRSHistory
     )
 
 
-def _latest_classification(session: Session, event_id: str) -> Classification | None:
-    return (
-        session.query(Classification)
-        .filter(Classification.event_id == event_id)
-        .order_by(Classification.created_at.desc())
-        .first()
-    )
-
-
 def _completed_task_codes(session: Session, driver_id: str) -> set[str]:
     task_ids = {
         completion.task_id
@@ -57,17 +48,18 @@ def _earned_licenses(session: Session, driver_id: str, discipline: str) -> set[s
 
 
 def _tiers_completed(session: Session, driver_id: str, discipline: str) -> set[str]:
-    tiers = set()
-    participations = (
-        session.query(Participation)
-        .filter(Participation.driver_id == driver_id, Participation.discipline == discipline)
+    rows = (
+        session.query(Event.current_tier)
+        .join(Participation, Participation.event_id == Event.id)
+        .filter(
+            Participation.driver_id == driver_id,
+            Participation.discipline == discipline,
+            Event.current_tier.isnot(None),
+        )
+        .distinct()
         .all()
     )
-    for participation in participations:
-        classification = _latest_classification(session, participation.event_id)
-        if classification:
-            tiers.add(classification.event_tier)
-    return tiers
+    return {tier for (tier,) in rows}
 
 
 def _tier_index(tier: str) -> int:
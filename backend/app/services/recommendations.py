@@ -5,7 +5,6 @@ from typing import List
 
 from sqlalchemy.orm import Session, selectinload
 
-from app.models.classification import Classification
 from app.services.crs import compute_inputs, compute_inputs_hash
 from app.models.crs_history import CRSHistory
 from app.models.event import Event
@@ -29,15 +28,6 @@ def _latest_crs(session: Session, driver_id: str, discipline: str) -> CRSHistory
     )
 
 
-def _latest_classification(session: Session, event_id: str) -> Classification | None:
-    return (
-        session.query(Classification)
-        .filter(Classification.event_id == event_id)
-        .order_by(Classification.created_at.desc())
-        .first()
-    )
-
-
 def _period_for_special_slot(special_value: str, now: datetime) -> tuple[datetime, datetime]:
     """Return (period_start, period_end) in UTC for the day/week/month/year containing now."""
     return get_period_bounds(special_value, now)
@@ -164,17 +154,13 @@ def _build_recommendation_content(
                 Event.special_event == special_value,
                 Event.start_time_utc.isnot(None),
                 Event.start_time_utc > now,
+                Event.current_tier == driver_tier,
             )
             .order_by(Event.start_time_utc.asc().nulls_last(), Event.created_at.desc())
         )
         if driver_games:
             q = q.filter(Event.game.in_(driver_games))
-        for event in q.all():
-            classification = _latest_classification(session, event.id)
-            tier = classification.event_tier if classification else None
-            if tier == driver_tier:
-                return event
-        return None
+        return q.first()
 
     def _format_featured(label: str, event, expired: bool = False) -> str:
         if event:
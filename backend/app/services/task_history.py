@@ -0,0 +1,155 @@
+"""
+Preloaded task completion history for one driver (used by evaluate_tasks).
+
+Instead of 6+ queries per task (total count, latest, recent, same-event, same-signature, pending lookups,
+legacy signature walk), load_task_history reads the driver's history for all candidate tasks at once:
+- one grouped query: completed count + latest completion time per task;
+- one query: completed rows inside the widest diversity window, joined to participation/event
+  (legacy rows without a stored signature fall back to events.event_signature);
+- one query: open (pending / in_progress) completions for the participation being evaluated.
+Per-task windows and counters are then answered from memory.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.models.event import Event
+from app.models.participation import Participation
+from app.models.task_completion import TaskCompletion
+
+
+def _as_utc(value: datetime | None) -> datetime | None:
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+@dataclass
+class CompletionRecord:
+    """One completed TaskCompletion inside the diversity window."""
+
+    task_id: str
+    created_at: datetime
+    completed_time: datetime  # completed_at or created_at
+    event_id: str | None
+    event_signature: str | None  # stored, or the event's signature for legacy rows
+
+
+@dataclass
+class TaskHistorySnapshot:
+    totals: dict[str, int] = field(default_factory=dict)
+    latest: dict[str, datetime] = field(default_factory=dict)
+    recent: dict[str, list[CompletionRecord]] = field(default_factory=dict)
+    open_completions: dict[str, list[TaskCompletion]] = field(default_factory=dict)
+
+    def total_completed(self, task_id: str) -> int:
+        return self.totals.get(task_id, 0)
+
+    def latest_completion_time(self, task_id: str) -> datetime | None:
+        return self.latest.get(task_id)
+
+    def recent_completions(self, task_id: str, cutoff: datetime) -> list[CompletionRecord]:
+        return [r for r in self.recent.get(task_id, []) if r.created_at >= cutoff]
+
+    def same_event_count(self, task_id: str, event_id: str | None, cutoff: datetime) -> int:
+        if not event_id:
+            return 0
+        return sum(1 for r in self.recent_completions(task_id, cutoff) if r.event_id == event_id)
+
+    def same_signature_count(self, task_id: str, signature: str | None, cutoff: datetime) -> int:
+        if not signature:
+            return 0
+        return sum(1 for r in self.recent_completions(task_id, cutoff) if r.event_signature == signature)
+
+    def last_same_signature_time(self, task_id: str, signature: str, cutoff: datetime) -> datetime | None:
+        times = [
+            r.completed_time
+            for r in self.recent_completions(task_id, cutoff)
+            if r.event_signature == signature
+        ]
+        return max(times) if times else None
+
+    def open_completion(self, task_id: str, statuses: tuple[str, ...]) -> TaskCompletion | None:
+        for completion in self.open_completions.get(task_id, []):
+            if completion.status in statuses:
+                return completion
+        return None
+
+
+def load_task_history(
+    session: Session,
+    driver_id: str,
+    task_ids: list[str],
+    participation_id: str,
+    window_start: datetime,
+) -> TaskHistorySnapshot:
+    """Load completion history of driver_id for task_ids; recent rows from window_start (widest window)."""
+    snapshot = TaskHistorySnapshot()
+    if not task_ids:
+        return snapshot
+
+    completed_filter = (
+        TaskCompletion.driver_id == driver_id,
+        TaskCompletion.task_id.in_(task_ids),
+        TaskCompletion.status == "completed",
+    )
+    for task_id, total, latest in (
+        session.query(
+            TaskCompletion.task_id,
+            func.count(TaskCompletion.id),
+            func.max(func.coalesce(TaskCompletion.completed_at, TaskCompletion.created_at)),
+        )
+        .filter(*completed_filter)
+        .group_by(TaskCompletion.task_id)
+        .all()
+    ):
+        snapshot.totals[task_id] = int(total)
+        if latest is not None:
+            snapshot.latest[task_id] = _as_utc(latest)
+
+    rows = (
+        session.query(
+            TaskCompletion.task_id,
+            TaskCompletion.created_at,
+            TaskCompletion.completed_at,
+            func.coalesce(TaskCompletion.event_signature, Event.event_signature),
+            Participation.event_id,
+        )
+        .outerjoin(Participation, TaskCompletion.participation_id == Participation.id)
+        .outerjoin(Event, Participation.event_id == Event.id)
+        .filter(*completed_filter, TaskCompletion.created_at >= window_start)
+        .order_by(TaskCompletion.created_at.desc())
+        .all()
+    )
+    for task_id, created_at, completed_at, signature, event_id in rows:
+        created = _as_utc(created_at) or datetime.now(timezone.utc)
+        snapshot.recent.setdefault(task_id, []).append(
+            CompletionRecord(
+                task_id=task_id,
+                created_at=created,
+                completed_time=_as_utc(completed_at) or created,
+                event_id=event_id,
+                event_signature=signature,
+            )
+        )
+
+    for completion in (
+        session.query(TaskCompletion)
+        .filter(
+            TaskCompletion.driver_id == driver_id,
+            TaskCompletion.task_id.in_(task_ids),
+            TaskCompletion.participation_id == participation_id,
+            TaskCompletion.status.in_(["pending", "in_progress"]),
+        )
+        .all()
+    ):
+        snapshot.open_completions.setdefault(completion.task_id, []).append(completion)
+
+    return snapshot
@@ -0,0 +1,316 @@
+"""
+Compiled TaskDefinition requirements.
+
+A task's requirements live partly in columns and partly in the legacy requirements JSON (see _get_req
+below). compile_requirements resolves them once into a CompiledRequirements object: a tuple of bound checks
+(only for requirements the task actually has) plus the repeat/diversity rule parameters with defaults
+applied. Compiled objects are cached per task id (least recently used beyond COMPILED_CACHE_MAX_TASKS are
+dropped) and invalidated when task.updated_at changes.
+
+Checks run against a ParticipationSnapshot built once per participation, so incidents/penalties counts and
+duration are not re-derived from relationships for every task.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable
+
+from app.core.constants import TIER_RANK
+from app.models.classification import Classification
+from app.models.event import Event
+from app.models.participation import Participation
+from app.models.task_definition import TaskDefinition
+
+
+@dataclass(frozen=True)
+class ParticipationSnapshot:
+    """Everything requirement checks read from participation, event and classification."""
+
+    status: str
+    event_tier: str
+    actual_duration_minutes: float | None
+    event_duration_minutes: int | None
+    incidents_count: int
+    penalties_count: int
+    position_overall: int | None
+    laps_completed: int
+    night: bool
+    weather: str | None
+    team_event: bool
+
+    @classmethod
+    def build(
+        cls,
+        participation: Participation,
+        event: Event,
+        classification: Classification | None,
+    ) -> "ParticipationSnapshot":
+        status = getattr(participation, "status", None)
+        status = status.value if hasattr(status, "value") else (str(status) if status else "")
+        incidents = participation.incidents
+        return cls(
+            status=status,
+            event_tier=classification.event_tier if classification else "E2",
+            actual_duration_minutes=participation_duration_minutes(participation),
+            event_duration_minutes=event.duration_minutes,
+            incidents_count=len(incidents),
+            penalties_count=sum(len(inc.penalties) for inc in incidents),
+            position_overall=participation.position_overall,
+            laps_completed=participation.laps_completed,
+            night=bool(event.night),
+            weather=event.weather,
+            team_event=bool(event.team_event),
+        )
+
+
+def participation_duration_minutes(participation: Participation) -> float | None:
+    """Driven minutes (finished_at - started_at), None until both are set."""
+    if not participation.started_at or not participation.finished_at:
+        return None
+    delta = participation.finished_at - participation.started_at
+    return abs(delta.total_seconds()) / 60.0
+
+
+# A check returns None when satisfied, otherwise the failure reason.
+Check = Callable[[ParticipationSnapshot], "str | None"]
+
+
+def _get_req(task: TaskDefinition, key: str, default=None):
+    """Read requirement from task column or fallback to task.requirements JSON."""
+    val = getattr(task, key, None)
+    if val is not None:
+        return val
+    return (task.requirements or {}).get(key, default)
+
+
+def _min_tier_check(min_tier: str) -> Check:
+    def check(snap: ParticipationSnapshot) -> str | None:
+        if TIER_RANK.get(snap.event_tier, 0) < TIER_RANK.get(min_tier, 0):
+            return f"Event tier must be at least {min_tier}, got {snap.event_tier}"
+        return None
+    return check
+
+
+def _max_tier_check(max_tier: str) -> Check:
+    def check(snap: ParticipationSnapshot) -> str | None:
+        if TIER_RANK.get(snap.event_tier, 0) > TIER_RANK.get(max_tier, 0):
+            return f"Event tier must be at most {max_tier}, got {snap.event_tier}"
+        return None
+    return check
+
+
+def _min_duration_check(min_duration) -> Check:
+    limit = float(min_duration)
+
+    def check(snap: ParticipationSnapshot) -> str | None:
+        actual = snap.actual_duration_minutes
+        duration_value = actual if actual is not None else snap.event_duration_minutes
+        if duration_value < limit:
+            mins_str = f"{actual:.1f} min" if actual is not None else "no data"
+            return f"Session duration must be at least {min_duration} min, actual: {mins_str}"
+        return None
+    return check
+
+
+def _max_incidents_check(max_incidents) -> Check:
+    limit = int(max_incidents)
+
+    def check(snap: ParticipationSnapshot) -> str | None:
+        if snap.incidents_count > limit:
+            return f"Incidents must be at most {max_incidents}, got {snap.incidents_count}"
+        return None
+    return check
+
+
+def _max_penalties_check(max_penalties) -> Check:
+    limit = int(max_penalties)
+
+    def check(snap: ParticipationSnapshot) -> str | None:
+        if snap.penalties_count > limit:
+            return f"Penalties must be at most {max_penalties}, got {snap.penalties_count}"
+        return None
+    return check
+
+
+def _night_check(snap: ParticipationSnapshot) -> str | None:
+    return None if snap.night else "Night session required"
+
+
+def _dynamic_weather_check(snap: ParticipationSnapshot) -> str | None:
+    return None if snap.weather == "dynamic" else "Dynamic weather required"
+
+
+def _team_event_check(snap: ParticipationSnapshot) -> str | None:
+    return None if snap.team_event else "Team event required"
+
+
+def _clean_finish_check(snap: ParticipationSnapshot) -> str | None:
+    if snap.status != "finished":
+        return "Clean finish (finished) required"
+    if snap.incidents_count > 0 or snap.penalties_count > 0:
+        return "Clean finish required (no incidents or penalties)"
+    return None
+
+
+def _finish_check(snap: ParticipationSnapshot) -> str | None:
+    return None if snap.status == "finished" else "Participation finish (finished) required"
+
+
+def _max_position_check(max_position) -> Check:
+    limit = int(max_position)
+
+    def check(snap: ParticipationSnapshot) -> str | None:
+        if snap.position_overall is not None and snap.position_overall > limit:
+            return f"Position overall must be no worse than {max_position}, got {snap.position_overall}"
+        return None
+    return check
+
+
+def _min_position_check(min_position) -> Check:
+    limit = int(min_position)
+
+    def check(snap: ParticipationSnapshot) -> str | None:
+        if snap.position_overall is not None and snap.position_overall < limit:
+            return f"Position overall must be no better than {min_position}, got {snap.position_overall}"
+        return None
+    return check
+
+
+def _min_laps_check(min_laps) -> Check:
+    limit = int(min_laps)
+
+    def check(snap: ParticipationSnapshot) -> str | None:
+        if snap.laps_completed < limit:
+            return f"Laps completed must be at least {min_laps}, got {snap.laps_completed}"
+        return None
+    return check
+
+
+@dataclass(frozen=True)
+class CompiledRequirements:
+    """Requirement checks and repeat/diversity rules of one TaskDefinition, defaults applied."""
+
+    checks: tuple[Check, ...]
+    repeatable: bool
+    max_completions: int | None
+    cooldown_hours: float | None
+    diversity_window_days: int
+    max_same_event_count: int | None
+    require_event_diversity: bool
+    max_same_signature_count: int | None
+    signature_cooldown_hours: float | None
+    diminishing: bool
+    diminishing_step: float
+    diminishing_floor: float
+
+    def matches(self, snap: ParticipationSnapshot) -> bool:
+        return all(check(snap) is None for check in self.checks)
+
+    def failure_reasons(self, snap: ParticipationSnapshot) -> list[str]:
+        return [reason for reason in (check(snap) for check in self.checks) if reason is not None]
+
+
+def _optional_int(value) -> int | None:
+    return int(value) if value is not None else None
+
+
+def _build(task: TaskDefinition) -> CompiledRequirements:
+    checks: list[Check] = []
+    min_event_tier = _get_req(task, "min_event_tier") or task.min_event_tier
+    if min_event_tier:
+        checks.append(_min_tier_check(min_event_tier))
+    max_event_tier = _get_req(task, "max_event_tier")
+    if max_event_tier:
+        checks.append(_max_tier_check(max_event_tier))
+    min_duration = _get_req(task, "min_duration_minutes")
+    if min_duration is not None:
+        checks.append(_min_duration_check(min_duration))
+    max_incidents = _get_req(task, "max_incidents")
+    if max_incidents is not None:
+        checks.append(_max_incidents_check(max_incidents))
+    max_penalties = _get_req(task, "max_penalties")
+    if max_penalties is not None:
+        checks.append(_max_penalties_check(max_penalties))
+    if _get_req(task, "require_night"):
+        checks.append(_night_check)
+    if _get_req(task, "require_dynamic_weather"):
+        checks.append(_dynamic_weather_check)
+    if _get_req(task, "require_team_event"):
+        checks.append(_team_event_check)
+    if _get_req(task, "require_clean_finish"):
+        checks.append(_clean_finish_check)
+    if not _get_req(task, "allow_non_finish"):
+        checks.append(_finish_check)
+    max_position_overall = _get_req(task, "max_position_overall")
+    if max_position_overall is not None:
+        checks.append(_max_position_check(max_position_overall))
+    min_position_overall = _get_req(task, "min_position_overall")
+    if min_position_overall is not None:
+        checks.append(_min_position_check(min_position_overall))
+    min_laps_completed = _get_req(task, "min_laps_completed")
+    if min_laps_completed is not None:
+        checks.append(_min_laps_check(min_laps_completed))
+
+    repeatable = bool(_get_req(task, "repeatable", False))
+    cooldown_hours = _get_req(task, "cooldown_hours")
+    if cooldown_hours is None and repeatable:
+        cooldown_hours = 24
+    max_same_event_count = _get_req(task, "max_same_event_count")
+    if max_same_event_count is None and repeatable:
+        max_same_event_count = 1
+    require_event_diversity = _get_req(task, "require_event_diversity")
+    if require_event_diversity is None:
+        require_event_diversity = repeatable
+    signature_cooldown_hours = _get_req(task, "signature_cooldown_hours")
+    return CompiledRequirements(
+        checks=tuple(checks),
+        repeatable=repeatable,
+        max_completions=_optional_int(_get_req(task, "max_completions")),
+        cooldown_hours=float(cooldown_hours) if cooldown_hours else None,
+        diversity_window_days=int(_get_req(task, "diversity_window_days") or 30),
+        max_same_event_count=_optional_int(max_same_event_count),
+        require_event_diversity=bool(require_event_diversity),
+        max_same_signature_count=_optional_int(_get_req(task, "max_same_signature_count")),
+        signature_cooldown_hours=float(signature_cooldown_hours) if signature_cooldown_hours else None,
+        diminishing=bool(_get_req(task, "diminishing_returns") or repeatable),
+        diminishing_step=float(_get_req(task, "diminishing_step") or 0.2),
+        diminishing_floor=float(_get_req(task, "diminishing_floor") or 0.4),
+    )
+
+
+COMPILED_CACHE_MAX_TASKS = 1024
+
+_cache_lock = threading.Lock()
+_compiled: OrderedDict[str, tuple[datetime | None, CompiledRequirements]] = OrderedDict()
+
+
+def compile_requirements(task: TaskDefinition) -> CompiledRequirements:
+    """Compiled requirements for task, cached by (task.id, task.updated_at)."""
+    version = getattr(task, "updated_at", None)
+    if task.id is None:
+        return _build(task)
+    with _cache_lock:
+        cached = _compiled.get(task.id)
+        if cached is not None and cached[0] == version:
+            _compiled.move_to_end(task.id)
+            return cached[1]
+    compiled = _build(task)
+    with _cache_lock:
+        _compiled[task.id] = (version, compiled)
+        _compiled.move_to_end(task.id)
+        while len(_compiled) > COMPILED_CACHE_MAX_TASKS:
+            _compiled.popitem(last=False)
+    return compiled
+
+
+def clear_compiled_requirements(task_id: str | None = None) -> None:
+    """Drop cached compiled requirements (one task or all)."""
+    with _cache_lock:
+        if task_id is None:
+            _compiled.clear()
+        else:
+            _compiled.pop(task_id, None)
@@ -5,6 +5,7 @@ from typing import List
 from sqlalchemy.orm import Session
 
 from app.models.task_definition import TaskDefinition
+from app.services.task_requirements import clear_compiled_requirements, compile_requirements
 
 from app.core.constants import DISCIPLINES, REQUIREMENT_COLUMN_KEYS
 
@@ -279,6 +280,8 @@ def seed_templates(session: Session) -> List[TaskDefinition]:
         session.add(task)
         created.append(task)
     session.commit()
+    clear_compiled_requirements()
     for task in created:
         session.refresh(task)
+        compile_requirements(task)
     return created
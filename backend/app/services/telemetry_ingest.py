@@ -0,0 +1,373 @@
+"""
+Live telemetry ingestion (POST /ingest/telemetry): lap, sector and incident messages of many participations
+in one request, as JSON (a list or {"messages": [...]}) or NDJSON (one message per line).
+
+One batch is one transaction:
+- participations and their events are loaded in two queries; registered participations of a started event
+  are started on their first message (as the mock race does); laps_completed is checked against the stored
+  laps (lap_telemetry.sync_lap_summaries) before lap numbers are validated;
+- laps are appended through app.services.lap_telemetry (one multi-row INSERT, summaries advanced in memory).
+  A lap_number at or below laps_completed is a resent message and counted as a duplicate;
+- sector splits are merged into a lap of the batch or into a stored lap; splits of the lap in progress are
+  kept in participation.raw_metrics["current_lap_sectors"] until that lap arrives;
+- incidents are built from platform codes and checked with validate_incident_timeline /
+  validate_penalty_timeline before they are added, then written in one flush (driver_stats and CRS
+  invalidation listeners run once per batch);
+- after commit, standings of the touched participations and the new incidents are published to the live
+  race channel of each event (app.services.live_race), and a CRS recompute is enqueued once per
+  (driver, discipline) touched by the batch.
+Invalid messages are reported by index and do not reject the rest of the batch.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Sequence
+
+from pydantic import ValidationError
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.event import Event
+from app.models.incident import Incident
+from app.models.participation import Participation, ParticipationState, ParticipationStatus
+from app.models.participation_lap import ParticipationLap
+from app.models.penalty import Penalty
+from app.repositories.event import EventRepository
+from app.repositories.participation import ParticipationRepository
+from app.repositories.participation_lap import ParticipationLapRepository
+from app.schemas.telemetry import (
+    TelemetryIncident,
+    TelemetryLap,
+    TelemetryMessage,
+    TelemetryMessageError,
+    TelemetrySector,
+    telemetry_message_adapter,
+)
+from app.services.crs_queue import enqueue_crs_recompute
+from app.services.incident_from_code import build_incident_from_code
+from app.services.lap_telemetry import LapRecord, lap_rows, sync_lap_summaries
+from app.services.live_race import get_live_race_hub, incident_message, publish_race_update, standings_message
+from app.services.timeline_validation import validate_incident_timeline, validate_penalty_timeline
+
+logger = logging.getLogger("racerpath")
+
+CURRENT_LAP_SECTORS_KEY = "current_lap_sectors"
+
+# (index in the request, validated message)
+IndexedMessage = tuple[int, TelemetryMessage]
+
+
+@dataclass
+class TelemetryIngestResult:
+    total: int = 0
+    duplicates: int = 0
+    laps_written: int = 0
+    sectors_applied: int = 0
+    incidents_created: int = 0
+    crs_recomputes: int = 0
+    errors: list[TelemetryMessageError] = field(default_factory=list)
+    event_ids: set[str] = field(default_factory=set)  # events that received accepted messages
+
+    @property
+    def rejected(self) -> int:
+        return len(self.errors)
+
+    @property
+    def accepted(self) -> int:
+        return self.total - self.rejected - self.duplicates
+
+    def reject(self, index: int, participation_id: str | None, error: str) -> None:
+        self.errors.append(TelemetryMessageError(index=index, participation_id=participation_id, error=error))
+
+
+def _validation_message(exc: ValidationError) -> str:
+    first = exc.errors()[0]
+    location = ".".join(str(part) for part in first.get("loc", ()))
+    return f"{location}: {first.get('msg')}" if location else str(first.get("msg"))
+
+
+def parse_telemetry_body(body: bytes, ndjson: bool) -> tuple[list[IndexedMessage], list[TelemetryMessageError]]:
+    """
+    Decode and validate messages one by one; returns (valid messages, errors by index).
+    Raises ValueError when the body itself is not a JSON list / {"messages": [...]} (or not UTF-8).
+    """
+    text = body.decode("utf-8")
+    errors: list[TelemetryMessageError] = []
+    if ndjson:
+        items: list = []
+        for line in text.splitlines():
+            if not line.strip():
+                continue
+            try:
+                items.append(json.loads(line))
+            except json.JSONDecodeError as e:
+                errors.append(TelemetryMessageError(index=len(items), error=f"Invalid JSON: {e.msg}"))
+                items.append(None)
+    else:
+        data = json.loads(text)
+        items = data.get("messages") if isinstance(data, dict) else data
+        if not isinstance(items, list):
+            raise ValueError('Expected a JSON list of messages or {"messages": [...]}')
+
+    messages: list[IndexedMessage] = []
+    for index, item in enumerate(items):
+        if item is None:
+            continue
+        try:
+            messages.append((index, telemetry_message_adapter.validate_python(item)))
+        except ValidationError as e:
+            participation_id = item.get("participation_id") if isinstance(item, dict) else None
+            errors.append(
+                TelemetryMessageError(
+                    index=index,
+                    participation_id=participation_id if isinstance(participation_id, str) else None,
+                    error=_validation_message(e),
+                )
+            )
+    errors.sort(key=lambda error: error.index)
+    return messages, errors
+
+
+def _as_utc(value: datetime | None) -> datetime | None:
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def _start_if_registered(participation: Participation, event: Event | None, now: datetime) -> str | None:
+    """None when the participation can take live telemetry (registered ones are started), else the reason."""
+    if participation.participation_state == ParticipationState.started:
+        return None
+    if participation.participation_state != ParticipationState.registered:
+        return "Participation is not in progress"
+    start = _as_utc(event.start_time_utc) if event else None
+    if start is None or start > now:
+        return "Event has not started"
+    if participation.started_at is None:
+        participation.started_at = start
+    participation.participation_state = ParticipationState.started
+    return None
+
+
+def _set_sector(sectors: list[float], sector: int, seconds: float) -> bool:
+    """Set split `sector` (1-based); splits are filled in order, a resent split overwrites."""
+    if sector > len(sectors) + 1:
+        return False
+    if sector == len(sectors) + 1:
+        sectors.append(seconds)
+    else:
+        sectors[sector - 1] = seconds
+    return True
+
+
+def ingest_telemetry(
+    session: Session,
+    messages: Sequence[IndexedMessage],
+    errors: Sequence[TelemetryMessageError] = (),
+) -> TelemetryIngestResult:
+    """Write one batch of validated messages (laps, then sectors, then incidents) and commit."""
+    result = TelemetryIngestResult(total=len(messages) + len(errors), errors=list(errors))
+    now = datetime.now(timezone.utc)
+
+    participations = {
+        part.id: part
+        for part in ParticipationRepository(session).list_by_ids(sorted({m.participation_id for _, m in messages}))
+    }
+    events = {
+        event.id: event
+        for event in EventRepository(session).list_by_ids(
+            sorted({part.event_id for part in participations.values() if part.event_id})
+        )
+    }
+    # Lap numbers are validated against laps_completed: make it agree with the stored laps first
+    sync_lap_summaries(session, list(participations.values()))
+    live: dict[str, Participation] = {}  # participations with accepted messages
+
+    def participation_for(index: int, participation_id: str) -> Participation | None:
+        part = participations.get(participation_id)
+        if part is None:
+            result.reject(index, participation_id, "Participation not found")
+            return None
+        if participation_id not in live:
+            reason = _start_if_registered(part, events.get(part.event_id), now)
+            if reason:
+                result.reject(index, participation_id, reason)
+                return None
+        return part
+
+    # Laps: numbered after laps_completed, in message order per participation
+    new_laps: dict[str, list[tuple[int, TelemetryLap, list[float]]]] = {}
+    for index, message in messages:
+        if not isinstance(message, TelemetryLap):
+            continue
+        part = participation_for(index, message.participation_id)
+        if part is None:
+            continue
+        queued = new_laps.setdefault(part.id, [])
+        expected = (part.laps_completed or 0) + len(queued) + 1
+        if message.lap_number is not None and message.lap_number < expected:
+            result.duplicates += 1
+            continue
+        if message.lap_number is not None and message.lap_number > expected:
+            result.reject(index, part.id, f"Lap {message.lap_number} out of order: expected lap {expected}")
+            continue
+        live[part.id] = part
+        queued.append((expected, message, list(message.sector_times or [])))
+
+    # Sectors: into a lap of this batch, the lap in progress, or a stored lap
+    batch_laps = {(pid, number): sectors for pid, laps in new_laps.items() for number, _, sectors in laps}
+    stored_updates: dict[tuple[str, int], list[tuple[int, TelemetrySector]]] = {}
+    for index, message in messages:
+        if not isinstance(message, TelemetrySector):
+            continue
+        part = participation_for(index, message.participation_id)
+        if part is None:
+            continue
+        key = (part.id, message.lap_number)
+        laps_after_batch = (part.laps_completed or 0) + len(new_laps.get(part.id, []))
+        if key in batch_laps:
+            if not _set_sector(batch_laps[key], message.sector, message.sector_time_seconds):
+                result.reject(index, part.id, f"Sector {message.sector} before sector {message.sector - 1}")
+                continue
+        elif message.lap_number <= (part.laps_completed or 0):
+            stored_updates.setdefault(key, []).append((index, message))
+            continue
+        elif message.lap_number == laps_after_batch + 1:
+            metrics = dict(part.raw_metrics or {})
+            current = metrics.get(CURRENT_LAP_SECTORS_KEY) or {}
+            sectors = list(current.get("sectors") or []) if current.get("lap") == message.lap_number else []
+            if not _set_sector(sectors, message.sector, message.sector_time_seconds):
+                result.reject(index, part.id, f"Sector {message.sector} before sector {message.sector - 1}")
+                continue
+            metrics[CURRENT_LAP_SECTORS_KEY] = {"lap": message.lap_number, "sectors": sectors}
+            part.raw_metrics = metrics
+        else:
+            result.reject(index, part.id, f"Lap {message.lap_number} is not recorded or in progress")
+            continue
+        live[part.id] = part
+        result.sectors_applied += 1
+    if stored_updates:
+        for lap in ParticipationLapRepository(session).list_for_keys(list(stored_updates)):
+            sectors = list(lap.sector_times or [])
+            for index, message in stored_updates.pop((lap.participation_id, lap.lap_number)):
+                if _set_sector(sectors, message.sector, message.sector_time_seconds):
+                    live[lap.participation_id] = participations[lap.participation_id]
+                    result.sectors_applied += 1
+                else:
+                    result.reject(index, lap.participation_id, f"Sector {message.sector} before sector {message.sector - 1}")
+            lap.sector_times = sectors
+        for (pid, number), missing in stored_updates.items():
+            for index, _ in missing:
+                result.reject(index, pid, f"Lap {number} is not recorded or in progress")
+
+    rows: list[dict] = []
+    for pid, laps in new_laps.items():
+        if not laps:
+            continue
+        part = participations[pid]
+        metrics = dict(part.raw_metrics or {})
+        buffered = metrics.get(CURRENT_LAP_SECTORS_KEY) or {}
+        records = []
+        for number, message, sectors in laps:
+            if not sectors and buffered.get("lap") == number:
+                sectors = list(buffered.get("sectors") or [])
+            records.append(LapRecord(message.lap_time_seconds, sectors or None))
+            if message.position_overall is not None:
+                part.position_overall = message.position_overall
+            if message.position_class is not None:
+                part.position_class = message.position_class
+        if buffered.get("lap") is not None and buffered["lap"] <= laps[-1][0]:
+            metrics.pop(CURRENT_LAP_SECTORS_KEY, None)
+            part.raw_metrics = metrics
+        rows.extend(lap_rows(part, records, now))
+    ParticipationLapRepository(session).add_many(rows)
+    result.laps_written = len(rows)
+
+    # Incidents: validated before they are added; one flush for the whole batch
+    accepted_incidents: list[tuple[Incident, Penalty | None, Participation]] = []
+    for index, message in messages:
+        if not isinstance(message, TelemetryIncident):
+            continue
+        part = participation_for(index, message.participation_id)
+        if part is None:
+            continue
+        event = events.get(part.event_id)
+        try:
+            incident, penalty = build_incident_from_code(
+                part,
+                event,
+                message.code,
+                severity=message.severity,
+                lap=message.lap,
+                timestamp_utc=message.timestamp_utc,
+                description=message.description,
+            )
+            if message.score is not None:
+                incident.score = message.score
+            if message.incident_type is not None:
+                incident.incident_type = message.incident_type.value
+            incident.created_at = now
+            validate_incident_timeline(incident, part, event)
+            if penalty is not None:
+                penalty.created_at = now
+                validate_penalty_timeline(penalty, incident, part, event)
+        except ValueError as e:
+            result.reject(index, part.id, str(e))
+            continue
+        session.add(incident)
+        if penalty is not None and penalty.penalty_type == "dsq":
+            part.status = ParticipationStatus.dsq
+        live[part.id] = part
+        accepted_incidents.append((incident, penalty, part))
+        result.incidents_created += 1
+
+    # Live race messages are built before commit expires the participations (flush assigns incident ids)
+    live_messages: list[dict] = []
+    if get_live_race_hub() is not None and live:
+        session.flush()
+        by_event: dict[str, list[Participation]] = {}
+        for part in live.values():
+            if part.event_id:
+                by_event.setdefault(part.event_id, []).append(part)
+        live_messages.extend(standings_message(event_id, parts) for event_id, parts in by_event.items())
+        live_messages.extend(
+            incident_message(part.event_id, incident, part, [penalty.penalty_type] if penalty is not None else [])
+            for incident, penalty, part in accepted_incidents
+            if part.event_id
+        )
+
+    # Read before commit: commit expires the participations and each attribute access would reload a row
+    crs_pairs: dict[tuple[str, str], str] = {}
+    for part in live.values():
+        discipline = part.discipline.value if hasattr(part.discipline, "value") else str(part.discipline)
+        crs_pairs.setdefault((part.driver_id, discipline), part.id)
+    result.event_ids = {part.event_id for part in live.values() if part.event_id}
+
+    session.commit()
+    for message in live_messages:
+        publish_race_update(message)
+    result.errors.sort(key=lambda error: error.index)
+
+    for (driver_id, discipline), participation_id in crs_pairs.items():
+        try:
+            enqueue_crs_recompute(session, driver_id, discipline, trigger_participation_id=participation_id)
+            result.crs_recomputes += 1
+        except Exception as e:
+            # Inline fallback (no queue worker): the batch is committed, only this recompute is skipped.
+            logger.exception("telemetry: CRS recompute for driver %s failed: %s", driver_id[:8], e)
+            session.rollback()
+    return result
+
+
+def is_lap_conflict(error: IntegrityError) -> bool:
+    """True when error is a participation_laps primary key violation (lap written by a concurrent batch)."""
+    constraint = ParticipationLap.__table__.primary_key.name
+    diag = getattr(error.orig, "diag", None)
+    if diag is not None and getattr(diag, "constraint_name", None):
+        return diag.constraint_name == constraint
+    # Drivers without diagnostics (SQLite): "UNIQUE constraint failed: participation_laps.participation_id, ..."
+    return f"{ParticipationLap.__tablename__}." in str(error.orig)
@@ -17,7 +17,8 @@ from app.models.raw_event import RawEvent
 from app.models.recommendation import Recommendation
 from app.models.task_completion import TaskCompletion
 from app.models.task_definition import TaskDefinition
-from app.services.classifier import TIER_LABELS, build_event_payload, classify_event
+from app.services.classification_cache import classify_event_cached
+from app.services.classifier import TIER_LABELS, build_event_payload
 
 TASK_CODES = ["GT_TEST_FLOW", "GT_TEST_FLOW_2"]
 EVENT_TITLE = "Test Flow · E2 Sprint"
@@ -123,7 +124,7 @@ def create_test_task_and_event_set(session: Session) -> dict:
         session.add(event)
         session.flush()
         payload = build_event_payload(event, "gt")
-        classification_data = classify_event(payload)
+        classification_data = classify_event_cached(payload)
         classification_data["event_tier"] = EVENT_TIER
         classification_data["tier_label"] = TIER_LABELS.get(EVENT_TIER, EVENT_TIER)
         classification = Classification(event_id=event.id, **classification_data)
@@ -28,3 +28,26 @@ def driver_rig_satisfies_event(driver_rig: dict | None, event_rig: dict | None)
     if event_rig.get("manual_with_clutch") is True and not driver.get("manual_with_clutch"):
         return False
     return True
+
+
+def event_rig_requirements(event_rig: dict | None) -> dict:
+    """
+    Ordinal projection of event.rig_options (stored in events.rig_* columns for SQL filtering):
+    rig_wheel_rank / rig_pedals_rank = minimum rank (None = no requirement), rig_clutch_required.
+    """
+    event_rig = event_rig or {}
+    return {
+        "rig_wheel_rank": WHEEL_ORDER.get(event_rig.get("wheel_type")),
+        "rig_pedals_rank": PEDALS_ORDER.get(event_rig.get("pedals_class")),
+        "rig_clutch_required": event_rig.get("manual_with_clutch") is True,
+    }
+
+
+def driver_rig_ranks(driver_rig: dict | None) -> tuple[int, int, bool]:
+    """(wheel rank, pedals rank, has clutch) of a driver's rig; unknown values rank -1 (fail any requirement)."""
+    driver = driver_rig if driver_rig else DEFAULT_DRIVER_RIG
+    return (
+        WHEEL_ORDER.get(driver.get("wheel_type"), -1),
+        PEDALS_ORDER.get(driver.get("pedals_class"), -1),
+        bool(driver.get("manual_with_clutch")),
+    )
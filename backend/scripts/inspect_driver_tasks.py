@@ -24,10 +24,10 @@ from app.models.user import User
 from app.services.tasks import (
     _latest_classification,
     _meets_requirements,
-    _participation_duration_minutes,
     assign_participation_id_for_completed_participation,
     evaluate_tasks,
 )
+from app.services.task_requirements import participation_duration_minutes
 
 
 def main() -> None:
@@ -62,7 +62,7 @@ def main() -> None:
         for p in participations:
             state = getattr(p.participation_state, "value", str(p.participation_state))
             status = getattr(p.status, "value", str(p.status))
-            dur = _participation_duration_minutes(p)
+            dur = participation_duration_minutes(p)
             print(
                 f"  id={p.id} event_id={p.event_id} state={state} status={status} "
                 f"started_at={p.started_at} finished_at={p.finished_at} "
@@ -101,7 +101,7 @@ def main() -> None:
                 continue
             meets = _meets_requirements(task_gt, p, event, classification)
             status_val = getattr(p.status, "value", str(p.status))
-            dur = _participation_duration_minutes(p)
+            dur = participation_duration_minutes(p)
             print(f"Participation {p.id} (event {event.title}): _meets_requirements(GT_TEST_FLOW) = {meets}")
             print(
                 f"  status={status_val} (must be 'finished') incidents={p.incidents_count} penalties={p.penalties_count} "
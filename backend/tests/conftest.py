@@ -1,7 +1,12 @@
 """Pytest fixtures for multi-driver (Variant C) and API tests."""
 import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 
+import app.models  # noqa: F401  (register all tables and ORM listeners)
 from app.db.session import SessionLocal
+from app.models.base import Base
 from app.models.audit_log import AuditLog
 from app.models.driver import Driver
 from app.models.user import User
@@ -25,6 +30,28 @@ def db_session():
         session.close()
 
 
+@pytest.fixture
+def sqlite_session():
+    """
+    In-memory SQLite session with all tables and ORM listeners, for repository/service tests that do not
+    need Postgres. session.info["statements"] collects executed SQL (query-count assertions).
+    """
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine, autoflush=False)()
+    session.info["statements"] = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        session.info["statements"].append(statement)
+
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+
+
 @pytest.fixture
 def multi_driver_user_and_drivers(db_session):
     """
@@ -0,0 +1,59 @@
+"""Tests: audit writer buffers entries and writes them in multi-row batches."""
+from app.services import audit_writer
+from app.services.audit_writer import AuditWriter
+
+
+class _Session:
+    def __init__(self, executed):
+        self._executed = executed
+
+    def execute(self, statement, rows):
+        self._executed.append(list(rows))
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def _entry(i):
+    return {"actor_user_id": None, "actor_role": None, "action": "POST", "path": f"/api/x/{i}", "status_code": 200}
+
+
+def test_flush_writes_buffer_in_batches(monkeypatch):
+    executed = []
+    monkeypatch.setattr(audit_writer, "SessionLocal", lambda: _Session(executed))
+    writer = AuditWriter(buffer_size=100, batch_size=4, flush_interval_seconds=60)
+    for i in range(10):
+        writer.enqueue(_entry(i))
+    assert writer.flush() == 10
+    assert [len(rows) for rows in executed] == [4, 4, 2]
+    stats = writer.stats()
+    assert stats["buffered"] == 0
+    assert stats["written"] == 10
+    assert stats["batches"] == 3
+
+
+def test_full_buffer_drops_oldest_entries(monkeypatch):
+    executed = []
+    monkeypatch.setattr(audit_writer, "SessionLocal", lambda: _Session(executed))
+    writer = AuditWriter(buffer_size=3, batch_size=10, flush_interval_seconds=60)
+    for i in range(5):
+        writer.enqueue(_entry(i))
+    assert writer.stats()["dropped"] == 2
+    writer.flush()
+    assert [row["path"] for row in executed[0]] == ["/api/x/2", "/api/x/3", "/api/x/4"]
+
+
+def test_stop_flushes_pending_entries(monkeypatch):
+    executed = []
+    monkeypatch.setattr(audit_writer, "SessionLocal", lambda: _Session(executed))
+    writer = AuditWriter(buffer_size=100, batch_size=50, flush_interval_seconds=60)
+    writer.start()
+    writer.enqueue(_entry(1))
+    writer.stop()
+    assert sum(len(rows) for rows in executed) == 1
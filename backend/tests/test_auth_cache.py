@@ -0,0 +1,106 @@
+"""Tests: API-key auth cache TTL, size bound, per-user invalidation after commit and across workers (Redis)."""
+from app.models.user import User
+from app.services import auth_cache
+from app.services.auth_cache import ApiKeyCache
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.data = {}
+
+    def mget(self, keys):
+        return [self.data.get(key) for key in keys]
+
+    def pipeline(self, transaction=True):
+        return self
+
+    def incr(self, key):
+        self.data[key] = str(int(self.data.get(key) or 0) + 1)
+
+    def expire(self, key, seconds):
+        pass
+
+    def execute(self):
+        pass
+
+
+def _user(user_id: str, role: str = "user") -> User:
+    return User(id=user_id, name=user_id, email=f"{user_id}@racerpath.test", role=role, api_key_hash="h", active=True)
+
+
+def test_hit_until_user_is_invalidated():
+    cache = ApiKeyCache(max_entries=10, ttl_seconds=60)
+    cache.put("key-a", _user("u1", "admin"))
+    cache.put("key-b", _user("u1", "admin"))
+    cache.put("key-c", _user("u2"))
+    assert cache.get("key-a")["role"] == "admin"
+    cache.invalidate_user("u1")
+    assert cache.get("key-a") is None
+    assert cache.get("key-b") is None
+    assert cache.get("key-c")["id"] == "u2"
+    assert (cache.hits, cache.misses) == (2, 2)
+
+
+def test_entries_expire_and_size_is_bounded():
+    expired = ApiKeyCache(max_entries=10, ttl_seconds=-1)
+    expired.put("key", _user("u1"))
+    assert expired.get("key") is None
+
+    cache = ApiKeyCache(max_entries=2, ttl_seconds=60)
+    for i in range(3):
+        cache.put(f"key-{i}", _user(f"u{i}"))
+    assert cache.get("key-0") is None
+    assert cache.get("key-2")["id"] == "u2"
+
+
+def test_password_hash_is_not_cached():
+    cache = ApiKeyCache(max_entries=10, ttl_seconds=60)
+    user = _user("u1")
+    user.password_hash = "salt$digest"
+    cache.put("key", user)
+    assert "password_hash" not in cache.get("key")
+
+
+def test_invalidation_waits_for_commit(sqlite_session, monkeypatch):
+    session = sqlite_session
+    cache = ApiKeyCache(max_entries=10, ttl_seconds=60)
+    monkeypatch.setattr(auth_cache, "_cache", cache)
+    user = _user("u1")
+    session.add(user)
+    session.commit()
+    cache.put("key", user)
+
+    user.role = "admin"
+    session.flush()
+    # Not committed yet: other requests keep the committed row
+    assert cache.get("key")["role"] == "user"
+    session.rollback()
+    assert cache.get("key")["role"] == "user"
+
+    user.role = "admin"
+    session.commit()
+    assert cache.get("key") is None
+
+    cache.put("key", user)
+    session.query(User).filter(User.id == "u1").update({"active": False})
+    assert cache.get("key") is not None
+    session.commit()
+    assert cache.get("key") is None
+
+
+def test_invalidation_reaches_other_workers_through_redis_epochs():
+    redis = _FakeRedis()
+    worker_a = ApiKeyCache(max_entries=10, ttl_seconds=60, redis_client=redis)
+    worker_b = ApiKeyCache(max_entries=10, ttl_seconds=60, redis_client=redis)
+    for cache in (worker_a, worker_b):
+        cache.put("key-1", _user("u1"))
+        cache.put("key-2", _user("u2"))
+
+    worker_a.invalidate_user("u1")
+    assert worker_b.get("key-1") is None
+    assert worker_b.get("key-2")["id"] == "u2"
+
+    worker_a.clear()  # bulk change on users
+    assert worker_b.get("key-2") is None
+    worker_b.put("key-2", _user("u2"))
+    assert worker_b.get("key-2")["id"] == "u2"
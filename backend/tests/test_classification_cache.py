@@ -0,0 +1,63 @@
+"""Tests: two-level classification cache returns classify_event results, counts hits, bounds memory."""
+from app.services.classification_cache import ClassificationCache
+from app.services.classifier import classify_event
+
+PAYLOAD = {
+    "format": "endurance",
+    "duration": 120,
+    "grid": 30,
+    "classes": 2,
+    "damage": "full",
+    "penalties": "strict",
+    "car_class_list": ["GT3", "GT4"],
+    "pit_rules": {"mandatory_stops": 1},
+}
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def setex(self, key, ttl, value):
+        self.data[key] = value
+
+
+def test_cached_result_matches_classify_event_and_is_a_copy():
+    cache = ClassificationCache(max_entries=8)
+    first = cache.classify(PAYLOAD)
+    first["event_tier"] = "E5"
+    first["inputs_snapshot"]["car_class_list"].append("mutated")
+    second = cache.classify(dict(PAYLOAD))
+    assert second == classify_event(PAYLOAD)
+    assert (cache.misses, cache.memory_hits) == (1, 1)
+
+
+def test_entry_does_not_share_lists_with_the_caller_payload():
+    cache = ClassificationCache(max_entries=8)
+    payload = {**PAYLOAD, "car_class_list": ["GT3", "GT4"], "pit_rules": {"mandatory_stops": 1}}
+    expected = classify_event(PAYLOAD)
+    cache.classify(payload)
+    payload["car_class_list"].append("LMP2")
+    payload["pit_rules"]["mandatory_stops"] = 3
+    assert cache.classify(dict(PAYLOAD)) == expected
+    assert cache.memory_hits == 1
+
+
+def test_lru_evicts_oldest_entry():
+    cache = ClassificationCache(max_entries=2)
+    for duration in (10, 20, 30):
+        cache.classify({**PAYLOAD, "duration": duration})
+    cache.classify({**PAYLOAD, "duration": 10})
+    assert cache.stats()["entries"] == 2
+    assert cache.misses == 4
+
+
+def test_redis_tier_shares_results_between_processes():
+    redis = _FakeRedis()
+    ClassificationCache(max_entries=8, redis_client=redis).classify(PAYLOAD)
+    other = ClassificationCache(max_entries=8, redis_client=redis)
+    assert other.classify(PAYLOAD) == classify_event(PAYLOAD)
+    assert (other.redis_hits, other.misses) == (1, 0)
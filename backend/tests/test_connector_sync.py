@@ -0,0 +1,168 @@
+"""Tests: paginated + conditional connector feed fetch (stream_events) against a local stub HTTP server; cursor;
+one sync run per source at a time."""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+from app.repositories.connector_sync_state import ConnectorSyncStateRepository
+from app.services.connector_sync import ConnectorSource, FeedCursor, SyncInProgressError, _source_lock, sync_source
+from app.services.ingestion import IngestItemResult
+from app.services.connectors import FeedFetch, stream_events
+
+PAGES = {
+    "/feed": ({"events": [{"id": "a", "title": "A"}, {"id": "b", "title": "B"}], "next": "/feed?page=2"}, None),
+    "/feed?page=2": ([{"id": "c", "title": "C"}], "/feed?page=3"),
+    "/feed?page=3": ([{"id": "d", "title": "D"}], None),
+}
+ETAG = '"v1"'
+# Second item starts before it was created: the events CHECK constraint makes its ingestion fail
+PARTIAL_FEED = [
+    {"id": "ok", "title": "Spa sprint", "game": "ACC", "start_time_utc": "2027-06-01T18:00:00Z"},
+    {"id": "bad", "title": "Monza sprint", "game": "ACC", "start_time_utc": "2020-01-01T18:00:00Z"},
+]
+
+
+class _FeedHandler(BaseHTTPRequestHandler):
+    requests: list = []
+
+    def do_GET(self):
+        _FeedHandler.requests.append((self.path, dict(self.headers)))
+        if self.path == "/broken":
+            self.send_response(503)
+            self.end_headers()
+            return
+        if self.path in ("/feed", "/partial") and self.headers.get("If-None-Match") == ETAG:
+            self.send_response(304)
+            self.end_headers()
+            return
+        body, next_link = (PARTIAL_FEED, None) if self.path == "/partial" else PAGES[self.path]
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        if self.path in ("/feed", "/partial"):
+            self.send_header("ETag", ETAG)
+            self.send_header("Last-Modified", "Wed, 04 Feb 2026 10:00:00 GMT")
+        if next_link:
+            self.send_header("Link", f'<{next_link}>; rel="next"')
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def feed_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FeedHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def client():
+    with httpx.Client(timeout=5) as c:
+        yield c
+
+
+def test_follows_body_and_link_pagination(feed_url, client):
+    fetch = FeedFetch()
+    events = list(stream_events(f"{feed_url}/feed", api_key="k", fetch=fetch, client=client))
+    assert [e["id"] for e in events] == ["a", "b", "c", "d"]
+    assert fetch.pages == 3
+    assert fetch.etag == ETAG
+    assert fetch.last_modified == "Wed, 04 Feb 2026 10:00:00 GMT"
+    assert _FeedHandler.requests[-1][1].get("X-API-Key") == "k"
+
+
+def test_unchanged_feed_is_skipped(feed_url, client):
+    fetch = FeedFetch(etag=ETAG, last_modified="Wed, 04 Feb 2026 10:00:00 GMT")
+    assert list(stream_events(f"{feed_url}/feed", fetch=fetch, client=client)) == []
+    assert fetch.not_modified is True
+    assert fetch.pages == 0
+    path, headers = _FeedHandler.requests[-1]
+    assert path == "/feed"
+    assert headers.get("If-Modified-Since") == "Wed, 04 Feb 2026 10:00:00 GMT"
+
+
+def test_max_pages_bounds_pagination(feed_url, client):
+    events = list(stream_events(f"{feed_url}/feed", max_pages=2, client=client))
+    assert [e["id"] for e in events] == ["a", "b", "c"]
+
+
+def test_http_error_raises(feed_url, client):
+    with pytest.raises(httpx.HTTPStatusError):
+        list(stream_events(f"{feed_url}/broken", client=client))
+
+
+def test_cursor_tracks_newest_item_and_builds_delta_params():
+    cursor = FeedCursor("2026-02-01T00:00:00Z", "old")
+    feed = [
+        {"id": "a", "updated_at": "2026-02-03T10:00:00+00:00"},
+        {"id": 7, "event": {"updated_at": "2026-02-04T09:00:00Z"}},
+        {"id": "c", "updated_at": "2026-02-02T00:00:00Z"},
+        {"id": "d", "updated_at": "not a date"},
+    ]
+    assert list(cursor.track(feed)) == feed
+    cursor.record([IngestItemResult(index=i, source_event_id=None, raw_event_id=f"r{i}") for i in range(4)])
+    cursor.advance()
+    assert (cursor.updated_at, cursor.source_event_id) == ("2026-02-04T09:00:00Z", "7")
+    assert cursor.params() == {"updated_since": "2026-02-04T09:00:00Z", "after_id": "7"}
+    assert FeedCursor().params() == {}
+
+
+def test_cursor_stops_before_the_oldest_failed_item():
+    cursor = FeedCursor("2026-02-01T00:00:00Z", "old")
+    feed = [
+        {"id": "a", "updated_at": "2026-02-02T00:00:00Z"},
+        {"id": "b", "updated_at": "2026-02-03T00:00:00Z"},
+        {"id": "c", "updated_at": "2026-02-04T00:00:00Z"},
+    ]
+    stored = [IngestItemResult(index=0, source_event_id="a", raw_event_id="r0")]
+    failed = [IngestItemResult(index=1, source_event_id="b", status="failed", errors=["ingest_error"])]
+    later = [IngestItemResult(index=2, source_event_id="c", raw_event_id="r2")]
+    list(cursor.track(feed))
+    for results in (stored, failed, later):  # streaming: one call per chunk
+        cursor.record(results)
+    cursor.advance()
+    assert (cursor.updated_at, cursor.source_event_id) == ("2026-02-02T00:00:00Z", "a")
+
+    # Nothing stored before the first failure: the cursor stays where it was
+    cursor = FeedCursor("2026-02-01T00:00:00Z", "old")
+    list(cursor.track(feed[1:]))
+    cursor.record(failed + later)
+    cursor.advance()
+    assert (cursor.updated_at, cursor.source_event_id) == ("2026-02-01T00:00:00Z", "old")
+
+
+def test_run_with_failed_items_drops_validators_so_the_next_run_refetches(feed_url, client, sqlite_session):
+    source = ConnectorSource("partial", f"{feed_url}/partial", None)
+    first = sync_source(sqlite_session, source, client)
+    assert (first["status"], first["failed"]) == ("ok", 1)
+    state = ConnectorSyncStateRepository(sqlite_session).get("partial")
+    assert (state.etag, state.last_modified) == (None, None)
+
+    second = sync_source(sqlite_session, source, client)
+    path, headers = _FeedHandler.requests[-1]
+    assert path == "/partial" and "If-None-Match" not in headers
+    assert second["status"] == "ok" and second["failed"] == 1  # not skipped by a 304
+
+
+def test_overlapping_run_of_the_same_source_is_refused(feed_url, client, sqlite_session):
+    source = ConnectorSource("partial", f"{feed_url}/partial", None)
+    requests_before = len(_FeedHandler.requests)
+    with _source_lock(sqlite_session, "partial"):
+        with pytest.raises(SyncInProgressError):
+            sync_source(sqlite_session, source, client)
+        # Other sources are not blocked
+        with _source_lock(sqlite_session, "feed"):
+            pass
+    assert len(_FeedHandler.requests) == requests_before
+    assert ConnectorSyncStateRepository(sqlite_session).get("partial") is None
+    assert sync_source(sqlite_session, source, client)["status"] == "ok"
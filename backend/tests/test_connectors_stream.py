@@ -0,0 +1,43 @@
+"""Tests: incremental connector feed parsing (iter_feed_events) matches extract_events on any chunking."""
+import json
+
+import pytest
+
+from app.services.connectors import extract_events, iter_feed_events
+
+
+def _chunks(data: bytes, size: int):
+    for i in range(0, len(data), size):
+        yield data[i:i + size]
+
+
+EVENTS = [
+    {"id": 1, "title": "Nürburgring 24h", "duration_minutes": 1440, "pit_rules": {"note": "]},"}},
+    "not-an-event",
+    {"id": 2, "title": "Spa sprint", "grid": 30.5},
+]
+
+
+@pytest.mark.parametrize("size", [1, 3, 7, 64, 4096])
+@pytest.mark.parametrize(
+    "data",
+    [EVENTS, {"meta": {"total": 2, "tags": ["}", "["]}, "events": EVENTS, "next": None}],
+)
+def test_stream_matches_extract_events(data, size):
+    payload = json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+    assert list(iter_feed_events(_chunks(payload, size))) == extract_events(data)
+
+
+def test_stream_yields_before_feed_is_complete():
+    payload = json.dumps(EVENTS).encode("utf-8")
+    truncated = payload[: payload.index(b'"not-an-event"')]
+    stream = iter_feed_events(_chunks(truncated, 5))
+    assert next(stream)["id"] == 1
+    with pytest.raises(ValueError):
+        next(stream)
+
+
+@pytest.mark.parametrize("payload", [b'{"meta": 1}', b'{"events": 5}', b"42", b""])
+def test_stream_rejects_unsupported_shapes(payload):
+    with pytest.raises(ValueError):
+        list(iter_feed_events(_chunks(payload, 4)))
@@ -0,0 +1,110 @@
+"""Tests: CRS recompute queue coalesces triggers per (driver_id, discipline); a failing key is isolated and dropped."""
+from app.services import crs_queue
+from app.services.crs_queue import CRSRecomputeWorker, MemoryCRSQueue
+
+
+def test_memory_queue_coalesces_burst_into_one_key():
+    queue = MemoryCRSQueue()
+    coalesced = [queue.push("d1", "gt", f"p{i}") for i in range(10)]
+    assert coalesced == [False] + [True] * 9
+    assert queue.drain() == [("d1", "gt", "p9")]
+    assert queue.drain() == []
+
+
+def test_memory_queue_keeps_trigger_when_later_push_has_none():
+    queue = MemoryCRSQueue()
+    queue.push("d1", "gt", "p1")
+    queue.push("d1", "gt", None)
+    queue.push("d1", "formula", None)
+    assert sorted(queue.drain()) == [("d1", "formula", None), ("d1", "gt", "p1")]
+
+
+def test_worker_flush_recomputes_each_key_once(monkeypatch):
+    batches = []
+
+    class _Session:
+        def rollback(self):
+            pass
+
+        def close(self):
+            pass
+
+    monkeypatch.setattr(crs_queue, "SessionLocal", _Session)
+    monkeypatch.setattr(
+        crs_queue, "recompute_crs_batch", lambda session, keys: batches.append(keys) or list(keys)
+    )
+    worker = CRSRecomputeWorker(MemoryCRSQueue(), debounce_seconds=60)
+    for _ in range(10):
+        worker.enqueue("d1", "gt", "p1")
+    worker.enqueue("d2", "gt")
+    assert worker.flush() == 2
+    assert len(batches) == 1
+    assert sorted(batches[0]) == [("d1", "gt", "p1"), ("d2", "gt", None)]
+    stats = worker.stats()
+    assert stats["enqueued"] == 11
+    assert stats["coalesced"] == 9
+    assert stats["recomputed"] == 2
+
+
+def test_worker_requeues_keys_of_a_failed_batch(monkeypatch):
+    class _Session:
+        def rollback(self):
+            pass
+
+        def close(self):
+            pass
+
+    def failing_batch(session, keys):
+        raise RuntimeError("connection reset")
+
+    monkeypatch.setattr(crs_queue, "SessionLocal", _Session)
+    monkeypatch.setattr(crs_queue, "recompute_crs_batch", failing_batch)
+    worker = CRSRecomputeWorker(MemoryCRSQueue(), debounce_seconds=60)
+    worker.enqueue("d1", "gt", "p1")
+    worker.enqueue("d2", "gt")
+    assert worker.flush() == 0
+    # A trigger pushed after the drain is kept over the failed batch's one
+    worker.queue.push("d1", "gt", "p2")
+    worker.queue.requeue([("d1", "gt", "p1")])
+    assert sorted(worker.queue.drain()) == [("d1", "gt", "p2"), ("d2", "gt", None)]
+    stats = worker.stats()
+    assert stats["failed_batches"] == 1 and stats["requeued"] == 2
+
+
+def test_poison_key_is_isolated_and_dropped_after_max_attempts(monkeypatch):
+    class _Session:
+        def rollback(self):
+            pass
+
+        def close(self):
+            pass
+
+    recomputed = []
+
+    def batch(session, keys):
+        if any(driver_id == "bad" for driver_id, _, _ in keys):
+            raise RuntimeError("numeric field overflow")
+        recomputed.extend(keys)
+        return list(keys)
+
+    monkeypatch.setattr(crs_queue, "SessionLocal", _Session)
+    monkeypatch.setattr(crs_queue, "recompute_crs_batch", batch)
+    worker = CRSRecomputeWorker(MemoryCRSQueue(), debounce_seconds=60, max_attempts=3)
+    worker.enqueue("d1", "gt")
+    worker.enqueue("bad", "gt")
+    worker.enqueue("d2", "gt")
+    # The batch fails, the per-key retry recomputes the healthy keys and requeues only the bad one
+    assert worker.flush() == 2
+    assert sorted(recomputed) == [("d1", "gt", None), ("d2", "gt", None)]
+    assert worker.queue.size() == 1
+
+    assert worker.flush() == 0 and worker.queue.size() == 1
+    assert worker.flush() == 0 and worker.queue.size() == 0  # third failure: dropped
+    stats = worker.stats()
+    assert (stats["failed_batches"], stats["requeued"], stats["dropped"]) == (3, 2, 1)
+
+    # A key that recovers starts counting from zero again
+    worker.enqueue("bad", "gt")
+    worker.flush()
+    monkeypatch.setattr(crs_queue, "recompute_crs_batch", lambda session, keys: list(keys))
+    assert worker.flush() == 1 and worker._attempts == {}
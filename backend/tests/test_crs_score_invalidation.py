@@ -0,0 +1,56 @@
+"""Tests: incident changes null crs_base_score of the participations they belong (or belonged) to."""
+from datetime import datetime, timedelta, timezone
+
+from app.models.event import Event
+from app.models.incident import Incident
+from app.models.participation import Participation
+
+NOW = datetime(2026, 3, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def _scored_participations(session):
+    events = [
+        Event(title=f"Race {i}", source="test", game="ACC", start_time_utc=NOW + timedelta(days=i), created_at=NOW)
+        for i in range(2)
+    ]
+    session.add_all(events)
+    session.flush()
+    parts = [Participation(driver_id="d1", event_id=event.id, discipline="gt") for event in events]
+    session.add_all(parts)
+    session.flush()
+    incident = Incident(participation_id=parts[0].id, incident_type="contact", score=2.0)
+    session.add(incident)
+    session.commit()
+    for part in parts:
+        part.crs_base_score = 80.0
+    session.commit()
+    return parts, incident
+
+
+def _scores(session, parts):
+    session.expire_all()
+    return [session.get(Participation, part.id).crs_base_score for part in parts]
+
+
+def test_moving_an_incident_marks_old_and_new_participation_stale(sqlite_session):
+    session = sqlite_session
+    parts, incident = _scored_participations(session)
+    incident.participation_id = parts[1].id
+    session.commit()
+    assert _scores(session, parts) == [None, None]
+
+
+def test_moving_an_incident_through_the_relationship_marks_both_stale(sqlite_session):
+    session = sqlite_session
+    parts, incident = _scored_participations(session)
+    incident.participation = session.get(Participation, parts[1].id)
+    session.commit()
+    assert _scores(session, parts) == [None, None]
+
+
+def test_score_change_only_marks_its_own_participation_stale(sqlite_session):
+    session = sqlite_session
+    parts, incident = _scored_participations(session)
+    incident.score = 4.0
+    session.commit()
+    assert _scores(session, parts) == [None, 80.0]
@@ -4,7 +4,13 @@ import hashlib
 
 import pytest
 
-from app.services.crs import compute_inputs, compute_inputs_hash, recompute_crs
+from app.services.crs import (
+    compute_crs,
+    compute_crs_incremental,
+    compute_inputs,
+    compute_inputs_hash,
+    recompute_crs,
+)
 
 
 def test_compute_inputs_hash_deterministic():
@@ -61,3 +67,19 @@ class TestRecomputeCrsSnapshot:
         rec1 = recompute_crs(session, driver.id, discipline, None)
         rec2 = recompute_crs(session, driver.id, discipline, None)
         assert rec1.inputs_hash == rec2.inputs_hash
+
+    def test_incremental_crs_matches_full_recompute(self, session):
+        from app.models.driver import Driver
+        driver = session.query(Driver).first()
+        if not driver:
+            pytest.skip("no drivers")
+        discipline = driver.primary_discipline or "gt"
+        try:
+            full = compute_crs(session, driver.id, discipline)
+            full_inputs = compute_inputs(session, driver.id, discipline)
+        except ValueError:
+            pytest.skip("driver has participations without classification")
+        result, inputs = compute_crs_incremental(session, driver.id, discipline)
+        assert result.score == full.score
+        assert result.inputs == full.inputs
+        assert compute_inputs_hash(inputs) == compute_inputs_hash(full_inputs)
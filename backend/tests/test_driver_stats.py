@@ -0,0 +1,191 @@
+"""Tests: driver_stats follows flushed participations/incidents/penalties with per-commit deltas (matching the full
+recompute) and falls back to the recompute for bulk deletes and deleted participations."""
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select
+
+from app.models.driver_stats import DriverStats
+from app.models.event import Event
+from app.models.incident import Incident
+from app.models.participation import Participation, ParticipationState, ParticipationStatus
+from app.models.penalty import Penalty
+from app.services.driver_stats import refresh_driver_stats
+
+NOW = datetime(2026, 3, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def _events(session, count):
+    events = [
+        Event(title=f"Race {i}", source="test", game="ACC", start_time_utc=NOW + timedelta(days=i), created_at=NOW)
+        for i in range(count)
+    ]
+    session.add_all(events)
+    session.flush()
+    return events
+
+
+def _stats(session, driver_id="d1"):
+    session.expire_all()
+    return {
+        row.discipline: row
+        for row in session.query(DriverStats).filter(DriverStats.driver_id == driver_id)
+    }
+
+
+def _stats_writes(session):
+    statements = session.info["statements"]
+    return [s for s in statements if "driver_stats" in s and not s.lstrip().upper().startswith("SELECT")]
+
+
+def _recomputes(session):
+    return [s for s in session.info["statements"] if "GROUP BY" in s]
+
+
+def _counters(session):
+    session.expire_all()
+    columns = [c for c in DriverStats.__table__.columns.keys() if c != "updated_at"]
+    rows = session.execute(select(*(DriverStats.__table__.c[c] for c in columns)))
+    return sorted(tuple(row) for row in rows)
+
+
+def test_listener_writes_deltas_once_per_commit(sqlite_session):
+    session = sqlite_session
+    first, second, third = _events(session, 3)
+    finished = Participation(
+        driver_id="d1",
+        event_id=first.id,
+        discipline="gt",
+        status=ParticipationStatus.finished,
+        participation_state=ParticipationState.completed,
+        finished_at=NOW,
+    )
+    dnf = Participation(
+        driver_id="d1",
+        event_id=second.id,
+        discipline="gt",
+        status=ParticipationStatus.dnf,
+        participation_state=ParticipationState.completed,
+        finished_at=NOW + timedelta(days=1),
+    )
+    other = Participation(driver_id="d2", event_id=first.id, discipline="formula")
+    session.add_all([finished, dnf, other])
+    session.flush()
+    incident = Incident(participation_id=finished.id, incident_type="contact", score=2.5)
+    session.add(incident)
+    session.flush()
+    session.add(Penalty(incident_id=incident.id, penalty_type="time_penalty"))
+    session.flush()
+    # Flushes only collect deltas; the rows are written once, before commit, without any recompute
+    assert _stats_writes(session) == []
+    session.commit()
+    assert len(_stats_writes(session)) == 1  # one upsert for both drivers
+    assert _recomputes(session) == []
+
+    gt = _stats(session)["gt"]
+    assert (gt.participations_count, gt.completed_count, gt.finished_count, gt.dnf_count) == (2, 2, 1, 1)
+    assert (gt.incidents_count, gt.incident_score_sum, gt.penalties_count) == (1, 2.5, 1)
+    assert gt.last_race_at.replace(tzinfo=timezone.utc) == NOW + timedelta(days=1)
+    assert _stats(session, "d2")["formula"].registered_count == 1
+
+    # Status changed while unloaded (old value unknown): recomputed; a deleted participation's discipline disappears
+    part = session.get(Participation, dnf.id)
+    part.status = ParticipationStatus.dsq
+    session.add(Participation(driver_id="d1", event_id=third.id, discipline="formula"))
+    session.commit()
+    stats = _stats(session)
+    assert (stats["gt"].dnf_count, stats["gt"].dsq_count, stats["formula"].participations_count) == (0, 1, 1)
+
+    formula = session.query(Participation).filter(Participation.driver_id == "d1", Participation.discipline == "formula")
+    session.delete(formula.one())
+    session.commit()
+    assert set(_stats(session)) == {"gt"}
+
+
+def test_bulk_deletes_refresh_the_affected_drivers_on_commit(sqlite_session):
+    session = sqlite_session
+    first, second = _events(session, 2)
+    parts = [
+        Participation(driver_id="d1", event_id=event.id, discipline="gt", finished_at=NOW) for event in (first, second)
+    ]
+    session.add_all(parts)
+    session.flush()
+    incidents = [Incident(participation_id=part.id, incident_type="contact", score=1.0) for part in parts]
+    session.add_all(incidents)
+    session.flush()
+    session.add_all([Penalty(incident_id=incident.id, penalty_type="warning") for incident in incidents])
+    session.commit()
+    assert _stats(session)["gt"].penalties_count == 2
+    part_id, incident_id = parts[1].id, incidents[1].id
+    session.info["statements"].clear()
+
+    # Cascading cleanup: penalties, incidents, then the participation
+    session.query(Penalty).filter(Penalty.incident_id == incident_id).delete(synchronize_session=False)
+    session.query(Incident).filter(Incident.id == incident_id).delete(synchronize_session=False)
+    session.query(Participation).filter(Participation.id == part_id).delete(synchronize_session=False)
+    assert _stats_writes(session) == []
+    session.commit()
+
+    gt = _stats(session)["gt"]
+    assert (gt.participations_count, gt.incidents_count, gt.incident_score_sum, gt.penalties_count) == (1, 1, 1.0, 1)
+
+    session.query(Incident).delete(synchronize_session=False)
+    session.query(Participation).filter(Participation.driver_id == "d1").delete(synchronize_session=False)
+    session.commit()
+    assert _stats(session) == {}
+
+
+def test_rolled_back_changes_leave_nothing_queued(sqlite_session):
+    session = sqlite_session
+    (event,) = _events(session, 1)
+    session.commit()
+    session.add(Participation(driver_id="d1", event_id=event.id, discipline="gt"))
+    session.flush()
+    session.rollback()
+    session.info["statements"].clear()
+    session.commit()
+    assert _stats_writes(session) == []
+    assert _stats(session) == {}
+
+
+def test_deltas_match_the_full_recompute(sqlite_session):
+    session = sqlite_session
+    first, second, third = _events(session, 3)
+    parts = [
+        Participation(
+            driver_id="d1", event_id=event.id, discipline="gt", started_at=NOW, created_at=NOW - timedelta(days=1)
+        )
+        for event in (first, second)
+    ]
+    session.add_all(parts)
+    session.flush()
+    incidents = [
+        Incident(participation_id=part.id, incident_type="contact", score=score)
+        for part, score in ((parts[0], 1.5), (parts[0], 2.0), (parts[1], 4.0))
+    ]
+    session.add_all(incidents)
+    session.flush()
+    session.add_all([Penalty(incident_id=incident.id, penalty_type="warning") for incident in incidents])
+    session.commit()
+
+    # Loaded rows: state/status moves, score change, incident delete (cascading its penalty), orphaned penalty,
+    # a later finish and a new participation in another discipline
+    session.info["statements"].clear()
+    for part in parts:
+        part.status, part.participation_state
+    parts[0].participation_state = ParticipationState.completed
+    parts[0].status = ParticipationStatus.dnf
+    parts[0].finished_at = NOW + timedelta(hours=2)
+    incidents[0].score = 3.0
+    session.delete(incidents[1])
+    incidents[2].penalties.clear()
+    session.add(Participation(driver_id="d1", event_id=third.id, discipline="formula", finished_at=NOW))
+    session.commit()
+    assert _recomputes(session) == []
+    incremental = _counters(session)
+
+    refresh_driver_stats(session.connection(), ["d1"])
+    session.commit()
+    assert _counters(session) == incremental
+    gt = _stats(session)["gt"]
+    assert (gt.incidents_count, gt.incident_score_sum, gt.penalties_count, gt.dnf_count) == (2, 7.0, 1, 1)
+    assert gt.last_race_at.replace(tzinfo=timezone.utc) == NOW + timedelta(hours=2)
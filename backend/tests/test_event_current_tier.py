@@ -0,0 +1,106 @@
+"""Tests: events.current_tier follows classification insert/update/delete; migration 0049 backfills the latest tier."""
+import importlib.util
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+from sqlalchemy import text
+
+from app.models.classification import Classification
+from app.models.event import Event
+
+START = datetime(2026, 3, 1, 18, 0, tzinfo=timezone.utc)
+
+_spec = importlib.util.spec_from_file_location(
+    "migration_0049", Path(__file__).resolve().parents[1] / "alembic" / "versions" / "0049_event_current_tier.py"
+)
+migration_0049 = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(migration_0049)
+
+
+def _event(title="Spa sprint") -> Event:
+    return Event(title=title, source="test", game="ACC", start_time_utc=START, created_at=START - timedelta(days=1))
+
+
+def _classification(event_id: str, tier: str) -> Classification:
+    return Classification(
+        event_id=event_id,
+        event_tier=tier,
+        tier_label=tier,
+        difficulty_score=50.0,
+        seriousness_score=50.0,
+        realism_score=50.0,
+        classification_version="test",
+        inputs_hash="0" * 64,
+    )
+
+
+def _stored_tier(session, event_id):
+    return session.execute(text("SELECT current_tier FROM events WHERE id = :id"), {"id": event_id}).scalar()
+
+
+def test_current_tier_follows_classification_insert_update_delete(sqlite_session):
+    session = sqlite_session
+    event = _event()
+    session.add(event)
+    session.flush()
+    assert event.current_tier is None
+
+    classification = _classification(event.id, "E2")
+    session.add(classification)
+    session.commit()
+    # The loaded Event is refreshed in place and not left dirty
+    assert event.current_tier == "E2" and event not in session.dirty
+    assert _stored_tier(session, event.id) == "E2"
+
+    classification.event_tier = "E4"
+    session.commit()
+    assert event.current_tier == "E4" and _stored_tier(session, event.id) == "E4"
+
+    session.delete(classification)
+    session.commit()
+    assert event.current_tier is None and _stored_tier(session, event.id) is None
+
+
+def test_listener_updates_event_that_is_not_loaded(sqlite_session):
+    session = sqlite_session
+    event = _event()
+    session.add(event)
+    session.commit()
+    event_id = event.id
+    session.expunge_all()
+
+    session.add(_classification(event_id, "E3"))
+    session.commit()
+    assert session.get(Event, event_id).current_tier == "E3"
+
+
+def test_backfill_picks_the_latest_classification(sqlite_session):
+    session = sqlite_session
+    events = [_event(title) for title in ("Spa", "Monza", "Imola")]
+    session.add_all(events)
+    session.commit()
+    spa, monza, imola = (e.id for e in events)
+
+    connection = session.connection()
+    # Schema before 0049 (index from 0050 dropped with the column), legacy duplicate classifications
+    connection.execute(text("DROP INDEX ix_events_current_tier_start_time"))
+    connection.execute(text("ALTER TABLE events DROP COLUMN current_tier"))
+    connection.execute(text("DROP TABLE classifications"))
+    connection.execute(text("CREATE TABLE classifications (id TEXT, event_id TEXT, event_tier TEXT, created_at TEXT)"))
+    for row_id, event_id, tier, created_at in (
+        ("c1", spa, "E1", "2026-01-01 10:00:00"),
+        ("c2", spa, "E3", "2026-01-03 10:00:00"),
+        ("c3", spa, "E2", "2026-01-02 10:00:00"),
+        ("c4", monza, "E5", "2026-01-01 10:00:00"),
+    ):
+        connection.execute(
+            text("INSERT INTO classifications VALUES (:id, :event_id, :tier, :created_at)"),
+            {"id": row_id, "event_id": event_id, "tier": tier, "created_at": created_at},
+        )
+
+    with Operations.context(MigrationContext.configure(connection)):
+        migration_0049.upgrade()
+
+    assert [_stored_tier(session, event_id) for event_id in (spa, monza, imola)] == ["E3", "E5", None]
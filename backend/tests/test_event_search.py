@@ -0,0 +1,51 @@
+"""Tests: upcoming/past event count cache keys, TTL and size bound; SQL rig filter parity."""
+import itertools
+
+from app.services.event_search import EventCountCache, _count_key
+from app.utils.rig_compat import driver_rig_ranks, driver_rig_satisfies_event, event_rig_requirements
+
+
+def test_count_key_ignores_game_order_and_unused_recent_days():
+    rig = (1, 2, False)
+    assert _count_key("upcoming", "E2", ["ACC", "iRacing"], rig, 30) == _count_key("upcoming", "E2", ["iRacing", "ACC"], rig, 7)
+    assert _count_key("past", "E2", ["ACC"], rig, 30) != _count_key("past", "E2", ["ACC"], rig, 7)
+    assert _count_key("past", "E2", None, rig, 30) == _count_key("past", "E2", [], rig, 30)
+    assert _count_key("past", "E2", None, rig, 30) != _count_key("past", "E2", None, (0, 0, False), 30)
+
+
+def test_counts_expire_and_size_is_bounded():
+    expired = EventCountCache(max_entries=10, ttl_seconds=-1)
+    expired.put(("upcoming", "E2", (), None, 0), 5)
+    assert expired.get(("upcoming", "E2", (), None, 0)) is None
+
+    cache = EventCountCache(max_entries=2, ttl_seconds=60)
+    for i in range(3):
+        cache.put(("upcoming", f"E{i}", (), None, 0), i)
+    assert cache.get(("upcoming", "E0", (), None, 0)) is None
+    assert cache.get(("upcoming", "E2", (), None, 0)) == 2
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def _ranks_satisfy(driver_rig: dict | None, event_rig: dict | None) -> bool:
+    # Same predicate as app.repositories.event.rig_filters, evaluated in Python.
+    req = event_rig_requirements(event_rig)
+    wheel, pedals, clutch = driver_rig_ranks(driver_rig)
+    return (
+        (req["rig_wheel_rank"] is None or req["rig_wheel_rank"] <= wheel)
+        and (req["rig_pedals_rank"] is None or req["rig_pedals_rank"] <= pedals)
+        and (clutch or not req["rig_clutch_required"])
+    )
+
+
+def test_rig_ranks_agree_with_driver_rig_satisfies_event():
+    values = {
+        "wheel_type": [None, "legacy", "force_feedback_nm", "unknown"],
+        "pedals_class": [None, "basic", "spring", "premium"],
+        "manual_with_clutch": [None, True, False],
+    }
+    rigs = [None] + [
+        {k: v for k, v in zip(values, combo) if v is not None} for combo in itertools.product(*values.values())
+    ]
+    for driver_rig in rigs:
+        for event_rig in rigs:
+            assert _ranks_satisfy(driver_rig, event_rig) == driver_rig_satisfies_event(driver_rig, event_rig)
@@ -0,0 +1,57 @@
+"""Tests: materialized events.event_signature on insert/update matches the signature computed from the row."""
+import importlib.util
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from sqlalchemy import text
+
+from app.domain.events import event_signature
+from app.models.event import Event
+
+START = datetime(2026, 3, 1, 18, 0, tzinfo=timezone.utc)
+
+_spec = importlib.util.spec_from_file_location(
+    "migration_0043", Path(__file__).resolve().parents[1] / "alembic" / "versions" / "0043_event_signature.py"
+)
+migration_0043 = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(migration_0043)
+
+
+def _event(**fields) -> Event:
+    return Event(title="Spa sprint", source="test", game="ACC", start_time_utc=START, created_at=START - timedelta(days=1), **fields)
+
+
+def _row(session, event_id):
+    return session.execute(text("SELECT * FROM events WHERE id = :id"), {"id": event_id}).one()
+
+
+def test_signature_on_insert_matches_persisted_row_and_migration_backfill(sqlite_session):
+    event = _event(car_class_list=["GT3", "GT4"], duration_minutes=45)
+    sqlite_session.add(event)
+    sqlite_session.commit()
+    stored = event.event_signature
+    sqlite_session.expire_all()
+    # Defaults applied by the INSERT (session_type, weather, ...) are part of the signature
+    reloaded = sqlite_session.get(Event, event.id)
+    assert stored == event_signature(reloaded)
+    assert stored == migration_0043._signature(_row(sqlite_session, event.id))
+
+
+def test_signature_follows_updates(sqlite_session):
+    event = _event()
+    sqlite_session.add(event)
+    sqlite_session.commit()
+    before = event.event_signature
+
+    event.title = "Renamed"
+    sqlite_session.commit()
+    assert event.event_signature == before
+
+    event.night = True
+    event.duration_minutes = 180
+    sqlite_session.commit()
+    sqlite_session.expire_all()
+    reloaded = sqlite_session.get(Event, event.id)
+    assert reloaded.event_signature != before
+    assert reloaded.event_signature == event_signature(reloaded)
+    assert reloaded.event_signature == migration_0043._signature(_row(sqlite_session, event.id))
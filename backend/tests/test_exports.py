@@ -0,0 +1,117 @@
+"""Tests: export encoders, query filters, and filtered exports streamed from SQLite (order, filters, CSV columns)."""
+import asyncio
+import csv
+import io
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app.api.routes.exports import export_dataset
+from app.models.event import Event
+from app.models.participation import Participation, ParticipationStatus
+from app.services import exports
+from app.services.exports import ExportFilters, csv_chunks, export_query, iter_export_rows, ndjson_chunks
+
+ROWS = [
+    {"id": "p1", "status": ParticipationStatus.finished, "created_at": datetime(2026, 1, 1, 10), "details": {"a": 1}},
+    {"id": "p2", "status": ParticipationStatus.dnf, "created_at": datetime(2026, 1, 2, 10), "details": None},
+]
+
+
+def test_ndjson_chunks_one_object_per_line():
+    body = b"".join(ndjson_chunks(iter(ROWS), rows_per_chunk=1)).decode()
+    assert body.splitlines() == [
+        '{"id": "p1", "status": "finished", "created_at": "2026-01-01T10:00:00", "details": {"a": 1}}',
+        '{"id": "p2", "status": "dnf", "created_at": "2026-01-02T10:00:00", "details": null}',
+    ]
+
+
+def test_csv_chunks_header_and_rows():
+    chunks = list(csv_chunks(iter(ROWS), ["id", "status", "details"], rows_per_chunk=1))
+    assert b"".join(chunks).decode().splitlines() == ["id,status,details", 'p1,finished,"{""a"": 1}"', "p2,dnf,"]
+
+
+def test_export_query_rejects_unsupported_filter():
+    with pytest.raises(ValueError):
+        export_query("audit_logs", ExportFilters(event_id="e1"))
+
+
+DAY = datetime(2026, 1, 1, 10, 0)
+
+
+@pytest.fixture
+def participations_db(sqlite_session, monkeypatch):
+    """Five participations of d1/d2 over four days; two share a created_at (ordered by id)."""
+    session = sqlite_session
+    events = [
+        Event(
+            id=f"e{i}", title=f"Race {i}", source="test", game="ACC", start_time_utc=DAY + timedelta(days=10), created_at=DAY
+        )
+        for i in range(3)
+    ]
+    session.add_all(events)
+    session.flush()
+    for part_id, driver_id, event_id, day in (
+        ("p-b", "d2", "e0", 0),
+        ("p-a", "d1", "e0", 0),
+        ("p-c", "d1", "e1", 1),
+        ("p-d", "d2", "e1", 2),
+        ("p-e", "d1", "e2", 3),
+    ):
+        session.add(
+            Participation(
+                id=part_id,
+                driver_id=driver_id,
+                event_id=event_id,
+                discipline="gt",
+                status=ParticipationStatus.finished,
+                created_at=DAY + timedelta(days=day),
+            )
+        )
+    session.commit()
+    # iter_export_rows opens its own session: same in-memory database
+    monkeypatch.setattr(exports, "SessionLocal", sessionmaker(bind=session.get_bind()))
+    return session
+
+
+def _export_csv(**params) -> list[list[str]]:
+    response = export_dataset("participations", format="csv", _=None, **params)
+
+    async def read():
+        return b"".join([chunk async for chunk in response.body_iterator])
+
+    return list(csv.reader(io.StringIO(asyncio.run(read()).decode())))
+
+
+def test_rows_stream_oldest_first_in_small_batches(participations_db):
+    query = export_query("participations", ExportFilters())
+    rows = list(iter_export_rows(query, batch_size=2))
+    assert [row["id"] for row in rows] == ["p-a", "p-b", "p-c", "p-d", "p-e"]
+    assert rows[0]["event_title"] == "Race 0"
+
+
+def test_csv_export_applies_filters_and_keeps_columns_aligned(participations_db):
+    columns = [column.key for column in export_query("participations", ExportFilters()).selected_columns]
+    header, *rows = _export_csv()
+    assert header == columns
+    assert all(len(row) == len(header) for row in rows)
+    assert [row[header.index("id")] for row in rows] == ["p-a", "p-b", "p-c", "p-d", "p-e"]
+    record = dict(zip(header, rows[2]))
+    assert (record["driver_id"], record["event_id"], record["event_title"], record["status"]) == (
+        "d1",
+        "e1",
+        "Race 1",
+        "finished",
+    )
+    assert record["created_at"].startswith("2026-01-02T10:00:00")
+
+    _, *d1 = _export_csv(driver_id="d1")
+    assert [row[0] for row in d1] == ["p-a", "p-c", "p-e"]
+    # since inclusive, until exclusive
+    _, *window = _export_csv(since=DAY + timedelta(days=1), until=DAY + timedelta(days=3))
+    assert [row[0] for row in window] == ["p-c", "p-d"]
+    _, *combined = _export_csv(driver_id="d2", since=DAY + timedelta(days=1))
+    assert [row[0] for row in combined] == ["p-d"]
+    header, *empty = _export_csv(driver_id="nobody")
+    assert header == columns and empty == []
@@ -0,0 +1,88 @@
+"""Tests: bulk connector ingestion dedupes by source_event_id (also against concurrent writers) and retries a
+failing chunk item by item."""
+from app.services import ingestion
+from app.domain.events import event_signature
+from app.models.classification import Classification
+from app.models.event import Event
+from app.models.raw_event import RawEvent
+from app.services.ingestion import ingest_payloads_bulk, summarize_ingest
+from app.utils.rig_compat import event_rig_requirements
+
+_real_existing = ingestion._existing_raw_events
+
+
+def _payload(source_event_id: str, **fields) -> dict:
+    return {
+        "id": source_event_id,
+        "title": f"Spa GT3 sprint {source_event_id}",
+        "game": "ACC",
+        "start_time_utc": "2027-06-01T18:00:00Z",
+        "car_class_list": ["GT3"],
+        **fields,
+    }
+
+
+def test_duplicates_in_batch_and_already_ingested_share_one_raw_event(sqlite_session):
+    session = sqlite_session
+    first = ingest_payloads_bulk(session, "feed", [_payload("a")])
+    payloads = [_payload("b"), _payload("a"), _payload("b"), _payload("c"), {"title": "No id", "game": "ACC"}]
+    session.info["statements"].clear()
+    results = ingest_payloads_bulk(session, "feed", payloads, chunk_size=10)
+
+    assert [r.index for r in results] == [0, 1, 2, 3, 4]
+    assert [r.duplicate for r in results] == [False, True, True, False, False]
+    assert results[1].raw_event_id == first[0].raw_event_id
+    assert (results[2].raw_event_id, results[2].event_id) == (results[0].raw_event_id, results[0].event_id)
+    # Duplicates report the status of the raw event they resolve to
+    assert summarize_ingest(results) == {"total": 5, "classified": 5, "failed": 0, "duplicates": 2}
+    # One dedupe query, then one INSERT per table for the single chunk
+    assert sum(stmt.lstrip().upper().startswith("SELECT") for stmt in session.info["statements"]) == 1
+    assert session.query(RawEvent).filter(RawEvent.source_event_id == "b").count() == 1
+    assert session.query(RawEvent).count() == 4  # a, b, c and the payload without an id
+
+
+def test_failing_chunk_falls_back_to_row_by_row_insert(sqlite_session):
+    session = sqlite_session
+    payloads = [
+        _payload("ok-1"),
+        # Start before created_at: the events CHECK constraint rejects the chunk's bulk INSERT
+        _payload("past", start_time_utc="2020-01-01T18:00:00Z"),
+        _payload("ok-2", night=True),
+    ]
+    results = ingest_payloads_bulk(session, "feed", payloads, chunk_size=3)
+
+    assert [r.status for r in results] == ["classified", "failed", "classified"]
+    assert results[1].errors == ["ingest_error"] and results[1].raw_event_id is None
+    assert {e.id for e in session.query(Event)} == {results[0].event_id, results[2].event_id}
+    assert session.query(RawEvent).filter(RawEvent.source_event_id == "past").count() == 0
+
+    # Columns the ORM listeners would have set are written explicitly by the bulk INSERT
+    for result in (results[0], results[2]):
+        event = session.get(Event, result.event_id)
+        classification = session.query(Classification).filter(Classification.event_id == event.id).one()
+        assert event.event_signature == event_signature(event)
+        assert event.current_tier == classification.event_tier
+        rig_columns = {key: getattr(event, key) for key in event_rig_requirements(None)}
+        assert rig_columns == event_rig_requirements(event.rig_options)
+
+
+def test_item_stored_concurrently_is_skipped_and_reported_as_duplicate(sqlite_session, monkeypatch):
+    session = sqlite_session
+    (stored,) = ingest_payloads_bulk(session, "feed", [_payload("a")])
+    events_before = session.query(Event).count()
+    lookups = []
+
+    # Another run stores "a" after this run's dedupe query: the INSERT hits uq_raw_events_source_event_id
+    def existing_after_dedupe(session, source, source_event_ids):
+        lookups.append(source_event_ids)
+        return {} if len(lookups) == 1 else _real_existing(session, source, source_event_ids)
+
+    monkeypatch.setattr(ingestion, "_existing_raw_events", existing_after_dedupe)
+    results = ingest_payloads_bulk(session, "feed", [_payload("a"), _payload("d")], chunk_size=10)
+
+    assert [(r.duplicate, r.status) for r in results] == [(True, "classified"), (False, "classified")]
+    assert (results[0].raw_event_id, results[0].event_id) == (stored.raw_event_id, stored.event_id)
+    assert session.query(RawEvent).filter(RawEvent.source_event_id == "a").count() == 1
+    # The event created for the skipped row is dropped with its classification
+    assert session.query(Event).count() == events_before + 1
+    assert session.query(Classification).count() == session.query(Event).count()
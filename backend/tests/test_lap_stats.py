@@ -0,0 +1,36 @@
+"""Tests: Welford lap statistics match the batch formulas; grid ranking by average lap."""
+import math
+import statistics
+
+from app.models.participation import Participation
+from app.services.lap_stats import LapStats, consistency_score, pace_delta, rank_by_average_lap
+
+
+def test_running_stats_match_batch_and_resume_from_participation():
+    laps = [106.2, 105.8, 107.9, 106.0, 110.4, 105.5]
+    stats = LapStats()
+    for lap in laps[:3]:
+        stats.push(lap)
+    part = Participation(laps_completed=stats.count, total_lap_seconds=stats.total, lap_time_m2=stats.m2, best_lap_seconds=stats.best)
+    resumed = LapStats.from_participation(part)
+    for lap in laps[3:]:
+        resumed.push(lap)
+    assert resumed.count == len(laps)
+    assert math.isclose(resumed.mean, statistics.mean(laps))
+    assert math.isclose(resumed.sample_stddev, statistics.stdev(laps))
+    assert resumed.best == min(laps)
+    assert consistency_score(resumed) == round(10.0 - min(10.0, statistics.stdev(laps) * 2.5), 1)
+
+
+def test_consistency_needs_two_laps_and_pace_delta_is_non_negative():
+    one = LapStats()
+    one.push(100.0)
+    assert consistency_score(one) == 5.0
+    assert pace_delta(101.234, 100.0) == 1.23
+    assert pace_delta(99.0, 100.0) == 0.0
+    assert pace_delta(None, 100.0) == 0.0
+
+
+def test_rank_by_average_lap_puts_cars_without_laps_last():
+    ranked = rank_by_average_lap(["a", "b", "c", "d"], [107.0, None, 105.5, 107.0])
+    assert ranked == [(1, "c"), (2, "a"), (3, "d"), (4, "b")]
@@ -0,0 +1,75 @@
+"""Tests: lap telemetry rows are numbered after laps_completed and keep the Participation lap summary."""
+import math
+import statistics
+from datetime import datetime, timedelta, timezone
+
+from app.models.event import Event
+from app.models.participation import Participation
+from app.repositories.participation_lap import ParticipationLapRepository
+from app.services.lap_stats import LapStats, consistency_score
+from app.services.lap_telemetry import LapRecord, append_laps, average_lap_seconds, lap_rows, sync_lap_summaries
+
+NOW = datetime(2026, 3, 1, 18, 0, tzinfo=timezone.utc)
+
+
+def test_lap_rows_continue_numbering_and_update_summary():
+    part = Participation(id="p1", laps_completed=2, best_lap_seconds=101.0, last_lap_seconds=102.0, total_lap_seconds=203.0)
+    now = datetime.now(timezone.utc)
+    rows = lap_rows(part, [LapRecord(100.5, (40.0, 35.0, 25.5)), LapRecord(103.0)], now)
+    assert [r["lap_number"] for r in rows] == [3, 4]
+    assert rows[0]["sector_times"] == [40.0, 35.0, 25.5]
+    assert rows[1]["sector_times"] is None
+    assert (part.laps_completed, part.best_lap_seconds, part.last_lap_seconds) == (4, 100.5, 103.0)
+    assert part.total_lap_seconds == 406.5
+    assert average_lap_seconds(part) == 406.5 / 4
+
+
+def test_no_new_laps_leaves_summary_untouched():
+    part = Participation(id="p1", laps_completed=0, total_lap_seconds=0.0)
+    assert lap_rows(part, [], datetime.now(timezone.utc)) == []
+    assert part.best_lap_seconds is None
+    assert average_lap_seconds(part) is None
+
+
+def _participation(session, **fields):
+    event = Event(title="Spa", source="test", game="ACC", start_time_utc=NOW, created_at=NOW - timedelta(days=1))
+    session.add(event)
+    session.flush()
+    part = Participation(driver_id="d1", event_id=event.id, discipline="gt", **fields)
+    session.add(part)
+    session.flush()
+    return part
+
+
+def test_client_reported_laps_without_stored_laps_are_reset_before_appending(sqlite_session):
+    part = _participation(sqlite_session, laps_completed=5, total_lap_seconds=0.0, consistency_score=9.0)
+    laps = [106.2, 105.8, 107.9]
+    assert append_laps(sqlite_session, [(part, [LapRecord(t) for t in laps])]) == 3
+
+    numbers = [lap.lap_number for lap in ParticipationLapRepository(sqlite_session).list_for_participation(part.id)]
+    assert numbers == [1, 2, 3]
+    stats = LapStats.from_participation(part)
+    assert part.laps_completed == 3 and part.total_lap_seconds == round(sum(laps), 3)
+    assert math.isclose(stats.sample_stddev, statistics.stdev(laps))
+    assert part.consistency_score == consistency_score(stats)
+
+
+def test_summary_is_reseeded_from_stored_laps_when_laps_completed_disagrees(sqlite_session):
+    part = _participation(sqlite_session)
+    stored = [101.25, 103.5, 102.125]
+    append_laps(sqlite_session, [(part, [LapRecord(t) for t in stored])])
+    part.laps_completed, part.total_lap_seconds, part.lap_time_m2 = 8, 0.0, 0.0  # edited by a client
+    sqlite_session.info["statements"].clear()
+
+    assert sync_lap_summaries(sqlite_session, [part]) == 1
+    assert (part.laps_completed, part.best_lap_seconds, part.last_lap_seconds) == (3, 101.25, 102.125)
+    assert part.total_lap_seconds == round(sum(stored), 3)
+    assert math.isclose(LapStats.from_participation(part).sample_stddev, statistics.stdev(stored))
+    # In agreement: one count query, nothing reseeded
+    sqlite_session.info["statements"].clear()
+    assert sync_lap_summaries(sqlite_session, [part]) == 0
+    assert len(sqlite_session.info["statements"]) == 1
+
+    rows = lap_rows(part, [LapRecord(104.0)], NOW)
+    assert rows[0]["lap_number"] == 4
+    assert math.isclose(LapStats.from_participation(part).sample_stddev, statistics.stdev([*stored, 104.0]))
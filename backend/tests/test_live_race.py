@@ -0,0 +1,215 @@
+"""Tests: live race hub fan-out, slow clients, SSE frames, Redis listener reconnects and subscribe confirmation,
+the stream access check."""
+import asyncio
+import json
+import time
+from datetime import datetime, timedelta, timezone
+
+from app.models.driver import Driver
+from app.models.event import Event
+from app.models.participation import Participation, ParticipationState
+from app.repositories.participation import ParticipationRepository
+from app.services.live_race import LiveRaceHub, standings_message, stream_live_race
+
+
+async def _drain(queue):
+    await asyncio.sleep(0)
+    items = []
+    while not queue.empty():
+        items.append(queue.get_nowait())
+    return items
+
+
+def test_hub_delivers_only_to_subscribers_of_the_event():
+    async def run():
+        hub = LiveRaceHub(queue_size=10)
+        first, second, other = hub.subscribe("e1"), hub.subscribe("e1"), hub.subscribe("e2")
+        hub.publish("e1", {"type": "standings", "event_id": "e1", "participations": []})
+        assert [t for t, _ in await _drain(first.queue)] == ["standings"]
+        assert len(await _drain(second.queue)) == 1
+        assert await _drain(other.queue) == []
+        hub.unsubscribe(first)
+        hub.unsubscribe(second)
+        stats = hub.stats()
+        assert (stats["backend"], stats["channels"], stats["published"], stats["delivered"]) == ("memory", 1, 1, 2)
+
+    asyncio.run(run())
+
+
+def test_slow_subscriber_keeps_the_newest_messages():
+    async def run():
+        hub = LiveRaceHub(queue_size=2)
+        sub = hub.subscribe("e1")
+        for lap in range(1, 5):
+            hub.publish("e1", {"type": "standings", "event_id": "e1", "lap": lap})
+        items = await _drain(sub.queue)
+        assert [json.loads(payload)["lap"] for _, payload in items] == [3, 4]
+        assert sub.dropped == 2
+
+    asyncio.run(run())
+
+
+def test_stream_sends_snapshot_then_updates_and_ends_on_finished():
+    async def run():
+        hub = LiveRaceHub()
+        sub = hub.subscribe("e1")
+        snapshot = {"type": "standings", "event_id": "e1", "participations": []}
+
+        async def connected():
+            return False
+
+        frames = stream_live_race(hub, sub, snapshot, connected, heartbeat_seconds=0.01)
+        assert (await frames.__anext__()).startswith("event: standings\ndata: ")
+        assert await frames.__anext__() == ": keepalive\n\n"
+        hub.publish("e1", {"type": "finished", "event_id": "e1", "participations": []})
+        assert (await frames.__anext__()).startswith("event: finished\n")
+        assert [frame async for frame in frames] == []
+        assert hub.stats()["subscribers"] == 0
+
+    asyncio.run(run())
+
+
+def test_standings_message_carries_lap_and_position_fields():
+    part = Participation(
+        id="p1",
+        driver_id="d1",
+        participation_state=ParticipationState.started,
+        laps_completed=3,
+        last_lap_seconds=101.2,
+        position_overall=2,
+    )
+    message = standings_message("e1", [part], finished=True)
+    assert message["type"] == "finished"
+    standing = message["participations"][0]
+    assert standing["participation_id"] == "p1" and "id" not in standing
+    assert (standing["participation_state"], standing["laps_completed"], standing["position_overall"]) == (
+        "started",
+        3,
+        2,
+    )
+
+
+class _FlakyPubSub:
+    """PubSub double: the first connection fails on its first read, later ones deliver published messages."""
+
+    def __init__(self, redis):
+        self.redis = redis
+        self.channels = set()
+        self.confirmations = []
+        self.fail = not redis.connections
+        redis.connections.append(self)
+
+    @property
+    def subscribed(self):
+        return bool(self.channels)
+
+    def subscribe(self, channel):
+        if self.redis.confirm:
+            self.channels.add(channel)
+            self.confirmations.append({"type": "subscribe", "channel": channel, "data": len(self.channels)})
+
+    def unsubscribe(self, channel):
+        self.channels.discard(channel)
+
+    def get_message(self, timeout=None):
+        if self.fail:
+            raise ConnectionError("connection reset")
+        if self.confirmations:
+            return self.confirmations.pop(0)
+        if self.redis.messages:
+            channel, data = self.redis.messages.pop(0)
+            if channel in self.channels:
+                return {"type": "message", "channel": channel, "data": data}
+        time.sleep(0.01)
+        return None
+
+    def close(self):
+        pass
+
+
+class _FlakyRedis:
+    def __init__(self, confirm=True):
+        self.connections = []
+        self.messages = []
+        self.confirm = confirm  # False: the server never acknowledges (or applies) a SUBSCRIBE
+
+    def pubsub(self, ignore_subscribe_messages=True):
+        return _FlakyPubSub(self)
+
+    def publish(self, channel, data):
+        self.messages.append((channel, data))
+
+
+def test_listener_reconnects_and_resubscribes_current_channels():
+    async def run():
+        redis = _FlakyRedis()
+        hub = LiveRaceHub(redis, reconnect_max_seconds=0.05)
+        sub = hub.subscribe("e1")
+        gone = hub.subscribe("e2")
+        hub.start()
+        try:
+            for _ in range(200):
+                if len(redis.connections) > 1 and redis.connections[-1].channels:
+                    break
+                await asyncio.sleep(0.01)
+            hub.unsubscribe(gone)
+            hub.publish("e1", {"type": "standings", "event_id": "e1", "participations": []})
+            message = await asyncio.wait_for(sub.queue.get(), timeout=2)
+        finally:
+            hub.stop()
+        assert message[0] == "standings"
+        assert redis.connections[1].channels == {"live_race:event:e1"}
+        assert hub.stats()["reconnects"] == 1
+
+    asyncio.run(run())
+
+
+def test_live_access_check_covers_all_drivers_of_the_user_in_one_query(sqlite_session):
+    start = datetime(2026, 3, 1, 18, 0, tzinfo=timezone.utc)
+    event = Event(title="Spa", source="test", game="ACC", start_time_utc=start, created_at=start - timedelta(days=1))
+    drivers = [
+        Driver(name=name, primary_discipline=discipline, user_id=user_id)
+        for name, discipline, user_id in (("GT", "gt", "u1"), ("Formula", "formula", "u1"), ("Other", "gt", "u2"))
+    ]
+    sqlite_session.add_all([event, *drivers])
+    sqlite_session.flush()
+    # Only the user's second driver is registered
+    sqlite_session.add(Participation(driver_id=drivers[1].id, event_id=event.id, discipline="formula"))
+    sqlite_session.commit()
+    repo, event_id = ParticipationRepository(sqlite_session), event.id
+
+    sqlite_session.info["statements"].clear()
+    assert repo.user_has_participation_in_event("u1", event_id)
+    assert len(sqlite_session.info["statements"]) == 1
+    assert not repo.user_has_participation_in_event("u2", event_id)
+    assert not repo.user_has_participation_in_event("u1", "other-event")
+
+
+def test_wait_subscribed_returns_once_redis_confirms_the_channel():
+    async def run():
+        redis = _FlakyRedis()
+        redis.connections.append(None)  # no failing first connection
+        hub = LiveRaceHub(redis)
+        hub.start()
+        try:
+            sub = hub.subscribe("e1")
+            assert await hub.wait_subscribed(sub, timeout=2)
+            # Channel is live: an update published right after (before the snapshot) reaches the client
+            assert "live_race:event:e1" in redis.connections[-1].channels
+            second = hub.subscribe("e1")
+            assert await hub.wait_subscribed(second, timeout=0)
+        finally:
+            hub.stop()
+
+        unconfirmed = _FlakyRedis(confirm=False)
+        unconfirmed.connections.append(None)
+        hub = LiveRaceHub(unconfirmed)
+        hub.start()
+        try:
+            assert not await hub.wait_subscribed(hub.subscribe("e1"), timeout=0.2)
+        finally:
+            hub.stop()
+        memory = LiveRaceHub()
+        assert await memory.wait_subscribed(memory.subscribe("e1"), timeout=0)
+
+    asyncio.run(run())
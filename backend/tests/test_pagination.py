@@ -0,0 +1,64 @@
+"""Tests: keyset pagination cursor tokens and page walks over NOT NULL timestamps."""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import Column, DateTime, String, select
+
+from app.models.audit_log import AuditLog
+from app.repositories.audit_log import AuditLogRepository
+from app.repositories.pagination import PageCursor, keyset_page, next_cursor
+
+
+def test_cursor_round_trip():
+    cursor = PageCursor(at=datetime(2026, 2, 8, 12, 30, 1, 123456, tzinfo=timezone.utc), id="abc-123")
+    assert PageCursor.decode(cursor.encode()) == cursor
+
+
+@pytest.mark.parametrize("token", ["", "not-base64!", "bm8tc2VwYXJhdG9y"])
+def test_invalid_cursor_raises_value_error(token):
+    with pytest.raises(ValueError):
+        PageCursor.decode(token)
+
+
+def test_next_cursor_only_for_full_pages():
+    rows = [{"id": "b", "created_at": datetime(2026, 1, 2)}, {"id": "a", "created_at": datetime(2026, 1, 1)}]
+    assert next_cursor(rows, limit=3) is None
+    assert PageCursor.decode(next_cursor(rows, limit=2)) == PageCursor(at=datetime(2026, 1, 1), id="a")
+
+
+def test_next_cursor_refuses_a_row_without_timestamp():
+    rows = [{"id": "b", "created_at": datetime(2026, 1, 2)}, {"id": "a", "created_at": None}]
+    with pytest.raises(ValueError):
+        next_cursor(rows, limit=2)
+
+
+def test_keyset_page_requires_not_null_timestamp():
+    column = Column("at", DateTime, nullable=True)
+    with pytest.raises(ValueError):
+        keyset_page(select(column), column, Column("id", String), None, limit=10)
+
+
+def test_pages_cover_every_row_once_including_equal_timestamps(sqlite_session):
+    at = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    # Three rows per timestamp: ties are broken by id, page boundaries fall inside a tie
+    sqlite_session.add_all(
+        AuditLog(
+            id=f"log-{i:02d}",
+            action="login",
+            path="/auth/login",
+            status_code=200,
+            created_at=at - timedelta(hours=i // 3),
+        )
+        for i in range(10)
+    )
+    sqlite_session.commit()
+    seen, cursor = [], None
+    while True:
+        page = AuditLogRepository(sqlite_session).list_recent(limit=4, cursor=cursor)
+        seen.extend(log.id for log in page)
+        token = next_cursor(page, limit=4)
+        if token is None:
+            break
+        cursor = PageCursor.decode(token)
+    assert sorted(seen) == sorted(f"log-{i:02d}" for i in range(10))
+    assert len(seen) == 10
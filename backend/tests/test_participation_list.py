@@ -0,0 +1,86 @@
+"""Tests: list_rows_with_event returns the same participations, event fields and counts as the per-row ORM path."""
+from datetime import datetime, timedelta, timezone
+
+from app.models.event import Event
+from app.models.incident import Incident
+from app.models.participation import Participation, ParticipationStatus, duration_minutes_between
+from app.models.penalty import Penalty
+from app.repositories.event import EventRepository
+from app.repositories.participation import ParticipationRepository
+from app.schemas.participation import ParticipationRead, ParticipationWithEventRead
+
+NOW = datetime(2026, 3, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def _seed(session):
+    events = [
+        Event(title=f"Race {i}", source="test", game="ACC", start_time_utc=NOW + timedelta(days=i), created_at=NOW)
+        for i in range(3)
+    ]
+    session.add_all(events)
+    session.flush()
+    parts = [
+        Participation(
+            driver_id=driver_id,
+            event_id=event.id,
+            discipline="gt",
+            status=ParticipationStatus.finished,
+            started_at=event.start_time_utc,
+            finished_at=event.start_time_utc + timedelta(minutes=47),
+            created_at=NOW - timedelta(hours=10 - i),
+        )
+        for i, (driver_id, event) in enumerate(
+            [("d1", events[0]), ("d1", events[1]), ("d1", events[2]), ("d2", events[0])]
+        )
+    ]
+    session.add_all(parts)
+    session.flush()
+    # 0, 1 and 3 incidents; penalties on some of them only
+    for part, scores in zip(parts, [[], [1.0], [2.0, 3.0, 4.0], [5.0]]):
+        for score in scores:
+            incident = Incident(participation_id=part.id, incident_type="contact", score=score)
+            session.add(incident)
+            session.flush()
+            for _ in range(int(score) - 1):
+                session.add(Penalty(incident_id=incident.id, penalty_type="warning"))
+    session.commit()
+
+
+def _per_row(session, **filters):
+    """The list view before the joined query: ORM participations plus one event lookup per row."""
+    event_repo = EventRepository(session)
+    result = []
+    for p in ParticipationRepository(session).list_filtered(**filters):
+        event = event_repo.get_by_id(p.event_id)
+        result.append(
+            ParticipationWithEventRead(
+                **ParticipationRead.model_validate(p).model_dump(),
+                event_title=event.title if event else "",
+                event_start_time_utc=event.start_time_utc if event else None,
+            )
+        )
+    return result
+
+
+def _joined(session, **filters):
+    return [
+        ParticipationWithEventRead(
+            **row, duration_minutes=duration_minutes_between(row["started_at"], row["finished_at"])
+        )
+        for row in ParticipationRepository(session).list_rows_with_event(**filters)
+    ]
+
+
+def test_joined_rows_match_per_row_queries(sqlite_session):
+    session = sqlite_session
+    _seed(session)
+    for filters in ({}, {"driver_id": "d1"}, {"driver_id": "d1", "offset": 1, "limit": 1}):
+        session.expire_all()
+        expected = _per_row(session, **filters)
+        session.info["statements"].clear()
+        rows = _joined(session, **filters)
+        assert len(session.info["statements"]) == 1
+        assert [r.model_dump() for r in rows] == [r.model_dump() for r in expected]
+
+    counts = {(r.incidents_count, r.penalties_count) for r in _joined(session, driver_id="d1")}
+    assert counts == {(0, 0), (1, 0), (3, 6)}
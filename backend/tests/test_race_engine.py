@@ -0,0 +1,118 @@
+"""Tests: race engine ticks each live event once per lap boundary, skips unchanged events, records lag;
+with Redis an event lease + lap watermark keep other workers off an event."""
+from datetime import datetime, timedelta, timezone
+
+from app.services.mock_race_runner import RaceEngine, RaceSlot
+from app.services.mock_race_service import RaceProgress
+
+START = datetime(2026, 1, 1, 12, 0, tzinfo=timezone.utc)
+
+
+class _Engine(RaceEngine):
+    def __init__(self, **kwargs):
+        super().__init__(interval_seconds=5, workers=1, start_delay_seconds=0, **kwargs)
+        self.calls = []
+
+    def tick_event(self, event_id, now):
+        self.calls.append((event_id, now))
+        if event_id == "broken":
+            raise RuntimeError("db down")
+        return True
+
+    def add(self, event_id):
+        self._slots[event_id] = RaceSlot(event_id=event_id, start_utc=START, next_due=START)
+
+
+class _Redis:
+    def __init__(self):
+        self.data = {}
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.data:
+            return None
+        self.data[key] = str(value)
+        return True
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def eval(self, script, numkeys, key, token):
+        if self.data.get(key) == token:
+            del self.data[key]
+            return 1
+        return 0
+
+
+def test_race_progress_one_lap_per_interval():
+    progress = RaceProgress.at(START, START + timedelta(seconds=12), 5)
+    assert (progress.tick_index, progress.laps_done, progress.total_laps, progress.finished) == (2, 3, 12, False)
+    done = RaceProgress.at(START, START + timedelta(seconds=59), 5)
+    assert done.finished and done.laps_done == 12
+    assert done.finish_at == START + timedelta(seconds=60)
+
+
+def test_engine_ticks_each_event_per_lap_and_skips_when_nothing_changed():
+    engine = _Engine()
+    engine.add("a")
+    engine.add("b")
+    now = START + timedelta(seconds=1.5)
+    assert engine.dispatch_due(now) == 2
+    assert engine._slots["a"].laps_done == 1
+    assert engine._slots["a"].next_due == START + timedelta(seconds=5)
+    # Not due yet: no tick; forced re-dispatch in the same lap is skipped without touching the DB
+    assert engine.dispatch_due(now) == 0
+    engine._slots["a"].next_due = START
+    assert engine.dispatch_due(now) == 0
+    assert len(engine.calls) == 2
+    stats = engine.stats()
+    assert stats["ticks"] == 2 and stats["skipped"] == 1
+    assert stats["lag_ms"]["max"] == 1500.0
+    # Late tick catches up several laps at once
+    assert engine.dispatch_due(START + timedelta(seconds=16)) == 2
+    assert engine._slots["a"].laps_done == 4
+
+
+def test_engine_failed_event_does_not_block_others_and_finished_events_leave_schedule():
+    engine = _Engine()
+    engine.add("broken")
+    engine.add("ok")
+    assert engine.dispatch_due(START + timedelta(seconds=61)) == 2
+    assert set(engine._slots) == {"broken"}
+    assert engine._slots["broken"].laps_done == 0
+    stats = engine.stats()
+    assert stats["failed"] == 1 and stats["finished_events"] == 1
+
+
+def test_engine_redis_claim_lets_one_worker_advance_each_lap():
+    redis = _Redis()
+    first, second = _Engine(redis_client=redis), _Engine(redis_client=redis)
+    for engine in (first, second):
+        engine.add("a")
+        engine.dispatch_due(START + timedelta(seconds=1))
+    assert len(first.calls) == 1 and second.calls == []
+    assert second.stats()["claimed_elsewhere"] == 1
+    assert second._slots["a"].laps_done == 1
+
+
+def test_event_lease_blocks_other_workers_until_the_tick_commits():
+    redis = _Redis()
+    first, second = _Engine(redis_client=redis), _Engine(redis_client=redis)
+    for engine in (first, second):
+        engine.add("a")
+    # first is mid-tick (lease held, not committed yet): second must not tick the event, even for a later lap
+    assert first._claim("a", 1) == (True, None)
+    assert second.dispatch_due(START + timedelta(seconds=6)) == 0
+    assert second.calls == [] and second.stats()["claimed_elsewhere"] == 1
+
+    first._release("a", 1)
+    assert redis.data == {"race_engine:event:a:laps": "1"}  # lease gone, no per-lap keys
+    second._slots["a"].next_due = START
+    assert second.dispatch_due(START + timedelta(seconds=6)) == 1
+    assert len(second.calls) == 1 and redis.data["race_engine:event:a:laps"] == "2"
+
+    # A failed tick releases the lease without moving the watermark
+    first._slots["a"].next_due = START
+    first._slots["a"].laps_done = 2
+    first.tick_event = lambda event_id, now: (_ for _ in ()).throw(RuntimeError("db down"))
+    assert first.dispatch_due(START + timedelta(seconds=11)) == 1
+    assert redis.data == {"race_engine:event:a:laps": "2"}
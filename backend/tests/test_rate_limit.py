@@ -0,0 +1,38 @@
+"""Tests: sliding-window rate limiter backends."""
+import pytest
+from fastapi import HTTPException
+
+from app.services import rate_limit
+from app.services.rate_limit import MemoryRateLimiter, RateLimitConfig
+
+
+def test_memory_limiter_sliding_window():
+    limiter = MemoryRateLimiter(max_keys=10)
+    config = RateLimitConfig(limit=2, window_seconds=60)
+    assert limiter.hit("k", config, now=0) is True
+    assert limiter.hit("k", config, now=10) is True
+    assert limiter.hit("k", config, now=20) is False
+    assert limiter.hit("k", config, now=61) is True
+
+
+def test_memory_limiter_evicts_least_recently_used_keys():
+    limiter = MemoryRateLimiter(max_keys=3)
+    config = RateLimitConfig(limit=5, window_seconds=60)
+    for i in range(10):
+        limiter.hit(f"client-{i}", config, now=i)
+    assert limiter.size() == 3
+    assert limiter.evicted == 7
+
+
+def test_enforce_falls_back_to_memory_when_redis_fails(monkeypatch):
+    class _BrokenRedis:
+        def hit(self, key, config, now=None):
+            raise ConnectionError("redis down")
+
+    monkeypatch.setattr(rate_limit, "_redis_limiter", _BrokenRedis())
+    monkeypatch.setattr(rate_limit, "_memory", MemoryRateLimiter(max_keys=10))
+    config = RateLimitConfig(limit=1, window_seconds=60)
+    rate_limit.enforce_rate_limit("auth:login:test", config)
+    with pytest.raises(HTTPException) as exc:
+        rate_limit.enforce_rate_limit("auth:login:test", config)
+    assert exc.value.status_code == 429
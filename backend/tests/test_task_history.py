@@ -0,0 +1,61 @@
+"""Tests: load_task_history reads all candidate tasks in three queries, newest completions first."""
+from datetime import datetime, timedelta, timezone
+
+from app.models.event import Event
+from app.models.participation import Participation
+from app.models.task_completion import TaskCompletion
+from app.services.task_history import load_task_history
+
+NOW = datetime(2026, 3, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def _completion(session, task_id, created_at, participation=None, status="completed", signature=None):
+    completion = TaskCompletion(
+        driver_id="d1",
+        task_id=task_id,
+        participation_id=participation.id if participation else None,
+        status=status,
+        event_signature=signature,
+        created_at=created_at,
+        completed_at=created_at if status == "completed" else None,
+    )
+    session.add(completion)
+    return completion
+
+
+def test_history_is_loaded_in_three_queries_newest_first(sqlite_session):
+    session = sqlite_session
+    event, next_event = (
+        Event(title=title, source="test", game="ACC", start_time_utc=start, created_at=NOW - timedelta(days=9))
+        for title, start in (("Spa 6h", NOW - timedelta(days=3)), ("Monza sprint", NOW))
+    )
+    session.add_all([event, next_event])
+    session.flush()
+    part = Participation(driver_id="d1", event_id=event.id, discipline="gt")
+    current = Participation(driver_id="d1", event_id=next_event.id, discipline="gt")
+    session.add_all([part, current])
+    session.flush()
+
+    _completion(session, "t1", NOW - timedelta(days=40), signature="old")  # outside the window
+    _completion(session, "t1", NOW - timedelta(days=5), signature="stored")
+    _completion(session, "t1", NOW - timedelta(days=2), participation=part)  # legacy: no stored signature
+    _completion(session, "t2", NOW - timedelta(days=1), signature="stored")
+    pending = _completion(session, "t2", NOW, participation=current, status="pending")
+    _completion(session, "t2", NOW, participation=part, status="pending")  # other participation
+    _completion(session, "t1", NOW, signature="other-driver").driver_id = "d2"
+    session.commit()
+    current_id, pending_id, event_id, signature = current.id, pending.id, event.id, event.event_signature
+    session.info["statements"].clear()
+
+    snapshot = load_task_history(session, "d1", ["t1", "t2", "t3"], current_id, NOW - timedelta(days=30))
+
+    assert len(session.info["statements"]) == 3
+    assert snapshot.total_completed("t1") == 3 and snapshot.total_completed("t3") == 0
+    assert snapshot.latest_completion_time("t1") == NOW - timedelta(days=2)
+    recent = snapshot.recent_completions("t1", NOW - timedelta(days=30))
+    assert [r.created_at for r in recent] == [NOW - timedelta(days=2), NOW - timedelta(days=5)]
+    assert [r.event_signature for r in recent] == [signature, "stored"]
+    assert snapshot.same_event_count("t1", event_id, NOW - timedelta(days=30)) == 1
+    assert snapshot.same_signature_count("t1", "stored", NOW - timedelta(days=3)) == 0
+    assert snapshot.open_completion("t2", ("pending", "in_progress")).id == pending_id
+    assert snapshot.open_completion("t1", ("pending", "in_progress")) is None
@@ -0,0 +1,94 @@
+"""Tests: compiled TaskDefinition requirements (checks, reasons, cache by updated_at)."""
+from datetime import datetime
+
+from app.models.task_definition import TaskDefinition
+from app.services import task_requirements
+from app.services.task_requirements import (
+    ParticipationSnapshot,
+    clear_compiled_requirements,
+    compile_requirements,
+)
+
+
+def _snapshot(**overrides) -> ParticipationSnapshot:
+    values = dict(
+        status="finished",
+        event_tier="E2",
+        actual_duration_minutes=45.0,
+        event_duration_minutes=45,
+        incidents_count=0,
+        penalties_count=0,
+        position_overall=3,
+        laps_completed=20,
+        night=False,
+        weather="fixed",
+        team_event=False,
+    )
+    values.update(overrides)
+    return ParticipationSnapshot(**values)
+
+
+def _task(**fields) -> TaskDefinition:
+    return TaskDefinition(
+        id=fields.pop("id", "task-1"),
+        code="T",
+        name="Task",
+        discipline="gt",
+        description="d",
+        requirements=fields.pop("requirements", {}),
+        updated_at=fields.pop("updated_at", datetime(2026, 1, 1)),
+        **fields,
+    )
+
+
+def setup_function():
+    clear_compiled_requirements()
+
+
+def test_clean_finish_reasons():
+    req = compile_requirements(_task(require_clean_finish=True, min_event_tier="E3"))
+    snap = _snapshot(incidents_count=1)
+    assert not req.matches(snap)
+    assert req.failure_reasons(snap) == [
+        "Event tier must be at least E3, got E2",
+        "Clean finish required (no incidents or penalties)",
+    ]
+    assert req.matches(_snapshot(event_tier="E3"))
+
+
+def test_requirements_json_fallback_and_defaults():
+    req = compile_requirements(_task(requirements={"max_incidents": 2, "repeatable": True}))
+    assert req.repeatable is True
+    assert req.cooldown_hours == 24
+    assert req.max_same_event_count == 1
+    assert req.require_event_diversity is True
+    assert req.diminishing is True
+    assert req.failure_reasons(_snapshot(incidents_count=3)) == ["Incidents must be at most 2, got 3"]
+
+
+def test_non_finish_requires_allow_non_finish():
+    assert compile_requirements(_task(id="a")).failure_reasons(_snapshot(status="dnf")) == [
+        "Participation finish (finished) required"
+    ]
+    assert compile_requirements(_task(id="b", allow_non_finish=True)).matches(_snapshot(status="dnf"))
+
+
+def test_cache_reused_until_updated_at_changes():
+    task = _task(max_incidents=1)
+    first = compile_requirements(task)
+    assert compile_requirements(task) is first
+    task.max_incidents = 5
+    assert compile_requirements(task) is first
+    task.updated_at = datetime(2026, 1, 2)
+    recompiled = compile_requirements(task)
+    assert recompiled is not first
+    assert recompiled.matches(_snapshot(incidents_count=4))
+
+
+def test_cache_keeps_most_recently_used_tasks(monkeypatch):
+    monkeypatch.setattr(task_requirements, "COMPILED_CACHE_MAX_TASKS", 2)
+    first = compile_requirements(_task(id="a"))
+    compile_requirements(_task(id="b"))
+    assert compile_requirements(_task(id="a")) is first
+    compile_requirements(_task(id="c"))
+    assert list(task_requirements._compiled) == ["a", "c"]
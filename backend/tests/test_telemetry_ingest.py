@@ -0,0 +1,163 @@
+"""Tests: telemetry batches parse per message (JSON / NDJSON), write laps and positions, enqueue CRS after commit."""
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.exc import IntegrityError
+
+from app.models.event import Event
+from app.models.participation import Participation, ParticipationState
+from app.repositories.participation_lap import ParticipationLapRepository
+from app.schemas.telemetry import TelemetryIncident, TelemetryLap, TelemetrySector
+from app.services import telemetry_ingest
+from app.services.telemetry_ingest import (
+    _set_sector,
+    _start_if_registered,
+    ingest_telemetry,
+    is_lap_conflict,
+    parse_telemetry_body,
+)
+
+MESSAGES = [
+    {"type": "lap", "participation_id": "p1", "lap_number": 1, "lap_time_seconds": 105.2, "sector_times": [40, 35, 30.2]},
+    {"type": "sector", "participation_id": "p1", "lap_number": 2, "sector": 1, "sector_time_seconds": 39.8},
+    {"type": "incident", "participation_id": "p2", "code": "acc_contact_no_penalty", "lap": 1},
+    {"type": "lap", "participation_id": "p1", "lap_time_seconds": 0},
+    {"type": "pit"},
+]
+
+
+def test_json_and_ndjson_bodies_validate_each_message():
+    for body, ndjson in (
+        (json.dumps({"messages": MESSAGES}).encode(), False),
+        (json.dumps(MESSAGES).encode(), False),
+        ("\n".join(json.dumps(m) for m in MESSAGES).encode() + b"\n\n", True),
+    ):
+        messages, errors = parse_telemetry_body(body, ndjson)
+        assert [index for index, _ in messages] == [0, 1, 2]
+        assert [type(m) for _, m in messages] == [TelemetryLap, TelemetrySector, TelemetryIncident]
+        assert [(e.index, e.participation_id) for e in errors] == [(3, "p1"), (4, None)]
+        assert "lap_time_seconds" in errors[0].error
+
+
+def test_ndjson_bad_line_is_reported_by_index_and_bad_body_raises():
+    messages, errors = parse_telemetry_body(b'{"type": "lap"\n' + json.dumps(MESSAGES[0]).encode(), True)
+    assert [index for index, _ in messages] == [1]
+    assert errors[0].index == 0 and errors[0].error.startswith("Invalid JSON")
+    with pytest.raises(ValueError):
+        parse_telemetry_body(b'{"laps": []}', False)
+    with pytest.raises(ValueError):
+        parse_telemetry_body(b"not json", False)
+
+
+def test_sectors_fill_in_order_and_resent_split_overwrites():
+    sectors = []
+    assert _set_sector(sectors, 1, 40.0)
+    assert not _set_sector(sectors, 3, 30.0)
+    assert _set_sector(sectors, 2, 35.0)
+    assert _set_sector(sectors, 1, 39.5)
+    assert sectors == [39.5, 35.0]
+
+
+def test_registered_participation_starts_only_when_event_has_started():
+    now = datetime.now(timezone.utc)
+    started = Event(start_time_utc=now - timedelta(minutes=1))
+    upcoming = Event(start_time_utc=now + timedelta(minutes=1))
+    part = Participation(participation_state=ParticipationState.registered)
+    assert _start_if_registered(part, upcoming, now) == "Event has not started"
+    assert _start_if_registered(part, started, now) is None
+    assert part.participation_state == ParticipationState.started
+    assert part.started_at == started.start_time_utc
+    done = Participation(participation_state=ParticipationState.completed)
+    assert _start_if_registered(done, started, now) == "Participation is not in progress"
+
+
+def _live_grid(session, now):
+    race = Event(
+        title="Spa",
+        source="test",
+        game="ACC",
+        start_time_utc=now - timedelta(minutes=10),
+        created_at=now - timedelta(days=1),
+    )
+    session.add(race)
+    session.flush()
+    parts = [
+        Participation(driver_id=driver_id, event_id=race.id, discipline="gt", created_at=now - timedelta(hours=1))
+        for driver_id in ("d1", "d2")
+    ]
+    session.add_all(parts)
+    session.commit()
+    return [part.id for part in parts]
+
+
+def test_batch_writes_laps_updates_positions_and_enqueues_crs_once_per_driver(sqlite_session, monkeypatch):
+    session = sqlite_session
+    now = datetime.now(timezone.utc)
+    p1, p2 = _live_grid(session, now)
+    enqueued, committed_at = [], []
+    event.listen(session, "after_commit", lambda s: committed_at.append(len(s.info["statements"])))
+
+    def record(session_, driver_id, discipline, trigger_participation_id=None):
+        # Nothing is reloaded between commit and the enqueue loop
+        enqueued.append((driver_id, discipline, trigger_participation_id, len(session_.info["statements"])))
+
+    monkeypatch.setattr(telemetry_ingest, "enqueue_crs_recompute", record)
+    messages, errors = parse_telemetry_body(
+        json.dumps(
+            [
+                {"type": "lap", "participation_id": p1, "lap_time_seconds": 105.2, "position_overall": 2},
+                {"type": "lap", "participation_id": p2, "lap_time_seconds": 104.1, "position_overall": 1},
+                {"type": "lap", "participation_id": p1, "lap_time_seconds": 104.9, "position_overall": 1},
+                # Lap 1 of p2 resent: counted as a duplicate
+                {"type": "lap", "participation_id": p2, "lap_number": 1, "lap_time_seconds": 104.1},
+                {"type": "lap", "participation_id": "missing", "lap_time_seconds": 100.0},
+            ]
+        ).encode(),
+        False,
+    )
+    result = ingest_telemetry(session, messages, errors)
+
+    assert (result.laps_written, result.duplicates, result.rejected, result.crs_recomputes) == (3, 1, 1, 2)
+    assert sorted(e[:3] for e in enqueued) == [("d1", "gt", p1), ("d2", "gt", p2)]
+    assert {e[3] for e in enqueued} == {committed_at[-1]}
+    session.expire_all()
+    first, second = session.get(Participation, p1), session.get(Participation, p2)
+    assert (first.laps_completed, first.position_overall) == (2, 1)
+    assert first.participation_state == ParticipationState.started
+    assert (second.laps_completed, second.position_overall) == (1, 1)
+    assert [lap.lap_number for lap in ParticipationLapRepository(session).list_for_participation(p1)] == [1, 2]
+
+
+def test_failed_inline_crs_recompute_keeps_the_committed_batch(sqlite_session, monkeypatch):
+    session = sqlite_session
+    now = datetime.now(timezone.utc)
+    p1, _ = _live_grid(session, now)
+
+    def fail(*args, **kwargs):
+        raise RuntimeError("database is gone")
+
+    monkeypatch.setattr(telemetry_ingest, "enqueue_crs_recompute", fail)
+    messages, errors = parse_telemetry_body(
+        json.dumps([{"type": "lap", "participation_id": p1, "lap_time_seconds": 105.2}]).encode(), False
+    )
+    result = ingest_telemetry(session, messages, errors)
+    assert (result.laps_written, result.crs_recomputes) == (1, 0)
+    session.expire_all()
+    assert session.get(Participation, p1).laps_completed == 1
+
+
+def test_only_lap_primary_key_violations_count_as_concurrent_lap_writes(sqlite_session):
+    session = sqlite_session
+    p1, _ = _live_grid(session, datetime.now(timezone.utc))
+    row = {"participation_id": p1, "lap_number": 1, "lap_time_seconds": 100.0}
+    ParticipationLapRepository(session).add_many([row])
+    with pytest.raises(IntegrityError) as lap_conflict:
+        ParticipationLapRepository(session).add_many([row])
+    session.rollback()
+    with pytest.raises(IntegrityError) as other:
+        session.execute(text("INSERT INTO events (id) VALUES (NULL)"))
+    session.rollback()
+    assert is_lap_conflict(lap_conflict.value)
+    assert not is_lap_conflict(other.value)
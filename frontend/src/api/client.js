@@ -43,3 +43,44 @@ export const apiFetchWithRetry = async (url, options = {}, onRetry) => {
   if (lastRes) return lastRes;
   throw lastErr;
 };
+
+/**
+ * Read a Server-Sent Events stream (fetch, so the X-API-Key header is sent; EventSource cannot set headers).
+ * Calls onMessage with each parsed `data:` payload; resolves when the server ends the stream or
+ * `signal` aborts it, rejects on a non-2xx response or network error.
+ */
+export const apiEventStream = async (url, onMessage, { signal } = {}) => {
+  const res = await apiFetch(url, { headers: { Accept: 'text/event-stream' }, signal });
+  if (!res.ok || !res.body) {
+    throw new Error(`Event stream failed: ${res.status}`);
+  }
+  const reader = res.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+  try {
+    for (;;) {
+      const { value, done } = await reader.read();
+      if (done) return;
+      buffer += decoder.decode(value, { stream: true });
+      let end = buffer.indexOf('\n\n');
+      while (end !== -1) {
+        const frame = buffer.slice(0, end);
+        buffer = buffer.slice(end + 2);
+        const data = frame
+          .split('\n')
+          .filter((line) => line.startsWith('data:'))
+          .map((line) => line.slice(5).trimStart())
+          .join('\n');
+        let message = null;
+        try {
+          message = data ? JSON.parse(data) : null;
+        } catch (_) {}
+        if (message) onMessage(message);
+        end = buffer.indexOf('\n\n');
+      }
+    }
+  } catch (err) {
+    if (signal?.aborted) return;
+    throw err;
+  }
+};
@@ -1,4 +1,4 @@
-import { apiFetch } from '../api/client.js';
+import { apiEventStream, apiFetch } from '../api/client.js';
 import { setList, setEventListWithRegister, setTaskListClickable, setRecommendationTasksList, setRecommendationRacesList, tickRecommendationCountdowns } from '../utils/dom.js';
 import { formatDateTime, formatCountdown } from '../utils/format.js';
 import { eventGameMatchesDriverGames } from '../utils/gameAliases.js';
@@ -51,6 +51,7 @@ const currentRacePenalties = document.querySelector('[data-current-race-penaltie
 const currentRaceIncidents = document.querySelector('[data-current-race-incidents]');
 let recommendationCountdownInterval = null;
 let activeRacePollInterval = null;
+let activeRaceStream = null;
 const ACTIVE_RACE_POLL_MS = 5000;
 
 const getParticipationMinutes = (participation) => {
@@ -1168,11 +1169,77 @@ const fetchActiveRace = async (driver) => {
   return data || null;
 };
 
-export const loadActiveRace = async (driver) => {
+const stopActiveRaceUpdates = () => {
   if (activeRacePollInterval) {
     clearInterval(activeRacePollInterval);
     activeRacePollInterval = null;
   }
+  if (activeRaceStream) {
+    activeRaceStream.abort();
+    activeRaceStream = null;
+  }
+};
+
+const pollActiveRace = (driver) => {
+  activeRacePollInterval = setInterval(async () => {
+    if (lastDriverForActiveRace?.id !== driver.id) return;
+    const next = await fetchActiveRace(driver);
+    if (!next) {
+      stopActiveRaceUpdates();
+      setCurrentRaceCard(null);
+      return;
+    }
+    setCurrentRaceCard(next);
+  }, ACTIVE_RACE_POLL_MS);
+};
+
+/** Merge a live race message (GET /events/{id}/live) into the card data; returns false when the race is over. */
+const applyLiveRaceMessage = (data, message) => {
+  if (message.type === 'standings' || message.type === 'finished') {
+    const own = (message.participations || []).find((p) => p.participation_id === data.id);
+    if (own) {
+      const { participation_id: _, ...standing } = own;
+      Object.assign(data, standing);
+    }
+    if (message.type === 'finished' || (own && own.participation_state !== 'started')) return false;
+  } else if (message.type === 'incident' && message.participation_id === data.id) {
+    data.incidents_count = (data.incidents_count ?? 0) + 1;
+    if ((message.penalty_types || []).length) {
+      data.penalties_count = (data.penalties_count ?? 0) + message.penalty_types.length;
+    }
+  }
+  return true;
+};
+
+/** Live updates pushed by the server while the race runs; falls back to polling if the stream fails. */
+const streamActiveRace = (driver, data) => {
+  const controller = new AbortController();
+  activeRaceStream = controller;
+  let finished = false;
+  apiEventStream(
+    `/api/events/${encodeURIComponent(data.event_id)}/live`,
+    (message) => {
+      if (finished || lastDriverForActiveRace?.id !== driver.id) return;
+      if (!applyLiveRaceMessage(data, message)) {
+        finished = true;
+        controller.abort();
+        setCurrentRaceCard(null);
+        return;
+      }
+      setCurrentRaceCard(data);
+    },
+    { signal: controller.signal },
+  )
+    .catch(() => {})
+    .finally(() => {
+      if (finished || controller.signal.aborted || activeRaceStream !== controller) return;
+      activeRaceStream = null;
+      pollActiveRace(driver);
+    });
+};
+
+export const loadActiveRace = async (driver) => {
+  stopActiveRaceUpdates();
   lastDriverForActiveRace = driver;
   if (!driver || !currentRaceCard) {
     setCurrentRaceCard(null);
@@ -1180,18 +1247,9 @@ export const loadActiveRace = async (driver) => {
   }
   const data = await fetchActiveRace(driver);
   setCurrentRaceCard(data ?? null);
-  if (data) {
-    activeRacePollInterval = setInterval(async () => {
-      if (lastDriverForActiveRace?.id !== driver.id) return;
-      const next = await fetchActiveRace(driver);
-      if (!next) {
-        if (activeRacePollInterval) clearInterval(activeRacePollInterval);
-        activeRacePollInterval = null;
-        setCurrentRaceCard(null);
-        return;
-      }
-      setCurrentRaceCard(next);
-    }, ACTIVE_RACE_POLL_MS);
+  if (data && lastDriverForActiveRace?.id === driver.id) {
+    if (data.event_id) streamActiveRace(driver, data);
+    else pollActiveRace(driver);
   }
 };
 
@@ -1420,10 +1478,9 @@ export const loadDashboardEvents = async (driver) => {
   };
   try {
     const discipline = driver.primary_discipline || 'gt';
-    const [eventsRes, upcomingCountRes, pastCountRes, upcomingPageRes, pastPageRes] = await Promise.all([
+    // Page responses carry the total in X-Total-Count, so no separate /count requests.
+    const [eventsRes, upcomingPageRes, pastPageRes] = await Promise.all([
       apiFetch(`/api/events?driver_id=${driver.id}&same_tier=${sameTier}&rig_filter=${sameTier}`),
-      apiFetch(`/api/events/upcoming/count?driver_id=${driver.id}`),
-      apiFetch(`/api/events/past/count?driver_id=${driver.id}`),
       apiFetch(`/api/events/upcoming?driver_id=${driver.id}&discipline=${discipline}&limit=${EVENT_PAGE_SIZE}&offset=0`),
       apiFetch(`/api/events/past?driver_id=${driver.id}&limit=${EVENT_PAGE_SIZE}&offset=0`),
     ]);
@@ -1452,14 +1509,8 @@ export const loadDashboardEvents = async (driver) => {
 
     lastUpcomingEventsDriver = driver;
     lastPastEventsDriver = driver;
-    if (upcomingCountRes.ok) {
-      const { total } = await upcomingCountRes.json();
-      upcomingEventsTotalCount = total ?? 0;
-    }
-    if (pastCountRes.ok) {
-      const { total } = await pastCountRes.json();
-      pastEventsTotalCount = total ?? 0;
-    }
+    upcomingEventsTotalCount = upcomingPageRes.ok ? Number(upcomingPageRes.headers.get('X-Total-Count')) || 0 : 0;
+    pastEventsTotalCount = pastPageRes.ok ? Number(pastPageRes.headers.get('X-Total-Count')) || 0 : 0;
 
     let upcomingPage = [];
     if (upcomingPageRes.ok) upcomingPage = await upcomingPageRes.json();